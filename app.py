@@ -1,7 +1,7 @@
 """
 Flask 应用入口文件
 """
-from src.app import app, socketio
+from src.app import app, socketio, start_dedup_background_services
 import socket
 import sys
 import os
@@ -97,6 +97,9 @@ if __name__ == '__main__':
     print("📝 请求日志已启用，所有 API 请求将在控制台显示")
     print("="*80 + "\n")
     
+    # 去重任务内置执行器和进度转发（未使用重载器，当前进程即服务进程）
+    start_dedup_background_services()
+    
     try:
         # 使用 SocketIO 运行应用（支持 WebSocket）
         # threading 模式兼容性更好，同时支持 HTTP 请求和 WebSocket
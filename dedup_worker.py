@@ -0,0 +1,38 @@
+"""
+去重任务执行器入口文件
+独立于 Web 服务运行，从 dedup_task_jobs 队列认领并执行去重任务。
+Web 服务关闭内置执行器（DEDUP_EMBEDDED_WORKER=false）后，可以启动一个或多个本进程：
+
+    python dedup_worker.py --max-tasks 2
+
+每个执行器进程的ID必须唯一（默认 主机名:worker:进程号）。执行器退出后，它认领的任务在租约
+（DEDUP_JOB_LEASE_SECONDS）到期后由其他执行器重新排队、从检查点继续执行；
+指定固定的 --worker-id 并以相同ID重启时不等租约到期，启动时立即恢复
+"""
+import argparse
+import sys
+
+from src.app import app
+from src.services.dedup_job_worker import DedupJobWorker, default_worker_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description='题目去重任务执行器')
+    parser.add_argument('--worker-id', default=app.config.get('DEDUP_WORKER_ID') or default_worker_id('worker'),
+                        help='执行器ID（默认 主机名:worker:进程号，同一时刻必须唯一）')
+    parser.add_argument('--max-tasks', type=int, default=app.config.get('DEDUP_WORKER_MAX_TASKS', 4),
+                        help='同时执行的任务数')
+    parser.add_argument('--poll-interval', type=float, default=app.config.get('DEDUP_WORKER_POLL_INTERVAL', 1.0),
+                        help='轮询队列、同步任务状态的间隔（秒）')
+    args = parser.parse_args()
+
+    worker = DedupJobWorker(app, args.worker_id, max_tasks=args.max_tasks, poll_interval=args.poll_interval)
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        print(f"\n执行器 {args.worker_id} 已停止，执行中的任务将在下次启动时从检查点继续")
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -38,8 +38,8 @@ def simulate_pause_resume(task_id):
         # 1. 检查初始状态
         print('\n1. 初始状态:')
         print(f'   数据库状态: {task.status}')
-        progress = QuestionDedupService.get_progress()
-        print(f'   进度文件状态: {progress.get("status", "N/A")}')
+        progress = QuestionDedupService.get_progress(task_id)
+        print(f'   进度状态: {progress.get("status", "N/A")}')
 
         # 2. 模拟暂停
         print('\n2. 模拟暂停操作:')
@@ -47,14 +47,7 @@ def simulate_pause_resume(task_id):
         task.status = 'paused'
         db.session.commit()
 
-        # 同时更新进度文件状态
-        progress = QuestionDedupService.get_progress()
-        if progress.get('task_id') == task_id:
-            progress['status'] = 'paused'
-            QuestionDedupService.save_progress(progress)
-
         print('   ✅ 已设置数据库状态为: paused')
-        print('   ✅ 已设置进度文件状态为: paused')
 
         # 等待一会儿
         print('   等待2秒...')
@@ -62,9 +55,9 @@ def simulate_pause_resume(task_id):
 
         # 检查状态
         task = DedupTask.query.get(task_id)
-        progress = QuestionDedupService.get_progress()
+        progress = QuestionDedupService.get_progress(task_id)
         print(f'   数据库状态: {task.status}')
-        print(f'   进度文件状态: {progress.get("status", "N/A")}')
+        print(f'   进度状态: {progress.get("status", "N/A")}')
 
         # 3. 模拟继续
         print('\n3. 模拟继续操作:')
@@ -72,14 +65,7 @@ def simulate_pause_resume(task_id):
         task.status = 'running'
         db.session.commit()
 
-        # 同时更新进度文件状态
-        progress = QuestionDedupService.get_progress()
-        if progress.get('task_id') == task_id:
-            progress['status'] = 'running'
-            QuestionDedupService.save_progress(progress)
-
         print('   ✅ 已设置数据库状态为: running')
-        print('   ✅ 已设置进度文件状态为: running')
 
         # 等待一会儿
         print('   等待2秒...')
@@ -87,9 +73,9 @@ def simulate_pause_resume(task_id):
 
         # 检查最终状态
         task = DedupTask.query.get(task_id)
-        progress = QuestionDedupService.get_progress()
+        progress = QuestionDedupService.get_progress(task_id)
         print(f'   数据库状态: {task.status}')
-        print(f'   进度文件状态: {progress.get("status", "N/A")}')
+        print(f'   进度状态: {progress.get("status", "N/A")}')
 
         print('\n✅ 模拟测试完成：状态同步正常工作！')
 
@@ -104,11 +90,11 @@ def check_state_sync():
             return
 
         db_status = task.status
-        progress = QuestionDedupService.get_progress()
+        progress = QuestionDedupService.get_progress(task.id)
         file_status = progress.get('status', 'N/A')
 
         print(f'数据库状态: {db_status}')
-        print(f'进度文件状态: {file_status}')
+        print(f'进度状态: {file_status}')
 
         if db_status == file_status:
             print('✅ 状态同步正常')
@@ -10,7 +10,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 from src.app import app, db
 from src.models.question_dedup import (
     DedupTask, QuestionDuplicatePair, QuestionDuplicateGroup,
-    QuestionDuplicateGroupItem, QuestionDedupFeature
+    QuestionDuplicateGroupItem, QuestionDedupFeature, QuestionDedupBandIndex,
+    DedupTaskCheckpoint, DedupTaskJob, QuestionDuplicateCluster, QuestionDuplicateClusterMember,
+    QuestionDuplicateSummary, DedupTaskStatistic
 )
 
 
@@ -32,6 +34,13 @@ def create_tables():
             print("  3. question_duplicate_groups - 完全重复题目组表")
             print("  4. question_duplicate_group_items - 完全重复组明细表")
             print("  5. question_dedup_features - 题目去重特征表")
+            print("  6. question_dedup_band_index - LSH band索引表")
+            print("  7. dedup_task_checkpoints - 去重任务检查点表")
+            print("  8. dedup_task_jobs - 去重任务执行队列表")
+            print("  9. question_duplicate_clusters - 重复题目簇表")
+            print("  10. question_duplicate_cluster_members - 重复题目簇成员表")
+            print("  11. question_duplicate_summaries - 相似重复题目汇总表")
+            print("  12. dedup_task_statistics - 去重任务分维度统计表")
             
             # 验证表是否存在
             inspector = db.inspect(db.engine)
@@ -42,7 +51,14 @@ def create_tables():
                 'question_duplicate_pairs',
                 'question_duplicate_groups',
                 'question_duplicate_group_items',
-                'question_dedup_features'
+                'question_dedup_features',
+                'question_dedup_band_index',
+                'dedup_task_checkpoints',
+                'dedup_task_jobs',
+                'question_duplicate_clusters',
+                'question_duplicate_cluster_members',
+                'question_duplicate_summaries',
+                'dedup_task_statistics'
             ]
             
             print("\n验证表是否存在：")
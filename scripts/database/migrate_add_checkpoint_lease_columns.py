@@ -0,0 +1,94 @@
+"""
+数据库迁移脚本：dedup_task_checkpoints 表添加分组租约字段
+添加 worker_id / lease_expires_at / heartbeat_at / attempts 字段，
+多个执行器按租约分担同一个任务的分组。脚本可以重复执行，已存在的字段会被跳过
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.app import app, db
+from sqlalchemy import text, inspect
+
+COLUMNS = {
+    'worker_id': {
+        'sqlite': 'VARCHAR(100)',
+        'mysql': "VARCHAR(100) COMMENT '租用分组的执行器ID' AFTER similar_duplicate_pairs"
+    },
+    'lease_expires_at': {
+        'sqlite': 'DATETIME',
+        'mysql': "DATETIME COMMENT '租约到期时间（到期后其他执行器可以重新租用）' AFTER worker_id"
+    },
+    'heartbeat_at': {
+        'sqlite': 'DATETIME',
+        'mysql': "DATETIME COMMENT '最近一次续租时间' AFTER lease_expires_at"
+    },
+    'attempts': {
+        'sqlite': 'INTEGER NOT NULL DEFAULT 0',
+        'mysql': "INT NOT NULL DEFAULT 0 COMMENT '租用次数' AFTER heartbeat_at"
+    }
+}
+
+
+def check_column_exists(table_name, column_name):
+    """检查字段是否已存在"""
+    inspector = inspect(db.engine)
+    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def migrate_add_checkpoint_lease_columns():
+    """检查点表添加分组租约字段"""
+    with app.app_context():
+        try:
+            db_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+            print("=" * 60)
+            print("数据库迁移：dedup_task_checkpoints 表添加分组租约字段")
+            print("=" * 60)
+            print(f"数据库类型: {db_url.split('://')[0]}")
+            print()
+
+            inspector = inspect(db.engine)
+            if 'dedup_task_checkpoints' not in inspector.get_table_names():
+                print("❌ 错误：dedup_task_checkpoints 表不存在，请先执行 migrate_create_task_checkpoints_table.py")
+                return False
+
+            if 'sqlite' in db_url.lower():
+                dialect = 'sqlite'
+            elif 'mysql' in db_url.lower():
+                dialect = 'mysql'
+            else:
+                print(f"❌ 不支持的数据库类型: {db_url.split('://')[0]}")
+                return False
+
+            for column_name, definitions in COLUMNS.items():
+                if check_column_exists('dedup_task_checkpoints', column_name):
+                    print(f"ℹ️  字段 {column_name} 已存在，跳过")
+                    continue
+                print(f"添加 {column_name} 字段...")
+                db.session.execute(text(
+                    f"ALTER TABLE dedup_task_checkpoints ADD COLUMN {column_name} {definitions[dialect]}"
+                ))
+                db.session.commit()
+                print(f"✅ {column_name} 字段添加成功")
+
+            print()
+            print("=" * 60)
+            print("✅ 数据库迁移成功！")
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ 迁移失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == '__main__':
+    success = migrate_add_checkpoint_lease_columns()
+    sys.exit(0 if success else 1)
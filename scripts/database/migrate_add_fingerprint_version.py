@@ -0,0 +1,92 @@
+"""
+数据库迁移脚本：为 question_dedup_features 表添加 fingerprint_version（指纹格式版本）字段
+旧记录保持 NULL，表示旧版进程相关哈希生成的指纹，不会被复用
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.app import app, db
+from sqlalchemy import text, inspect
+
+
+def check_column_exists(table_name, column_name):
+    """检查字段是否已存在"""
+    inspector = inspect(db.engine)
+    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def migrate_add_fingerprint_version():
+    """添加特征表的指纹版本字段"""
+    with app.app_context():
+        try:
+            db_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+            print("=" * 60)
+            print("数据库迁移：为 question_dedup_features 表添加 fingerprint_version 字段")
+            print("=" * 60)
+            print(f"数据库类型: {db_url.split('://')[0]}")
+            print()
+
+            inspector = inspect(db.engine)
+            if 'question_dedup_features' not in inspector.get_table_names():
+                print("❌ 错误：question_dedup_features 表不存在，请先创建表")
+                return False
+
+            if check_column_exists('question_dedup_features', 'fingerprint_version'):
+                print("ℹ️  字段已存在，跳过迁移")
+                return True
+
+            print("添加 fingerprint_version 字段...")
+            if 'sqlite' in db_url.lower():
+                db.session.execute(text("""
+                    ALTER TABLE question_dedup_features
+                    ADD COLUMN fingerprint_version VARCHAR(20);
+                """))
+                db.session.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_dedup_features_group_version
+                    ON question_dedup_features (group_type, group_subject_id, group_channel_code, fingerprint_version);
+                """))
+            elif 'mysql' in db_url.lower():
+                db.session.execute(text("""
+                    ALTER TABLE question_dedup_features
+                    ADD COLUMN fingerprint_version VARCHAR(20)
+                    COMMENT '指纹格式版本（为空表示旧版进程相关哈希，不可复用）'
+                    AFTER minhash_json;
+                """))
+                db.session.execute(text("""
+                    CREATE INDEX idx_group_version
+                    ON question_dedup_features (group_type, group_subject_id, group_channel_code, fingerprint_version);
+                """))
+            else:
+                print(f"❌ 不支持的数据库类型: {db_url.split('://')[0]}")
+                return False
+
+            db.session.commit()
+            print("✅ fingerprint_version 字段添加成功")
+            print()
+            print("=" * 60)
+            print("✅ 数据库迁移成功！")
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            db.session.rollback()
+            error_msg = str(e).lower()
+
+            if 'duplicate column name' in error_msg or 'already exists' in error_msg:
+                print("ℹ️  字段已存在，跳过迁移")
+                return True
+            else:
+                print(f"❌ 迁移失败: {str(e)}")
+                import traceback
+                traceback.print_exc()
+                return False
+
+
+if __name__ == '__main__':
+    success = migrate_add_fingerprint_version()
+    sys.exit(0 if success else 1)
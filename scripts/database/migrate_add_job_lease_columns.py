@@ -0,0 +1,104 @@
+"""
+数据库迁移脚本：dedup_task_jobs 表添加认领租约字段
+添加 lease_expires_at / heartbeat_at 字段和 (status, lease_expires_at) 索引，
+执行器退出后租约到期，任务由任意执行器重新排队。脚本可以重复执行，已存在的字段会被跳过
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.app import app, db
+from sqlalchemy import text, inspect
+
+COLUMNS = {
+    'lease_expires_at': {
+        'sqlite': 'DATETIME',
+        'mysql': "DATETIME COMMENT '认领租约到期时间（执行器每次轮询续租，到期后任意执行器可重新排队）' AFTER finished_at"
+    },
+    'heartbeat_at': {
+        'sqlite': 'DATETIME',
+        'mysql': "DATETIME COMMENT '执行器最近一次续租时间' AFTER lease_expires_at"
+    }
+}
+
+INDEX_NAME = 'idx_status_lease'
+
+
+def check_column_exists(table_name, column_name):
+    """检查字段是否已存在"""
+    inspector = inspect(db.engine)
+    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def check_index_exists(table_name, index_name):
+    """检查索引是否已存在"""
+    inspector = inspect(db.engine)
+    return any(index['name'] == index_name for index in inspector.get_indexes(table_name))
+
+
+def migrate_add_job_lease_columns():
+    """执行队列表添加认领租约字段"""
+    with app.app_context():
+        try:
+            db_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+            print("=" * 60)
+            print("数据库迁移：dedup_task_jobs 表添加认领租约字段")
+            print("=" * 60)
+            print(f"数据库类型: {db_url.split('://')[0]}")
+            print()
+
+            inspector = inspect(db.engine)
+            if 'dedup_task_jobs' not in inspector.get_table_names():
+                print("❌ 错误：dedup_task_jobs 表不存在，请先执行 migrate_create_task_jobs_table.py")
+                return False
+
+            if 'sqlite' in db_url.lower():
+                dialect = 'sqlite'
+            elif 'mysql' in db_url.lower():
+                dialect = 'mysql'
+            else:
+                print(f"❌ 不支持的数据库类型: {db_url.split('://')[0]}")
+                return False
+
+            for column_name, definitions in COLUMNS.items():
+                if check_column_exists('dedup_task_jobs', column_name):
+                    print(f"ℹ️  字段 {column_name} 已存在，跳过")
+                    continue
+                print(f"添加 {column_name} 字段...")
+                db.session.execute(text(
+                    f"ALTER TABLE dedup_task_jobs ADD COLUMN {column_name} {definitions[dialect]}"
+                ))
+                db.session.commit()
+                print(f"✅ {column_name} 字段添加成功")
+
+            if check_index_exists('dedup_task_jobs', INDEX_NAME):
+                print(f"ℹ️  索引 {INDEX_NAME} 已存在，跳过")
+            else:
+                print(f"创建索引 {INDEX_NAME}...")
+                db.session.execute(text(
+                    f"CREATE INDEX {INDEX_NAME} ON dedup_task_jobs(status, lease_expires_at)"
+                ))
+                db.session.commit()
+                print(f"✅ 索引 {INDEX_NAME} 创建成功")
+
+            print()
+            print("=" * 60)
+            print("✅ 数据库迁移成功！")
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ 迁移失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == '__main__':
+    success = migrate_add_job_lease_columns()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,87 @@
+"""
+数据库迁移脚本：添加游标分页使用的复合索引
+去重结果列表（相似重复对、完全重复组）和题目列表按排序键游标分页，
+索引以过滤条件开头、以排序键结尾。脚本可以重复执行，已存在的索引会被跳过
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.app import app, db
+from sqlalchemy import text, inspect
+
+# (表名, MySQL 索引名, SQLite 索引名, 索引列)
+INDEXES = [
+    ('question_duplicate_pairs', 'idx_task_dup_similarity',
+     'idx_duplicate_pairs_task_dup_similarity', 'task_id, duplicate_type, similarity, id'),
+    ('question_duplicate_pairs', 'idx_task_dup_type_similarity',
+     'idx_duplicate_pairs_task_dup_type_similarity', 'task_id, duplicate_type, group_type, similarity, id'),
+    ('question_duplicate_groups', 'idx_task_detected',
+     'idx_duplicate_groups_task_detected', 'task_id, detected_at, id'),
+    ('question_duplicate_groups', 'idx_task_type_detected',
+     'idx_duplicate_groups_task_type_detected', 'task_id, group_type, detected_at, id'),
+    ('teach_question', 'idx_type_del_sort',
+     'idx_teach_question_type_del_sort', 'type, is_del, sort, question_id'),
+]
+
+
+def check_index_exists(table_name, columns):
+    """检查表上是否已有相同列的索引（不比较索引名，兼容 db.create_all 建表时生成的索引）"""
+    inspector = inspect(db.engine)
+    expected = [col.strip() for col in columns.split(',')]
+    return any(index['column_names'] == expected for index in inspector.get_indexes(table_name))
+
+
+def migrate_add_keyset_pagination_indexes():
+    """添加游标分页索引"""
+    with app.app_context():
+        try:
+            db_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+            print("=" * 60)
+            print("数据库迁移：添加游标分页使用的复合索引")
+            print("=" * 60)
+            print(f"数据库类型: {db_url.split('://')[0]}")
+            print()
+
+            if 'sqlite' in db_url.lower():
+                dialect = 'sqlite'
+            elif 'mysql' in db_url.lower():
+                dialect = 'mysql'
+            else:
+                print(f"❌ 不支持的数据库类型: {db_url.split('://')[0]}")
+                return False
+
+            tables = inspect(db.engine).get_table_names()
+            for table_name, mysql_name, sqlite_name, columns in INDEXES:
+                index_name = mysql_name if dialect == 'mysql' else sqlite_name
+                if table_name not in tables:
+                    print(f"⚠️  表 {table_name} 不存在，跳过索引 {index_name}")
+                    continue
+                if check_index_exists(table_name, columns):
+                    print(f"ℹ️  {table_name} 已有索引 ({columns})，跳过")
+                    continue
+                print(f"创建索引 {table_name}.{index_name} ({columns})...")
+                db.session.execute(text(f"CREATE INDEX {index_name} ON {table_name} ({columns})"))
+                db.session.commit()
+                print(f"✅ 索引 {index_name} 创建成功")
+
+            print()
+            print("=" * 60)
+            print("✅ 数据库迁移成功！")
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ 迁移失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == '__main__':
+    success = migrate_add_keyset_pagination_indexes()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,150 @@
+"""
+数据库迁移脚本：question_dedup_features 表改用二进制特征格式
+1. 添加 content_digest / ngram_blob / minhash_blob 字段
+2. 按主键分批把已有记录的 content_hash / ngram_json / minhash_json 转换为二进制格式，
+   转换后清空旧格式字段（MySQL 可再执行 OPTIMIZE TABLE 释放空间）
+脚本可以重复执行，已转换的记录会被跳过
+"""
+import sys
+import os
+import json
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.app import app, db
+from src.models.question_dedup import QuestionDedupFeature
+from src.utils.feature_codec import encode_uint32, ngram_ids_from_ngrams
+from sqlalchemy import text, inspect, or_
+
+# 每批转换的记录数
+BATCH_SIZE = 1000
+
+COLUMNS = {
+    'content_digest': {
+        'sqlite': 'BINARY(16)',
+        'mysql': "BINARY(16) COMMENT '内容哈希值（MD5原始摘要）' AFTER content_hash"
+    },
+    'ngram_blob': {
+        'sqlite': 'BLOB',
+        'mysql': "MEDIUMBLOB COMMENT 'N-gram哈希ID（升序小端uint32数组）' AFTER minhash_json"
+    },
+    'minhash_blob': {
+        'sqlite': 'BLOB',
+        'mysql': "BLOB COMMENT 'MinHash指纹（小端uint32数组）' AFTER ngram_blob"
+    }
+}
+
+
+def check_column_exists(table_name, column_name):
+    """检查字段是否已存在"""
+    inspector = inspect(db.engine)
+    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def add_columns(dialect):
+    """添加二进制特征字段"""
+    for column_name, definitions in COLUMNS.items():
+        if check_column_exists('question_dedup_features', column_name):
+            print(f"ℹ️  字段 {column_name} 已存在，跳过")
+            continue
+        print(f"添加 {column_name} 字段...")
+        db.session.execute(text(
+            f"ALTER TABLE question_dedup_features ADD COLUMN {column_name} {definitions[dialect]}"
+        ))
+        db.session.commit()
+        print(f"✅ {column_name} 字段添加成功")
+
+
+def convert_rows():
+    """按主键分批转换旧格式记录，返回转换的记录数"""
+    feature = QuestionDedupFeature
+    converted = 0
+    last_id = 0
+    while True:
+        rows = db.session.query(
+            feature.id, feature.content_hash, feature.ngram_json, feature.minhash_json
+        ).filter(
+            feature.id > last_id,
+            or_(feature.content_hash.isnot(None),
+                feature.ngram_json.isnot(None),
+                feature.minhash_json.isnot(None))
+        ).order_by(feature.id).limit(BATCH_SIZE).all()
+        if not rows:
+            break
+
+        updates = []
+        for row in rows:
+            update = {'id': row.id, 'content_hash': None, 'ngram_json': None, 'minhash_json': None}
+            if row.content_hash:
+                update['content_digest'] = bytes.fromhex(row.content_hash)
+            if row.ngram_json:
+                update['ngram_blob'] = encode_uint32(ngram_ids_from_ngrams(json.loads(row.ngram_json)))
+            if row.minhash_json:
+                update['minhash_blob'] = encode_uint32(json.loads(row.minhash_json))
+            updates.append(update)
+
+        # executemany 要求每行的键相同，按键集合分组执行
+        by_keys = {}
+        for update in updates:
+            by_keys.setdefault(tuple(sorted(update)), []).append(update)
+        for batch in by_keys.values():
+            db.session.bulk_update_mappings(feature, batch)
+        db.session.commit()
+
+        converted += len(rows)
+        last_id = rows[-1].id
+        print(f"  已转换 {converted} 条记录（ID ≤ {last_id}）")
+    return converted
+
+
+def migrate_binary_dedup_features():
+    """特征表改用二进制格式"""
+    with app.app_context():
+        try:
+            db_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+            print("=" * 60)
+            print("数据库迁移：question_dedup_features 表改用二进制特征格式")
+            print("=" * 60)
+            print(f"数据库类型: {db_url.split('://')[0]}")
+            print()
+
+            inspector = inspect(db.engine)
+            if 'question_dedup_features' not in inspector.get_table_names():
+                print("❌ 错误：question_dedup_features 表不存在，请先创建表")
+                return False
+
+            if 'sqlite' in db_url.lower():
+                dialect = 'sqlite'
+            elif 'mysql' in db_url.lower():
+                dialect = 'mysql'
+            else:
+                print(f"❌ 不支持的数据库类型: {db_url.split('://')[0]}")
+                return False
+
+            add_columns(dialect)
+            print()
+            print("转换已有记录...")
+            converted = convert_rows()
+            print(f"✅ 共转换 {converted} 条记录")
+            if converted and dialect == 'mysql':
+                print("ℹ️  可以执行 OPTIMIZE TABLE question_dedup_features; 释放旧格式占用的空间")
+            print()
+            print("=" * 60)
+            print("✅ 数据库迁移成功！")
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ 迁移失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == '__main__':
+    success = migrate_binary_dedup_features()
+    sys.exit(0 if success else 1)
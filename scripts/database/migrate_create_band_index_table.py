@@ -0,0 +1,55 @@
+"""
+数据库迁移脚本：创建 LSH band 索引表 question_dedup_band_index
+已有任务不回填索引，增量分析遇到没有索引的基线任务时会回退为读取签名重新分桶
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.app import app, db
+from src.models.question_dedup import QuestionDedupBandIndex
+from sqlalchemy import inspect
+
+
+def migrate_create_band_index_table():
+    """创建 band 索引表"""
+    with app.app_context():
+        try:
+            db_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+            print("=" * 60)
+            print("数据库迁移：创建 question_dedup_band_index 表")
+            print("=" * 60)
+            print(f"数据库类型: {db_url.split('://')[0]}")
+            print()
+
+            inspector = inspect(db.engine)
+            if 'dedup_tasks' not in inspector.get_table_names():
+                print("❌ 错误：dedup_tasks 表不存在，请先创建去重相关表")
+                return False
+
+            if 'question_dedup_band_index' in inspector.get_table_names():
+                print("ℹ️  表已存在，跳过迁移")
+                return True
+
+            print("创建 question_dedup_band_index 表...")
+            QuestionDedupBandIndex.__table__.create(db.engine, checkfirst=True)
+            print("✅ question_dedup_band_index 表创建成功")
+            print()
+            print("=" * 60)
+            print("✅ 数据库迁移成功！")
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            print(f"❌ 迁移失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == '__main__':
+    success = migrate_create_band_index_table()
+    sys.exit(0 if success else 1)
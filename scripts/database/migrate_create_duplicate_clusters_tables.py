@@ -0,0 +1,58 @@
+"""
+数据库迁移脚本：创建重复题目簇表 question_duplicate_clusters / question_duplicate_cluster_members
+迁移前已完成的任务没有簇记录，重新执行任务后生成
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.app import app, db
+from src.models.question_dedup import QuestionDuplicateCluster, QuestionDuplicateClusterMember
+from sqlalchemy import inspect
+
+
+def migrate_create_duplicate_clusters_tables():
+    """创建重复题目簇表和簇成员表"""
+    with app.app_context():
+        try:
+            db_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+            print("=" * 60)
+            print("数据库迁移：创建 question_duplicate_clusters / question_duplicate_cluster_members 表")
+            print("=" * 60)
+            print(f"数据库类型: {db_url.split('://')[0]}")
+            print()
+
+            inspector = inspect(db.engine)
+            if 'dedup_tasks' not in inspector.get_table_names():
+                print("❌ 错误：dedup_tasks 表不存在，请先创建去重相关表")
+                return False
+
+            for model in (QuestionDuplicateCluster, QuestionDuplicateClusterMember):
+                table_name = model.__tablename__
+                if table_name in inspector.get_table_names():
+                    print(f"ℹ️  {table_name} 表已存在，跳过")
+                    continue
+                print(f"创建 {table_name} 表...")
+                model.__table__.create(db.engine, checkfirst=True)
+                print(f"✅ {table_name} 表创建成功")
+
+            print("ℹ️  新任务默认只保存重复题目簇，如需同时保存相似重复对明细（similar-pairs 明细接口），请设置 DEDUP_STORE_SIMILAR_PAIRS=true")
+            print()
+            print("=" * 60)
+            print("✅ 数据库迁移成功！")
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            print(f"❌ 迁移失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == '__main__':
+    success = migrate_create_duplicate_clusters_tables()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,74 @@
+"""
+数据库迁移脚本：创建相似重复题目汇总表 question_duplicate_summaries
+创建后从 question_duplicate_pairs 为已有任务生成汇总数据（每个任务一条 INSERT ... SELECT）。
+请在没有执行中的去重任务时迁移
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.app import app, db
+from src.models.question_dedup import QuestionDuplicatePair, QuestionDuplicateSummary
+from src.services.question_dedup_service import QuestionDedupService
+from sqlalchemy import inspect
+
+
+def migrate_create_duplicate_summaries_table():
+    """创建相似重复题目汇总表，并为已有任务生成汇总数据"""
+    with app.app_context():
+        try:
+            db_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+            print("=" * 60)
+            print("数据库迁移：创建 question_duplicate_summaries 表")
+            print("=" * 60)
+            print(f"数据库类型: {db_url.split('://')[0]}")
+            print()
+
+            inspector = inspect(db.engine)
+            if 'question_duplicate_pairs' not in inspector.get_table_names():
+                print("❌ 错误：question_duplicate_pairs 表不存在，请先创建去重相关表")
+                return False
+
+            if 'question_duplicate_summaries' in inspector.get_table_names():
+                print("ℹ️  表已存在，跳过建表")
+            else:
+                print("创建 question_duplicate_summaries 表...")
+                QuestionDuplicateSummary.__table__.create(db.engine, checkfirst=True)
+                print("✅ question_duplicate_summaries 表创建成功")
+
+            # 为有相似重复对、但还没有汇总数据的任务生成汇总
+            summarized = {
+                task_id for (task_id,) in db.session.query(QuestionDuplicateSummary.task_id).distinct()
+            }
+            task_ids = [
+                task_id for (task_id,) in db.session.query(QuestionDuplicatePair.task_id).filter(
+                    QuestionDuplicatePair.duplicate_type == 'similar'
+                ).distinct()
+                if task_id not in summarized
+            ]
+            print(f"需要生成汇总数据的任务数: {len(task_ids)}")
+            for task_id in task_ids:
+                rows = QuestionDedupService.rebuild_duplicate_summary(task_id)
+                db.session.commit()
+                print(f"  ✅ 任务 {task_id}: {rows} 道题目")
+
+            print()
+            print("=" * 60)
+            print("✅ 数据库迁移成功！")
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ 迁移失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == '__main__':
+    success = migrate_create_duplicate_summaries_table()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,52 @@
+"""
+数据库迁移脚本：创建聚合题目文档缓存表 question_document_cache
+仅在 QUESTION_CACHE_BACKEND=database（多个进程共享题目文档缓存）时需要
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.app import app, db
+from src.models.question import QuestionDocumentCache
+from sqlalchemy import inspect
+
+
+def migrate_create_question_document_cache_table():
+    """创建聚合题目文档缓存表"""
+    with app.app_context():
+        try:
+            db_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+            print("=" * 60)
+            print("数据库迁移：创建 question_document_cache 表")
+            print("=" * 60)
+            print(f"数据库类型: {db_url.split('://')[0]}")
+            print(f"当前缓存后端: {app.config.get('QUESTION_CACHE_BACKEND', 'memory')}")
+            print()
+
+            inspector = inspect(db.engine)
+            if 'question_document_cache' in inspector.get_table_names():
+                print("ℹ️  表已存在，跳过建表")
+            else:
+                print("创建 question_document_cache 表...")
+                QuestionDocumentCache.__table__.create(db.engine, checkfirst=True)
+                print("✅ question_document_cache 表创建成功")
+
+            print()
+            print("=" * 60)
+            print("✅ 数据库迁移成功！")
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            print(f"❌ 迁移失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == '__main__':
+    success = migrate_create_question_document_cache_table()
+    sys.exit(0 if success else 1)
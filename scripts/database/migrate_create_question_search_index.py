@@ -0,0 +1,69 @@
+"""
+数据库迁移脚本：创建题目关键字搜索索引表并建立索引
+question_search_ngrams（n-gram 倒排表）、question_search_documents（已索引题目）。
+脚本可以重复执行：已索引且内容未变化的题目会被跳过，只重建新增、修改和删除的题目
+"""
+import sys
+import os
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.app import app, db
+from src.models.question import QuestionSearchNgram, QuestionSearchDocument
+from src.services.question_search_index import QuestionSearchIndex
+from sqlalchemy import inspect
+
+
+def migrate_create_question_search_index():
+    """创建搜索索引表并增量同步全部题目"""
+    with app.app_context():
+        try:
+            db_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+            print("=" * 60)
+            print("数据库迁移：创建题目关键字搜索索引")
+            print("=" * 60)
+            print(f"数据库类型: {db_url.split('://')[0]}")
+            print()
+
+            inspector = inspect(db.engine)
+            if 'teach_question' not in inspector.get_table_names():
+                print("❌ 错误：teach_question 表不存在")
+                return False
+
+            for model in (QuestionSearchNgram, QuestionSearchDocument):
+                table_name = model.__tablename__
+                if table_name in inspector.get_table_names():
+                    print(f"ℹ️  {table_name} 表已存在，跳过建表")
+                else:
+                    print(f"创建 {table_name} 表...")
+                    model.__table__.create(db.engine, checkfirst=True)
+                    print(f"✅ {table_name} 表创建成功")
+
+            print()
+            print("同步题目索引（只处理新增、修改和删除的题目）...")
+            started = time.time()
+            stats = QuestionSearchIndex.sync()
+            print(f"✅ 扫描题目 {stats['scanned']} 道，重建 {stats['indexed']} 道，"
+                  f"删除 {stats['removed']} 道，写入倒排记录 {stats['postings']} 条，"
+                  f"耗时 {time.time() - started:.1f} 秒")
+
+            print()
+            print("=" * 60)
+            print("✅ 数据库迁移成功！")
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ 迁移失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == '__main__':
+    success = migrate_create_question_search_index()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,57 @@
+"""
+数据库迁移脚本：创建去重任务检查点表 dedup_task_checkpoints
+替代项目根目录的 question_dedup_progress.json。迁移前未完成的任务没有检查点，
+重新执行时会按当前分组从头处理
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.app import app, db
+from src.models.question_dedup import DedupTaskCheckpoint
+from sqlalchemy import inspect
+
+
+def migrate_create_task_checkpoints_table():
+    """创建任务检查点表"""
+    with app.app_context():
+        try:
+            db_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+            print("=" * 60)
+            print("数据库迁移：创建 dedup_task_checkpoints 表")
+            print("=" * 60)
+            print(f"数据库类型: {db_url.split('://')[0]}")
+            print()
+
+            inspector = inspect(db.engine)
+            if 'dedup_tasks' not in inspector.get_table_names():
+                print("❌ 错误：dedup_tasks 表不存在，请先创建去重相关表")
+                return False
+
+            if 'dedup_task_checkpoints' in inspector.get_table_names():
+                print("ℹ️  表已存在，跳过迁移")
+                return True
+
+            print("创建 dedup_task_checkpoints 表...")
+            DedupTaskCheckpoint.__table__.create(db.engine, checkfirst=True)
+            print("✅ dedup_task_checkpoints 表创建成功")
+            print("ℹ️  项目根目录的 question_dedup_progress.json 已不再使用，可以删除")
+            print()
+            print("=" * 60)
+            print("✅ 数据库迁移成功！")
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            print(f"❌ 迁移失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == '__main__':
+    success = migrate_create_task_checkpoints_table()
+    sys.exit(0 if success else 1)
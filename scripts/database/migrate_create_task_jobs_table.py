@@ -0,0 +1,58 @@
+"""
+数据库迁移脚本：创建去重任务执行队列表 dedup_task_jobs
+迁移前状态为 running 的任务（执行线程已随旧进程退出）会在执行器启动时重新入队，
+从检查点继续执行
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.app import app, db
+from src.models.question_dedup import DedupTaskJob
+from sqlalchemy import inspect
+
+
+def migrate_create_task_jobs_table():
+    """创建任务执行队列表"""
+    with app.app_context():
+        try:
+            db_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+            print("=" * 60)
+            print("数据库迁移：创建 dedup_task_jobs 表")
+            print("=" * 60)
+            print(f"数据库类型: {db_url.split('://')[0]}")
+            print()
+
+            inspector = inspect(db.engine)
+            if 'dedup_tasks' not in inspector.get_table_names():
+                print("❌ 错误：dedup_tasks 表不存在，请先创建去重相关表")
+                return False
+
+            if 'dedup_task_jobs' in inspector.get_table_names():
+                print("ℹ️  表已存在，跳过迁移")
+                return True
+
+            print("创建 dedup_task_jobs 表...")
+            DedupTaskJob.__table__.create(db.engine, checkfirst=True)
+            print("✅ dedup_task_jobs 表创建成功")
+            print("ℹ️  Web 服务默认内置执行器；关闭内置执行器（DEDUP_EMBEDDED_WORKER=false）后，"
+                  "请使用 python dedup_worker.py 启动独立执行器")
+            print()
+            print("=" * 60)
+            print("✅ 数据库迁移成功！")
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            print(f"❌ 迁移失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == '__main__':
+    success = migrate_create_task_jobs_table()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,75 @@
+"""
+数据库迁移脚本：创建去重任务分维度统计表 dedup_task_statistics
+创建后从已保存的完全重复组、相似重复对和分组检查点为已有任务生成统计数据。
+请在没有执行中的去重任务时迁移
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.app import app, db
+from src.models.question_dedup import DedupTask, DedupTaskStatistic
+from src.services.question_dedup_service import QuestionDedupService
+from sqlalchemy import inspect
+
+
+def migrate_create_task_statistics_table():
+    """创建任务分维度统计表，并为已有任务生成统计数据"""
+    with app.app_context():
+        try:
+            db_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+            print("=" * 60)
+            print("数据库迁移：创建 dedup_task_statistics 表")
+            print("=" * 60)
+            print(f"数据库类型: {db_url.split('://')[0]}")
+            print()
+
+            inspector = inspect(db.engine)
+            if 'dedup_tasks' not in inspector.get_table_names():
+                print("❌ 错误：dedup_tasks 表不存在，请先创建去重相关表")
+                return False
+
+            if 'dedup_task_statistics' in inspector.get_table_names():
+                print("ℹ️  表已存在，跳过建表")
+            else:
+                print("创建 dedup_task_statistics 表...")
+                DedupTaskStatistic.__table__.create(db.engine, checkfirst=True)
+                print("✅ dedup_task_statistics 表创建成功")
+
+            # 为已处理过分组、但还没有统计数据的任务生成统计
+            summarized = {
+                task_id for (task_id,) in db.session.query(DedupTaskStatistic.task_id).distinct()
+            }
+            task_ids = [
+                task_id for (task_id,) in db.session.query(DedupTask.id).filter(
+                    DedupTask.processed_groups > 0
+                ).order_by(DedupTask.id)
+                if task_id not in summarized
+            ]
+            print(f"需要生成统计数据的任务数: {len(task_ids)}")
+            for task_id in task_ids:
+                rows = QuestionDedupService.rebuild_task_statistics(task_id)
+                db.session.commit()
+                print(f"  ✅ 任务 {task_id}: {rows} 个维度")
+
+            print("ℹ️  total_questions 不再随分组完成累加；迁移前完成的任务该字段可能是实际题目数的两倍")
+            print()
+            print("=" * 60)
+            print("✅ 数据库迁移成功！")
+            print("=" * 60)
+            return True
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ 迁移失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == '__main__':
+    success = migrate_create_task_statistics_table()
+    sys.exit(0 if success else 1)
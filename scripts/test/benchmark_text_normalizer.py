@@ -0,0 +1,91 @@
+"""
+题干清洗性能对比
+对比旧的逐题清洗实现（5 次 re.sub + 逐字符拼接全角转半角）与 TextNormalizer 批量清洗的耗时，
+并校验两者输出逐字一致
+
+用法：
+    python scripts/test/benchmark_text_normalizer.py [题目数量] [题干长度]
+"""
+import sys
+import os
+import re
+import time
+import random
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.services.text_normalizer import TextNormalizer
+
+
+def legacy_clean_question_content(content):
+    """旧实现（与改造前的 QuestionDedupService._clean_question_content 一致）"""
+    if not content:
+        return ""
+    content = re.sub(r'<[^>]+>', '', content)
+
+    def full_to_half(text):
+        result = ""
+        for char in text:
+            code = ord(char)
+            if code == 12288:
+                result += chr(32)
+            elif 65281 <= code <= 65374:
+                result += chr(code - 65248)
+            else:
+                result += char
+        return result
+
+    content = full_to_half(content)
+    content = re.sub(r'\[图片\d+\]', '[IMG]', content)
+    content = re.sub(r'\[公式\d+\]', '[FORMULA]', content)
+    content = re.sub(r'\s+', ' ', content)
+    content = content.strip()
+    content = re.sub(r'[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F-\x9F\u200B-\u200D\uFEFF]', '', content)
+    return content
+
+
+def build_corpus(count, length):
+    """生成测试题干：HTML 段落包裹的汉字，混入全角字符、占位符、空白和零宽字符"""
+    rng = random.Random(42)
+    charset = [chr(c) for c in range(0x4E00, 0x4E00 + 800)]
+    extras = ['ＡＢＣ', '（１）', '　', '  ', '\n', '[图片1]', '[公式12]', '\u200b', '<br/>', '&nbsp;']
+    texts = []
+    for _ in range(count):
+        parts = []
+        while sum(len(p) for p in parts) < length:
+            parts.append(''.join(rng.choice(charset) for _ in range(rng.randint(4, 16))))
+            if rng.random() < 0.3:
+                parts.append(rng.choice(extras))
+        texts.append('<p>' + ''.join(parts) + '</p>')
+    return texts
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    print("=" * 60)
+    print(f"题干清洗性能对比：{count} 题，题干长度约 {length}")
+    print("=" * 60)
+
+    texts = build_corpus(count, length)
+
+    start = time.perf_counter()
+    legacy = [legacy_clean_question_content(t) for t in texts]
+    legacy_seconds = time.perf_counter() - start
+    print(f"旧实现（逐题清洗）:   {legacy_seconds:.3f}s  ({legacy_seconds / count * 1e6:.1f} µs/题)")
+
+    normalizer = TextNormalizer()
+    start = time.perf_counter()
+    cleaned = normalizer.normalize_many(texts)
+    engine_seconds = time.perf_counter() - start
+    print(f"新实现（批量清洗）:   {engine_seconds:.3f}s  ({engine_seconds / count * 1e6:.1f} µs/题)")
+    print(f"加速比: {legacy_seconds / engine_seconds:.1f}x")
+
+    mismatches = sum(1 for a, b in zip(legacy, cleaned) if a != b)
+    print(f"输出一致: {'是' if mismatches == 0 else f'否（{mismatches} 题不一致）'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -43,9 +43,9 @@ with app.app_context():
         features = QuestionDedupFeature.query.limit(3).all()
         for feat in features:
             print(f"  - 题目ID: {feat.question_id}, 任务ID: {feat.task_id}")
-            print(f"    内容哈希: {feat.content_hash}")
-            ngrams_count = len(feat.get_ngrams()) if feat.ngram_json else 0
-            minhash_count = len(feat.get_minhash()) if feat.minhash_json else 0
+            print(f"    内容哈希: {feat.get_content_hash()}")
+            ngrams_count = len(feat.get_ngram_ids()) or len(feat.get_ngrams())
+            minhash_count = len(feat.get_minhash_array())
             print(f"    N-gram数量: {ngrams_count}, MinHash长度: {minhash_count}")
     
     if pairs_count > 0:
@@ -0,0 +1,60 @@
+-- ============================================================================
+-- 数据库迁移脚本：question_dedup_features 表改用二进制特征格式
+-- ============================================================================
+-- 说明：ngram_json / minhash_json 以 JSON 文本保存 n-gram 原文和 128 个整数，
+--       表体积是 teach_question 的数倍，读取时 json.loads 也很慢。新格式：
+--       content_digest  BINARY(16)   清洗后内容的 MD5 原始摘要（替代 32 位十六进制 content_hash）
+--       ngram_blob      MEDIUMBLOB   3-gram 哈希ID，升序去重的小端 uint32 数组
+--       minhash_blob    BLOB         MinHash 签名，小端 uint32 数组（128 × 4 = 512 字节）
+--       新记录只写二进制列；已有记录的 ngram_blob / minhash_blob 需要由
+--       scripts/database/migrate_binary_dedup_features.py 转换（n-gram 哈希需要在 Python 中计算）
+-- ============================================================================
+
+-- ============================================================================
+-- MySQL 版本
+-- ============================================================================
+
+ALTER TABLE question_dedup_features
+ADD COLUMN IF NOT EXISTS content_digest BINARY(16)
+COMMENT '内容哈希值（MD5原始摘要）'
+AFTER content_hash;
+
+ALTER TABLE question_dedup_features
+ADD COLUMN IF NOT EXISTS ngram_blob MEDIUMBLOB
+COMMENT 'N-gram哈希ID（升序小端uint32数组）'
+AFTER minhash_json;
+
+ALTER TABLE question_dedup_features
+ADD COLUMN IF NOT EXISTS minhash_blob BLOB
+COMMENT 'MinHash指纹（小端uint32数组）'
+AFTER ngram_blob;
+
+-- 内容摘要可以直接在 SQL 中回填
+UPDATE question_dedup_features
+SET content_digest = UNHEX(content_hash)
+WHERE content_digest IS NULL AND content_hash IS NOT NULL;
+
+-- 迁移脚本转换完成后，可以执行以下语句释放旧格式占用的空间：
+-- OPTIMIZE TABLE question_dedup_features;
+
+-- ============================================================================
+-- SQLite 版本（如果需要）
+-- ============================================================================
+
+/*
+ALTER TABLE question_dedup_features ADD COLUMN content_digest BINARY(16);
+ALTER TABLE question_dedup_features ADD COLUMN ngram_blob BLOB;
+ALTER TABLE question_dedup_features ADD COLUMN minhash_blob BLOB;
+
+UPDATE question_dedup_features
+SET content_digest = unhex(content_hash)
+WHERE content_digest IS NULL AND content_hash IS NOT NULL;
+-- unhex() 需要 SQLite 3.41+，低版本请使用迁移脚本回填
+*/
+
+-- ============================================================================
+-- 验证脚本（可选）
+-- ============================================================================
+
+-- SELECT COUNT(*) AS legacy_rows FROM question_dedup_features
+-- WHERE minhash_json IS NOT NULL OR ngram_json IS NOT NULL;
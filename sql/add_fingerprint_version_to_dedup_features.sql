@@ -0,0 +1,36 @@
+-- ============================================================================
+-- 数据库迁移脚本：为 question_dedup_features 表添加指纹版本字段
+-- ============================================================================
+-- 说明：MinHash 指纹改为确定性哈希（blake2b），与进程、机器无关，可以跨任务复用
+--       fingerprint_version 记录指纹格式版本，旧记录为 NULL（进程相关哈希，不可复用）
+-- ============================================================================
+
+-- ============================================================================
+-- MySQL 版本
+-- ============================================================================
+
+ALTER TABLE question_dedup_features
+ADD COLUMN IF NOT EXISTS fingerprint_version VARCHAR(20)
+COMMENT '指纹格式版本（为空表示旧版进程相关哈希，不可复用）'
+AFTER minhash_json;
+
+-- 按分组 + 版本读取可复用指纹
+CREATE INDEX idx_group_version ON question_dedup_features (group_type, group_subject_id, group_channel_code, fingerprint_version);
+
+-- ============================================================================
+-- SQLite 版本（如果需要）
+-- ============================================================================
+
+/*
+ALTER TABLE question_dedup_features
+ADD COLUMN fingerprint_version VARCHAR(20);
+
+CREATE INDEX IF NOT EXISTS idx_dedup_features_group_version
+ON question_dedup_features (group_type, group_subject_id, group_channel_code, fingerprint_version);
+*/
+
+-- ============================================================================
+-- 验证脚本（可选）
+-- ============================================================================
+
+-- SELECT fingerprint_version, COUNT(*) FROM question_dedup_features GROUP BY fingerprint_version;
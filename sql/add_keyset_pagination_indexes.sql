@@ -0,0 +1,55 @@
+-- ============================================================================
+-- 数据库迁移脚本：添加游标分页使用的复合索引
+-- ============================================================================
+-- 说明：去重结果列表和题目列表支持游标（keyset）分页，按排序键定位下一页，
+--       不再使用 OFFSET 跳过前面的行。索引以过滤条件开头、以排序键结尾，
+--       任意一页都是索引上的一次范围扫描：
+--       question_duplicate_pairs   (task_id, duplicate_type[, group_type], similarity, id)
+--       question_duplicate_groups  (task_id[, group_type], detected_at, id)
+--       teach_question             (type, is_del, sort, question_id)
+--       大表建索引耗时较长，建议在低峰期执行
+-- ============================================================================
+
+-- ============================================================================
+-- MySQL 版本
+-- ============================================================================
+
+-- 相似重复对列表（format=pairs），按相似度降序
+CREATE INDEX idx_task_dup_similarity ON question_duplicate_pairs (task_id, duplicate_type, similarity, id);
+CREATE INDEX idx_task_dup_type_similarity ON question_duplicate_pairs (task_id, duplicate_type, group_type, similarity, id);
+
+-- 完全重复组列表，按检测时间降序
+CREATE INDEX idx_task_detected ON question_duplicate_groups (task_id, detected_at, id);
+CREATE INDEX idx_task_type_detected ON question_duplicate_groups (task_id, group_type, detected_at, id);
+
+-- 题目列表，按 sort、question_id 升序
+CREATE INDEX idx_type_del_sort ON teach_question (type, is_del, sort, question_id);
+
+-- ============================================================================
+-- SQLite 版本（如果需要）
+-- ============================================================================
+
+/*
+CREATE INDEX IF NOT EXISTS idx_duplicate_pairs_task_dup_similarity
+ON question_duplicate_pairs (task_id, duplicate_type, similarity, id);
+CREATE INDEX IF NOT EXISTS idx_duplicate_pairs_task_dup_type_similarity
+ON question_duplicate_pairs (task_id, duplicate_type, group_type, similarity, id);
+
+CREATE INDEX IF NOT EXISTS idx_duplicate_groups_task_detected
+ON question_duplicate_groups (task_id, detected_at, id);
+CREATE INDEX IF NOT EXISTS idx_duplicate_groups_task_type_detected
+ON question_duplicate_groups (task_id, group_type, detected_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_teach_question_type_del_sort
+ON teach_question (type, is_del, sort, question_id);
+*/
+
+-- ============================================================================
+-- 验证脚本（可选）
+-- ============================================================================
+
+-- SHOW INDEX FROM question_duplicate_pairs WHERE Key_name LIKE 'idx_task_dup%';
+-- EXPLAIN SELECT id FROM question_duplicate_pairs
+-- WHERE task_id = 1 AND duplicate_type = 'similar'
+--   AND (similarity < 0.9 OR (similarity = 0.9 AND id < 100000))
+-- ORDER BY similarity DESC, id DESC LIMIT 21;
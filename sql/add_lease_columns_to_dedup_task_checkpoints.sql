@@ -0,0 +1,53 @@
+-- ============================================================================
+-- 数据库迁移脚本：dedup_task_checkpoints 表添加分组租约字段
+-- ============================================================================
+-- 说明：一个任务可以由多台机器上的执行器同时处理（任务配置 distributed=true）。
+--       执行器用带条件的 UPDATE 租用未完成、且没有有效租约的分组，处理期间定期续租：
+--       worker_id         租用分组的执行器ID
+--       lease_expires_at  租约到期时间，执行器退出后到期，分组由其他执行器重新租用
+--       heartbeat_at      最近一次续租时间
+--       attempts          租用次数
+--       完成分组时要求租约仍属于该执行器，分组结果和任务统计只会计入一次
+-- ============================================================================
+
+-- ============================================================================
+-- MySQL 版本
+-- ============================================================================
+
+ALTER TABLE dedup_task_checkpoints
+ADD COLUMN IF NOT EXISTS worker_id VARCHAR(100)
+COMMENT '租用分组的执行器ID'
+AFTER similar_duplicate_pairs;
+
+ALTER TABLE dedup_task_checkpoints
+ADD COLUMN IF NOT EXISTS lease_expires_at DATETIME
+COMMENT '租约到期时间（到期后其他执行器可以重新租用）'
+AFTER worker_id;
+
+ALTER TABLE dedup_task_checkpoints
+ADD COLUMN IF NOT EXISTS heartbeat_at DATETIME
+COMMENT '最近一次续租时间'
+AFTER lease_expires_at;
+
+ALTER TABLE dedup_task_checkpoints
+ADD COLUMN IF NOT EXISTS attempts INT NOT NULL DEFAULT 0
+COMMENT '租用次数'
+AFTER heartbeat_at;
+
+-- ============================================================================
+-- SQLite 版本（如果需要）
+-- ============================================================================
+
+/*
+ALTER TABLE dedup_task_checkpoints ADD COLUMN worker_id VARCHAR(100);
+ALTER TABLE dedup_task_checkpoints ADD COLUMN lease_expires_at DATETIME;
+ALTER TABLE dedup_task_checkpoints ADD COLUMN heartbeat_at DATETIME;
+ALTER TABLE dedup_task_checkpoints ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0;
+*/
+
+-- ============================================================================
+-- 验证脚本（可选）
+-- ============================================================================
+
+-- SELECT task_id, worker_id, status, COUNT(*) AS groups, SUM(attempts) AS attempts
+-- FROM dedup_task_checkpoints GROUP BY task_id, worker_id, status;
@@ -0,0 +1,44 @@
+-- ============================================================================
+-- 数据库迁移脚本：dedup_task_jobs 表添加认领租约字段
+-- ============================================================================
+-- 说明：原先只有执行器以相同ID重启时才会恢复它认领的任务；执行器崩溃后以新ID启动
+--       （容器重新部署后主机名变化）或所在机器下线时，任务一直停留在 running 状态。
+--       认领任务时写入租约，执行器每次轮询续租：
+--       lease_expires_at  认领租约到期时间，到期后任意执行器把任务重新排队
+--       heartbeat_at      执行器最近一次续租时间
+--       已认领、没有租约的记录（迁移前认领的任务）视为租约已到期，迁移后会被重新排队
+-- ============================================================================
+
+-- ============================================================================
+-- MySQL 版本
+-- ============================================================================
+
+ALTER TABLE dedup_task_jobs
+ADD COLUMN IF NOT EXISTS lease_expires_at DATETIME
+COMMENT '认领租约到期时间（执行器每次轮询续租，到期后任意执行器可重新排队）'
+AFTER finished_at;
+
+ALTER TABLE dedup_task_jobs
+ADD COLUMN IF NOT EXISTS heartbeat_at DATETIME
+COMMENT '执行器最近一次续租时间'
+AFTER lease_expires_at;
+
+CREATE INDEX idx_status_lease ON dedup_task_jobs(status, lease_expires_at);
+
+-- ============================================================================
+-- SQLite 版本（如果需要）
+-- ============================================================================
+
+/*
+ALTER TABLE dedup_task_jobs ADD COLUMN lease_expires_at DATETIME;
+ALTER TABLE dedup_task_jobs ADD COLUMN heartbeat_at DATETIME;
+CREATE INDEX IF NOT EXISTS idx_status_lease ON dedup_task_jobs(status, lease_expires_at);
+*/
+
+-- ============================================================================
+-- 验证脚本（可选）
+-- ============================================================================
+
+-- SELECT task_id, status, worker_id, heartbeat_at, lease_expires_at,
+--        lease_expires_at < NOW() AS expired
+-- FROM dedup_task_jobs WHERE status = 'claimed';
@@ -0,0 +1,58 @@
+-- ============================================================================
+-- 数据库迁移脚本：创建 LSH band 索引表 question_dedup_band_index
+-- ============================================================================
+-- 说明：去重任务保存特征时，同时按 (band_idx, band_hash) → question_id 写入 band 索引，
+--       后续任务、增量分析可以按索引查找候选重复题，不必重新加载全部签名分桶
+--       每道题 16 行（NUM_BANDS），band_hash 为 uint64 按位转换的有符号 BIGINT
+-- ============================================================================
+
+-- ============================================================================
+-- MySQL 版本
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS question_dedup_band_index (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY COMMENT '记录ID',
+    task_id INT NOT NULL COMMENT '任务ID',
+    question_id INT NOT NULL COMMENT '题目ID',
+    band_idx SMALLINT NOT NULL COMMENT 'band序号',
+    band_hash BIGINT NOT NULL COMMENT 'band哈希值（uint64按位转为有符号int64存储）',
+    fingerprint_version VARCHAR(20) NOT NULL COMMENT '指纹格式版本',
+    group_type VARCHAR(2) COMMENT '题型',
+    group_subject_id INT COMMENT '科目ID',
+    group_channel_code VARCHAR(20) COMMENT '渠道代码',
+    INDEX idx_band_hash (band_hash, band_idx),
+    INDEX idx_band_group (group_type, group_subject_id, group_channel_code, fingerprint_version, task_id),
+    UNIQUE KEY uk_task_question_band (task_id, question_id, band_idx),
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='LSH band索引表';
+
+-- ============================================================================
+-- SQLite 版本（如果需要）
+-- ============================================================================
+
+/*
+CREATE TABLE IF NOT EXISTS question_dedup_band_index (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    band_idx SMALLINT NOT NULL,
+    band_hash BIGINT NOT NULL,
+    fingerprint_version VARCHAR(20) NOT NULL,
+    group_type VARCHAR(2),
+    group_subject_id INTEGER,
+    group_channel_code VARCHAR(20),
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE,
+    UNIQUE(task_id, question_id, band_idx)
+);
+
+CREATE INDEX IF NOT EXISTS idx_band_index_hash ON question_dedup_band_index(band_hash, band_idx);
+CREATE INDEX IF NOT EXISTS idx_band_index_group
+ON question_dedup_band_index(group_type, group_subject_id, group_channel_code, fingerprint_version, task_id);
+*/
+
+-- ============================================================================
+-- 验证脚本（可选）
+-- ============================================================================
+
+-- SELECT task_id, COUNT(DISTINCT question_id) AS questions, COUNT(*) AS band_rows
+-- FROM question_dedup_band_index GROUP BY task_id;
@@ -0,0 +1,72 @@
+-- ============================================================================
+-- 数据库迁移脚本：创建去重任务检查点表 dedup_task_checkpoints
+-- ============================================================================
+-- 说明：替代项目根目录的 question_dedup_progress.json。原进度文件每完成一个分组
+--       就把全部分组结果（含清洗后的题目和 n-gram）追加进去并整体重写，
+--       文件大小和写入耗时随分组数平方增长。检查点表每个分组一行，
+--       任务首次执行时写入分组列表，分组完成时只更新该分组一行的状态和统计数；
+--       断点续传按 (task_id, status, group_index) 索引读取第一个未完成的分组
+-- ============================================================================
+
+-- ============================================================================
+-- MySQL 版本
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS dedup_task_checkpoints (
+    id INT AUTO_INCREMENT PRIMARY KEY COMMENT '记录ID',
+    task_id INT NOT NULL COMMENT '任务ID',
+    group_index INT NOT NULL COMMENT '分组序号',
+    group_type VARCHAR(2) COMMENT '题型',
+    group_subject_id INT COMMENT '科目ID',
+    group_channel_code VARCHAR(20) COMMENT '渠道代码',
+    group_json TEXT COMMENT '分组信息（JSON格式，含名称和题目数）',
+    status ENUM('pending', 'completed') NOT NULL DEFAULT 'pending' COMMENT '分组状态',
+    question_count INT DEFAULT 0 COMMENT '处理题目数',
+    exact_duplicate_groups INT DEFAULT 0 COMMENT '完全重复组数',
+    exact_duplicate_pairs INT DEFAULT 0 COMMENT '完全重复对数',
+    similar_duplicate_pairs INT DEFAULT 0 COMMENT '相似重复对数',
+    worker_id VARCHAR(100) COMMENT '租用分组的执行器ID',
+    lease_expires_at DATETIME COMMENT '租约到期时间（到期后其他执行器可以重新租用）',
+    heartbeat_at DATETIME COMMENT '最近一次续租时间',
+    attempts INT NOT NULL DEFAULT 0 COMMENT '租用次数',
+    completed_at DATETIME COMMENT '完成时间',
+    UNIQUE KEY uk_task_group_index (task_id, group_index),
+    INDEX idx_task_status_index (task_id, status, group_index),
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='去重任务检查点表';
+
+-- ============================================================================
+-- SQLite 版本（如果需要）
+-- ============================================================================
+
+/*
+CREATE TABLE IF NOT EXISTS dedup_task_checkpoints (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    group_index INTEGER NOT NULL,
+    group_type VARCHAR(2),
+    group_subject_id INTEGER,
+    group_channel_code VARCHAR(20),
+    group_json TEXT,
+    status VARCHAR(9) NOT NULL DEFAULT 'pending',
+    question_count INTEGER DEFAULT 0,
+    exact_duplicate_groups INTEGER DEFAULT 0,
+    exact_duplicate_pairs INTEGER DEFAULT 0,
+    similar_duplicate_pairs INTEGER DEFAULT 0,
+    worker_id VARCHAR(100),
+    lease_expires_at DATETIME,
+    heartbeat_at DATETIME,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    completed_at DATETIME,
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE,
+    UNIQUE(task_id, group_index)
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_status_index ON dedup_task_checkpoints(task_id, status, group_index);
+*/
+
+-- ============================================================================
+-- 验证脚本（可选）
+-- ============================================================================
+
+-- SELECT task_id, status, COUNT(*) AS groups FROM dedup_task_checkpoints GROUP BY task_id, status;
@@ -0,0 +1,64 @@
+-- ============================================================================
+-- 数据库迁移脚本：创建去重任务执行队列表 dedup_task_jobs
+-- ============================================================================
+-- 说明：任务原先在处理 HTTP 请求的 Web 进程中由后台线程执行，Web 进程重启或
+--       重新部署时执行中的任务随之中断。启动/恢复任务时改为写入执行队列，
+--       由 Web 进程内置的执行器或独立的 dedup_worker.py 进程认领执行；
+--       认领使用带状态条件的 UPDATE，多个执行器不会重复认领同一个任务。
+--       执行器每次轮询为认领的任务续租，执行器退出后租约到期，任务由任意执行器
+--       重新排队，从检查点继续执行（已有表请执行 add_lease_columns_to_dedup_task_jobs.sql）
+-- ============================================================================
+
+-- ============================================================================
+-- MySQL 版本
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS dedup_task_jobs (
+    id INT AUTO_INCREMENT PRIMARY KEY COMMENT '记录ID',
+    task_id INT NOT NULL COMMENT '任务ID',
+    status ENUM('queued', 'claimed', 'finished') NOT NULL DEFAULT 'queued' COMMENT '队列状态',
+    priority INT NOT NULL DEFAULT 0 COMMENT '优先级（数值越大越先认领）',
+    worker_id VARCHAR(100) COMMENT '认领的执行器ID',
+    attempts INT NOT NULL DEFAULT 0 COMMENT '认领次数',
+    enqueued_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '入队时间',
+    claimed_at DATETIME COMMENT '认领时间',
+    finished_at DATETIME COMMENT '执行结束时间',
+    lease_expires_at DATETIME COMMENT '认领租约到期时间（执行器每次轮询续租，到期后任意执行器可重新排队）',
+    heartbeat_at DATETIME COMMENT '执行器最近一次续租时间',
+    UNIQUE KEY uk_task_id (task_id),
+    INDEX idx_status_priority (status, priority, id),
+    INDEX idx_worker_status (worker_id, status),
+    INDEX idx_status_lease (status, lease_expires_at),
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='去重任务执行队列表';
+
+-- ============================================================================
+-- SQLite 版本（如果需要）
+-- ============================================================================
+
+/*
+CREATE TABLE IF NOT EXISTS dedup_task_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL UNIQUE,
+    status VARCHAR(8) NOT NULL DEFAULT 'queued',
+    priority INTEGER NOT NULL DEFAULT 0,
+    worker_id VARCHAR(100),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    claimed_at DATETIME,
+    finished_at DATETIME,
+    lease_expires_at DATETIME,
+    heartbeat_at DATETIME,
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_status_priority ON dedup_task_jobs(status, priority, id);
+CREATE INDEX IF NOT EXISTS idx_worker_status ON dedup_task_jobs(worker_id, status);
+CREATE INDEX IF NOT EXISTS idx_status_lease ON dedup_task_jobs(status, lease_expires_at);
+*/
+
+-- ============================================================================
+-- 验证脚本（可选）
+-- ============================================================================
+
+-- SELECT status, worker_id, COUNT(*) AS jobs FROM dedup_task_jobs GROUP BY status, worker_id;
@@ -0,0 +1,63 @@
+-- ============================================================================
+-- 数据库迁移脚本：创建去重任务分维度统计表 dedup_task_statistics
+-- ============================================================================
+-- 说明：任务统计接口原先在每次请求时对 question_duplicate_groups 做 GROUP BY，
+--       再按每个题型、每个科目分别统计相似重复对数量。分组结果保存时在同一事务中
+--       累加 (task_id, 题型, 科目, 渠道) 统计行，统计接口只读取该任务的统计行，
+--       任务执行期间实时更新。
+--       dedup_tasks.total_questions 改为创建任务时按分组统计的总题目数，不再随分组
+--       完成累加（原先会计入两次）；已处理题目数为统计行 question_count 之和。
+--       已有任务的统计数据请运行 scripts/database/migrate_create_task_statistics_table.py 生成
+-- ============================================================================
+
+-- ============================================================================
+-- MySQL 版本
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS dedup_task_statistics (
+    id INT AUTO_INCREMENT PRIMARY KEY COMMENT '记录ID',
+    task_id INT NOT NULL COMMENT '任务ID',
+    group_type VARCHAR(2) COMMENT '题型',
+    group_subject_id INT COMMENT '科目ID',
+    group_channel_code VARCHAR(20) COMMENT '渠道代码',
+    processed_groups INT NOT NULL DEFAULT 0 COMMENT '已处理分组数',
+    question_count INT NOT NULL DEFAULT 0 COMMENT '处理题目数',
+    exact_duplicate_groups INT NOT NULL DEFAULT 0 COMMENT '完全重复组数',
+    exact_duplicate_questions INT NOT NULL DEFAULT 0 COMMENT '完全重复组内题目数',
+    exact_duplicate_pairs INT NOT NULL DEFAULT 0 COMMENT '完全重复对数',
+    similar_duplicate_pairs INT NOT NULL DEFAULT 0 COMMENT '相似重复对数',
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+    UNIQUE KEY uk_task_dimension (task_id, group_type, group_subject_id, group_channel_code),
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='去重任务分维度统计表';
+
+-- ============================================================================
+-- SQLite 版本（如果需要）
+-- ============================================================================
+
+/*
+CREATE TABLE IF NOT EXISTS dedup_task_statistics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    group_type VARCHAR(2),
+    group_subject_id INTEGER,
+    group_channel_code VARCHAR(20),
+    processed_groups INTEGER NOT NULL DEFAULT 0,
+    question_count INTEGER NOT NULL DEFAULT 0,
+    exact_duplicate_groups INTEGER NOT NULL DEFAULT 0,
+    exact_duplicate_questions INTEGER NOT NULL DEFAULT 0,
+    exact_duplicate_pairs INTEGER NOT NULL DEFAULT 0,
+    similar_duplicate_pairs INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (task_id, group_type, group_subject_id, group_channel_code),
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE
+);
+*/
+
+-- ============================================================================
+-- 验证脚本（可选）
+-- ============================================================================
+
+-- SELECT task_id, SUM(question_count) AS questions, SUM(exact_duplicate_groups) AS exact_groups,
+--        SUM(similar_duplicate_pairs) AS similar_pairs
+-- FROM dedup_task_statistics GROUP BY task_id;
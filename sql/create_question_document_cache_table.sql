@@ -0,0 +1,54 @@
+-- ============================================================================
+-- 数据库迁移脚本：创建聚合题目文档缓存表 question_document_cache
+-- ============================================================================
+-- 说明：题目详情、批量查询、题目列表和去重结果详情把题目主表、答案表、选项表
+--       聚合成 JSON 文档，聚合结果按 (题目ID, 渠道, 是否包含答案, 是否包含解析)
+--       缓存。默认使用进程内缓存（QUESTION_CACHE_BACKEND=memory）；多个 Web 进程
+--       或多台机器部署时配置 QUESTION_CACHE_BACKEND=database 使用本表共享缓存，
+--       失效接口 POST /api/questions/cache/invalidate 对所有进程生效。
+--       过期记录在写入缓存时按间隔删除，表中只保留有效期内的题目文档
+-- ============================================================================
+
+-- ============================================================================
+-- MySQL 版本
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS question_document_cache (
+    id INT AUTO_INCREMENT PRIMARY KEY COMMENT '记录ID',
+    question_id INT NOT NULL COMMENT '题目ID',
+    channel_code VARCHAR(20) NOT NULL COMMENT '渠道代码',
+    include_answer TINYINT(1) NOT NULL COMMENT '是否包含答案',
+    include_analysis TINYINT(1) NOT NULL COMMENT '是否包含解析',
+    document MEDIUMTEXT NOT NULL COMMENT '聚合后的题目 JSON',
+    expires_at DATETIME NOT NULL COMMENT '过期时间',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+    UNIQUE KEY uk_question_document (question_id, channel_code, include_answer, include_analysis),
+    INDEX idx_document_expires (expires_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='聚合题目文档缓存表';
+
+-- ============================================================================
+-- SQLite 版本（如果需要）
+-- ============================================================================
+
+/*
+CREATE TABLE IF NOT EXISTS question_document_cache (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    question_id INTEGER NOT NULL,
+    channel_code VARCHAR(20) NOT NULL,
+    include_answer BOOLEAN NOT NULL,
+    include_analysis BOOLEAN NOT NULL,
+    document TEXT NOT NULL,
+    expires_at DATETIME NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (question_id, channel_code, include_answer, include_analysis)
+);
+
+CREATE INDEX IF NOT EXISTS idx_question_document_cache_expires ON question_document_cache(expires_at);
+*/
+
+-- ============================================================================
+-- 验证脚本（可选）
+-- ============================================================================
+
+-- SELECT COUNT(*) AS entries, SUM(LENGTH(document)) AS bytes
+-- FROM question_document_cache WHERE expires_at > NOW();
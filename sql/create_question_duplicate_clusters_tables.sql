@@ -0,0 +1,96 @@
+-- ============================================================================
+-- 数据库迁移脚本：创建重复题目簇表 question_duplicate_clusters / question_duplicate_cluster_members
+-- ============================================================================
+-- 说明：相似重复对按题目两两保存，k 道近似模板题组成的簇有 O(k²) 行题目对，
+--       查询时还要从全部题目对重建邻接关系。分组处理完成后对完全重复组和
+--       相似重复对做并查集聚类，每个连通分量保存 1 行簇记录（代表题目和
+--       相似边统计）和 k 行成员记录。
+--       默认不再保存相似重复对明细，只保存簇（DEDUP_STORE_SIMILAR_PAIRS=true 时仍保存题目对）
+-- ============================================================================
+
+-- ============================================================================
+-- MySQL 版本
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS question_duplicate_clusters (
+    id INT AUTO_INCREMENT PRIMARY KEY COMMENT '簇ID',
+    task_id INT NOT NULL COMMENT '任务ID',
+    representative_question_id INT NOT NULL COMMENT '代表题目ID（簇内相似边最多的题目）',
+    member_count INT NOT NULL COMMENT '成员题目数',
+    exact_question_count INT NOT NULL DEFAULT 0 COMMENT '属于完全重复组的成员数',
+    similar_edge_count INT NOT NULL DEFAULT 0 COMMENT '簇内相似重复对数',
+    min_similarity DECIMAL(5, 4) COMMENT '簇内最小相似度',
+    max_similarity DECIMAL(5, 4) COMMENT '簇内最大相似度',
+    avg_similarity DECIMAL(5, 4) COMMENT '簇内平均相似度',
+    group_type VARCHAR(2) COMMENT '题型',
+    group_subject_id INT COMMENT '科目ID',
+    group_channel_code VARCHAR(20) COMMENT '渠道代码',
+    detected_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '检测时间',
+    UNIQUE KEY uk_task_representative (task_id, representative_question_id),
+    INDEX idx_task_size (task_id, member_count),
+    INDEX idx_group (group_type, group_subject_id, group_channel_code),
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='重复题目簇表';
+
+CREATE TABLE IF NOT EXISTS question_duplicate_cluster_members (
+    id INT AUTO_INCREMENT PRIMARY KEY COMMENT '记录ID',
+    cluster_id INT NOT NULL COMMENT '簇ID',
+    task_id INT NOT NULL COMMENT '任务ID',
+    question_id INT NOT NULL COMMENT '题目ID',
+    degree INT NOT NULL DEFAULT 0 COMMENT '与该题目相似的簇内题目数',
+    max_similarity DECIMAL(5, 4) COMMENT '与簇内其他题目的最大相似度',
+    is_exact TINYINT(1) NOT NULL DEFAULT 0 COMMENT '是否属于完全重复组',
+    UNIQUE KEY uk_cluster_question (cluster_id, question_id),
+    INDEX idx_task_question (task_id, question_id),
+    FOREIGN KEY (cluster_id) REFERENCES question_duplicate_clusters(id) ON DELETE CASCADE,
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='重复题目簇成员表';
+
+-- ============================================================================
+-- SQLite 版本（如果需要）
+-- ============================================================================
+
+/*
+CREATE TABLE IF NOT EXISTS question_duplicate_clusters (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    representative_question_id INTEGER NOT NULL,
+    member_count INTEGER NOT NULL,
+    exact_question_count INTEGER NOT NULL DEFAULT 0,
+    similar_edge_count INTEGER NOT NULL DEFAULT 0,
+    min_similarity NUMERIC(5, 4),
+    max_similarity NUMERIC(5, 4),
+    avg_similarity NUMERIC(5, 4),
+    group_type VARCHAR(2),
+    group_subject_id INTEGER,
+    group_channel_code VARCHAR(20),
+    detected_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (task_id, representative_question_id),
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_size ON question_duplicate_clusters(task_id, member_count);
+CREATE INDEX IF NOT EXISTS idx_cluster_group ON question_duplicate_clusters(group_type, group_subject_id, group_channel_code);
+
+CREATE TABLE IF NOT EXISTS question_duplicate_cluster_members (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cluster_id INTEGER NOT NULL,
+    task_id INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    degree INTEGER NOT NULL DEFAULT 0,
+    max_similarity NUMERIC(5, 4),
+    is_exact BOOLEAN NOT NULL DEFAULT 0,
+    UNIQUE (cluster_id, question_id),
+    FOREIGN KEY (cluster_id) REFERENCES question_duplicate_clusters(id) ON DELETE CASCADE,
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_question ON question_duplicate_cluster_members(task_id, question_id);
+*/
+
+-- ============================================================================
+-- 验证脚本（可选）
+-- ============================================================================
+
+-- SELECT task_id, COUNT(*) AS clusters, SUM(member_count) AS members, SUM(similar_edge_count) AS edges
+-- FROM question_duplicate_clusters GROUP BY task_id;
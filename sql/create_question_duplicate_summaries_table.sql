@@ -0,0 +1,75 @@
+-- ============================================================================
+-- 数据库迁移脚本：创建相似重复题目汇总表 question_duplicate_summaries
+-- ============================================================================
+-- 说明：按题目分组的相似重复列表（similar-pairs?format=grouped）原先读取任务的
+--       全部相似重复对，在内存中按题目汇总、逐题查询科目名称后再分页。
+--       分组处理完成时按题目写入汇总行（相似重复题目数、最大/最小相似度、
+--       分组信息），列表改为按 (task_id, max_similarity, question_id) 索引分页查询，
+--       只读取当前页题目的相似重复对
+-- ============================================================================
+
+-- ============================================================================
+-- MySQL 版本
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS question_duplicate_summaries (
+    id INT AUTO_INCREMENT PRIMARY KEY COMMENT '记录ID',
+    task_id INT NOT NULL COMMENT '任务ID',
+    question_id INT NOT NULL COMMENT '题目ID',
+    duplicate_count INT NOT NULL COMMENT '相似重复题目数',
+    max_similarity DECIMAL(5, 4) NOT NULL COMMENT '最大相似度',
+    min_similarity DECIMAL(5, 4) NOT NULL COMMENT '最小相似度',
+    group_type VARCHAR(2) COMMENT '题型',
+    group_subject_id INT COMMENT '科目ID',
+    group_channel_code VARCHAR(20) COMMENT '渠道代码',
+    UNIQUE KEY uk_task_question (task_id, question_id),
+    INDEX idx_task_similarity (task_id, max_similarity, question_id),
+    INDEX idx_task_type_similarity (task_id, group_type, max_similarity, question_id),
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='相似重复题目汇总表';
+
+-- 为已有任务生成汇总数据（也可以运行 scripts/database/migrate_create_duplicate_summaries_table.py）
+INSERT INTO question_duplicate_summaries
+    (task_id, question_id, duplicate_count, max_similarity, min_similarity,
+     group_type, group_subject_id, group_channel_code)
+SELECT task_id, question_id, COUNT(*), MAX(similarity), MIN(similarity),
+       MAX(group_type), MAX(group_subject_id), MAX(group_channel_code)
+FROM (
+    SELECT task_id, question_id_1 AS question_id, similarity, group_type, group_subject_id, group_channel_code
+    FROM question_duplicate_pairs WHERE duplicate_type = 'similar'
+    UNION ALL
+    SELECT task_id, question_id_2 AS question_id, similarity, group_type, group_subject_id, group_channel_code
+    FROM question_duplicate_pairs WHERE duplicate_type = 'similar'
+) AS sides
+WHERE task_id NOT IN (SELECT DISTINCT task_id FROM question_duplicate_summaries)
+GROUP BY task_id, question_id;
+
+-- ============================================================================
+-- SQLite 版本（如果需要）
+-- ============================================================================
+
+/*
+CREATE TABLE IF NOT EXISTS question_duplicate_summaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    duplicate_count INTEGER NOT NULL,
+    max_similarity NUMERIC(5, 4) NOT NULL,
+    min_similarity NUMERIC(5, 4) NOT NULL,
+    group_type VARCHAR(2),
+    group_subject_id INTEGER,
+    group_channel_code VARCHAR(20),
+    UNIQUE (task_id, question_id),
+    FOREIGN KEY (task_id) REFERENCES dedup_tasks(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_similarity ON question_duplicate_summaries(task_id, max_similarity, question_id);
+CREATE INDEX IF NOT EXISTS idx_task_type_similarity ON question_duplicate_summaries(task_id, group_type, max_similarity, question_id);
+*/
+
+-- ============================================================================
+-- 验证脚本（可选）
+-- ============================================================================
+
+-- SELECT task_id, COUNT(*) AS questions, SUM(duplicate_count) / 2 AS pairs
+-- FROM question_duplicate_summaries GROUP BY task_id;
@@ -0,0 +1,58 @@
+-- ============================================================================
+-- 数据库迁移脚本：创建题目关键字搜索索引表
+-- question_search_ngrams / question_search_documents
+-- ============================================================================
+-- 说明：题目列表的 keyword 筛选原先是 content LIKE '%关键字%'，每次搜索都扫描题目内容。
+--       question_search_ngrams 按 (n-gram 哈希ID, 题目ID) 保存题目内容的 3-gram 倒排列表，
+--       主键按 n-gram 聚集，搜索时对关键字各 n-gram 的倒排列表求交集得到候选题目，
+--       再对候选题目执行原来的 LIKE 校验。
+--       question_search_documents 记录已索引题目的内容摘要，增量同步只重建内容变化的题目。
+--       建表后请运行 scripts/database/migrate_create_question_search_index.py 建立索引
+--       （同一脚本也可以用于重建，只处理新增、修改和删除的题目）
+-- ============================================================================
+
+-- ============================================================================
+-- MySQL 版本
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS question_search_ngrams (
+    ngram_id INT NOT NULL COMMENT 'n-gram 哈希ID（uint32按位转为有符号int32存储）',
+    question_id INT NOT NULL COMMENT '题目ID',
+    PRIMARY KEY (ngram_id, question_id),
+    INDEX idx_search_question (question_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='题目关键字搜索倒排表';
+
+CREATE TABLE IF NOT EXISTS question_search_documents (
+    question_id INT NOT NULL PRIMARY KEY COMMENT '题目ID',
+    content_digest BINARY(16) NOT NULL COMMENT '题目内容的MD5原始摘要',
+    ngram_count INT NOT NULL DEFAULT 0 COMMENT 'n-gram数量',
+    indexed_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '索引时间'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='题目关键字搜索已索引题目表';
+
+-- ============================================================================
+-- SQLite 版本（如果需要）
+-- ============================================================================
+
+/*
+CREATE TABLE IF NOT EXISTS question_search_ngrams (
+    ngram_id INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    PRIMARY KEY (ngram_id, question_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_question_search_ngrams_question ON question_search_ngrams(question_id);
+
+CREATE TABLE IF NOT EXISTS question_search_documents (
+    question_id INTEGER NOT NULL PRIMARY KEY,
+    content_digest BLOB NOT NULL,
+    ngram_count INTEGER NOT NULL DEFAULT 0,
+    indexed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+*/
+
+-- ============================================================================
+-- 验证脚本（可选）
+-- ============================================================================
+
+-- SELECT COUNT(*) AS indexed_questions, MAX(question_id) AS watermark, SUM(ngram_count) AS postings
+-- FROM question_search_documents;
@@ -223,6 +223,32 @@ with app.app_context():
         print("=" * 80)
         print()
 
+# 去重任务调度器的全局并发上限
+from src.services.dedup_scheduler import DedupTaskScheduler
+DedupTaskScheduler.configure(app.config.get('DEDUP_MAX_CONCURRENCY', 0))
+
+
+def start_dedup_background_services():
+    """
+    启动 Web 进程的去重后台服务（只在实际提供服务的进程中调用，迁移脚本等导入本模块时不启动）：
+    - 内置执行器（DEDUP_EMBEDDED_WORKER 开启时），从执行队列认领并执行去重任务
+    - 进度转发，把独立 worker 进程执行的任务进度推送到 WebSocket 客户端
+    - 单题查重内存索引预热（DEDUP_CHECK_INDEX_WARMUP 开启时），后台加载，不阻塞启动
+    """
+    from src.routes.websocket import start_progress_relay
+    if app.config.get('DEDUP_CHECK_INDEX_WARMUP'):
+        from src.services.dedup_check_service import DedupCheckService
+        DedupCheckService.warm_up_async(app)
+    if app.config.get('DEDUP_EMBEDDED_WORKER'):
+        from src.services.dedup_job_worker import DedupJobWorker, default_worker_id
+        DedupJobWorker(
+            app,
+            app.config.get('DEDUP_WORKER_ID') or default_worker_id('web'),
+            max_tasks=app.config.get('DEDUP_WORKER_MAX_TASKS', 4),
+            poll_interval=app.config.get('DEDUP_WORKER_POLL_INTERVAL', 1.0)
+        ).start()
+    start_progress_relay(app)
+
 @app.route('/')
 def index():
     """首页（保留原有功能）"""
@@ -346,6 +372,10 @@ if __name__ == '__main__':
     print("📝 请求日志已启用，所有 API 请求将在控制台显示")
     print("="*80 + "\n")
     
+    # debug 模式下由重载器启动的子进程提供服务，只在子进程中启动去重后台服务
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_dedup_background_services()
+    
     try:
         # 使用 SocketIO 运行应用（支持 WebSocket）
         socketio.run(app, debug=True, host=host, port=selected_port, allow_unsafe_werkzeug=True)
@@ -133,3 +133,45 @@ class Config:
     LOGIN_FAIL_LIMIT = int(os.environ.get('LOGIN_FAIL_LIMIT', 10))  # 登录失败次数限制（默认10次）
     LOGIN_FAIL_WINDOW_MINUTES = int(os.environ.get('LOGIN_FAIL_WINDOW_MINUTES', 10))  # 时间窗口（分钟，默认10分钟）
 
+    
+    # 题目维度缓存配置
+    # 科目名称、渠道元数据的进程内缓存有效期（秒），过期后下一次读取时在后台刷新
+    DIMENSION_CACHE_TTL = int(os.environ.get('DIMENSION_CACHE_TTL', 300))
+
+    # 题目文档缓存配置
+    # 聚合后的题目文档（题目 + 答案 + 选项）的读穿透缓存，题目详情、批量查询、题目列表和去重结果详情共用
+    QUESTION_CACHE_ENABLED = os.environ.get('QUESTION_CACHE_ENABLED', 'true').lower() in ['true', 'on', '1']
+    # 缓存后端：memory=进程内 LRU，database=question_document_cache 表（多进程共享）
+    QUESTION_CACHE_BACKEND = os.environ.get('QUESTION_CACHE_BACKEND', 'memory')
+    # 缓存有效期（秒）
+    QUESTION_CACHE_TTL = int(os.environ.get('QUESTION_CACHE_TTL', 600))
+    # 进程内缓存的内存上限（字节）和条数上限，超过时淘汰最久未使用的题目
+    QUESTION_CACHE_MAX_BYTES = int(os.environ.get('QUESTION_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    QUESTION_CACHE_MAX_ENTRIES = int(os.environ.get('QUESTION_CACHE_MAX_ENTRIES', 50000))
+
+    # 题目关键字搜索索引配置
+    # 题目列表 keyword 搜索是否使用 n-gram 倒排索引（索引由 scripts/database/migrate_create_question_search_index.py 建立）
+    QUESTION_SEARCH_INDEX_ENABLED = os.environ.get('QUESTION_SEARCH_INDEX_ENABLED', 'true').lower() in ['true', 'on', '1']
+    # 搜索时后台比对全部题目内容摘要的间隔（秒），已索引题目被修改后最多经过该间隔（加一次同步耗时）按新内容搜到
+    QUESTION_SEARCH_INDEX_SYNC_INTERVAL = int(os.environ.get('QUESTION_SEARCH_INDEX_SYNC_INTERVAL', 300))
+
+    # 题目去重配置
+    # 启动时是否在后台加载单题查重（/api/dedup/check）的内存索引
+    DEDUP_CHECK_INDEX_WARMUP = os.environ.get('DEDUP_CHECK_INDEX_WARMUP', 'true').lower() in ['true', 'on', '1']
+    # 所有去重任务同时处理的分组数上限（0 表示 CPU 核数），名额按任务优先级和轮转顺序分配
+    DEDUP_MAX_CONCURRENCY = int(os.environ.get('DEDUP_MAX_CONCURRENCY', 0))
+    # Web 进程是否内置执行器（从 dedup_task_jobs 队列认领任务）；关闭后由 dedup_worker.py 独立进程执行
+    DEDUP_EMBEDDED_WORKER = os.environ.get('DEDUP_EMBEDDED_WORKER', 'true').lower() in ['true', 'on', '1']
+    # 执行器ID（每个执行器进程唯一；以相同ID重启时立即恢复遗留任务），为空时使用 主机名:web:进程号 / 主机名:worker:进程号
+    DEDUP_WORKER_ID = os.environ.get('DEDUP_WORKER_ID', '')
+    # 执行器认领任务的租约时长（秒）：执行器每次轮询续租，退出后租约到期，任务由任意执行器重新排队
+    DEDUP_JOB_LEASE_SECONDS = float(os.environ.get('DEDUP_JOB_LEASE_SECONDS', 60))
+    # 每个执行器同时执行的任务数
+    DEDUP_WORKER_MAX_TASKS = int(os.environ.get('DEDUP_WORKER_MAX_TASKS', 4))
+    # 执行器轮询队列、同步任务状态的间隔（秒）
+    DEDUP_WORKER_POLL_INTERVAL = float(os.environ.get('DEDUP_WORKER_POLL_INTERVAL', 1.0))
+    # 分组租约时长（秒）：执行器每隔 1/3 时长续租，执行器退出后租约到期、分组由其他执行器重新租用
+    DEDUP_GROUP_LEASE_SECONDS = float(os.environ.get('DEDUP_GROUP_LEASE_SECONDS', 120))
+    # 是否保存相似重复对明细（默认关闭）：默认只保存重复题目簇和按题目汇总（簇内 k 道题目只需 k 行成员记录，
+    # 而不是 O(k²) 行题目对）；旧版 similar-pairs 明细接口和 pairs 导出需要题目对时再开启
+    DEDUP_STORE_SIMILAR_PAIRS = os.environ.get('DEDUP_STORE_SIMILAR_PAIRS', 'false').lower() in ['true', 'on', '1']
@@ -17,11 +17,14 @@ from src.models.question import (
     Question, SingleChoiceAnswer, SingleChoiceOption,
     MultChoiceAnswer, MultChoiceOption, JudgmentAnswer,
     BlankAnswer, CalcParentAnswer, CalcChildAnswer,
-    CalcChildItem, BlankChildAnswer
+    CalcChildItem, BlankChildAnswer, QuestionDocumentCache,
+    QuestionSearchNgram, QuestionSearchDocument
 )
 from src.models.question_dedup import (
     DedupTask, QuestionDuplicatePair, QuestionDuplicateGroup,
-    QuestionDuplicateGroupItem, QuestionDedupFeature
+    QuestionDuplicateGroupItem, QuestionDedupFeature, QuestionDedupBandIndex,
+    DedupTaskCheckpoint, DedupTaskJob, QuestionDuplicateCluster, QuestionDuplicateClusterMember,
+    QuestionDuplicateSummary, DedupTaskStatistic
 )
 
 # 统一导出
@@ -30,8 +33,11 @@ __all__ = [
     'Question', 'SingleChoiceAnswer', 'SingleChoiceOption',
     'MultChoiceAnswer', 'MultChoiceOption', 'JudgmentAnswer',
     'BlankAnswer', 'CalcParentAnswer', 'CalcChildAnswer',
-    'CalcChildItem', 'BlankChildAnswer',
+    'CalcChildItem', 'BlankChildAnswer', 'QuestionDocumentCache',
+    'QuestionSearchNgram', 'QuestionSearchDocument',
     'DedupTask', 'QuestionDuplicatePair', 'QuestionDuplicateGroup',
-    'QuestionDuplicateGroupItem', 'QuestionDedupFeature'
+    'QuestionDuplicateGroupItem', 'QuestionDedupFeature', 'QuestionDedupBandIndex',
+    'DedupTaskCheckpoint', 'DedupTaskJob', 'QuestionDuplicateCluster', 'QuestionDuplicateClusterMember',
+    'QuestionDuplicateSummary', 'DedupTaskStatistic'
 ]
 
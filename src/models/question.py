@@ -26,6 +26,11 @@ class Question(db.Model):
     create_time = db.Column(db.DateTime)
     is_del = db.Column(db.Integer, default=0)  # 0=正常, 1=删除
     
+    __table_args__ = (
+        # 题目列表按 (sort, question_id) 游标分页
+        db.Index('idx_type_del_sort', 'type', 'is_del', 'sort', 'question_id'),
+    )
+    
     def to_dict(self, include_answer=True, include_analysis=True):
         """转换为字典"""
         result = {
@@ -263,3 +268,45 @@ class BlankChildAnswer(db.Model):
             'sort': self.sort
         }
 
+
+class QuestionDocumentCache(db.Model):
+    """聚合题目文档缓存表（QUESTION_CACHE_BACKEND=database 时多个进程共享）"""
+    __tablename__ = 'question_document_cache'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    question_id = db.Column(db.Integer, nullable=False)
+    channel_code = db.Column(db.String(20), nullable=False)
+    include_answer = db.Column(db.Boolean, nullable=False)
+    include_analysis = db.Column(db.Boolean, nullable=False)
+    document = db.Column(db.Text(16777215), nullable=False)  # 聚合后的题目 JSON
+    expires_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    
+    __table_args__ = (
+        db.UniqueConstraint('question_id', 'channel_code', 'include_answer', 'include_analysis',
+                            name='uk_question_document'),
+        db.Index('idx_document_expires', 'expires_at'),
+    )
+
+
+class QuestionSearchNgram(db.Model):
+    """题目关键字搜索倒排表：(n-gram 哈希ID, 题目ID)，按 n-gram 聚集存放，每个 n-gram 的题目ID即倒排列表"""
+    __tablename__ = 'question_search_ngrams'
+    
+    ngram_id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # uint32 按位转为有符号 int32
+    question_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    
+    __table_args__ = (
+        # 题目内容修改后按题目删除旧的倒排记录
+        db.Index('idx_search_question', 'question_id'),
+    )
+
+
+class QuestionSearchDocument(db.Model):
+    """题目关键字搜索索引的已索引题目（内容摘要用于增量更新时判断内容是否变化）"""
+    __tablename__ = 'question_search_documents'
+    
+    question_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    content_digest = db.Column(db.BINARY(16), nullable=False)  # 题目内容的 MD5 原始摘要
+    ngram_count = db.Column(db.Integer, nullable=False, default=0)
+    indexed_at = db.Column(db.DateTime, default=datetime.now)
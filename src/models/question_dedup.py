@@ -5,6 +5,7 @@
 import json
 from datetime import datetime
 from src.models import db
+from src.utils.feature_codec import encode_uint32, decode_uint32, ngram_ids_from_ngrams
 
 
 class DedupTask(db.Model):
@@ -30,10 +31,17 @@ class DedupTask(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.now, comment='创建时间')
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, comment='更新时间')
     
-    # 关系
-    duplicate_pairs = db.relationship('QuestionDuplicatePair', backref='task', lazy='dynamic', cascade='all, delete-orphan')
-    duplicate_groups = db.relationship('QuestionDuplicateGroup', backref='task', lazy='dynamic', cascade='all, delete-orphan')
-    features = db.relationship('QuestionDedupFeature', backref='task', lazy='dynamic', cascade='all, delete-orphan')
+    # 关系（passive_deletes：删除任务时不把关联记录逐条加载到会话中，由外键 ON DELETE CASCADE
+    # 或 QuestionDedupService.delete_task 的按 task_id 批量删除完成）
+    duplicate_pairs = db.relationship('QuestionDuplicatePair', backref='task', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
+    duplicate_groups = db.relationship('QuestionDuplicateGroup', backref='task', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
+    duplicate_clusters = db.relationship('QuestionDuplicateCluster', backref='task', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
+    duplicate_summaries = db.relationship('QuestionDuplicateSummary', backref='task', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
+    features = db.relationship('QuestionDedupFeature', backref='task', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
+    band_index = db.relationship('QuestionDedupBandIndex', backref='task', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
+    checkpoints = db.relationship('DedupTaskCheckpoint', backref='task', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
+    statistics = db.relationship('DedupTaskStatistic', backref='task', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
+    job = db.relationship('DedupTaskJob', backref='task', uselist=False, cascade='all, delete-orphan', passive_deletes=True)
     
     def to_dict(self):
         """转换为字典"""
@@ -89,6 +97,9 @@ class QuestionDuplicatePair(db.Model):
         db.Index('idx_similarity', 'similarity'),
         db.Index('idx_type', 'duplicate_type'),
         db.Index('idx_group', 'group_type', 'group_subject_id', 'group_channel_code'),
+        # 相似对列表按 (similarity, id) 游标分页
+        db.Index('idx_task_dup_similarity', 'task_id', 'duplicate_type', 'similarity', 'id'),
+        db.Index('idx_task_dup_type_similarity', 'task_id', 'duplicate_type', 'group_type', 'similarity', 'id'),
     )
     
     def to_dict(self):
@@ -124,11 +135,14 @@ class QuestionDuplicateGroup(db.Model):
     detected_at = db.Column(db.DateTime, default=datetime.now, comment='检测时间')
     
     # 关系
-    items = db.relationship('QuestionDuplicateGroupItem', backref='group', lazy='dynamic', cascade='all, delete-orphan')
+    items = db.relationship('QuestionDuplicateGroupItem', backref='group', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
     
     __table_args__ = (
         db.Index('idx_content_hash', 'content_hash'),
         db.Index('idx_group', 'group_type', 'group_subject_id', 'group_channel_code'),
+        # 完全重复组列表按 (detected_at, id) 游标分页
+        db.Index('idx_task_detected', 'task_id', 'detected_at', 'id'),
+        db.Index('idx_task_type_detected', 'task_id', 'group_type', 'detected_at', 'id'),
     )
     
     def to_dict(self, include_items=True):
@@ -169,6 +183,131 @@ class QuestionDuplicateGroupItem(db.Model):
     )
 
 
+class QuestionDuplicateCluster(db.Model):
+    """重复题目簇表：完全重复组和相似重复对经并查集合并后的连通分量"""
+    __tablename__ = 'question_duplicate_clusters'
+    
+    id = db.Column(db.Integer, primary_key=True, comment='簇ID')
+    task_id = db.Column(db.Integer, db.ForeignKey('dedup_tasks.id', ondelete='CASCADE'), 
+                        nullable=False, comment='任务ID')
+    representative_question_id = db.Column(db.Integer, nullable=False, comment='代表题目ID（簇内相似边最多的题目）')
+    member_count = db.Column(db.Integer, nullable=False, comment='成员题目数')
+    exact_question_count = db.Column(db.Integer, nullable=False, default=0, comment='属于完全重复组的成员数')
+    similar_edge_count = db.Column(db.Integer, nullable=False, default=0, comment='簇内相似重复对数')
+    min_similarity = db.Column(db.Numeric(5, 4), comment='簇内最小相似度')
+    max_similarity = db.Column(db.Numeric(5, 4), comment='簇内最大相似度')
+    avg_similarity = db.Column(db.Numeric(5, 4), comment='簇内平均相似度')
+    group_type = db.Column(db.String(2), comment='题型')
+    group_subject_id = db.Column(db.Integer, comment='科目ID')
+    group_channel_code = db.Column(db.String(20), comment='渠道代码')
+    detected_at = db.Column(db.DateTime, default=datetime.now, comment='检测时间')
+    
+    # 关系
+    members = db.relationship('QuestionDuplicateClusterMember', backref='cluster', lazy='dynamic',
+                              cascade='all, delete-orphan', passive_deletes=True)
+    
+    __table_args__ = (
+        db.UniqueConstraint('task_id', 'representative_question_id', name='uk_task_representative'),
+        db.Index('idx_task_size', 'task_id', 'member_count'),
+        db.Index('idx_group', 'group_type', 'group_subject_id', 'group_channel_code'),
+    )
+    
+    def to_dict(self, include_members=False):
+        """转换为字典"""
+        result = {
+            'id': self.id,
+            'task_id': self.task_id,
+            'representative_question_id': self.representative_question_id,
+            'member_count': self.member_count,
+            'exact_question_count': self.exact_question_count,
+            'similar_edge_count': self.similar_edge_count,
+            'min_similarity': float(self.min_similarity) if self.min_similarity is not None else None,
+            'max_similarity': float(self.max_similarity) if self.max_similarity is not None else None,
+            'avg_similarity': float(self.avg_similarity) if self.avg_similarity is not None else None,
+            'group': {
+                'type': self.group_type,
+                'subject_id': self.group_subject_id,
+                'channel_code': self.group_channel_code
+            },
+            'detected_at': self.detected_at.isoformat() if self.detected_at else None
+        }
+        
+        if include_members:
+            result['members'] = [
+                member.to_dict() for member in self.members.order_by(
+                    QuestionDuplicateClusterMember.degree.desc(),
+                    QuestionDuplicateClusterMember.question_id
+                )
+            ]
+        
+        return result
+
+
+class QuestionDuplicateClusterMember(db.Model):
+    """重复题目簇成员表"""
+    __tablename__ = 'question_duplicate_cluster_members'
+    
+    id = db.Column(db.Integer, primary_key=True, comment='记录ID')
+    cluster_id = db.Column(db.Integer, db.ForeignKey('question_duplicate_clusters.id', ondelete='CASCADE'), 
+                           nullable=False, comment='簇ID')
+    task_id = db.Column(db.Integer, db.ForeignKey('dedup_tasks.id', ondelete='CASCADE'), 
+                        nullable=False, comment='任务ID')
+    question_id = db.Column(db.Integer, nullable=False, comment='题目ID')
+    degree = db.Column(db.Integer, nullable=False, default=0, comment='与该题目相似的簇内题目数')
+    max_similarity = db.Column(db.Numeric(5, 4), comment='与簇内其他题目的最大相似度')
+    is_exact = db.Column(db.Boolean, nullable=False, default=False, comment='是否属于完全重复组')
+    
+    __table_args__ = (
+        db.UniqueConstraint('cluster_id', 'question_id', name='uk_cluster_question'),
+        db.Index('idx_task_question', 'task_id', 'question_id'),
+    )
+    
+    def to_dict(self):
+        """转换为字典"""
+        return {
+            'question_id': self.question_id,
+            'degree': self.degree,
+            'max_similarity': float(self.max_similarity) if self.max_similarity is not None else None,
+            'is_exact': bool(self.is_exact)
+        }
+
+
+class QuestionDuplicateSummary(db.Model):
+    """相似重复题目汇总表：每个任务中每道有相似重复的题目一行，供按题目分组的相似重复列表分页查询"""
+    __tablename__ = 'question_duplicate_summaries'
+    
+    id = db.Column(db.Integer, primary_key=True, comment='记录ID')
+    task_id = db.Column(db.Integer, db.ForeignKey('dedup_tasks.id', ondelete='CASCADE'), 
+                        nullable=False, comment='任务ID')
+    question_id = db.Column(db.Integer, nullable=False, comment='题目ID')
+    duplicate_count = db.Column(db.Integer, nullable=False, comment='相似重复题目数')
+    max_similarity = db.Column(db.Numeric(5, 4), nullable=False, comment='最大相似度')
+    min_similarity = db.Column(db.Numeric(5, 4), nullable=False, comment='最小相似度')
+    group_type = db.Column(db.String(2), comment='题型')
+    group_subject_id = db.Column(db.Integer, comment='科目ID')
+    group_channel_code = db.Column(db.String(20), comment='渠道代码')
+    
+    __table_args__ = (
+        db.UniqueConstraint('task_id', 'question_id', name='uk_task_question'),
+        db.Index('idx_task_similarity', 'task_id', 'max_similarity', 'question_id'),
+        db.Index('idx_task_type_similarity', 'task_id', 'group_type', 'max_similarity', 'question_id'),
+    )
+    
+    def to_dict(self):
+        """转换为字典"""
+        return {
+            'question_id': self.question_id,
+            'duplicate_count': self.duplicate_count,
+            'max_similarity': float(self.max_similarity) if self.max_similarity is not None else 0.0,
+            'min_similarity': float(self.min_similarity) if self.min_similarity is not None else 0.0,
+            'group': {
+                'type': self.group_type,
+                'subject_id': self.group_subject_id,
+                'channel_code': self.group_channel_code
+            }
+        }
+
+
 class QuestionDedupFeature(db.Model):
     """题目去重特征表"""
     __tablename__ = 'question_dedup_features'
@@ -178,9 +317,13 @@ class QuestionDedupFeature(db.Model):
                         nullable=False, comment='任务ID')
     question_id = db.Column(db.Integer, nullable=False, comment='题目ID')
     cleaned_content = db.Column(db.Text, comment='清洗后的题目内容')
-    content_hash = db.Column(db.String(32), comment='内容哈希值（MD5）')
-    ngram_json = db.Column(db.Text, comment='N-gram特征（JSON数组格式）')
-    minhash_json = db.Column(db.Text, comment='MinHash指纹（JSON数组格式）')
+    content_hash = db.Column(db.String(32), comment='内容哈希值（MD5，旧格式，新记录使用 content_digest）')
+    content_digest = db.Column(db.BINARY(16), comment='内容哈希值（MD5原始摘要）')
+    ngram_json = db.Column(db.Text, comment='N-gram特征（JSON数组格式，旧格式）')
+    minhash_json = db.Column(db.Text, comment='MinHash指纹（JSON数组格式，旧格式）')
+    ngram_blob = db.Column(db.LargeBinary(16777215), comment='N-gram哈希ID（升序小端uint32数组）')
+    minhash_blob = db.Column(db.LargeBinary(65535), comment='MinHash指纹（小端uint32数组）')
+    fingerprint_version = db.Column(db.String(20), comment='指纹格式版本（为空表示旧版进程相关哈希，不可复用）')
     group_type = db.Column(db.String(2), comment='题型')
     group_subject_id = db.Column(db.Integer, comment='科目ID')
     group_channel_code = db.Column(db.String(20), comment='渠道代码')
@@ -190,35 +333,49 @@ class QuestionDedupFeature(db.Model):
         db.UniqueConstraint('task_id', 'question_id', name='uk_task_question'),
         db.Index('idx_content_hash', 'content_hash'),
         db.Index('idx_group', 'group_type', 'group_subject_id', 'group_channel_code'),
+        db.Index('idx_group_version', 'group_type', 'group_subject_id', 'group_channel_code',
+                 'fingerprint_version'),
     )
     
     def set_ngrams(self, ngrams):
-        """设置N-gram特征（列表转JSON）"""
-        if ngrams:
-            if isinstance(ngrams, set):
-                ngrams = list(ngrams)
-            self.ngram_json = json.dumps(ngrams, ensure_ascii=False)
-        else:
-            self.ngram_json = None
+        """设置N-gram特征（n-gram 字符串集合转为哈希ID保存）"""
+        self.set_ngram_ids(ngram_ids_from_ngrams(ngrams) if ngrams else None)
+    
+    def set_ngram_ids(self, ngram_ids):
+        """设置N-gram哈希ID（升序 uint32 数组，见 feature_codec.ngram_ids）"""
+        self.ngram_blob = encode_uint32(ngram_ids)
+    
+    def get_ngram_ids(self):
+        """获取N-gram哈希ID（NumPy 只读数组，直接引用 BLOB 数据不复制）"""
+        return decode_uint32(self.ngram_blob)
     
     def get_ngrams(self):
-        """获取N-gram特征（JSON转列表）"""
+        """获取N-gram特征（旧格式 JSON 转列表；二进制格式不保存 n-gram 原文，返回空列表）"""
         if self.ngram_json:
             return json.loads(self.ngram_json)
         return []
     
     def set_minhash(self, minhash):
-        """设置MinHash指纹（列表转JSON）"""
-        if minhash:
-            self.minhash_json = json.dumps(minhash, ensure_ascii=False)
-        else:
-            self.minhash_json = None
+        """设置MinHash指纹（uint32 数组或整数列表）"""
+        self.minhash_blob = encode_uint32(minhash)
     
-    def get_minhash(self):
-        """获取MinHash指纹（JSON转列表）"""
+    def get_minhash_array(self):
+        """获取MinHash指纹（NumPy 只读数组，直接引用 BLOB 数据不复制；旧记录从 JSON 解析）"""
+        if self.minhash_blob:
+            return decode_uint32(self.minhash_blob)
         if self.minhash_json:
-            return json.loads(self.minhash_json)
-        return []
+            return decode_uint32(encode_uint32(json.loads(self.minhash_json)))
+        return decode_uint32(None)
+    
+    def get_minhash(self):
+        """获取MinHash指纹（列表）"""
+        return self.get_minhash_array().tolist()
+    
+    def get_content_hash(self):
+        """获取内容哈希值（十六进制字符串）"""
+        if self.content_digest:
+            return self.content_digest.hex()
+        return self.content_hash
     
     def to_dict(self):
         """转换为字典"""
@@ -227,9 +384,11 @@ class QuestionDedupFeature(db.Model):
             'task_id': self.task_id,
             'question_id': self.question_id,
             'cleaned_content': self.cleaned_content,
-            'content_hash': self.content_hash,
+            'content_hash': self.get_content_hash(),
             'ngrams': self.get_ngrams(),
+            'ngram_count': len(self.get_ngram_ids()) or len(self.get_ngrams()),
             'minhash': self.get_minhash(),
+            'fingerprint_version': self.fingerprint_version,
             'group': {
                 'type': self.group_type,
                 'subject_id': self.group_subject_id,
@@ -238,3 +397,175 @@ class QuestionDedupFeature(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+
+
+class QuestionDedupBandIndex(db.Model):
+    """LSH band 索引表：(band_idx, band_hash) → question_id，用于跨任务按索引查找候选重复题"""
+    __tablename__ = 'question_dedup_band_index'
+    
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True, comment='记录ID')
+    task_id = db.Column(db.Integer, db.ForeignKey('dedup_tasks.id', ondelete='CASCADE'), 
+                        nullable=False, comment='任务ID')
+    question_id = db.Column(db.Integer, nullable=False, comment='题目ID')
+    band_idx = db.Column(db.SmallInteger, nullable=False, comment='band序号')
+    band_hash = db.Column(db.BigInteger, nullable=False, comment='band哈希值（uint64按位转为有符号int64存储）')
+    fingerprint_version = db.Column(db.String(20), nullable=False, comment='指纹格式版本')
+    group_type = db.Column(db.String(2), comment='题型')
+    group_subject_id = db.Column(db.Integer, comment='科目ID')
+    group_channel_code = db.Column(db.String(20), comment='渠道代码')
+    
+    __table_args__ = (
+        db.UniqueConstraint('task_id', 'question_id', 'band_idx', name='uk_task_question_band'),
+        db.Index('idx_band_hash', 'band_hash', 'band_idx'),
+        db.Index('idx_band_group', 'group_type', 'group_subject_id', 'group_channel_code',
+                 'fingerprint_version', 'task_id'),
+    )
+    
+    def to_dict(self):
+        """转换为字典"""
+        return {
+            'id': self.id,
+            'task_id': self.task_id,
+            'question_id': self.question_id,
+            'band_idx': self.band_idx,
+            'band_hash': self.band_hash,
+            'fingerprint_version': self.fingerprint_version,
+            'group': {
+                'type': self.group_type,
+                'subject_id': self.group_subject_id,
+                'channel_code': self.group_channel_code
+            }
+        }
+
+
+class DedupTaskCheckpoint(db.Model):
+    """去重任务检查点表：每个分组一行，记录分组序号、处理状态和统计数，用于断点续传"""
+    __tablename__ = 'dedup_task_checkpoints'
+    
+    id = db.Column(db.Integer, primary_key=True, comment='记录ID')
+    task_id = db.Column(db.Integer, db.ForeignKey('dedup_tasks.id', ondelete='CASCADE'), 
+                        nullable=False, comment='任务ID')
+    group_index = db.Column(db.Integer, nullable=False, comment='分组序号')
+    group_type = db.Column(db.String(2), comment='题型')
+    group_subject_id = db.Column(db.Integer, comment='科目ID')
+    group_channel_code = db.Column(db.String(20), comment='渠道代码')
+    group_json = db.Column(db.Text, comment='分组信息（JSON格式，含名称和题目数）')
+    status = db.Column(db.Enum('pending', 'completed'), nullable=False, default='pending', comment='分组状态')
+    question_count = db.Column(db.Integer, default=0, comment='处理题目数')
+    exact_duplicate_groups = db.Column(db.Integer, default=0, comment='完全重复组数')
+    exact_duplicate_pairs = db.Column(db.Integer, default=0, comment='完全重复对数')
+    similar_duplicate_pairs = db.Column(db.Integer, default=0, comment='相似重复对数')
+    worker_id = db.Column(db.String(100), comment='租用分组的执行器ID')
+    lease_expires_at = db.Column(db.DateTime, comment='租约到期时间（到期后其他执行器可以重新租用）')
+    heartbeat_at = db.Column(db.DateTime, comment='最近一次续租时间')
+    attempts = db.Column(db.Integer, nullable=False, default=0, comment='租用次数')
+    completed_at = db.Column(db.DateTime, comment='完成时间')
+    
+    __table_args__ = (
+        db.UniqueConstraint('task_id', 'group_index', name='uk_task_group_index'),
+        db.Index('idx_task_status_index', 'task_id', 'status', 'group_index'),
+    )
+    
+    def get_group(self):
+        """获取分组信息（JSON转字典）"""
+        return json.loads(self.group_json) if self.group_json else None
+    
+    def to_dict(self):
+        """转换为字典"""
+        return {
+            'id': self.id,
+            'task_id': self.task_id,
+            'group_index': self.group_index,
+            'group': self.get_group(),
+            'status': self.status,
+            'question_count': self.question_count,
+            'exact_duplicate_groups': self.exact_duplicate_groups,
+            'exact_duplicate_pairs': self.exact_duplicate_pairs,
+            'similar_duplicate_pairs': self.similar_duplicate_pairs,
+            'worker_id': self.worker_id,
+            'lease_expires_at': self.lease_expires_at.isoformat() if self.lease_expires_at else None,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            'attempts': self.attempts,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
+
+
+class DedupTaskStatistic(db.Model):
+    """去重任务分维度统计表：每个任务每个 (题型, 科目, 渠道) 一行，分组结果保存时累加，任务执行期间实时可读"""
+    __tablename__ = 'dedup_task_statistics'
+    
+    id = db.Column(db.Integer, primary_key=True, comment='记录ID')
+    task_id = db.Column(db.Integer, db.ForeignKey('dedup_tasks.id', ondelete='CASCADE'), 
+                        nullable=False, comment='任务ID')
+    group_type = db.Column(db.String(2), comment='题型')
+    group_subject_id = db.Column(db.Integer, comment='科目ID')
+    group_channel_code = db.Column(db.String(20), comment='渠道代码')
+    processed_groups = db.Column(db.Integer, nullable=False, default=0, comment='已处理分组数')
+    question_count = db.Column(db.Integer, nullable=False, default=0, comment='处理题目数')
+    exact_duplicate_groups = db.Column(db.Integer, nullable=False, default=0, comment='完全重复组数')
+    exact_duplicate_questions = db.Column(db.Integer, nullable=False, default=0, comment='完全重复组内题目数')
+    exact_duplicate_pairs = db.Column(db.Integer, nullable=False, default=0, comment='完全重复对数')
+    similar_duplicate_pairs = db.Column(db.Integer, nullable=False, default=0, comment='相似重复对数')
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, comment='更新时间')
+    
+    __table_args__ = (
+        db.UniqueConstraint('task_id', 'group_type', 'group_subject_id', 'group_channel_code',
+                            name='uk_task_dimension'),
+    )
+    
+    def to_dict(self):
+        """转换为字典"""
+        return {
+            'group': {
+                'type': self.group_type,
+                'subject_id': self.group_subject_id,
+                'channel_code': self.group_channel_code
+            },
+            'processed_groups': self.processed_groups,
+            'question_count': self.question_count,
+            'exact_duplicate_groups': self.exact_duplicate_groups,
+            'exact_duplicate_questions': self.exact_duplicate_questions,
+            'exact_duplicate_pairs': self.exact_duplicate_pairs,
+            'similar_duplicate_pairs': self.similar_duplicate_pairs,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class DedupTaskJob(db.Model):
+    """去重任务执行队列表：启动/恢复任务时入队，由 Web 进程内置的执行器或独立 worker 进程认领执行"""
+    __tablename__ = 'dedup_task_jobs'
+    
+    id = db.Column(db.Integer, primary_key=True, comment='记录ID')
+    task_id = db.Column(db.Integer, db.ForeignKey('dedup_tasks.id', ondelete='CASCADE'), 
+                        nullable=False, unique=True, comment='任务ID')
+    status = db.Column(db.Enum('queued', 'claimed', 'finished'), nullable=False, default='queued', comment='队列状态')
+    priority = db.Column(db.Integer, nullable=False, default=0, comment='优先级（数值越大越先认领）')
+    worker_id = db.Column(db.String(100), comment='认领的执行器ID')
+    attempts = db.Column(db.Integer, nullable=False, default=0, comment='认领次数')
+    enqueued_at = db.Column(db.DateTime, default=datetime.now, comment='入队时间')
+    claimed_at = db.Column(db.DateTime, comment='认领时间')
+    finished_at = db.Column(db.DateTime, comment='执行结束时间')
+    lease_expires_at = db.Column(db.DateTime, comment='认领租约到期时间（执行器每次轮询续租，到期后任意执行器可重新排队）')
+    heartbeat_at = db.Column(db.DateTime, comment='执行器最近一次续租时间')
+    
+    __table_args__ = (
+        db.Index('idx_status_priority', 'status', 'priority', 'id'),
+        db.Index('idx_worker_status', 'worker_id', 'status'),
+        db.Index('idx_status_lease', 'status', 'lease_expires_at'),
+    )
+    
+    def to_dict(self):
+        """转换为字典"""
+        return {
+            'id': self.id,
+            'task_id': self.task_id,
+            'status': self.status,
+            'priority': self.priority,
+            'worker_id': self.worker_id,
+            'attempts': self.attempts,
+            'enqueued_at': self.enqueued_at.isoformat() if self.enqueued_at else None,
+            'claimed_at': self.claimed_at.isoformat() if self.claimed_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'lease_expires_at': self.lease_expires_at.isoformat() if self.lease_expires_at else None,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None
+        }
@@ -3,6 +3,9 @@
 """
 from flask import request, jsonify
 from src.services.question_service import QuestionService
+from src.services.dimension_cache import DimensionCache
+from src.services.question_cache import QuestionCache
+from src.services.question_search_index import QuestionSearchIndex
 
 
 def register_question_routes(app):
@@ -23,6 +26,8 @@ def register_question_routes(app):
             keyword (str, 可选): 关键字，用于搜索题目内容
             page (int, 可选): 页码，默认 1
             page_size (int, 可选): 每页数量，默认 20，最大 100
+            cursor (str, 可选): 游标，传入时按游标分页（第一页传空字符串，之后传上一页返回的 next_cursor），忽略 page
+            with_total (bool, 可选): 游标分页时是否统计总数，默认 false
             include_answer (bool, 可选): 是否包含答案，默认 true
             include_analysis (bool, 可选): 是否包含解析，默认 true
         """
@@ -38,6 +43,8 @@ def register_question_routes(app):
             keyword = request.args.get('keyword', '').strip() or request.args.get('search', '').strip() or None
             page = request.args.get('page', type=int, default=1)
             page_size = request.args.get('page_size', type=int, default=20)
+            cursor = request.args.get('cursor')
+            with_total = request.args.get('with_total', 'false').strip().lower() in ('true', '1', 'yes', 'on')
             
             # 布尔参数处理
             include_answer_str = request.args.get('include_answer', 'true').strip().lower()
@@ -70,7 +77,9 @@ def register_question_routes(app):
                 page=page,
                 page_size=page_size,
                 include_answer=include_answer,
-                include_analysis=include_analysis
+                include_analysis=include_analysis,
+                cursor=cursor,
+                with_total=with_total
             )
             
             return jsonify({
@@ -265,4 +274,181 @@ def register_question_routes(app):
                 'message': f'服务器内部错误: {str(e)}',
                 'error_code': 'INTERNAL_ERROR'
             }), 500
-
+    
+    @app.route('/api/questions/dimensions', methods=['GET'])
+    def get_question_dimensions():
+        """
+        获取题目维度（科目、渠道、题型），从进程内维度缓存读取，不查询题目表
+        """
+        try:
+            subjects = [
+                {'subject_id': subject_id, 'subject_name': subject_name}
+                for subject_id, subject_name in sorted(DimensionCache.subject_names().items())
+            ]
+            
+            return jsonify({
+                'success': True,
+                'message': '获取成功',
+                'data': {
+                    'subjects': subjects,
+                    'channels': DimensionCache.channels(),
+                    'types': [
+                        {'type': q_type, 'type_name': QuestionService.TYPE_NAMES.get(q_type, '未知题型')}
+                        for q_type in QuestionService.SUPPORTED_TYPES
+                    ],
+                    'cache': DimensionCache.get_status()
+                }
+            }), 200
+        
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                'success': False,
+                'message': f'服务器内部错误: {str(e)}',
+                'error_code': 'INTERNAL_ERROR'
+            }), 500
+    
+    @app.route('/api/questions/cache/stats', methods=['GET'])
+    def get_question_cache_stats():
+        """
+        获取题目文档缓存状态（命中率、条数、占用）
+        """
+        try:
+            return jsonify({
+                'success': True,
+                'message': '获取成功',
+                'data': QuestionCache.get_stats()
+            }), 200
+        
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                'success': False,
+                'message': f'服务器内部错误: {str(e)}',
+                'error_code': 'INTERNAL_ERROR'
+            }), 500
+    
+    @app.route('/api/questions/cache/invalidate', methods=['POST'])
+    def invalidate_question_cache():
+        """
+        使题目文档缓存失效（题库同步修改题目、答案或选项后调用）
+        
+        请求体:
+            question_ids (array[int], 可选): 题目 ID 数组，不传时清空全部缓存
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            question_ids = data.get('question_ids')
+            
+            if question_ids is not None:
+                if not isinstance(question_ids, list):
+                    return jsonify({
+                        'success': False,
+                        'message': '题目ID列表必须是数组',
+                        'error_code': 'INVALID_PARAMETER'
+                    }), 400
+                try:
+                    question_ids = [int(qid) for qid in question_ids]
+                except (ValueError, TypeError):
+                    return jsonify({
+                        'success': False,
+                        'message': '题目ID必须是整数',
+                        'error_code': 'INVALID_PARAMETER'
+                    }), 400
+            
+            removed = QuestionCache.invalidate(question_ids)
+            
+            return jsonify({
+                'success': True,
+                'message': '缓存已失效',
+                'data': {
+                    'removed': removed
+                }
+            }), 200
+        
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                'success': False,
+                'message': f'服务器内部错误: {str(e)}',
+                'error_code': 'INTERNAL_ERROR'
+            }), 500
+    
+    @app.route('/api/questions/search-index/status', methods=['GET'])
+    def get_question_search_index_status():
+        """
+        获取题目关键字搜索索引状态
+        """
+        try:
+            return jsonify({
+                'success': True,
+                'message': '获取成功',
+                'data': QuestionSearchIndex.get_status()
+            }), 200
+        
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                'success': False,
+                'message': f'服务器内部错误: {str(e)}',
+                'error_code': 'INTERNAL_ERROR'
+            }), 500
+    
+    @app.route('/api/questions/search-index/sync', methods=['POST'])
+    def sync_question_search_index():
+        """
+        同步题目关键字搜索索引（题库同步修改题目内容后调用）
+        
+        请求体:
+            question_ids (array[int], 可选): 题目 ID 数组，立即重建这些题目的索引；
+                不传时在后台增量同步全部题目（只重建内容变化的题目）
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            question_ids = data.get('question_ids')
+            
+            if question_ids is None:
+                started = QuestionSearchIndex.sync_async(app)
+                return jsonify({
+                    'success': True,
+                    'message': '已开始同步' if started else '同步正在进行中',
+                    'data': {
+                        'started': started
+                    }
+                }), 200
+            
+            if not isinstance(question_ids, list):
+                return jsonify({
+                    'success': False,
+                    'message': '题目ID列表必须是数组',
+                    'error_code': 'INVALID_PARAMETER'
+                }), 400
+            try:
+                question_ids = [int(qid) for qid in question_ids]
+            except (ValueError, TypeError):
+                return jsonify({
+                    'success': False,
+                    'message': '题目ID必须是整数',
+                    'error_code': 'INVALID_PARAMETER'
+                }), 400
+            
+            result = QuestionSearchIndex.index_questions(question_ids)
+            
+            return jsonify({
+                'success': True,
+                'message': '同步成功',
+                'data': result
+            }), 200
+        
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                'success': False,
+                'message': f'服务器内部错误: {str(e)}',
+                'error_code': 'INTERNAL_ERROR'
+            }), 500
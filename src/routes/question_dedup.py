@@ -2,365 +2,27 @@
 题目去重相关路由
 提供任务管理、重复题目查询等API接口
 """
-from flask import request, jsonify
-from sqlalchemy import func, desc, and_
+from flask import request, jsonify, Response, stream_with_context
+from sqlalchemy import desc, and_, or_
 from typing import Dict, Any, Optional
 from datetime import datetime
-import threading
 from src.models import db
-from src.models.question import Question
 from src.models.question_dedup import (
     DedupTask, QuestionDuplicatePair, QuestionDuplicateGroup,
-    QuestionDuplicateGroupItem, QuestionDedupFeature
+    QuestionDuplicateGroupItem, QuestionDedupFeature,
+    QuestionDuplicateCluster, QuestionDuplicateClusterMember, QuestionDuplicateSummary,
+    DedupTaskStatistic
 )
 from src.services.question_service import QuestionService
 from src.services.question_dedup_service import QuestionDedupService
 from src.services.question_aggregation_service import QuestionAggregationService
-
-# 任务线程管理器：跟踪运行中的任务线程
-_task_threads = {}
-_task_threads_lock = threading.Lock()
-
-
-def _execute_dedup_task(task_id: int):
-    """
-    在后台线程中执行去重任务
-
-    Args:
-        task_id: 任务ID
-    """
-    from src.app import app as flask_app
-    from src.services.question_dedup_service import QuestionDedupService
-
-    with flask_app.app_context():
-        try:
-            task = DedupTask.query.get(task_id)
-            if not task:
-                print(f"任务 {task_id} 不存在")
-                return
-
-            # 获取任务配置
-            config = task.get_config()
-            similarity_threshold = config.get('similarity_threshold', 0.8)
-
-            # 检查是否已有进度（支持断点续传）
-            existing_progress = QuestionDedupService.get_progress()
-            is_resume = (existing_progress.get('task_id') == task_id and 
-                        existing_progress.get('total_groups', 0) > 0 and
-                        existing_progress.get('processed_groups', 0) < existing_progress.get('total_groups', 0))
-            
-            if is_resume:
-                # 恢复执行：使用现有进度
-                print(f"恢复执行任务 {task_id}，从第 {existing_progress.get('processed_groups', 0) + 1} 个分组继续")
-                groups = existing_progress.get('groups', [])
-                if not groups:
-                    # 如果进度中没有分组信息，重新获取
-                    groups = QuestionService.get_question_groups()
-                    existing_progress['groups'] = groups
-                    existing_progress['total_groups'] = len(groups)
-                    QuestionDedupService.save_progress(existing_progress)
-            else:
-                # 首次执行：初始化进度
-                print(f"首次执行任务 {task_id}，初始化进度...")
-                groups = QuestionService.get_question_groups()
-                
-                # 初始化进度（关联到现有的task_id）
-                progress = {
-                    'task_id': task_id,
-                    'current_group_index': 0,
-                    'total_groups': len(groups),
-                    'processed_groups': 0,
-                    'current_group': None,
-                    'status': 'running',
-                    'last_update': datetime.now().isoformat(),
-                    'groups': groups
-                }
-                QuestionDedupService.save_progress(progress)
-                
-                # 更新任务状态（仅在首次执行时设置）
-                if not task.started_at:
-                    task.started_at = datetime.now()
-                task.total_groups = len(groups)
-                task.total_questions = sum(group['count'] for group in groups)
-                db.session.commit()
-            
-            # 更新任务状态为运行中（恢复时也需要更新）
-            task.status = 'running'
-            db.session.commit()
-            
-            print(f"开始处理任务 {task_id}，共 {len(groups)} 个分组，已处理 {task.processed_groups} 个")
-            
-            # 循环处理所有分组
-            while True:
-                # 检查任务状态（支持暂停功能）
-                # 使用 expire_all() 确保获取最新状态
-                db.session.expire_all()
-                task = DedupTask.query.get(task_id)
-                if not task:
-                    print(f"任务 {task_id} 不存在，停止执行")
-                    break
-                
-                # 如果任务被暂停，等待恢复
-                if task.status == 'paused':
-                    print(f"任务 {task_id} 已暂停，等待恢复...")
-
-                    # 🔧 修复：同时更新进度文件状态为 'paused'
-                    from src.services.question_dedup_service import QuestionDedupService
-                    progress = QuestionDedupService.get_progress()
-                    if progress.get('task_id') == task_id:
-                        progress['status'] = 'paused'
-                        QuestionDedupService.save_progress(progress)
-
-                    # 发送暂停状态到WebSocket
-                    from src.routes.websocket import emit_task_progress
-                    progress_percentage = 0.0
-                    if task.total_groups > 0:
-                        progress_percentage = round(
-                            (task.processed_groups / task.total_groups) * 100, 2
-                        )
-                    emit_task_progress(task_id, {
-                        'status': 'paused',
-                        'processed_groups': task.processed_groups,
-                        'total_groups': task.total_groups,
-                        'progress_percentage': progress_percentage,
-                        'message': '任务已暂停'
-                    })
-                    
-                    # 轮询检查状态，直到恢复或取消
-                    import time
-                    resumed = False
-                    should_exit = False
-                    while True:
-                        time.sleep(0.5)  # 每0.5秒检查一次，提高响应速度
-                        # 重新获取任务对象以确保状态最新
-                        # 清除所有对象的缓存，强制重新加载
-                        db.session.expire_all()
-                        # 重新查询任务，确保获取最新状态（使用新的查询上下文）
-                        task = db.session.query(DedupTask).filter_by(id=task_id).first()
-                        if not task:
-                            print(f"任务 {task_id} 不存在，停止执行")
-                            should_exit = True
-                            break
-                        
-                        # 检查状态变化
-                        if task.status != 'paused':
-                            if task.status == 'running':
-                                print(f"任务 {task_id} 已恢复运行，继续处理...")
-
-                                # 🔧 修复：同时更新进度文件状态为 'running'
-                                progress = QuestionDedupService.get_progress()
-                                if progress.get('task_id') == task_id:
-                                    progress['status'] = 'running'
-                                    QuestionDedupService.save_progress(progress)
-
-                                # 发送恢复状态到WebSocket
-                                progress_percentage = 0.0
-                                if task.total_groups > 0:
-                                    progress_percentage = round(
-                                        (task.processed_groups / task.total_groups) * 100, 2
-                                    )
-                                emit_task_progress(task_id, {
-                                    'status': 'running',
-                                    'processed_groups': task.processed_groups,
-                                    'total_groups': task.total_groups,
-                                    'progress_percentage': progress_percentage,
-                                    'message': '任务已恢复运行'
-                                })
-                                # 标记为已恢复，退出等待循环
-                                resumed = True
-                                break
-                            elif task.status in ['cancelled', 'completed', 'error']:
-                                print(f"任务 {task_id} 状态变为 {task.status}，停止执行")
-                                # 标记需要退出主循环
-                                should_exit = True
-                                break
-                    
-                    # 如果任务不存在或被取消/完成，退出主循环
-                    if should_exit or not task:
-                        if not task:
-                            print(f"任务 {task_id} 不存在，停止执行")
-                        break
-                    
-                    if task and task.status in ['cancelled', 'completed', 'error']:
-                        print(f"任务 {task_id} 状态为 {task.status}，停止执行")
-                        break
-                    
-                    # 如果恢复运行，继续执行主循环（处理分组）
-                    if resumed and task and task.status == 'running':
-                        print(f"任务 {task_id} 已从暂停状态恢复，继续处理分组...")
-                        # 重新获取任务对象以确保状态最新
-                        db.session.expire_all()
-                        task = DedupTask.query.get(task_id)
-                        # 继续执行，不要 break，让循环继续处理分组
-                        # 这里会继续到下面的代码，获取下一个分组并处理
-                    elif not resumed:
-                        # 如果等待循环因为其他原因退出（如任务被取消），退出主循环
-                        print(f"任务 {task_id} 等待循环退出，但未恢复运行，停止执行")
-                        break
-                
-                # 如果任务被取消或完成，退出循环
-                if task and task.status in ['cancelled', 'completed', 'error']:
-                    print(f"任务 {task_id} 状态为 {task.status}，停止执行")
-                    break
-                
-                # 如果任务不存在，退出循环
-                if not task:
-                    print(f"任务 {task_id} 不存在，停止执行")
-                    break
-                
-                # 再次检查状态（防止在处理分组期间状态被改变）
-                db.session.expire_all()  # 确保获取最新状态
-                task = DedupTask.query.get(task_id)
-                if not task:
-                    print(f"任务 {task_id} 不存在，停止执行")
-                    break
-                
-                if task.status == 'paused':
-                    # 如果状态在获取分组后变为暂停，跳过处理，回到循环开始
-                    print(f"任务 {task_id} 已暂停，跳过当前分组")
-                    continue
-                
-                if task.status in ['cancelled', 'completed', 'error']:
-                    print(f"任务 {task_id} 状态为 {task.status}，停止执行")
-                    break
-                
-                # 确保状态是 running 才继续处理
-                if task.status != 'running':
-                    print(f"任务 {task_id} 状态为 {task.status}，跳过处理")
-                    continue
-                
-                # 获取下一个分组（传入task_id确保使用正确的进度）
-                print(f"任务 {task_id} 准备获取下一个分组...")
-                group = QuestionDedupService.get_next_group(task_id=task_id)
-                if not group:
-                    print(f"任务 {task_id} 所有分组处理完成")
-                    break
-                
-                print(f"任务 {task_id} 获取到分组: {group.get('type_name', 'N/A')} - {group.get('subject_name', 'N/A')}")
-                
-                # 最后一次检查状态（在开始处理分组之前）
-                task = DedupTask.query.get(task_id)
-                if not task or task.status != 'running':
-                    if task and task.status == 'paused':
-                        print(f"任务 {task_id} 在处理分组前被暂停，跳过当前分组")
-                        continue
-                    elif task and task.status in ['cancelled', 'completed', 'error']:
-                        print(f"任务 {task_id} 状态为 {task.status}，停止执行")
-                        break
-                    else:
-                        print(f"任务 {task_id} 不存在或状态异常，停止执行")
-                        break
-                
-                try:
-                    # 处理该分组（传入 task_id 用于状态检查）
-                    results = QuestionDedupService.process_single_group(group, task_id=task_id)
-                    
-                    # 标记完成（会自动保存到数据库）
-                    QuestionDedupService.mark_group_completed(results)
-                    
-                    # 发送进度更新到WebSocket
-                    from src.routes.websocket import emit_task_progress
-                    progress = QuestionDedupService.get_progress()
-                    task = DedupTask.query.get(task_id)
-                    
-                    if task:
-                        progress_percentage = 0.0
-                        if task.total_groups > 0:
-                            progress_percentage = round(
-                                (task.processed_groups / task.total_groups) * 100, 2
-                            )
-                        
-                        emit_task_progress(task_id, {
-                            'status': task.status,
-                            'processed_groups': task.processed_groups,
-                            'total_groups': task.total_groups,
-                            'progress_percentage': progress_percentage,
-                            'current_group': {
-                                'type_name': group['type_name'],
-                                'subject_name': group['subject_name'],
-                                'channel_code': group['channel_code']
-                            },
-                            'message': f"已完成分组: {group['type_name']} - {group['subject_name']}"
-                        })
-                    
-                    print(f"分组处理完成: {group['type_name']} - {group['subject_name']} ({group['channel_code']})")
-                    
-                except RuntimeError as e:
-                    # 处理暂停或取消的情况
-                    error_msg = str(e)
-                    if '已暂停' in error_msg:
-                        print(f"任务 {task_id} 在处理分组时被暂停")
-                        # 不更新任务状态，保持 paused 状态
-                        # 任务会在下次循环时进入暂停等待逻辑
-                        continue
-                    elif '状态为' in error_msg:
-                        print(f"任务 {task_id} 在处理分组时状态改变: {error_msg}")
-                        # 任务状态已被改变，退出循环
-                        break
-                    else:
-                        # 其他运行时错误，当作普通异常处理
-                        raise
-                except Exception as e:
-                    print(f"处理分组失败: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-                    
-                    # 更新任务状态为错误
-                    task = DedupTask.query.get(task_id)
-                    if task:
-                        task.status = 'error'
-                        task.error_message = str(e)
-                        db.session.commit()
-                        
-                        # 发送错误通知到WebSocket
-                        from src.routes.websocket import emit_task_error
-                        emit_task_error(task_id, str(e))
-                    break
-            
-            # 检查是否完成
-            progress = QuestionDedupService.get_progress()
-            if progress.get('status') == 'completed':
-                task = DedupTask.query.get(task_id)
-                if task:
-                    task.status = 'completed'
-                    task.completed_at = datetime.now()
-                    db.session.commit()
-                    
-                    # 发送任务完成通知到WebSocket
-                    from src.routes.websocket import emit_task_completed
-                    task_dict = task.to_dict()
-                    task_dict['progress_percentage'] = 100.0
-                    emit_task_completed(task_id, task_dict)
-                    
-                    print(f"任务 {task_id} 完成")
-            
-        except Exception as e:
-            print(f"执行任务 {task_id} 失败: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            
-            # 更新任务状态为错误
-            try:
-                task = DedupTask.query.get(task_id)
-                if task:
-                    task.status = 'error'
-                    task.error_message = str(e)
-                    db.session.commit()
-                    
-                    # 发送错误通知到WebSocket
-                    from src.routes.websocket import emit_task_error
-                    emit_task_error(task_id, str(e))
-            except:
-                pass
-            finally:
-                # 从线程管理器中移除
-                with _task_threads_lock:
-                    _task_threads.pop(task_id, None)
-        finally:
-            # 确保任务完成后从线程管理器中移除
-            with _task_threads_lock:
-                _task_threads.pop(task_id, None)
-                pass
+from src.services.dedup_task_control import DedupTaskControl
+from src.services.dedup_scheduler import DedupTaskScheduler, resolve_priority
+from src.services.dedup_job_queue import DedupJobQueue
+from src.services.dedup_job_worker import DedupJobWorker
+from src.services.dimension_cache import DimensionCache
+from src.services.dedup_export_service import DedupExportService
+from src.utils.cursor_pagination import paginate
 
 
 def register_question_dedup_routes(app):
@@ -448,7 +110,9 @@ def register_question_dedup_routes(app):
         
         请求体:
             task_name (str, 可选): 任务名称
-            config (dict, 可选): 任务配置，如 {"similarity_threshold": 0.8}
+            config (dict, 可选): 任务配置，如 {"similarity_threshold": 0.8, "max_workers": 8, "priority": 0}
+                max_workers 为并行处理分组的进程数，默认1（在任务线程中串行处理）
+                priority 为调度优先级，数值越大越优先获得处理名额，默认0
             analysis_type (str, 可选): 分析类型，full=全量分析, incremental=增量分析, custom=自定义分析，默认full
         """
         try:
@@ -575,7 +239,7 @@ def register_question_dedup_routes(app):
                     'error_code': 'NOT_FOUND'
                 }), 404
             
-            db.session.delete(task)
+            QuestionDedupService.delete_task(task)
             db.session.commit()
             
             return jsonify({
@@ -597,7 +261,7 @@ def register_question_dedup_routes(app):
     def start_dedup_task(task_id):
         """
         启动任务（后台异步执行）
-        会在后台线程中执行去重分析
+        任务加入执行队列，由执行器认领后执行去重分析
         """
         try:
             task = DedupTask.query.get(task_id)
@@ -630,21 +294,23 @@ def register_question_dedup_routes(app):
                     'error_code': 'INVALID_STATUS'
                 }), 400
             
-            # 在后台线程中执行任务
-            thread = threading.Thread(
-                target=_execute_dedup_task,
-                args=(task_id,),
-                daemon=True
-            )
-            thread.start()
+            if DedupJobQueue.is_active(task_id):
+                return jsonify({
+                    'success': False,
+                    'message': '任务已在执行队列中',
+                    'error_code': 'INVALID_STATUS'
+                }), 400
             
-            # 保存线程到管理器
-            with _task_threads_lock:
-                _task_threads[task_id] = thread
+            # 加入执行队列，由执行器（内置执行器或独立 worker 进程）认领后执行
+            task.status = 'pending'
+            task.error_message = None
+            db.session.commit()
+            DedupJobQueue.enqueue(task_id, resolve_priority(task.get_config()))
+            DedupJobWorker.notify()
             
             return jsonify({
                 'success': True,
-                'message': '任务已启动，正在后台执行',
+                'message': '任务已加入执行队列',
                 'data': task.to_dict()
             }), 200
         
@@ -681,9 +347,10 @@ def register_question_dedup_routes(app):
                     'error_code': 'INVALID_STATUS'
                 }), 400
             
-            # 更新任务状态为暂停
+            # 更新任务状态为暂停，并通知执行线程（下一个检查点立即退出当前分组）
             task.status = 'paused'
             db.session.commit()
+            DedupTaskControl.pause(task_id)
             
             # 发送暂停通知到WebSocket
             from src.routes.websocket import emit_task_progress
@@ -719,6 +386,79 @@ def register_question_dedup_routes(app):
                 'error_code': 'INTERNAL_ERROR'
             }), 500
     
+    @app.route('/api/dedup/tasks/<int:task_id>/priority', methods=['PUT'])
+    def update_dedup_task_priority(task_id):
+        """
+        调整任务优先级（数值越大越先被执行器认领、越优先获得调度器名额）
+        在当前进程中执行的任务立即生效
+        
+        请求体:
+            priority (int): 优先级
+        """
+        try:
+            task = DedupTask.query.get(task_id)
+            
+            if not task:
+                return jsonify({
+                    'success': False,
+                    'message': '任务不存在',
+                    'error_code': 'NOT_FOUND'
+                }), 404
+            
+            data = request.get_json() or {}
+            try:
+                priority = int(data.get('priority'))
+            except (TypeError, ValueError):
+                return jsonify({
+                    'success': False,
+                    'message': '优先级必须是整数',
+                    'error_code': 'INVALID_PARAMETER'
+                }), 400
+            
+            config = task.get_config()
+            config['priority'] = priority
+            task.set_config(config)
+            db.session.commit()
+            DedupJobQueue.set_priority(task_id, priority)
+            DedupTaskScheduler.set_priority(task_id, priority)
+            
+            return jsonify({
+                'success': True,
+                'message': '任务优先级已更新',
+                'data': task.to_dict()
+            }), 200
+        
+        except Exception as e:
+            db.session.rollback()
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                'success': False,
+                'message': f'更新任务优先级失败: {str(e)}',
+                'error_code': 'INTERNAL_ERROR'
+            }), 500
+    
+    @app.route('/api/dedup/scheduler', methods=['GET'])
+    def get_dedup_scheduler_status():
+        """
+        获取任务调度器状态
+        返回全局并发上限、已占用名额，以及执行中任务的优先级和名额占用情况
+        """
+        try:
+            return jsonify({
+                'success': True,
+                'data': DedupTaskScheduler.get_status()
+            }), 200
+        
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                'success': False,
+                'message': f'获取调度器状态失败: {str(e)}',
+                'error_code': 'INTERNAL_ERROR'
+            }), 500
+    
     @app.route('/api/dedup/tasks/<int:task_id>/resume', methods=['POST'])
     def resume_dedup_task(task_id):
         """
@@ -745,38 +485,27 @@ def register_question_dedup_routes(app):
             # 检查任务是否还有未完成的分组
             has_unfinished_groups = task.processed_groups < task.total_groups if task.total_groups > 0 else False
             
-            # 检查执行线程是否还在运行
-            thread_running = False
-            with _task_threads_lock:
-                thread = _task_threads.get(task_id)
-                if thread and thread.is_alive():
-                    thread_running = True
+            # 检查任务是否仍由执行器执行（暂停期间执行线程阻塞等待恢复）
+            job_active = DedupJobQueue.is_active(task_id)
             
-            # 更新任务状态为运行中（必须在检查线程之前更新，让等待循环能检测到）
+            # 更新任务状态为运行中，并唤醒等待中的执行线程
+            # （任务在独立 worker 进程中执行时，由执行器在下一次轮询时同步状态）
             print(f"继续任务 {task_id}: 更新状态为 running...")
             task.status = 'running'
             db.session.commit()
-            print(f"继续任务 {task_id}: 状态已更新为 running，线程运行状态: {thread_running}")
+            DedupTaskControl.resume(task_id)
+            print(f"继续任务 {task_id}: 状态已更新为 running，执行器执行状态: {job_active}")
             
-            # 如果线程不存在或已结束，且还有未完成的分组，重新启动线程
-            if not thread_running:
+            # 执行器已不再执行该任务（如执行器重启），且还有未完成的分组，重新加入执行队列
+            if not job_active:
                 if has_unfinished_groups:
-                    print(f"任务 {task_id} 的执行线程已结束，重新启动线程继续执行...")
-                    thread = threading.Thread(
-                        target=_execute_dedup_task,
-                        args=(task_id,),
-                        daemon=True
-                    )
-                    thread.start()
-                    with _task_threads_lock:
-                        _task_threads[task_id] = thread
-                    print(f"任务 {task_id} 的新线程已启动")
+                    print(f"任务 {task_id} 已不在执行器中，重新加入执行队列...")
+                    DedupJobQueue.enqueue(task_id, resolve_priority(task.get_config()))
+                    DedupJobWorker.notify()
                 else:
-                    print(f"任务 {task_id} 的执行线程已结束，但所有分组已完成，无需重新启动")
+                    print(f"任务 {task_id} 已不在执行器中，但所有分组已完成，无需重新执行")
             else:
-                print(f"任务 {task_id} 的执行线程仍在运行，状态已更新为 running，等待循环应该会检测到并继续执行")
-                # 确保等待循环能检测到状态变化，强制刷新一次
-                # 注意：这里不能直接操作线程，只能等待等待循环自己检测
+                print(f"任务 {task_id} 仍在执行器中，状态已更新为 running")
             
             # 发送恢复通知到WebSocket
             from src.routes.websocket import emit_task_progress
@@ -790,7 +519,7 @@ def register_question_dedup_routes(app):
                 'processed_groups': task.processed_groups,
                 'total_groups': task.total_groups,
                 'progress_percentage': progress_percentage,
-                'message': '任务已恢复运行' if thread_running else '任务已重新启动并继续执行'
+                'message': '任务已恢复运行' if job_active else '任务已重新加入执行队列'
             })
             
             task_dict = task.to_dict()
@@ -798,7 +527,7 @@ def register_question_dedup_routes(app):
             
             return jsonify({
                 'success': True,
-                'message': '任务已恢复运行' if thread_running else '任务已重新启动并继续执行',
+                'message': '任务已恢复运行' if job_active else '任务已重新加入执行队列',
                 'data': task_dict
             }), 200
         
@@ -839,6 +568,8 @@ def register_question_dedup_routes(app):
             
             task.status = 'cancelled'
             db.session.commit()
+            DedupTaskControl.cancel(task_id)
+            DedupJobQueue.dequeue(task_id)
             
             return jsonify({
                 'success': True,
@@ -864,12 +595,16 @@ def register_question_dedup_routes(app):
         请求参数:
             page (int, 可选): 页码，默认1
             page_size (int, 可选): 每页数量，默认20
+            cursor (str, 可选): 游标，传入时按游标分页（第一页传空字符串，之后传上一页返回的 next_cursor），忽略 page
+            with_total (bool, 可选): 游标分页时是否统计总数，默认 false
             group_type (str, 可选): 题型筛选
             subject_id (int, 可选): 科目ID筛选
         """
         try:
             page = request.args.get('page', type=int, default=1)
             page_size = request.args.get('page_size', type=int, default=20)
+            cursor = request.args.get('cursor')
+            with_total = request.args.get('with_total', 'false').strip().lower() in ('true', '1', 'yes', 'on')
             group_type = request.args.get('group_type', '').strip() or None
             subject_id = request.args.get('subject_id', type=int) or None
             
@@ -896,18 +631,16 @@ def register_question_dedup_routes(app):
             if subject_id:
                 query = query.filter(QuestionDuplicateGroup.group_subject_id == subject_id)
             
-            query = query.order_by(desc(QuestionDuplicateGroup.detected_at))
-            
-            # 分页
-            pagination = query.paginate(
-                page=page,
-                per_page=page_size,
-                error_out=False
+            # 分页（按检测时间倒序，索引 idx_task_detected / idx_task_type_detected）
+            items, pagination = paginate(
+                query,
+                ((QuestionDuplicateGroup.detected_at, True), (QuestionDuplicateGroup.id, True)),
+                page, page_size, cursor=cursor, with_total=with_total
             )
             
             # 转换为字典
             groups = []
-            for group in pagination.items:
+            for group in items:
                 group_dict = group.to_dict(include_items=True)
                 
                 # 添加题型名称和科目名称
@@ -915,13 +648,10 @@ def register_question_dedup_routes(app):
                     group.group_type, '未知题型'
                 )
                 
-                # 查询科目名称（从第一个题目获取）
-                if group_dict['question_ids']:
-                    first_question = Question.query.filter_by(
-                        question_id=group_dict['question_ids'][0]
-                    ).first()
-                    if first_question and first_question.subject_name:
-                        group_dict['group']['subject_name'] = first_question.subject_name
+                # 科目名称（维度缓存）
+                subject_name = DimensionCache.subject_name(group.group_subject_id)
+                if subject_name:
+                    group_dict['group']['subject_name'] = subject_name
                 
                 groups.append(group_dict)
             
@@ -930,15 +660,17 @@ def register_question_dedup_routes(app):
                 'message': '获取成功',
                 'data': {
                     'list': groups,
-                    'pagination': {
-                        'page': pagination.page,
-                        'page_size': page_size,
-                        'total': pagination.total,
-                        'total_pages': pagination.pages
-                    }
+                    'pagination': pagination
                 }
             }), 200
         
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e),
+                'error_code': 'INVALID_PARAMETER'
+            }), 400
+        
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -1030,6 +762,8 @@ def register_question_dedup_routes(app):
         请求参数:
             page (int, 可选): 页码，默认1
             page_size (int, 可选): 每页数量，默认20
+            cursor (str, 可选): 游标，传入时按游标分页（第一页传空字符串，之后传上一页返回的 next_cursor），忽略 page
+            with_total (bool, 可选): 游标分页时是否统计总数，默认 false
             min_similarity (float, 可选): 最小相似度，默认0.8
             group_type (str, 可选): 题型筛选
             format (str, 可选): 返回格式，'grouped'=按题目分组（默认），'pairs'=原始对格式
@@ -1037,6 +771,8 @@ def register_question_dedup_routes(app):
         try:
             page = request.args.get('page', type=int, default=1)
             page_size = request.args.get('page_size', type=int, default=20)
+            cursor = request.args.get('cursor')
+            with_total = request.args.get('with_total', 'false').strip().lower() in ('true', '1', 'yes', 'on')
             min_similarity = request.args.get('min_similarity', type=float) or 0.8
             group_type = request.args.get('group_type', '').strip() or None
             format_type = request.args.get('format', 'grouped').strip() or 'grouped'
@@ -1056,7 +792,7 @@ def register_question_dedup_routes(app):
             if page_size < 1 or page_size > 100:
                 page_size = 20
             
-            # 构建查询（获取所有符合条件的相似对，不分页）
+            # 相似对查询条件
             query = QuestionDuplicatePair.query.filter_by(
                 task_id=task_id,
                 duplicate_type='similar'
@@ -1067,16 +803,13 @@ def register_question_dedup_routes(app):
             if group_type:
                 query = query.filter(QuestionDuplicatePair.group_type == group_type)
             
-            # 获取所有相似对
-            all_pairs = query.order_by(desc(QuestionDuplicatePair.similarity)).all()
-            
             if format_type == 'pairs':
-                # 原始格式：返回所有对
-                # 分页处理
-                total = len(all_pairs)
-                start = (page - 1) * page_size
-                end = start + page_size
-                paginated_pairs = all_pairs[start:end]
+                # 原始格式：按相似度降序分页（索引 idx_task_dup_similarity / idx_task_dup_type_similarity）
+                paginated_pairs, pagination = paginate(
+                    query,
+                    ((QuestionDuplicatePair.similarity, True), (QuestionDuplicatePair.id, True)),
+                    page, page_size, cursor=cursor, with_total=with_total
+                )
                 
                 pairs = []
                 for pair in paginated_pairs:
@@ -1087,126 +820,101 @@ def register_question_dedup_routes(app):
                         pair.group_type, '未知题型'
                     )
                     
-                    # 查询科目名称（从第一个题目获取）
-                    first_question = Question.query.filter_by(
-                        question_id=pair.question_id_1
-                    ).first()
-                    if first_question and first_question.subject_name:
-                        pair_dict['group']['subject_name'] = first_question.subject_name
+                    # 科目名称（维度缓存）
+                    subject_name = DimensionCache.subject_name(pair.group_subject_id)
+                    if subject_name:
+                        pair_dict['group']['subject_name'] = subject_name
                     
                     pairs.append(pair_dict)
                 
-                total_pages = (total + page_size - 1) // page_size
-                
                 return jsonify({
                     'success': True,
                     'message': '获取成功',
                     'data': {
                         'list': pairs,
-                        'pagination': {
-                            'page': page,
-                            'page_size': page_size,
-                            'total': total,
-                            'total_pages': total_pages
-                        }
+                        'pagination': pagination
                     }
                 }), 200
             else:
                 # 按题目分组格式：每个题目只返回一次，列出所有与它重复的题目
-                # 构建题目到重复题目的映射
-                question_duplicates = {}  # {question_id: [{'question_id': x, 'similarity': y, 'pair_id': z}, ...]}
-                question_info = {}  # {question_id: {group_type, group_subject_id, group_channel_code, ...}}
+                # 从相似重复汇总表（每题一行）按最大相似度分页，只读取当前页题目的相似对
+                summary_query = QuestionDuplicateSummary.query.filter(
+                    QuestionDuplicateSummary.task_id == task_id
+                )
+                if min_similarity:
+                    summary_query = summary_query.filter(QuestionDuplicateSummary.max_similarity >= min_similarity)
+                if group_type:
+                    summary_query = summary_query.filter(QuestionDuplicateSummary.group_type == group_type)
                 
-                for pair in all_pairs:
-                    q1 = pair.question_id_1
-                    q2 = pair.question_id_2
-                    similarity = float(pair.similarity) if pair.similarity else 0.0
-                    
-                    # 为每个题目记录重复信息
-                    if q1 not in question_duplicates:
-                        question_duplicates[q1] = []
-                        question_info[q1] = {
-                            'group_type': pair.group_type,
-                            'group_subject_id': pair.group_subject_id,
-                            'group_channel_code': pair.group_channel_code
-                        }
-                    
-                    if q2 not in question_duplicates:
-                        question_duplicates[q2] = []
-                        question_info[q2] = {
-                            'group_type': pair.group_type,
-                            'group_subject_id': pair.group_subject_id,
-                            'group_channel_code': pair.group_channel_code
-                        }
-                    
-                    # 记录重复关系（双向）
-                    question_duplicates[q1].append({
-                        'question_id': q2,
-                        'similarity': similarity,
-                        'pair_id': pair.id
-                    })
-                    question_duplicates[q2].append({
-                        'question_id': q1,
-                        'similarity': similarity,
-                        'pair_id': pair.id
-                    })
+                summaries, pagination = paginate(
+                    summary_query,
+                    ((QuestionDuplicateSummary.max_similarity, True), (QuestionDuplicateSummary.question_id, False)),
+                    page, page_size, cursor=cursor, with_total=with_total
+                )
+                question_ids = [summary.question_id for summary in summaries]
+                
+                # 当前页题目的相似对（双向记录重复关系）
+                question_duplicates = {qid: [] for qid in question_ids}  # {question_id: [{'question_id': x, 'similarity': y, 'pair_id': z}, ...]}
+                if question_ids:
+                    page_pairs = query.filter(or_(
+                        QuestionDuplicatePair.question_id_1.in_(question_ids),
+                        QuestionDuplicatePair.question_id_2.in_(question_ids)
+                    )).all()
+                    for pair in page_pairs:
+                        similarity = float(pair.similarity) if pair.similarity else 0.0
+                        for qid, other_id in ((pair.question_id_1, pair.question_id_2),
+                                              (pair.question_id_2, pair.question_id_1)):
+                            if qid in question_duplicates:
+                                question_duplicates[qid].append({
+                                    'question_id': other_id,
+                                    'similarity': similarity,
+                                    'pair_id': pair.id
+                                })
                 
-                # 转换为列表格式，按题目ID排序
-                grouped_list = []
-                for question_id in sorted(question_duplicates.keys()):
-                    duplicates = question_duplicates[question_id]
-                    info = question_info[question_id]
+                paginated_list = []
+                for summary in summaries:
+                    duplicates = question_duplicates[summary.question_id]
                     
                     # 按相似度降序排序
                     duplicates.sort(key=lambda x: x['similarity'], reverse=True)
+                    summary_dict = summary.to_dict()
                     
-                    # 获取题目基本信息
-                    question = Question.query.filter_by(question_id=question_id).first()
-                    subject_name = question.subject_name if question else None
-                    
+                    # 未保存相似对明细（DEDUP_STORE_SIMILAR_PAIRS 未开启）时使用汇总统计
                     grouped_item = {
-                        'question_id': question_id,
-                        'duplicate_count': len(duplicates),
+                        'question_id': summary.question_id,
+                        'duplicate_count': len(duplicates) if duplicates else summary_dict['duplicate_count'],
                         'duplicates': duplicates,
-                        'max_similarity': duplicates[0]['similarity'] if duplicates else 0.0,
-                        'min_similarity': duplicates[-1]['similarity'] if duplicates else 0.0,
+                        'max_similarity': duplicates[0]['similarity'] if duplicates else summary_dict['max_similarity'],
+                        'min_similarity': duplicates[-1]['similarity'] if duplicates else summary_dict['min_similarity'],
                         'group': {
-                            'type': info['group_type'],
+                            'type': summary.group_type,
                             'type_name': QuestionService.TYPE_NAMES.get(
-                                info['group_type'], '未知题型'
+                                summary.group_type, '未知题型'
                             ),
-                            'subject_id': info['group_subject_id'],
-                            'subject_name': subject_name,
-                            'channel_code': info['group_channel_code']
+                            'subject_id': summary.group_subject_id,
+                            'subject_name': DimensionCache.subject_name(summary.group_subject_id),
+                            'channel_code': summary.group_channel_code
                         }
                     }
-                    grouped_list.append(grouped_item)
-                
-                # 按最大相似度降序排序
-                grouped_list.sort(key=lambda x: x['max_similarity'], reverse=True)
-                
-                # 分页
-                total = len(grouped_list)
-                start = (page - 1) * page_size
-                end = start + page_size
-                paginated_list = grouped_list[start:end]
-                total_pages = (total + page_size - 1) // page_size
+                    paginated_list.append(grouped_item)
                 
                 return jsonify({
                     'success': True,
                     'message': '获取成功',
                     'data': {
                         'list': paginated_list,
-                        'pagination': {
-                            'page': page,
-                            'page_size': page_size,
-                            'total': total,
-                            'total_pages': total_pages
-                        },
+                        'pagination': pagination,
                         'format': 'grouped'
                     }
                 }), 200
         
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e),
+                'error_code': 'INVALID_PARAMETER'
+            }), 400
+        
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -1301,10 +1009,260 @@ def register_question_dedup_routes(app):
                 'error_code': 'INTERNAL_ERROR'
             }), 500
     
+    @app.route('/api/dedup/tasks/<int:task_id>/clusters', methods=['GET'])
+    def get_duplicate_clusters(task_id):
+        """
+        获取重复题目簇列表（完全重复组和相似重复对经并查集合并后的连通分量，按成员数降序）
+        
+        请求参数:
+            page (int, 可选): 页码，默认1
+            page_size (int, 可选): 每页数量，默认20
+            cursor (str, 可选): 游标，传入时按游标分页（第一页传空字符串，之后传上一页返回的 next_cursor），忽略 page
+            with_total (bool, 可选): 游标分页时是否统计总数，默认 false
+            group_type (str, 可选): 题型筛选
+            subject_id (int, 可选): 科目ID筛选
+            min_size (int, 可选): 最小成员数，默认2
+        """
+        try:
+            page = request.args.get('page', type=int, default=1)
+            page_size = request.args.get('page_size', type=int, default=20)
+            cursor = request.args.get('cursor')
+            with_total = request.args.get('with_total', 'false').strip().lower() in ('true', '1', 'yes', 'on')
+            group_type = request.args.get('group_type', '').strip() or None
+            subject_id = request.args.get('subject_id', type=int) or None
+            min_size = request.args.get('min_size', type=int) or 2
+            
+            # 验证任务是否存在
+            task = DedupTask.query.get(task_id)
+            if not task:
+                return jsonify({
+                    'success': False,
+                    'message': '任务不存在',
+                    'error_code': 'NOT_FOUND'
+                }), 404
+            
+            # 验证参数
+            if page < 1:
+                page = 1
+            if page_size < 1 or page_size > 100:
+                page_size = 20
+            
+            # 构建查询
+            query = QuestionDuplicateCluster.query.filter_by(task_id=task_id)
+            
+            if group_type:
+                query = query.filter(QuestionDuplicateCluster.group_type == group_type)
+            if subject_id:
+                query = query.filter(QuestionDuplicateCluster.group_subject_id == subject_id)
+            if min_size > 2:
+                query = query.filter(QuestionDuplicateCluster.member_count >= min_size)
+            
+            # 分页（按成员数降序）
+            items, pagination = paginate(
+                query,
+                ((QuestionDuplicateCluster.member_count, True), (QuestionDuplicateCluster.id, False)),
+                page, page_size, cursor=cursor, with_total=with_total
+            )
+            
+            clusters = []
+            for cluster in items:
+                cluster_dict = cluster.to_dict()
+                cluster_dict['group']['type_name'] = QuestionService.TYPE_NAMES.get(
+                    cluster.group_type, '未知题型'
+                )
+                cluster_dict['group']['subject_name'] = DimensionCache.subject_name(cluster.group_subject_id)
+                clusters.append(cluster_dict)
+            
+            return jsonify({
+                'success': True,
+                'message': '获取成功',
+                'data': {
+                    'list': clusters,
+                    'pagination': pagination
+                }
+            }), 200
+        
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e),
+                'error_code': 'INVALID_PARAMETER'
+            }), 400
+        
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                'success': False,
+                'message': f'服务器内部错误: {str(e)}',
+                'error_code': 'INTERNAL_ERROR'
+            }), 500
+    
+    @app.route('/api/dedup/tasks/<int:task_id>/clusters/<int:cluster_id>', methods=['GET'])
+    def get_duplicate_cluster_detail(task_id, cluster_id):
+        """
+        获取重复题目簇详情（成员按相似边数降序分页，包含题目内容）
+        
+        请求参数:
+            page (int, 可选): 成员页码，默认1
+            page_size (int, 可选): 每页成员数，默认20
+        """
+        try:
+            page = request.args.get('page', type=int, default=1)
+            page_size = request.args.get('page_size', type=int, default=20)
+            if page < 1:
+                page = 1
+            if page_size < 1 or page_size > 100:
+                page_size = 20
+            
+            # 验证任务
+            task = DedupTask.query.get(task_id)
+            if not task:
+                return jsonify({
+                    'success': False,
+                    'message': '任务不存在',
+                    'error_code': 'NOT_FOUND'
+                }), 404
+            
+            # 查询簇
+            cluster = QuestionDuplicateCluster.query.filter_by(
+                task_id=task_id,
+                id=cluster_id
+            ).first()
+            
+            if not cluster:
+                return jsonify({
+                    'success': False,
+                    'message': '重复题目簇不存在',
+                    'error_code': 'NOT_FOUND'
+                }), 404
+            
+            cluster_dict = cluster.to_dict()
+            cluster_dict['group']['type_name'] = QuestionService.TYPE_NAMES.get(
+                cluster.group_type, '未知题型'
+            )
+            
+            # 成员分页
+            pagination = cluster.members.order_by(
+                desc(QuestionDuplicateClusterMember.degree),
+                QuestionDuplicateClusterMember.question_id
+            ).paginate(page=page, per_page=page_size, error_out=False)
+            
+            # 一次查询当前页成员的清洗后内容
+            member_ids = [member.question_id for member in pagination.items]
+            cleaned_contents = dict(
+                db.session.query(QuestionDedupFeature.question_id, QuestionDedupFeature.cleaned_content).filter(
+                    QuestionDedupFeature.task_id == task_id,
+                    QuestionDedupFeature.question_id.in_(member_ids)
+                ).all()
+            ) if member_ids else {}
+            
+            members = []
+            for member in pagination.items:
+                member_dict = member.to_dict()
+                question_detail = QuestionService.get_question_detail(
+                    question_id=member.question_id,
+                    include_answer=False,
+                    include_analysis=False
+                )
+                if question_detail and member.question_id in cleaned_contents:
+                    question_detail['cleaned_content'] = cleaned_contents[member.question_id]
+                member_dict['question'] = question_detail
+                members.append(member_dict)
+            
+            cluster_dict['members'] = members
+            cluster_dict['members_pagination'] = {
+                'page': pagination.page,
+                'page_size': page_size,
+                'total': pagination.total,
+                'total_pages': pagination.pages
+            }
+            
+            # 添加科目名称
+            cluster_dict['group']['subject_name'] = DimensionCache.subject_name(cluster.group_subject_id)
+            
+            return jsonify({
+                'success': True,
+                'message': '获取成功',
+                'data': cluster_dict
+            }), 200
+        
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                'success': False,
+                'message': f'服务器内部错误: {str(e)}',
+                'error_code': 'INTERNAL_ERROR'
+            }), 500
+    
+    @app.route('/api/dedup/tasks/<int:task_id>/export', methods=['GET'])
+    def export_dedup_results(task_id):
+        """
+        导出任务的去重结果（流式响应，边读边输出）
+        
+        请求参数:
+            kind (str, 可选): 导出内容，'pairs'=相似重复对（默认），'groups'=完全重复组，'clusters'=重复题目簇
+            format (str, 可选): 导出格式，'ndjson'（默认）或 'csv'
+            gzip (bool, 可选): 是否 gzip 压缩，默认 false
+            group_type (str, 可选): 题型筛选
+            subject_id (int, 可选): 科目ID筛选
+            min_similarity (float, 可选): 最小相似度（仅 pairs）
+        """
+        try:
+            kind = request.args.get('kind', 'pairs').strip() or 'pairs'
+            fmt = request.args.get('format', 'ndjson').strip().lower() or 'ndjson'
+            compress = request.args.get('gzip', 'false').strip().lower() in ('true', '1', 'yes', 'on')
+            group_type = request.args.get('group_type', '').strip() or None
+            subject_id = request.args.get('subject_id', type=int) or None
+            min_similarity = request.args.get('min_similarity', type=float) or None
+            
+            task = DedupTask.query.get(task_id)
+            if not task:
+                return jsonify({
+                    'success': False,
+                    'message': '任务不存在',
+                    'error_code': 'NOT_FOUND'
+                }), 404
+            
+            export = DedupExportService.export(
+                task_id, kind, fmt,
+                compress=compress,
+                group_type=group_type,
+                subject_id=subject_id,
+                min_similarity=min_similarity
+            )
+            
+            return Response(
+                stream_with_context(export['stream']),
+                mimetype=export['mimetype'],
+                headers={
+                    'Content-Disposition': f"attachment; filename={export['filename']}",
+                    # 禁止反向代理缓冲，数据边生成边发送
+                    'X-Accel-Buffering': 'no'
+                }
+            )
+        
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e),
+                'error_code': 'INVALID_PARAMETER'
+            }), 400
+        
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                'success': False,
+                'message': f'服务器内部错误: {str(e)}',
+                'error_code': 'INTERNAL_ERROR'
+            }), 500
+    
     @app.route('/api/dedup/tasks/<int:task_id>/statistics', methods=['GET'])
     def get_task_statistics(task_id):
         """
-        获取任务统计信息
+        获取任务统计信息（读取分维度统计表，任务执行期间实时更新）
         """
         try:
             task = DedupTask.query.get(task_id)
@@ -1333,71 +1291,43 @@ def register_question_dedup_routes(app):
                 'unique_question_count': max(0, task.total_questions - task.exact_duplicate_pairs - task.similar_duplicate_pairs)
             }
             
-            # 按题型统计
-            by_type_query = db.session.query(
-                QuestionDuplicateGroup.group_type,
-                func.count(QuestionDuplicateGroup.id).label('exact_groups'),
-                func.sum(QuestionDuplicateGroup.question_count).label('total_questions')
-            ).filter_by(
-                task_id=task_id
-            ).group_by(
-                QuestionDuplicateGroup.group_type
-            )
-            
-            by_type = []
-            for row in by_type_query.all():
-                # 统计相似重复对
-                similar_count = QuestionDuplicatePair.query.filter_by(
-                    task_id=task_id,
-                    duplicate_type='similar',
-                    group_type=row.group_type
-                ).count()
-                
-                by_type.append({
-                    'type': row.group_type,
-                    'type_name': QuestionService.TYPE_NAMES.get(row.group_type, '未知题型'),
-                    'exact_groups': row.exact_groups or 0,
-                    'similar_pairs': similar_count
-                })
-            
-            # 按科目统计
-            by_subject_query = db.session.query(
-                QuestionDuplicateGroup.group_subject_id,
-                func.count(QuestionDuplicateGroup.id).label('exact_groups')
-            ).filter_by(
-                task_id=task_id
-            ).group_by(
-                QuestionDuplicateGroup.group_subject_id
-            )
-            
-            by_subject = []
-            for row in by_subject_query.all():
-                # 统计相似重复对
-                similar_count = QuestionDuplicatePair.query.filter_by(
-                    task_id=task_id,
-                    duplicate_type='similar',
-                    group_subject_id=row.group_subject_id
-                ).count()
-                
-                # 获取科目名称
-                subject_name = None
-                first_group = QuestionDuplicateGroup.query.filter_by(
-                    task_id=task_id,
-                    group_subject_id=row.group_subject_id
-                ).first()
-                if first_group and first_group.items.first():
-                    first_question = Question.query.filter_by(
-                        question_id=first_group.items.first().question_id
-                    ).first()
-                    if first_question:
-                        subject_name = first_question.subject_name
-                
-                by_subject.append({
-                    'subject_id': row.group_subject_id,
-                    'subject_name': subject_name,
-                    'exact_groups': row.exact_groups or 0,
-                    'similar_pairs': similar_count
-                })
+            # 分维度统计（每个 (题型, 科目, 渠道) 一行，分组完成时累加），一次查询后按题型、科目汇总
+            statistics = DedupTaskStatistic.query.filter_by(task_id=task_id).all()
+            summary['processed_questions'] = sum(row.question_count for row in statistics)
+            
+            type_stats = {}
+            subject_stats = {}
+            for row in statistics:
+                for stats, key in ((type_stats, row.group_type), (subject_stats, row.group_subject_id)):
+                    item = stats.setdefault(key, {'question_count': 0, 'exact_groups': 0, 'similar_pairs': 0})
+                    item['question_count'] += row.question_count
+                    item['exact_groups'] += row.exact_duplicate_groups
+                    item['similar_pairs'] += row.similar_duplicate_pairs
+            
+            # 只列出有重复结果的题型、科目
+            by_type = [
+                {
+                    'type': group_type,
+                    'type_name': QuestionService.TYPE_NAMES.get(group_type, '未知题型'),
+                    'question_count': item['question_count'],
+                    'exact_groups': item['exact_groups'],
+                    'similar_pairs': item['similar_pairs']
+                }
+                for group_type, item in sorted(type_stats.items(), key=lambda kv: kv[0] or '')
+                if item['exact_groups'] or item['similar_pairs']
+            ]
+            
+            by_subject = [
+                {
+                    'subject_id': subject_id,
+                    'subject_name': DimensionCache.subject_name(subject_id),
+                    'question_count': item['question_count'],
+                    'exact_groups': item['exact_groups'],
+                    'similar_pairs': item['similar_pairs']
+                }
+                for subject_id, item in sorted(subject_stats.items(), key=lambda kv: kv[0] or 0)
+                if item['exact_groups'] or item['similar_pairs']
+            ]
             
             return jsonify({
                 'success': True,
@@ -1417,4 +1347,98 @@ def register_question_dedup_routes(app):
                 'success': False,
                 'message': f'服务器内部错误: {str(e)}',
                 'error_code': 'INTERNAL_ERROR'
-            }), 500
\ No newline at end of file
+            }), 500
+    
+    @app.route('/api/dedup/check', methods=['POST'])
+    def check_question_duplicates():
+        """
+        单题查重：编辑保存题目前检查同分组中是否已存在近似重复的题目
+        
+        使用启动时从已持久化特征构建的内存 LSH 索引，只能找到已完成去重任务覆盖过的题目
+        
+        请求体:
+            content (str): 题目原始内容（可包含HTML）
+            type (str): 题型
+            subject_id (int): 科目ID
+            channel_code (str, 可选): 渠道代码，默认 default
+            similarity_threshold (float, 可选): 相似度阈值，默认0.8
+            limit (int, 可选): 最多返回的候选数量，默认10，最大100
+        """
+        try:
+            data = request.get_json() or {}
+            content = data.get('content')
+            question_type = data.get('type')
+            subject_id = data.get('subject_id')
+            
+            if not content or question_type in (None, '') or subject_id in (None, ''):
+                return jsonify({
+                    'success': False,
+                    'message': 'content、type、subject_id 为必填参数',
+                    'error_code': 'INVALID_PARAMETER'
+                }), 400
+            
+            try:
+                subject_id = int(subject_id)
+                similarity_threshold = float(data.get('similarity_threshold', 0.8))
+                limit = int(data.get('limit', 10))
+            except (TypeError, ValueError):
+                return jsonify({
+                    'success': False,
+                    'message': 'subject_id、similarity_threshold、limit 参数格式错误',
+                    'error_code': 'INVALID_PARAMETER'
+                }), 400
+            
+            if not 0 < similarity_threshold <= 1:
+                return jsonify({
+                    'success': False,
+                    'message': 'similarity_threshold 必须在 (0, 1] 之间',
+                    'error_code': 'INVALID_PARAMETER'
+                }), 400
+            limit = max(1, min(limit, 100))
+            
+            from src.services.dedup_check_service import DedupCheckService
+            result = DedupCheckService.check_question(
+                content,
+                question_type=str(question_type),
+                subject_id=subject_id,
+                channel_code=data.get('channel_code') or 'default',
+                similarity_threshold=similarity_threshold,
+                limit=limit
+            )
+            
+            return jsonify({
+                'success': True,
+                'message': '查重完成',
+                'data': result
+            }), 200
+        
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                'success': False,
+                'message': f'查重失败: {str(e)}',
+                'error_code': 'INTERNAL_ERROR'
+            }), 500
+    
+    @app.route('/api/dedup/check/status', methods=['GET'])
+    def get_check_index_status():
+        """
+        获取单题查重内存索引的加载状态
+        """
+        try:
+            from src.services.dedup_check_service import DedupCheckService
+            return jsonify({
+                'success': True,
+                'message': '获取成功',
+                'data': DedupCheckService.get_status()
+            }), 200
+        
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                'success': False,
+                'message': f'服务器内部错误: {str(e)}',
+                'error_code': 'INTERNAL_ERROR'
+            }), 500
@@ -141,3 +141,75 @@ def emit_task_error(task_id: int, error_message: str):
     except Exception as e:
         print(f"发送错误通知失败: {e}")
 
+
+
+def start_progress_relay(app, interval: float = 2.0):
+    """
+    启动进度转发线程：独立 worker 进程执行的任务无法直接推送到 Web 进程的 WebSocket 客户端，
+    由 Web 进程按间隔读取这些任务的状态和已处理分组数，变化时推送进度，
+    任务完成或出错时推送完成/错误通知（在 Web 进程内执行的任务仍由执行线程直接推送）
+
+    Args:
+        app: Flask 应用
+        interval: 轮询间隔（秒）
+    """
+    import threading
+    import time
+    from src.models import db
+    from src.models.question_dedup import DedupTaskJob
+    from src.services.dedup_task_control import DedupTaskControl
+
+    def relay():
+        # {task_id: (status, processed_groups)}
+        last_seen = {}
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                try:
+                    claimed_ids = [
+                        row.task_id for row in db.session.query(DedupTaskJob.task_id).filter(
+                            DedupTaskJob.status == 'claimed'
+                        )
+                    ]
+                    local_ids = set(DedupTaskControl.running_task_ids())
+                    task_ids = {task_id for task_id in claimed_ids if task_id not in local_ids}
+                    task_ids.update(last_seen)
+                    if not task_ids:
+                        continue
+
+                    tasks = DedupTask.query.filter(DedupTask.id.in_(task_ids)).all()
+                    seen = {}
+                    for task in tasks:
+                        state = (task.status, task.processed_groups)
+                        if task.id in claimed_ids and task.id not in local_ids:
+                            seen[task.id] = state
+                        if last_seen.get(task.id) == state:
+                            continue
+                        progress_percentage = 0.0
+                        if task.total_groups > 0:
+                            progress_percentage = round(
+                                (task.processed_groups / task.total_groups) * 100, 2
+                            )
+                        if task.status == 'completed':
+                            task_dict = task.to_dict()
+                            task_dict['progress_percentage'] = 100.0
+                            emit_task_completed(task.id, task_dict)
+                        elif task.status == 'error':
+                            emit_task_error(task.id, task.error_message or '')
+                        else:
+                            emit_task_progress(task.id, {
+                                'status': task.status,
+                                'processed_groups': task.processed_groups,
+                                'total_groups': task.total_groups,
+                                'progress_percentage': progress_percentage
+                            })
+                    last_seen = seen
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"转发任务进度失败: {e}")
+                finally:
+                    db.session.remove()
+
+    thread = threading.Thread(target=relay, name='dedup-progress-relay', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,326 @@
+"""
+题目查重服务
+编辑保存题目前，对单道题目的原始内容做近似重复检查
+
+启动时从已持久化的特征（question_dedup_features）在后台构建内存 LSH 索引，
+查询时只需对一道题生成指纹，按 band 二分查找候选，再对少量候选精算 Jaccard 相似度
+"""
+import threading
+import hashlib
+import numpy as np
+from typing import Dict, Any, Optional, Tuple
+from datetime import datetime
+from src.models import db
+from src.models.question_dedup import QuestionDedupFeature
+from src.utils.feature_codec import ngram_ids, ngram_jaccard, decode_uint32
+from src.services.question_dedup_service import QuestionDedupService
+from src.services.minhash_engine import (
+    MinHashEngine, NUM_BANDS, ROWS_PER_BAND, FINGERPRINT_VERSION
+)
+
+
+class _GroupBandIndex:
+    """
+    单个分组的内存 LSH 索引
+
+    每个 band 保存一列排序后的 band 哈希及其对应的行号，
+    查询时对每个 band 做二分查找，不需要为每个桶建 Python 字典
+    """
+
+    def __init__(self, question_ids: np.ndarray, feature_ids: np.ndarray, band_hashes: np.ndarray):
+        """
+        Args:
+            question_ids: 题目ID数组
+            feature_ids: 特征记录ID数组（用于按主键读取清洗后的内容）
+            band_hashes: band 哈希矩阵 (题目数, NUM_BANDS)
+        """
+        self.question_ids = question_ids
+        self.feature_ids = feature_ids
+        order = np.argsort(band_hashes, axis=0, kind='stable')
+        # 按 band 连续存储：(NUM_BANDS, 题目数)
+        self.sorted_hashes = np.ascontiguousarray(np.take_along_axis(band_hashes, order, axis=0).T)
+        self.order = np.ascontiguousarray(order.T.astype(np.int32))
+
+    def __len__(self):
+        return len(self.question_ids)
+
+    def candidates(self, query_bands: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        查找与查询签名至少有一个 band 相同的题目
+
+        Args:
+            query_bands: 查询题目的 band 哈希，长度为 NUM_BANDS
+
+        Returns:
+            (行号数组, 命中的 band 数量数组)
+        """
+        hits = []
+        for band_idx, band_hash in enumerate(query_bands):
+            column = self.sorted_hashes[band_idx]
+            lo = np.searchsorted(column, band_hash, side='left')
+            hi = np.searchsorted(column, band_hash, side='right')
+            if hi > lo:
+                hits.append(self.order[band_idx, lo:hi])
+        if not hits:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(hits), return_counts=True)
+
+
+class DedupCheckService:
+    """题目查重服务（单题近似重复检查）"""
+
+    # 精算 Jaccard 的候选数量上限（按命中 band 数排序取前 N 个）
+    MAX_CANDIDATES = 100
+
+    # {(type, subject_id, channel_code): _GroupBandIndex}
+    _indexes: Dict[Tuple[str, int, str], _GroupBandIndex] = {}
+    _lock = threading.Lock()
+    _warm_thread: Optional[threading.Thread] = None
+    _rewarm_requested = False
+    _status: Dict[str, Any] = {
+        'state': 'empty',
+        'groups': 0,
+        'questions': 0,
+        'loaded_at': None,
+        'error': None
+    }
+
+    @staticmethod
+    def _group_key(question_type, subject_id, channel_code) -> Tuple[str, int, str]:
+        """分组键（与 QuestionService.get_question_groups 返回的字段一致）"""
+        return (str(question_type), int(subject_id), channel_code or 'default')
+
+    @staticmethod
+    def _build_group_index(group: Dict[str, Any]) -> Optional[_GroupBandIndex]:
+        """
+        从持久化特征构建单个分组的内存索引
+
+        Args:
+            group: 分组信息字典，包含 type, subject_id, channel_code
+
+        Returns:
+            分组索引，分组没有可用指纹时返回 None
+        """
+        persisted = QuestionDedupService.load_persisted_signatures(group)
+        if not persisted:
+            return None
+        question_ids = np.fromiter(persisted.keys(), dtype=np.int64, count=len(persisted))
+        feature_ids = np.fromiter(
+            (item['feature_id'] for item in persisted.values()), dtype=np.int64, count=len(persisted)
+        )
+        signatures = np.vstack([item['minhash'] for item in persisted.values()])
+        band_hashes = MinHashEngine.band_hashes(signatures, NUM_BANDS, ROWS_PER_BAND)
+        return _GroupBandIndex(question_ids, feature_ids, band_hashes)
+
+    @staticmethod
+    def warm_up():
+        """
+        从持久化特征构建全部分组的内存索引（需要在应用上下文中调用）
+
+        新索引构建完成后整体替换旧索引，构建期间查询仍使用旧索引
+        """
+        with DedupCheckService._lock:
+            DedupCheckService._status['state'] = 'warming'
+            DedupCheckService._status['error'] = None
+
+        try:
+            groups = db.session.query(
+                QuestionDedupFeature.group_type,
+                QuestionDedupFeature.group_subject_id,
+                QuestionDedupFeature.group_channel_code
+            ).filter(
+                QuestionDedupFeature.fingerprint_version == FINGERPRINT_VERSION
+            ).distinct().all()
+
+            indexes = {}
+            for row in groups:
+                if row.group_type is None or row.group_subject_id is None:
+                    continue
+                group = {
+                    'type': row.group_type,
+                    'subject_id': row.group_subject_id,
+                    'channel_code': row.group_channel_code
+                }
+                index = DedupCheckService._build_group_index(group)
+                if index is not None:
+                    key = DedupCheckService._group_key(row.group_type, row.group_subject_id,
+                                                       row.group_channel_code)
+                    indexes[key] = index
+
+            with DedupCheckService._lock:
+                DedupCheckService._indexes = indexes
+                DedupCheckService._status.update({
+                    'state': 'ready',
+                    'groups': len(indexes),
+                    'questions': sum(len(index) for index in indexes.values()),
+                    'loaded_at': datetime.now().isoformat()
+                })
+            print(f"查重索引加载完成: {len(indexes)} 个分组，"
+                  f"{DedupCheckService._status['questions']} 道题目")
+        except Exception as e:
+            with DedupCheckService._lock:
+                DedupCheckService._status['state'] = 'error'
+                DedupCheckService._status['error'] = str(e)
+            print(f"查重索引加载失败: {e}")
+
+    @staticmethod
+    def warm_up_async(app):
+        """
+        在后台线程中构建内存索引（Web 进程启动、refresh_async 调用）
+
+        已有构建线程在运行时只记录一次重建请求，当前构建结束后再重建一次
+
+        Args:
+            app: Flask 应用实例
+        """
+        def run():
+            while True:
+                with app.app_context():
+                    try:
+                        DedupCheckService.warm_up()
+                    finally:
+                        db.session.remove()
+                with DedupCheckService._lock:
+                    if not DedupCheckService._rewarm_requested:
+                        DedupCheckService._warm_thread = None
+                        return
+                    DedupCheckService._rewarm_requested = False
+
+        with DedupCheckService._lock:
+            if DedupCheckService._warm_thread is not None:
+                DedupCheckService._rewarm_requested = True
+                return
+            DedupCheckService._warm_thread = threading.Thread(
+                target=run, daemon=True, name='dedup-check-warmup'
+            )
+            DedupCheckService._warm_thread.start()
+
+    @staticmethod
+    def refresh_async(app):
+        """
+        去重任务持久化新特征后刷新内存索引
+
+        只有已经预热过的进程（Web 进程）才在后台重建完整索引；未预热的进程（独立执行器、
+        关闭预热的 Web 进程）只丢弃按需构建的分组索引，下次查重时重新构建，不加载全部特征
+
+        Args:
+            app: Flask 应用实例
+        """
+        with DedupCheckService._lock:
+            if DedupCheckService._status['state'] == 'empty' and DedupCheckService._warm_thread is None:
+                DedupCheckService._indexes = {}
+                return
+        DedupCheckService.warm_up_async(app)
+
+    @staticmethod
+    def get_status() -> Dict[str, Any]:
+        """获取内存索引状态"""
+        with DedupCheckService._lock:
+            return dict(DedupCheckService._status)
+
+    @staticmethod
+    def _get_group_index(question_type, subject_id, channel_code) -> Optional[_GroupBandIndex]:
+        """
+        获取分组索引；索引尚未加载完成时按需构建该分组
+
+        Returns:
+            分组索引，分组没有持久化指纹时返回 None
+        """
+        key = DedupCheckService._group_key(question_type, subject_id, channel_code)
+        with DedupCheckService._lock:
+            index = DedupCheckService._indexes.get(key)
+            ready = DedupCheckService._status['state'] == 'ready'
+        if index is not None or ready:
+            return index
+
+        index = DedupCheckService._build_group_index({
+            'type': key[0],
+            'subject_id': key[1],
+            'channel_code': key[2]
+        })
+        if index is not None:
+            with DedupCheckService._lock:
+                DedupCheckService._indexes.setdefault(key, index)
+        return index
+
+    @staticmethod
+    def check_question(content: str,
+                       question_type,
+                       subject_id,
+                       channel_code: Optional[str] = None,
+                       similarity_threshold: float = 0.8,
+                       limit: int = 10) -> Dict[str, Any]:
+        """
+        检查一道题目在同分组中是否已存在近似重复
+
+        与去重任务使用相同的流程：清洗题干 → 3-gram → MinHash → LSH 候选 → Jaccard 精算
+
+        Args:
+            content: 题目原始内容（可包含HTML）
+            question_type: 题型
+            subject_id: 科目ID
+            channel_code: 渠道代码，默认为 default
+            similarity_threshold: 相似度阈值，默认为0.8
+            limit: 最多返回的候选数量
+
+        Returns:
+            查重结果字典，candidates 按相似度从高到低排序
+        """
+        cleaned_content = QuestionDedupService._clean_question_content(content, channel_code)
+        result = {
+            'cleaned_content': cleaned_content,
+            'content_hash': hashlib.md5(cleaned_content.encode('utf-8')).hexdigest() if cleaned_content else None,
+            'candidates': [],
+            'index': DedupCheckService.get_status()
+        }
+        if not cleaned_content:
+            return result
+
+        index = DedupCheckService._get_group_index(question_type, subject_id, channel_code)
+        if index is None:
+            return result
+
+        ngrams = QuestionDedupService._extract_ngrams(cleaned_content, n=3)
+        signature = QuestionDedupService._minhash_engine.signature(ngrams)
+        query_bands = MinHashEngine.band_hashes(signature[None, :], NUM_BANDS, ROWS_PER_BAND)[0]
+
+        rows, band_matches = index.candidates(query_bands)
+        if len(rows) == 0:
+            return result
+        if len(rows) > DedupCheckService.MAX_CANDIDATES:
+            top = np.argsort(-band_matches, kind='stable')[:DedupCheckService.MAX_CANDIDATES]
+            rows, band_matches = rows[top], band_matches[top]
+        matches_by_feature = {
+            int(index.feature_ids[row]): int(count) for row, count in zip(rows, band_matches)
+        }
+
+        features = db.session.query(
+            QuestionDedupFeature.id,
+            QuestionDedupFeature.question_id,
+            QuestionDedupFeature.cleaned_content,
+            QuestionDedupFeature.content_digest,
+            QuestionDedupFeature.content_hash,
+            QuestionDedupFeature.ngram_blob
+        ).filter(QuestionDedupFeature.id.in_(list(matches_by_feature.keys()))).all()
+
+        query_ids = ngram_ids(cleaned_content)
+        candidates = []
+        for feature in features:
+            if feature.ngram_blob:
+                similarity = ngram_jaccard(query_ids, decode_uint32(feature.ngram_blob))
+            else:
+                # 旧格式特征没有 n-gram 哈希ID，从清洗后的内容重新提取
+                candidate_ngrams = QuestionDedupService._extract_ngrams(feature.cleaned_content or '', n=3)
+                similarity = QuestionDedupService._jaccard_similarity(ngrams, candidate_ngrams)
+            content_hash = feature.content_digest.hex() if feature.content_digest else feature.content_hash
+            if similarity >= similarity_threshold:
+                candidates.append({
+                    'question_id': feature.question_id,
+                    'similarity': round(similarity, 4),
+                    'is_exact': content_hash == result['content_hash'],
+                    'band_matches': matches_by_feature[feature.id]
+                })
+
+        candidates.sort(key=lambda item: (-item['similarity'], item['question_id']))
+        result['candidates'] = candidates[:limit]
+        return result
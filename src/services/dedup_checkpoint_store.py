@@ -0,0 +1,289 @@
+"""
+去重任务检查点
+每个任务的分组列表在任务首次执行时写入 dedup_task_checkpoints 表（每个分组一行），
+分组完成时只更新该分组一行的状态和统计数，不再重写整个进度文件
+
+断点续传按 (task_id, status, group_index) 索引读取第一个未完成的分组，
+与已完成分组的数量无关
+
+多个执行器（可以在不同机器上）处理同一个任务时，分组按租约分配：执行器用带条件的 UPDATE
+租用未完成、且没有有效租约的分组，处理期间定期续租；执行器退出后租约到期，分组由其他执行器
+重新租用。完成分组时要求租约仍属于该执行器，同一分组的结果和统计数只会计入一次
+"""
+import json
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+from sqlalchemy import func, or_
+from src.models import db
+from src.models.question_dedup import DedupTaskCheckpoint
+
+
+class DedupCheckpointStore:
+    """去重任务检查点存储"""
+
+    # 创建检查点时每条 INSERT 语句的行数
+    INSERT_CHUNK_SIZE = 2000
+
+    @staticmethod
+    def create(task_id: int, groups: List[Dict[str, Any]]):
+        """
+        写入任务的分组列表（全部为待处理状态），已有的检查点会被替换
+
+        Args:
+            task_id: 任务ID
+            groups: 分组列表（顺序即分组序号）
+        """
+        DedupTaskCheckpoint.query.filter_by(task_id=task_id).delete(synchronize_session=False)
+        rows = [
+            {
+                'task_id': task_id,
+                'group_index': index,
+                'group_type': group.get('type'),
+                'group_subject_id': group.get('subject_id'),
+                'group_channel_code': group.get('channel_code'),
+                'group_json': json.dumps(group, ensure_ascii=False),
+                'status': 'pending',
+                'question_count': 0,
+                'exact_duplicate_groups': 0,
+                'exact_duplicate_pairs': 0,
+                'similar_duplicate_pairs': 0
+            }
+            for index, group in enumerate(groups)
+        ]
+        statement = DedupTaskCheckpoint.__table__.insert()
+        chunk_size = DedupCheckpointStore.INSERT_CHUNK_SIZE
+        for start in range(0, len(rows), chunk_size):
+            db.session.execute(statement, rows[start:start + chunk_size])
+        db.session.commit()
+
+    @staticmethod
+    def exists(task_id: int) -> bool:
+        """任务是否已写入检查点"""
+        return db.session.query(
+            DedupTaskCheckpoint.query.filter_by(task_id=task_id).exists()
+        ).scalar()
+
+    @staticmethod
+    def load_groups(task_id: int) -> List[Dict[str, Any]]:
+        """
+        读取任务的分组列表（按分组序号排列）
+
+        Returns:
+            分组列表，任务没有检查点时返回空列表
+        """
+        rows = db.session.query(DedupTaskCheckpoint.group_json).filter(
+            DedupTaskCheckpoint.task_id == task_id
+        ).order_by(DedupTaskCheckpoint.group_index).all()
+        return [json.loads(row.group_json) for row in rows]
+
+    @staticmethod
+    def get_group(task_id: int, group_index: int) -> Optional[Dict[str, Any]]:
+        """读取指定序号的分组信息"""
+        row = db.session.query(DedupTaskCheckpoint.group_json).filter(
+            DedupTaskCheckpoint.task_id == task_id,
+            DedupTaskCheckpoint.group_index == group_index
+        ).first()
+        return json.loads(row.group_json) if row else None
+
+    @staticmethod
+    def next_pending_index(task_id: int) -> Optional[int]:
+        """
+        第一个未完成分组的序号（断点续传的位置）
+
+        Returns:
+            分组序号，全部完成（或没有检查点）时返回 None
+        """
+        return db.session.query(func.min(DedupTaskCheckpoint.group_index)).filter(
+            DedupTaskCheckpoint.task_id == task_id,
+            DedupTaskCheckpoint.status == 'pending'
+        ).scalar()
+
+    @staticmethod
+    def pending_indexes(task_id: int) -> List[int]:
+        """所有未完成分组的序号（升序）"""
+        rows = db.session.query(DedupTaskCheckpoint.group_index).filter(
+            DedupTaskCheckpoint.task_id == task_id,
+            DedupTaskCheckpoint.status == 'pending'
+        ).order_by(DedupTaskCheckpoint.group_index).all()
+        return [row.group_index for row in rows]
+
+    @staticmethod
+    def completed_indexes_after(task_id: int, group_index: int) -> List[int]:
+        """序号大于 group_index 的已完成分组（并行执行时乱序完成的分组）"""
+        rows = db.session.query(DedupTaskCheckpoint.group_index).filter(
+            DedupTaskCheckpoint.task_id == task_id,
+            DedupTaskCheckpoint.status == 'completed',
+            DedupTaskCheckpoint.group_index > group_index
+        ).order_by(DedupTaskCheckpoint.group_index).all()
+        return [row.group_index for row in rows]
+
+    @staticmethod
+    def group_counters(results: Optional[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        分组处理结果的统计数
+
+        Returns:
+            {'question_count', 'exact_duplicate_groups', 'exact_duplicate_pairs', 'similar_duplicate_pairs'}
+        """
+        if not results:
+            return {
+                'question_count': 0,
+                'exact_duplicate_groups': 0,
+                'exact_duplicate_pairs': 0,
+                'similar_duplicate_pairs': 0
+            }
+        exact_duplicates = results.get('exact_duplicates', [])
+        return {
+            'question_count': results.get('total_questions', 0),
+            # 完全重复对数 = 每组C(n,2)的和
+            'exact_duplicate_groups': sum(1 for g in exact_duplicates if g.get('count', 0) > 1),
+            'exact_duplicate_pairs': sum(
+                g.get('count', 0) * (g.get('count', 0) - 1) // 2 for g in exact_duplicates
+            ),
+            'similar_duplicate_pairs': len(results.get('similar_duplicates', []))
+        }
+
+    @staticmethod
+    def mark_completed(task_id: int, group_index: int,
+                       results: Optional[Dict[str, Any]] = None,
+                       worker_id: Optional[str] = None) -> bool:
+        """
+        把分组标记为已完成并记录统计数（不提交，与分组结果在同一事务中提交）
+
+        Args:
+            task_id: 任务ID
+            group_index: 分组序号
+            results: 分组处理结果（可选）
+            worker_id: 执行器ID（可选），指定时只有分组仍由该执行器租用（或未被租用）才更新
+
+        Returns:
+            是否更新了检查点（分组已完成、不存在或已被其他执行器租用时返回 False）
+        """
+        values = {'status': 'completed', 'completed_at': datetime.now(), 'lease_expires_at': None}
+        if results:
+            values.update(DedupCheckpointStore.group_counters(results))
+        conditions = [
+            DedupTaskCheckpoint.task_id == task_id,
+            DedupTaskCheckpoint.group_index == group_index,
+            DedupTaskCheckpoint.status == 'pending'
+        ]
+        if worker_id:
+            conditions.append(or_(DedupTaskCheckpoint.worker_id == worker_id,
+                                  DedupTaskCheckpoint.worker_id.is_(None)))
+        updated = DedupTaskCheckpoint.query.filter(*conditions).update(values, synchronize_session=False)
+        return updated > 0
+
+    @staticmethod
+    def _leasable(task_id: int, worker_id: str, now: datetime) -> list:
+        """可以被执行器租用的分组条件：未完成，且没有租约、租约已到期或租约属于该执行器"""
+        return [
+            DedupTaskCheckpoint.task_id == task_id,
+            DedupTaskCheckpoint.status == 'pending',
+            or_(DedupTaskCheckpoint.lease_expires_at.is_(None),
+                DedupTaskCheckpoint.lease_expires_at < now,
+                DedupTaskCheckpoint.worker_id == worker_id)
+        ]
+
+    @staticmethod
+    def leasable_indexes(task_id: int, worker_id: str) -> List[int]:
+        """执行器可以租用的分组序号（升序）"""
+        rows = db.session.query(DedupTaskCheckpoint.group_index).filter(
+            *DedupCheckpointStore._leasable(task_id, worker_id, datetime.now())
+        ).order_by(DedupTaskCheckpoint.group_index).all()
+        return [row.group_index for row in rows]
+
+    @staticmethod
+    def has_leasable(task_id: int, worker_id: str) -> bool:
+        """是否还有执行器可以租用的分组"""
+        return db.session.query(
+            DedupTaskCheckpoint.query.filter(
+                *DedupCheckpointStore._leasable(task_id, worker_id, datetime.now())
+            ).exists()
+        ).scalar()
+
+    @staticmethod
+    def try_lease(task_id: int, group_index: int, worker_id: str, lease_seconds: float) -> bool:
+        """
+        租用指定分组（带条件的 UPDATE，多个执行器同时租用时只有一个成功）并提交
+
+        Args:
+            task_id: 任务ID
+            group_index: 分组序号
+            worker_id: 执行器ID
+            lease_seconds: 租约时长（秒），处理期间需要在到期前续租
+
+        Returns:
+            是否租用成功
+        """
+        now = datetime.now()
+        updated = DedupTaskCheckpoint.query.filter(
+            DedupTaskCheckpoint.group_index == group_index,
+            *DedupCheckpointStore._leasable(task_id, worker_id, now)
+        ).update({
+            'worker_id': worker_id,
+            'lease_expires_at': now + timedelta(seconds=lease_seconds),
+            'heartbeat_at': now,
+            'attempts': DedupTaskCheckpoint.attempts + 1
+        }, synchronize_session=False)
+        db.session.commit()
+        return updated > 0
+
+    @staticmethod
+    def lease_next(task_id: int, worker_id: str, lease_seconds: float) -> Optional[int]:
+        """
+        租用序号最小的可租用分组
+
+        Returns:
+            租到的分组序号；没有可租用的分组（全部完成，或其余分组由其他执行器租用中）时返回 None
+        """
+        while True:
+            group_index = db.session.query(func.min(DedupTaskCheckpoint.group_index)).filter(
+                *DedupCheckpointStore._leasable(task_id, worker_id, datetime.now())
+            ).scalar()
+            if group_index is None:
+                return None
+            if DedupCheckpointStore.try_lease(task_id, group_index, worker_id, lease_seconds):
+                return group_index
+            # 被其他执行器抢先租用，继续找下一个
+
+    @staticmethod
+    def renew_leases(task_id: int, worker_id: str, lease_seconds: float) -> int:
+        """
+        为执行器在该任务中租用的所有未完成分组续租并提交
+
+        Returns:
+            续租的分组数
+        """
+        now = datetime.now()
+        updated = DedupTaskCheckpoint.query.filter(
+            DedupTaskCheckpoint.task_id == task_id,
+            DedupTaskCheckpoint.worker_id == worker_id,
+            DedupTaskCheckpoint.status == 'pending',
+            DedupTaskCheckpoint.lease_expires_at.isnot(None)
+        ).update({
+            'lease_expires_at': now + timedelta(seconds=lease_seconds),
+            'heartbeat_at': now
+        }, synchronize_session=False)
+        db.session.commit()
+        return updated
+
+    @staticmethod
+    def release_lease(task_id: int, group_index: int, worker_id: str):
+        """归还分组租约（暂停时中断的分组由任意执行器重新租用）并提交"""
+        DedupTaskCheckpoint.query.filter(
+            DedupTaskCheckpoint.task_id == task_id,
+            DedupTaskCheckpoint.group_index == group_index,
+            DedupTaskCheckpoint.worker_id == worker_id,
+            DedupTaskCheckpoint.status == 'pending'
+        ).update({'lease_expires_at': None}, synchronize_session=False)
+        db.session.commit()
+
+    @staticmethod
+    def release_leases(task_id: int, worker_id: str):
+        """归还执行器在该任务中的所有租约并提交（执行线程退出时调用）"""
+        DedupTaskCheckpoint.query.filter(
+            DedupTaskCheckpoint.task_id == task_id,
+            DedupTaskCheckpoint.worker_id == worker_id,
+            DedupTaskCheckpoint.status == 'pending'
+        ).update({'lease_expires_at': None}, synchronize_session=False)
+        db.session.commit()
@@ -0,0 +1,136 @@
+"""
+重复题目聚类
+在相似度精算之后，对完全重复组和相似重复对做并查集（union-find），得到重复题目的连通分量（簇）。
+一个由 k 道近似模板题组成的簇有 O(k²) 个相似对，但只需要 1 条簇记录和 k 条成员记录，
+查询重复题目时按簇读取，不必在每次请求时从全部题目对重建邻接关系
+"""
+from typing import Any, Dict, Iterable, List
+
+
+class UnionFind:
+    """并查集（按大小合并 + 路径减半）"""
+
+    def __init__(self):
+        self._parent: Dict[int, int] = {}
+        self._size: Dict[int, int] = {}
+
+    def add(self, item: int):
+        """加入元素（已存在时忽略）"""
+        if item not in self._parent:
+            self._parent[item] = item
+            self._size[item] = 1
+
+    def find(self, item: int) -> int:
+        """查找元素所在集合的根"""
+        self.add(item)
+        parent = self._parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> int:
+        """合并两个元素所在的集合，返回合并后的根"""
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size[root_b]
+        return root_a
+
+    def components(self) -> Dict[int, List[int]]:
+        """所有集合：根 → 成员列表（成员按加入顺序）"""
+        result: Dict[int, List[int]] = {}
+        for item in self._parent:
+            result.setdefault(self.find(item), []).append(item)
+        return result
+
+
+def build_clusters(exact_duplicates: Iterable[Dict[str, Any]],
+                   similar_duplicates: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    对完全重复组和相似重复对做并查集聚类
+
+    完全重复组内的题目相互之间相似度为 1.0（不计入边数）；相似重复对是簇内的边。
+    代表题目取簇内相似边最多的题目，边数相同时取题目ID最小的，只由完全重复组构成的簇取ID最小的题目
+
+    Args:
+        exact_duplicates: 完全重复组列表（_find_exact_duplicates 的返回格式）
+        similar_duplicates: 相似重复对列表（_calculate_similar_duplicates 的返回格式）
+
+    Returns:
+        簇列表，按成员数降序、代表题目ID升序排列
+        [
+            {
+                'representative_question_id': 123,
+                'member_count': 5,
+                'exact_question_count': 2,   # 属于完全重复组的成员数
+                'similar_edge_count': 4,     # 簇内相似重复对数
+                'min_similarity': 0.82,      # 簇内相似边的最小/最大/平均相似度（没有相似边时为 1.0）
+                'max_similarity': 0.97,
+                'avg_similarity': 0.9,
+                'members': [
+                    {'question_id': 123, 'degree': 3, 'max_similarity': 0.97, 'is_exact': False},
+                    ...
+                ]
+            },
+            ...
+        ]
+    """
+    uf = UnionFind()
+    exact_ids = set()
+    for dup_group in exact_duplicates:
+        question_ids = dup_group.get('question_ids') or []
+        exact_ids.update(question_ids)
+        for qid in question_ids:
+            uf.union(question_ids[0], qid)
+
+    degree: Dict[int, int] = {}
+    best: Dict[int, float] = {}
+    edges = []
+    for pair in similar_duplicates:
+        qid1 = pair['question_id_1']
+        qid2 = pair['question_id_2']
+        similarity = float(pair.get('similarity', 0.0))
+        uf.union(qid1, qid2)
+        edges.append((qid1, similarity))
+        for qid in (qid1, qid2):
+            degree[qid] = degree.get(qid, 0) + 1
+            if similarity > best.get(qid, 0.0):
+                best[qid] = similarity
+
+    # 按根汇总边统计（每条边只计一次）
+    edge_stats: Dict[int, List[float]] = {}
+    for qid, similarity in edges:
+        edge_stats.setdefault(uf.find(qid), []).append(similarity)
+
+    clusters = []
+    for root, members in uf.components().items():
+        if len(members) < 2:
+            continue
+        members.sort()
+        similarities = edge_stats.get(root, [])
+        representative = min(members, key=lambda qid: (-degree.get(qid, 0), qid))
+        clusters.append({
+            'representative_question_id': representative,
+            'member_count': len(members),
+            'exact_question_count': sum(1 for qid in members if qid in exact_ids),
+            'similar_edge_count': len(similarities),
+            'min_similarity': min(similarities) if similarities else 1.0,
+            'max_similarity': max(similarities) if similarities else 1.0,
+            'avg_similarity': sum(similarities) / len(similarities) if similarities else 1.0,
+            'members': [
+                {
+                    'question_id': qid,
+                    'degree': degree.get(qid, 0),
+                    'max_similarity': 1.0 if qid in exact_ids else best.get(qid, 0.0),
+                    'is_exact': qid in exact_ids
+                }
+                for qid in members
+            ]
+        })
+    clusters.sort(key=lambda c: (-c['member_count'], c['representative_question_id']))
+    return clusters
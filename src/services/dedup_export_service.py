@@ -0,0 +1,282 @@
+"""
+去重结果导出服务
+把任务的相似重复对、完全重复组或重复题目簇导出为 NDJSON / CSV，可选 gzip 压缩。
+
+导出是一个生成器：按主键范围分批读取（id > 上一批最大ID ORDER BY id LIMIT n），
+每批转换成文本后立即输出，内存占用与批大小相关而与任务结果数量无关；
+每批是一条独立的短查询，客户端下载慢时也不会长时间占用数据库游标
+"""
+import csv
+import io
+import json
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from src.models import db
+from src.models.question_dedup import (
+    QuestionDuplicatePair, QuestionDuplicateGroup, QuestionDuplicateGroupItem,
+    QuestionDuplicateCluster, QuestionDuplicateClusterMember
+)
+from src.services.question_service import QuestionService
+from src.services.dimension_cache import DimensionCache
+
+
+class DedupExportService:
+    """去重结果导出服务"""
+
+    KINDS = ('pairs', 'groups', 'clusters')
+    FORMATS = ('ndjson', 'csv')
+
+    # 每批读取的行数
+    BATCH_SIZE = 2000
+    # 输出块大小（字节），文本攒到这个大小再输出/压缩
+    CHUNK_SIZE = 64 * 1024
+
+    # 各类导出的列（CSV 表头顺序，NDJSON 字段相同）
+    COLUMNS = {
+        'pairs': [
+            'id', 'question_id_1', 'question_id_2', 'similarity',
+            'type', 'type_name', 'subject_id', 'subject_name', 'channel_code', 'detected_at'
+        ],
+        'groups': [
+            'id', 'content_hash', 'question_count', 'question_ids',
+            'type', 'type_name', 'subject_id', 'subject_name', 'channel_code', 'detected_at'
+        ],
+        'clusters': [
+            'id', 'representative_question_id', 'member_count', 'exact_question_count', 'similar_edge_count',
+            'min_similarity', 'max_similarity', 'avg_similarity', 'question_ids',
+            'type', 'type_name', 'subject_id', 'subject_name', 'channel_code', 'detected_at'
+        ]
+    }
+
+    MIMETYPES = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv'
+    }
+
+    @staticmethod
+    def export(
+        task_id: int,
+        kind: str,
+        fmt: str,
+        compress: bool = False,
+        group_type: Optional[str] = None,
+        subject_id: Optional[int] = None,
+        min_similarity: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        创建导出流
+
+        Args:
+            task_id: 任务ID
+            kind: 导出内容：pairs=相似重复对，groups=完全重复组，clusters=重复题目簇
+            fmt: 导出格式：ndjson / csv
+            compress: 是否 gzip 压缩
+            group_type: 题型筛选
+            subject_id: 科目ID筛选
+            min_similarity: 最小相似度（仅 pairs）
+
+        Returns:
+            {'stream': 字节块生成器, 'mimetype': ..., 'filename': ...}
+
+        Raises:
+            ValueError: kind 或 fmt 无效
+        """
+        if kind not in DedupExportService.KINDS:
+            raise ValueError(f"导出内容无效，支持：{','.join(DedupExportService.KINDS)}")
+        if fmt not in DedupExportService.FORMATS:
+            raise ValueError(f"导出格式无效，支持：{','.join(DedupExportService.FORMATS)}")
+
+        records = DedupExportService.iter_records(
+            task_id, kind, group_type=group_type, subject_id=subject_id, min_similarity=min_similarity
+        )
+        if fmt == 'csv':
+            lines = DedupExportService.iter_csv(records, DedupExportService.COLUMNS[kind])
+        else:
+            lines = DedupExportService.iter_ndjson(records)
+        stream = DedupExportService._chunked(lines)
+
+        filename = f"dedup_task_{task_id}_{kind}.{fmt}"
+        mimetype = DedupExportService.MIMETYPES[fmt]
+        if compress:
+            stream = DedupExportService.gzip_stream(stream)
+            filename += '.gz'
+            mimetype = 'application/gzip'
+
+        return {'stream': stream, 'mimetype': mimetype, 'filename': filename}
+
+    @staticmethod
+    def iter_records(
+        task_id: int,
+        kind: str,
+        group_type: Optional[str] = None,
+        subject_id: Optional[int] = None,
+        min_similarity: Optional[float] = None,
+        batch_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        按主键顺序流式读取导出记录（扁平字典，字段见 COLUMNS）
+
+        Args:
+            task_id: 任务ID
+            kind: pairs / groups / clusters
+            group_type: 题型筛选
+            subject_id: 科目ID筛选
+            min_similarity: 最小相似度（仅 pairs）
+            batch_size: 每批行数，默认为 BATCH_SIZE
+        """
+        model = {
+            'pairs': QuestionDuplicatePair,
+            'groups': QuestionDuplicateGroup,
+            'clusters': QuestionDuplicateCluster
+        }[kind]
+        batch_size = batch_size or DedupExportService.BATCH_SIZE
+
+        filters = [model.task_id == task_id]
+        if kind == 'pairs':
+            filters.append(QuestionDuplicatePair.duplicate_type == 'similar')
+            if min_similarity:
+                filters.append(QuestionDuplicatePair.similarity >= min_similarity)
+        if group_type:
+            filters.append(model.group_type == group_type)
+        if subject_id:
+            filters.append(model.group_subject_id == subject_id)
+
+        last_id = None
+        while True:
+            # 只读列值，不创建 ORM 实体
+            query = db.session.query(*model.__table__.columns).filter(*filters)
+            if last_id is not None:
+                query = query.filter(model.id > last_id)
+            rows = query.order_by(model.id).limit(batch_size).all()
+            if not rows:
+                break
+
+            question_ids = DedupExportService._load_question_ids(kind, [row.id for row in rows])
+            for row in rows:
+                yield DedupExportService._to_record(kind, row, question_ids.get(row.id, []))
+
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1].id
+
+    @staticmethod
+    def _load_question_ids(kind: str, ids: List[int]) -> Dict[int, List[int]]:
+        """一次查询当前批所有组/簇的题目ID"""
+        if kind == 'groups':
+            rows = db.session.query(
+                QuestionDuplicateGroupItem.group_id, QuestionDuplicateGroupItem.question_id
+            ).filter(
+                QuestionDuplicateGroupItem.group_id.in_(ids)
+            ).order_by(QuestionDuplicateGroupItem.id).all()
+        elif kind == 'clusters':
+            # 与簇详情接口一致：按相似边数降序、题目ID升序
+            rows = db.session.query(
+                QuestionDuplicateClusterMember.cluster_id, QuestionDuplicateClusterMember.question_id
+            ).filter(
+                QuestionDuplicateClusterMember.cluster_id.in_(ids)
+            ).order_by(
+                QuestionDuplicateClusterMember.degree.desc(),
+                QuestionDuplicateClusterMember.question_id
+            ).all()
+        else:
+            return {}
+
+        result: Dict[int, List[int]] = {}
+        for owner_id, question_id in rows:
+            result.setdefault(owner_id, []).append(question_id)
+        return result
+
+    @staticmethod
+    def _to_record(kind: str, row: Any, question_ids: List[int]) -> Dict[str, Any]:
+        if kind == 'pairs':
+            record = {
+                'id': row.id,
+                'question_id_1': row.question_id_1,
+                'question_id_2': row.question_id_2,
+                'similarity': float(row.similarity) if row.similarity is not None else None
+            }
+        elif kind == 'groups':
+            record = {
+                'id': row.id,
+                'content_hash': row.content_hash,
+                'question_count': row.question_count,
+                'question_ids': question_ids
+            }
+        else:
+            record = {
+                'id': row.id,
+                'representative_question_id': row.representative_question_id,
+                'member_count': row.member_count,
+                'exact_question_count': row.exact_question_count,
+                'similar_edge_count': row.similar_edge_count,
+                'min_similarity': float(row.min_similarity) if row.min_similarity is not None else None,
+                'max_similarity': float(row.max_similarity) if row.max_similarity is not None else None,
+                'avg_similarity': float(row.avg_similarity) if row.avg_similarity is not None else None,
+                'question_ids': question_ids
+            }
+        record.update({
+            'type': row.group_type,
+            'type_name': QuestionService.TYPE_NAMES.get(row.group_type, '未知题型'),
+            'subject_id': row.group_subject_id,
+            'subject_name': DimensionCache.subject_name(row.group_subject_id),
+            'channel_code': row.group_channel_code,
+            'detected_at': row.detected_at.isoformat() if row.detected_at else None
+        })
+        return record
+
+    @staticmethod
+    def iter_ndjson(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """每条记录一行 JSON"""
+        for record in records:
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+
+    @staticmethod
+    def iter_csv(records: Iterable[Dict[str, Any]], columns: List[str]) -> Iterator[str]:
+        """
+        CSV 行（第一行为表头）
+
+        以 UTF-8 BOM 开头，Excel 打开时能正确识别中文；题目ID列表用分号连接
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def flush() -> str:
+            text = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return text
+
+        writer.writerow(columns)
+        yield '\ufeff' + flush()
+        for record in records:
+            writer.writerow([
+                ';'.join(str(qid) for qid in value) if isinstance(value, list) else value
+                for value in (record.get(column) for column in columns)
+            ])
+            yield flush()
+
+    @staticmethod
+    def _chunked(lines: Iterable[str]) -> Iterator[bytes]:
+        """把文本行攒成约 CHUNK_SIZE 字节的块，减少响应写入次数"""
+        parts: List[bytes] = []
+        size = 0
+        for line in lines:
+            data = line.encode('utf-8')
+            parts.append(data)
+            size += len(data)
+            if size >= DedupExportService.CHUNK_SIZE:
+                yield b''.join(parts)
+                parts = []
+                size = 0
+        if parts:
+            yield b''.join(parts)
+
+    @staticmethod
+    def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+        """边读边压缩为 gzip 格式（不缓存完整内容）"""
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
@@ -0,0 +1,294 @@
+"""
+去重任务执行队列
+启动或恢复任务时写入 dedup_task_jobs 表，执行器（Web 进程内置的执行器或独立的 worker 进程）
+轮询认领后执行。队列保存在数据库中，进程重启后不会丢失；认领使用带状态条件的 UPDATE，
+不依赖 SELECT ... FOR UPDATE SKIP LOCKED，SQLite 上同样可用
+
+认领的任务带有租约：执行器每次轮询为自己认领的任务续租，执行器崩溃、重新部署后换了ID
+或所在机器下线时租约到期，任意执行器认领时把租约到期的任务重新排队，从检查点继续执行
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import or_
+from src.models import db
+from src.models.question_dedup import DedupTask, DedupTaskJob
+
+
+class DedupJobQueue:
+    """去重任务执行队列"""
+
+    # 认领时的任务状态要求：暂停、取消、完成或出错的任务不会被执行
+    RUNNABLE_TASK_STATUSES = ('pending', 'running')
+
+    # 默认认领租约时长（秒），可通过 DEDUP_JOB_LEASE_SECONDS 配置，应为执行器轮询间隔的数倍
+    DEFAULT_LEASE_SECONDS = 60
+
+    @staticmethod
+    def enqueue(task_id: int, priority: int = 0) -> DedupTaskJob:
+        """
+        任务入队（已在队列中或正在执行时不重复入队）
+
+        Args:
+            task_id: 任务ID
+            priority: 优先级，数值越大越先认领
+
+        Returns:
+            队列记录
+        """
+        job = DedupTaskJob.query.filter_by(task_id=task_id).first()
+        if job is None:
+            job = DedupTaskJob(task_id=task_id, priority=priority, attempts=0)
+            db.session.add(job)
+        elif job.status == 'finished':
+            job.status = 'queued'
+            job.priority = priority
+            job.worker_id = None
+            job.enqueued_at = datetime.now()
+            job.claimed_at = None
+            job.finished_at = None
+            job.lease_expires_at = None
+        else:
+            job.priority = priority
+        db.session.commit()
+        return job
+
+    @staticmethod
+    def is_active(task_id: int) -> bool:
+        """任务是否在队列中等待或正在被执行器执行"""
+        return db.session.query(
+            DedupTaskJob.query.filter(
+                DedupTaskJob.task_id == task_id,
+                DedupTaskJob.status.in_(('queued', 'claimed'))
+            ).exists()
+        ).scalar()
+
+    @staticmethod
+    def set_priority(task_id: int, priority: int):
+        """调整队列中任务的优先级"""
+        DedupTaskJob.query.filter_by(task_id=task_id).update(
+            {'priority': priority}, synchronize_session=False
+        )
+        db.session.commit()
+
+    @staticmethod
+    def dequeue(task_id: int):
+        """移出尚未被认领的任务（取消任务时调用，正在执行的任务由控制信号停止）"""
+        DedupTaskJob.query.filter_by(task_id=task_id, status='queued').update(
+            {'status': 'finished', 'finished_at': datetime.now()}, synchronize_session=False
+        )
+        db.session.commit()
+
+    @staticmethod
+    def claim(worker_id: str, limit: int = 1, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> List[int]:
+        """
+        认领待执行的任务（按优先级从高到低、入队先后），认领前先把租约到期的任务重新排队
+
+        多个执行器同时认领时，只有状态仍为 queued 的那一次 UPDATE 生效
+
+        Args:
+            worker_id: 执行器ID
+            limit: 最多认领的任务数
+            lease_seconds: 认领租约时长（秒）
+
+        Returns:
+            认领到的任务ID列表
+        """
+        DedupJobQueue.requeue_expired()
+        if limit <= 0:
+            return []
+        candidates = db.session.query(DedupTaskJob.id, DedupTaskJob.task_id, DedupTask.status).join(
+            DedupTask, DedupTask.id == DedupTaskJob.task_id
+        ).filter(
+            DedupTaskJob.status == 'queued'
+        ).order_by(DedupTaskJob.priority.desc(), DedupTaskJob.id).limit(limit * 4).all()
+
+        claimed = []
+        for row in candidates:
+            if row.status not in DedupJobQueue.RUNNABLE_TASK_STATUSES:
+                # 入队后被暂停或取消的任务直接结束，恢复时重新入队
+                DedupJobQueue._finish_job(row.id, 'queued')
+                continue
+            now = datetime.now()
+            updated = DedupTaskJob.query.filter(
+                DedupTaskJob.id == row.id,
+                DedupTaskJob.status == 'queued'
+            ).update({
+                'status': 'claimed',
+                'worker_id': worker_id,
+                'claimed_at': now,
+                'heartbeat_at': now,
+                'lease_expires_at': now + timedelta(seconds=lease_seconds),
+                'attempts': DedupTaskJob.attempts + 1
+            }, synchronize_session=False)
+            db.session.commit()
+            if updated:
+                claimed.append(row.task_id)
+                if len(claimed) >= limit:
+                    break
+        return claimed
+
+    @staticmethod
+    def assist_candidates(worker_id: str, exclude: List[int], limit: int) -> List[int]:
+        """
+        可以协助执行的任务：开启了 config.distributed、由其他执行器执行中，且还有可以租用的分组
+
+        Args:
+            worker_id: 执行器ID
+            exclude: 该执行器已在执行的任务ID
+            limit: 最多返回的任务数
+
+        Returns:
+            任务ID列表（按优先级从高到低）
+        """
+        if limit <= 0:
+            return []
+        from src.services.dedup_checkpoint_store import DedupCheckpointStore
+
+        tasks = DedupTask.query.join(DedupTaskJob, DedupTaskJob.task_id == DedupTask.id).filter(
+            DedupTaskJob.status == 'claimed',
+            DedupTaskJob.worker_id != worker_id,
+            DedupTask.status == 'running'
+        ).order_by(DedupTaskJob.priority.desc(), DedupTaskJob.id).all()
+
+        candidates = []
+        for task in tasks:
+            if task.id in exclude or not task.get_config().get('distributed'):
+                continue
+            if DedupCheckpointStore.has_leasable(task.id, worker_id):
+                candidates.append(task.id)
+                if len(candidates) >= limit:
+                    break
+        return candidates
+
+    @staticmethod
+    def _finish_job(job_id: int, from_status: str):
+        DedupTaskJob.query.filter(
+            DedupTaskJob.id == job_id,
+            DedupTaskJob.status == from_status
+        ).update({
+            'status': 'finished', 'finished_at': datetime.now(), 'lease_expires_at': None
+        }, synchronize_session=False)
+        db.session.commit()
+
+    @staticmethod
+    def finish(task_id: int, worker_id: str):
+        """执行器执行结束（完成、出错、取消或任务被删除）后调用"""
+        DedupTaskJob.query.filter_by(task_id=task_id, worker_id=worker_id, status='claimed').update(
+            {'status': 'finished', 'finished_at': datetime.now(), 'lease_expires_at': None},
+            synchronize_session=False
+        )
+        db.session.commit()
+
+    @staticmethod
+    def heartbeat(worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> int:
+        """
+        为执行器认领的所有任务续租并提交（执行器每次轮询时调用）
+
+        Returns:
+            续租的任务数
+        """
+        now = datetime.now()
+        updated = DedupTaskJob.query.filter(
+            DedupTaskJob.worker_id == worker_id,
+            DedupTaskJob.status == 'claimed'
+        ).update({
+            'heartbeat_at': now,
+            'lease_expires_at': now + timedelta(seconds=lease_seconds)
+        }, synchronize_session=False)
+        db.session.commit()
+        return updated
+
+    @staticmethod
+    def _requeue_claimed(job_id: int, task_id: int, *conditions) -> bool:
+        """
+        把认领中的任务重新排队（带条件的 UPDATE，多个执行器同时处理时只有一个生效）并提交
+
+        任务仍可执行时状态改为 pending，等待重新认领；已暂停、取消或完成的任务结束队列记录
+
+        Returns:
+            是否重新排队
+        """
+        task = DedupTask.query.get(task_id)
+        runnable = task is not None and task.status in DedupJobQueue.RUNNABLE_TASK_STATUSES
+        values = {'worker_id': None, 'claimed_at': None, 'lease_expires_at': None}
+        values.update({'status': 'queued'} if runnable else {'status': 'finished', 'finished_at': datetime.now()})
+        updated = DedupTaskJob.query.filter(
+            DedupTaskJob.id == job_id,
+            DedupTaskJob.status == 'claimed',
+            *conditions
+        ).update(values, synchronize_session=False)
+        if updated and runnable:
+            task.status = 'pending'
+        db.session.commit()
+        return bool(updated and runnable)
+
+    @staticmethod
+    def requeue_expired() -> List[int]:
+        """
+        把租约已到期的认领任务重新排队（认领执行器已退出，无论其执行器ID）
+
+        没有租约的认领记录（添加租约字段前认领的任务）同样视为已到期
+
+        Returns:
+            重新排队的任务ID列表
+        """
+        expired = or_(DedupTaskJob.lease_expires_at.is_(None), DedupTaskJob.lease_expires_at < datetime.now())
+        jobs = db.session.query(DedupTaskJob.id, DedupTaskJob.task_id).filter(
+            DedupTaskJob.status == 'claimed', expired
+        ).all()
+        return [
+            job.task_id for job in jobs
+            if DedupJobQueue._requeue_claimed(job.id, job.task_id, expired)
+        ]
+
+    @staticmethod
+    def recover_orphans(worker_id: str) -> List[int]:
+        """
+        执行器启动时恢复遗留的任务
+
+        - 由同一执行器ID认领的任务（执行器以相同ID重启）：不等租约到期，立即重新排队
+        - 租约已到期的认领任务（执行器崩溃、换了ID或所在机器下线）：重新排队
+        - 状态为 running 却没有在队列中的任务（旧版本在线程中执行时进程退出）：重新入队
+
+        重新入队的任务状态改为 pending，被执行器认领后再变为 running；
+        已暂停、取消或完成的任务结束队列记录（恢复时重新入队）
+
+        Args:
+            worker_id: 执行器ID
+
+        Returns:
+            重新入队的任务ID列表
+        """
+        jobs = db.session.query(DedupTaskJob.id, DedupTaskJob.task_id).filter(
+            DedupTaskJob.worker_id == worker_id,
+            DedupTaskJob.status == 'claimed'
+        ).all()
+        recovered = [
+            job.task_id for job in jobs
+            if DedupJobQueue._requeue_claimed(job.id, job.task_id, DedupTaskJob.worker_id == worker_id)
+        ]
+        recovered.extend(DedupJobQueue.requeue_expired())
+
+        active_task_ids = db.session.query(DedupTaskJob.task_id).filter(
+            DedupTaskJob.status.in_(('queued', 'claimed'))
+        )
+        stranded = DedupTask.query.filter(
+            DedupTask.status == 'running',
+            ~DedupTask.id.in_(active_task_ids)
+        ).all()
+        for task in stranded:
+            task.status = 'pending'
+            db.session.commit()
+            DedupJobQueue.enqueue(task.id, DedupJobQueue._priority_of(task))
+            recovered.append(task.id)
+        return recovered
+
+    @staticmethod
+    def _priority_of(task: DedupTask) -> int:
+        from src.services.dedup_scheduler import resolve_priority
+        return resolve_priority(task.get_config())
+
+    @staticmethod
+    def get_job(task_id: int) -> Optional[DedupTaskJob]:
+        """获取任务的队列记录"""
+        return DedupTaskJob.query.filter_by(task_id=task_id).first()
@@ -0,0 +1,174 @@
+"""
+去重任务执行器
+从 dedup_task_jobs 队列认领任务，每个任务在一个执行线程中运行（见 dedup_task_runner）。
+执行器可以内置在 Web 进程中（DEDUP_EMBEDDED_WORKER），也可以通过 dedup_worker.py 独立运行，
+Web 进程重启或重新部署时独立执行器中的任务不受影响
+
+任务在其他进程中被暂停/恢复/取消时只修改了数据库状态，执行器每轮轮询时把自己执行中任务的
+数据库状态同步到内存控制信号，执行线程在下一个检查点响应
+
+开启 config.distributed 的任务由认领的执行器负责初始化和收尾，其他执行器有空闲容量时以协助方式加入，
+按分组租约分担剩余分组（见 DedupCheckpointStore）
+
+执行器每次轮询为认领的任务续租（见 DedupJobQueue.heartbeat），执行器退出后租约到期，
+任务由其他执行器（或以新ID重启的同一台机器）重新排队执行
+"""
+import os
+import socket
+import threading
+from typing import Dict, Optional
+from src.models import db
+from src.models.question_dedup import DedupTask
+from src.services.dedup_job_queue import DedupJobQueue
+from src.services.dedup_task_control import DedupTaskControl
+
+
+def default_worker_id(role: str) -> str:
+    """
+    默认执行器ID：主机名:角色（web / worker）:进程号
+
+    同一台机器上的多个执行器进程ID互不相同，各自认领的任务和分组租约不会被当作对方的
+    """
+    return f"{socket.gethostname()}:{role}:{os.getpid()}"
+
+
+class DedupJobWorker:
+    """去重任务执行器"""
+
+    # 有任务入队时唤醒当前进程中的执行器，不必等到下一次轮询
+    _wakeup = threading.Event()
+
+    def __init__(self, app, worker_id: str, max_tasks: int = 4, poll_interval: float = 1.0,
+                 lease_seconds: Optional[float] = None):
+        """
+        Args:
+            app: Flask 应用
+            worker_id: 执行器ID（同一时刻每个执行器进程必须唯一；以相同ID重启时立即恢复上次遗留的任务，
+                否则遗留的任务在认领租约到期后恢复）
+            max_tasks: 同时执行的任务数
+            poll_interval: 轮询队列、同步任务状态的间隔（秒）
+            lease_seconds: 认领租约时长（秒），默认为 DEDUP_JOB_LEASE_SECONDS
+        """
+        self.app = app
+        self.worker_id = worker_id
+        self.max_tasks = max(1, int(max_tasks))
+        self.poll_interval = poll_interval
+        if lease_seconds is None:
+            lease_seconds = app.config.get('DEDUP_JOB_LEASE_SECONDS', DedupJobQueue.DEFAULT_LEASE_SECONDS)
+        # 租约至少覆盖几次轮询，避免轮询稍有延迟就被其他执行器重新排队
+        self.lease_seconds = max(float(lease_seconds), poll_interval * 5)
+        # {task_id: 执行线程}
+        self._threads: Dict[int, threading.Thread] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._loop_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def notify():
+        """通知当前进程中的执行器立即认领（任务入队后调用）"""
+        DedupJobWorker._wakeup.set()
+
+    def start(self) -> threading.Thread:
+        """在后台线程中运行执行器（内置在 Web 进程中时使用）"""
+        self._loop_thread = threading.Thread(
+            target=self.run_forever, name=f'dedup-worker-{self.worker_id}', daemon=True
+        )
+        self._loop_thread.start()
+        return self._loop_thread
+
+    def stop(self):
+        """停止认领新任务（执行中的任务继续运行到结束）"""
+        self._stopped.set()
+        DedupJobWorker._wakeup.set()
+
+    def running_task_ids(self):
+        """执行中的任务ID"""
+        with self._lock:
+            return [task_id for task_id, thread in self._threads.items() if thread.is_alive()]
+
+    def run_forever(self):
+        """执行器主循环：恢复遗留任务后，按间隔续租、同步任务状态、认领新任务"""
+        print(f"去重任务执行器 {self.worker_id} 已启动（最多同时执行 {self.max_tasks} 个任务）")
+        with self.app.app_context():
+            try:
+                recovered = DedupJobQueue.recover_orphans(self.worker_id)
+                if recovered:
+                    print(f"执行器 {self.worker_id} 重新排队遗留任务: {recovered}")
+            except Exception as e:
+                db.session.rollback()
+                print(f"恢复遗留任务失败: {e}")
+            finally:
+                db.session.remove()
+
+        while not self._stopped.is_set():
+            with self.app.app_context():
+                try:
+                    DedupJobQueue.heartbeat(self.worker_id, self.lease_seconds)
+                    self._sync_running_tasks()
+                    self._claim_tasks()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"执行器 {self.worker_id} 轮询失败: {e}")
+                finally:
+                    db.session.remove()
+            DedupJobWorker._wakeup.wait(self.poll_interval)
+            DedupJobWorker._wakeup.clear()
+
+    def _sync_running_tasks(self):
+        """把执行中任务的数据库状态同步到内存控制信号（任务被其他进程暂停/恢复/取消/删除时生效）"""
+        task_ids = self.running_task_ids()
+        if not task_ids:
+            return
+        statuses = dict(
+            db.session.query(DedupTask.id, DedupTask.status).filter(DedupTask.id.in_(task_ids)).all()
+        )
+        for task_id in task_ids:
+            # 任务被删除时按取消处理
+            DedupTaskControl.sync(task_id, statuses.get(task_id, 'cancelled'))
+
+    def _claim_tasks(self):
+        """
+        按空闲容量认领任务，每个任务启动一个执行线程；
+        还有空闲容量时协助执行其他执行器中开启了 config.distributed 的任务
+        """
+        with self._lock:
+            self._threads = {task_id: thread for task_id, thread in self._threads.items() if thread.is_alive()}
+            capacity = self.max_tasks - len(self._threads)
+        claimed = DedupJobQueue.claim(self.worker_id, capacity, self.lease_seconds)
+        for task_id in claimed:
+            self._start_thread(task_id, assist=False)
+            print(f"执行器 {self.worker_id} 认领任务 {task_id}")
+
+        capacity -= len(claimed)
+        if capacity > 0:
+            for task_id in DedupJobQueue.assist_candidates(self.worker_id, self.running_task_ids(), capacity):
+                self._start_thread(task_id, assist=True)
+                print(f"执行器 {self.worker_id} 协助执行任务 {task_id}")
+
+    def _start_thread(self, task_id: int, assist: bool):
+        thread = threading.Thread(
+            target=self._run_task, args=(task_id, assist), name=f'dedup-task-{task_id}', daemon=True
+        )
+        with self._lock:
+            self._threads[task_id] = thread
+        thread.start()
+
+    def _run_task(self, task_id: int, assist: bool = False):
+        """执行线程：执行任务，结束后标记队列记录为已结束（协助执行时队列记录由认领的执行器处理）"""
+        from src.services.dedup_task_runner import execute_dedup_task
+
+        try:
+            execute_dedup_task(task_id, worker_id=self.worker_id, assist=assist)
+        finally:
+            if not assist:
+                self._finish(task_id)
+
+    def _finish(self, task_id: int):
+        with self.app.app_context():
+            try:
+                DedupJobQueue.finish(task_id, self.worker_id)
+            except Exception as e:
+                db.session.rollback()
+                print(f"标记任务 {task_id} 执行结束失败: {e}")
+            finally:
+                db.session.remove()
@@ -0,0 +1,240 @@
+"""
+去重任务调度
+多个去重任务可以同时执行（每个任务一个执行线程，进度各自保存在检查点表中），
+调度器限制所有任务同时处理的分组数，并按优先级和轮转顺序分配处理名额：
+
+- 每处理一个分组占用一个名额，任务在分组之间让出名额（yield_slot），
+  有其他任务等待时轮流处理分组
+- 有多个任务等待时，优先级高的任务先获得名额；优先级相同时最久没有获得名额的任务优先，
+  小任务不会排在整库任务的所有分组之后
+"""
+import os
+import itertools
+import threading
+from typing import Dict, Any, Optional
+
+
+def resolve_priority(config: Dict[str, Any]) -> int:
+    """
+    从任务配置中读取优先级（config.priority，数值越大越优先，默认 0）
+
+    Args:
+        config: 任务配置字典
+
+    Returns:
+        优先级
+    """
+    try:
+        return int(config.get('priority') or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class _TaskSlots:
+    """单个任务的调度状态"""
+
+    def __init__(self, priority: int):
+        self.priority = priority
+        # 当前占用的名额数
+        self.held = 0
+        # 阻塞等待名额的线程数
+        self.waiting = 0
+        # 最近一次获得名额的序号（越小表示越久没有获得名额）
+        self.last_granted = 0
+
+
+class DedupTaskScheduler:
+    """去重任务调度器（进程内全局）"""
+
+    # 同时处理的分组数上限（所有任务共享），0 表示 CPU 核数
+    _max_concurrency = 0
+
+    # {task_id: _TaskSlots}
+    _tasks: Dict[int, _TaskSlots] = {}
+    _condition = threading.Condition()
+    _sequence = itertools.count(1)
+
+    @staticmethod
+    def configure(max_concurrency: int):
+        """设置全局并发上限（0 表示 CPU 核数）"""
+        with DedupTaskScheduler._condition:
+            DedupTaskScheduler._max_concurrency = max(0, int(max_concurrency or 0))
+            DedupTaskScheduler._condition.notify_all()
+
+    @staticmethod
+    def max_concurrency() -> int:
+        """当前的全局并发上限"""
+        return DedupTaskScheduler._max_concurrency or os.cpu_count() or 1
+
+    @staticmethod
+    def register(task_id: int, priority: int = 0):
+        """
+        任务开始执行时注册（已注册时只更新优先级）
+
+        Args:
+            task_id: 任务ID
+            priority: 优先级，数值越大越优先
+        """
+        with DedupTaskScheduler._condition:
+            slots = DedupTaskScheduler._tasks.get(task_id)
+            if slots is None:
+                DedupTaskScheduler._tasks[task_id] = _TaskSlots(priority)
+            else:
+                slots.priority = priority
+            DedupTaskScheduler._condition.notify_all()
+
+    @staticmethod
+    def unregister(task_id: int):
+        """任务执行线程退出时注销，归还任务占用的所有名额"""
+        with DedupTaskScheduler._condition:
+            DedupTaskScheduler._tasks.pop(task_id, None)
+            DedupTaskScheduler._condition.notify_all()
+
+    @staticmethod
+    def set_priority(task_id: int, priority: int) -> bool:
+        """调整执行中任务的优先级，返回任务是否在当前进程中执行"""
+        with DedupTaskScheduler._condition:
+            slots = DedupTaskScheduler._tasks.get(task_id)
+            if slots is None:
+                return False
+            slots.priority = priority
+            DedupTaskScheduler._condition.notify_all()
+            return True
+
+    @staticmethod
+    def _held_total() -> int:
+        return sum(slots.held for slots in DedupTaskScheduler._tasks.values())
+
+    @staticmethod
+    def _rank(task_id: int, slots: _TaskSlots):
+        return (-slots.priority, slots.last_granted, task_id)
+
+    @staticmethod
+    def _best_waiter():
+        """排在最前面的阻塞等待任务的排序键，没有等待任务时返回 None"""
+        ranks = [
+            DedupTaskScheduler._rank(task_id, slots)
+            for task_id, slots in DedupTaskScheduler._tasks.items() if slots.waiting
+        ]
+        return min(ranks) if ranks else None
+
+    @staticmethod
+    def _grant(slots: _TaskSlots):
+        slots.held += 1
+        slots.last_granted = next(DedupTaskScheduler._sequence)
+
+    @staticmethod
+    def acquire(task_id: int, timeout: Optional[float] = None) -> bool:
+        """
+        阻塞获取一个处理名额（处理一个分组前调用，处理完后调用 release 归还）
+
+        Args:
+            task_id: 任务ID（未注册时按优先级 0 注册）
+            timeout: 最长等待秒数，为空时一直等待
+
+        Returns:
+            是否获得名额；超时返回 False（调用方可以借机检查暂停/取消信号后重试）
+        """
+        condition = DedupTaskScheduler._condition
+        with condition:
+            slots = DedupTaskScheduler._tasks.get(task_id)
+            if slots is None:
+                slots = DedupTaskScheduler._tasks[task_id] = _TaskSlots(0)
+
+            def cancelled():
+                return DedupTaskScheduler._tasks.get(task_id) is not slots
+
+            def ready():
+                return (DedupTaskScheduler._held_total() < DedupTaskScheduler.max_concurrency()
+                        and DedupTaskScheduler._best_waiter() == DedupTaskScheduler._rank(task_id, slots))
+
+            slots.waiting += 1
+            try:
+                # 等待期间任务被注销时立即返回
+                condition.wait_for(lambda: cancelled() or ready(), timeout)
+                if cancelled() or not ready():
+                    return False
+                DedupTaskScheduler._grant(slots)
+                return True
+            finally:
+                slots.waiting -= 1
+                condition.notify_all()
+
+    @staticmethod
+    def try_acquire(task_id: int) -> bool:
+        """
+        不阻塞地获取一个处理名额（进程池并行执行时在提交分组前调用）
+
+        有空闲名额、且没有排在该任务前面的阻塞等待任务时才成功
+
+        Returns:
+            是否获得名额
+        """
+        with DedupTaskScheduler._condition:
+            slots = DedupTaskScheduler._tasks.get(task_id)
+            if slots is None:
+                slots = DedupTaskScheduler._tasks[task_id] = _TaskSlots(0)
+            if DedupTaskScheduler._held_total() >= DedupTaskScheduler.max_concurrency():
+                return False
+            best = DedupTaskScheduler._best_waiter()
+            if best is not None and best < DedupTaskScheduler._rank(task_id, slots):
+                return False
+            DedupTaskScheduler._grant(slots)
+            return True
+
+    @staticmethod
+    def yield_slot(task_id: int, timeout: Optional[float] = None) -> bool:
+        """
+        在分组之间让出名额（任务已占用名额时调用）
+
+        归还名额并以等待者身份重新排队（两步在同一把锁内完成，其他线程看不到空档）：
+        有排在前面的等待任务（优先级更高，或同优先级下更久没有获得名额）时由它先获得名额，
+        否则立即重新获得名额
+
+        Args:
+            task_id: 任务ID
+            timeout: 最长等待秒数，为空时一直等待
+
+        Returns:
+            是否重新获得名额；返回 False 时任务已不再占用名额
+        """
+        # Condition 默认使用可重入锁，release/acquire 在同一把锁内完成
+        with DedupTaskScheduler._condition:
+            DedupTaskScheduler.release(task_id)
+            return DedupTaskScheduler.acquire(task_id, timeout)
+
+    @staticmethod
+    def release(task_id: int):
+        """归还一个处理名额"""
+        with DedupTaskScheduler._condition:
+            slots = DedupTaskScheduler._tasks.get(task_id)
+            if slots is not None and slots.held > 0:
+                slots.held -= 1
+            DedupTaskScheduler._condition.notify_all()
+
+    @staticmethod
+    def get_status() -> Dict[str, Any]:
+        """
+        调度器状态
+
+        Returns:
+            {'max_concurrency': 上限, 'in_use': 已占用名额, 'tasks': [{task_id, priority, held, waiting}, ...]}
+        """
+        with DedupTaskScheduler._condition:
+            tasks = [
+                {
+                    'task_id': task_id,
+                    'priority': slots.priority,
+                    'held': slots.held,
+                    'waiting': slots.waiting > 0
+                }
+                for task_id, slots in sorted(
+                    DedupTaskScheduler._tasks.items(),
+                    key=lambda item: DedupTaskScheduler._rank(*item)
+                )
+            ]
+            return {
+                'max_concurrency': DedupTaskScheduler.max_concurrency(),
+                'in_use': DedupTaskScheduler._held_total(),
+                'tasks': tasks
+            }
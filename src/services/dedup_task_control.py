@@ -0,0 +1,191 @@
+"""
+去重任务控制
+暂停、恢复、取消信号保存在内存中，任务执行线程和工作进程在处理步骤之间、
+以及逐批处理题目时检查，不需要反复查询 dedup_tasks 表
+
+路由在更新数据库状态的同时设置控制信号；执行线程暂停时阻塞在条件变量上，
+恢复或取消后立即被唤醒
+"""
+import threading
+import multiprocessing
+from typing import Dict, Iterable, Iterator, List, Optional, TypeVar
+
+RUNNING = 0
+PAUSED = 1
+CANCELLED = 2
+
+_STATUS_NAMES = {RUNNING: 'running', PAUSED: 'paused', CANCELLED: 'cancelled'}
+
+# 逐条处理题目时，每隔多少条检查一次控制信号
+CHECK_INTERVAL = 1000
+
+T = TypeVar('T')
+
+
+class TaskControlToken:
+    """
+    单个任务的控制信号
+
+    状态保存在 spawn 上下文创建的共享内存值中，可以通过进程池的 initializer
+    传给工作进程，工作进程读取到的状态与主进程实时一致
+    """
+
+    def __init__(self, task_id: int, state=None):
+        """
+        Args:
+            task_id: 任务ID
+            state: 已有的共享状态值（工作进程中传入主进程创建的值），为空时新建
+        """
+        self.task_id = task_id
+        self.state = state if state is not None else multiprocessing.get_context('spawn').RawValue('b', RUNNING)
+        self._changed = threading.Condition()
+
+    @property
+    def status(self) -> str:
+        """当前状态：running / paused / cancelled"""
+        return _STATUS_NAMES[self.state.value]
+
+    def set(self, value: int):
+        """设置状态并唤醒等待中的线程"""
+        with self._changed:
+            self.state.value = value
+            self._changed.notify_all()
+
+    def check(self):
+        """
+        检查控制信号（只读取一个共享内存值）
+
+        Raises:
+            RuntimeError: 任务被暂停或取消（错误信息与数据库状态检查一致）
+        """
+        value = self.state.value
+        if value == PAUSED:
+            raise RuntimeError(f"任务 {self.task_id} 已暂停")
+        if value == CANCELLED:
+            raise RuntimeError(f"任务 {self.task_id} 状态为 cancelled")
+
+    def wait_while_paused(self, timeout: Optional[float] = None) -> str:
+        """
+        暂停期间阻塞，恢复或取消时立即返回
+
+        Args:
+            timeout: 最长等待秒数，为空时一直等待
+
+        Returns:
+            返回时的状态
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.state.value != PAUSED, timeout)
+        return self.status
+
+
+class DedupTaskControl:
+    """去重任务控制信号注册表"""
+
+    # {task_id: TaskControlToken}
+    _tokens: Dict[int, TaskControlToken] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def register(task_id: int) -> TaskControlToken:
+        """
+        任务开始执行时注册控制信号（已注册时复用并重置为运行中）
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            控制信号
+        """
+        with DedupTaskControl._lock:
+            token = DedupTaskControl._tokens.get(task_id)
+            if token is None:
+                token = TaskControlToken(task_id)
+                DedupTaskControl._tokens[task_id] = token
+        token.set(RUNNING)
+        return token
+
+    @staticmethod
+    def attach(task_id: int, state) -> TaskControlToken:
+        """在工作进程中使用主进程的共享状态注册控制信号"""
+        token = TaskControlToken(task_id, state)
+        with DedupTaskControl._lock:
+            DedupTaskControl._tokens[task_id] = token
+        return token
+
+    @staticmethod
+    def unregister(task_id: int):
+        """任务执行线程退出时移除控制信号"""
+        with DedupTaskControl._lock:
+            DedupTaskControl._tokens.pop(task_id, None)
+
+    @staticmethod
+    def get(task_id: Optional[int]) -> Optional[TaskControlToken]:
+        """获取任务的控制信号，任务不在当前进程中执行时返回 None"""
+        if not task_id:
+            return None
+        with DedupTaskControl._lock:
+            return DedupTaskControl._tokens.get(task_id)
+
+    @staticmethod
+    def _set(task_id: int, value: int) -> bool:
+        token = DedupTaskControl.get(task_id)
+        if token is None:
+            return False
+        token.set(value)
+        return True
+
+    @staticmethod
+    def pause(task_id: int) -> bool:
+        """发送暂停信号，返回任务是否在当前进程中执行"""
+        return DedupTaskControl._set(task_id, PAUSED)
+
+    @staticmethod
+    def resume(task_id: int) -> bool:
+        """发送恢复信号，返回任务是否在当前进程中执行"""
+        return DedupTaskControl._set(task_id, RUNNING)
+
+    @staticmethod
+    def cancel(task_id: int) -> bool:
+        """发送取消信号，返回任务是否在当前进程中执行"""
+        return DedupTaskControl._set(task_id, CANCELLED)
+
+    @staticmethod
+    def sync(task_id: int, status: str) -> bool:
+        """
+        按数据库中的任务状态设置控制信号（running → 运行中，paused → 暂停，其他 → 取消），
+        用于任务在其他进程中被暂停/恢复/取消的情况
+
+        Returns:
+            任务是否在当前进程中执行
+        """
+        token = DedupTaskControl.get(task_id)
+        if token is None:
+            return False
+        target = {'running': RUNNING, 'paused': PAUSED}.get(status, CANCELLED)
+        if token.state.value != target:
+            token.set(target)
+        return True
+
+    @staticmethod
+    def running_task_ids() -> List[int]:
+        """在当前进程中执行的任务ID"""
+        with DedupTaskControl._lock:
+            return list(DedupTaskControl._tokens)
+
+    @staticmethod
+    def checked(items: Iterable[T], task_id: Optional[int], interval: int = CHECK_INTERVAL) -> Iterator[T]:
+        """
+        逐条产出 items，每 interval 条检查一次控制信号
+
+        Raises:
+            RuntimeError: 任务被暂停或取消
+        """
+        token = DedupTaskControl.get(task_id)
+        if token is None:
+            yield from items
+            return
+        for count, item in enumerate(items):
+            if count % interval == 0:
+                token.check()
+            yield item
@@ -0,0 +1,589 @@
+"""
+去重任务执行
+执行器（Web 进程内置的执行器或独立的 worker 进程，见 dedup_job_worker）从执行队列认领任务后，
+在执行线程中调用 execute_dedup_task：按检查点逐个（或由进程池并行）处理分组、保存结果并推送进度
+
+分组按租约分配（见 DedupCheckpointStore），开启 config.distributed 的任务可以由多个执行器
+同时处理：认领任务的执行器负责初始化和收尾，其他执行器以协助方式加入，各自租用未处理的分组
+"""
+import os
+import time
+import socket
+import threading
+from typing import Dict, Any, Optional
+from datetime import datetime
+from src.models import db
+from src.models.question_dedup import DedupTask
+from src.services.question_service import QuestionService
+from src.services.question_dedup_service import QuestionDedupService
+from src.services.dedup_worker_pool import SHARD_MIN_QUESTIONS, resolve_max_workers, create_pool, submit_group
+from src.services.dedup_task_control import DedupTaskControl, TaskControlToken
+from src.services.dedup_checkpoint_store import DedupCheckpointStore
+from src.services.dedup_scheduler import DedupTaskScheduler, resolve_priority
+
+# 执行线程与数据库任务状态同步的间隔（秒）
+# 任务在 Web 进程内执行时，暂停/恢复/取消由路由直接写入内存控制信号；
+# 在独立 worker 进程中执行时由执行器按轮询间隔同步，这里的同步只用于兜底
+STATUS_SYNC_INTERVAL = 10.0
+
+# 等待调度器名额时检查暂停/取消信号的间隔（秒）
+SLOT_WAIT_INTERVAL = 0.5
+
+# 其余分组都由其他执行器租用时，重新检查租约的间隔（秒）
+LEASE_WAIT_INTERVAL = 1.0
+
+
+def _sync_task_status(task_id: int, token: Optional[TaskControlToken]) -> Optional[str]:
+    """
+    读取数据库中的任务状态，并同步到内存控制信号
+
+    Args:
+        task_id: 任务ID
+        token: 任务控制信号
+
+    Returns:
+        数据库中的任务状态；任务不存在时返回 None
+    """
+    db.session.expire_all()
+    row = db.session.query(DedupTask.status).filter(DedupTask.id == task_id).first()
+    if row is None:
+        return None
+    if token is not None:
+        DedupTaskControl.sync(task_id, row.status)
+    return row.status
+
+
+def _acquire_slot(task_id: int, token: TaskControlToken, holding: bool = False) -> bool:
+    """
+    获取调度器名额（处理一个分组前调用）
+
+    Args:
+        task_id: 任务ID
+        token: 任务控制信号
+        holding: 任务是否已占用名额（处理完上一个分组），是时先让出名额、
+            由排在前面的等待任务先处理
+
+    Returns:
+        是否获得名额；等待期间任务被暂停/取消，或等待超过 STATUS_SYNC_INTERVAL
+        （需要与数据库同步状态）时返回 False，此时任务不占用名额
+    """
+    if holding and DedupTaskScheduler.yield_slot(task_id, timeout=SLOT_WAIT_INTERVAL):
+        return True
+    deadline = time.monotonic() + STATUS_SYNC_INTERVAL
+    while token.status == 'running' and time.monotonic() < deadline:
+        if DedupTaskScheduler.acquire(task_id, timeout=SLOT_WAIT_INTERVAL):
+            return True
+    return False
+
+
+def _wait_while_paused(task_id: int) -> Optional[DedupTask]:
+    """
+    任务暂停时阻塞等待，直到任务恢复运行或被取消
+
+    Args:
+        task_id: 任务ID
+
+    Returns:
+        恢复运行后的任务对象；任务不存在或被取消/完成/出错时返回 None
+    """
+    from src.routes.websocket import emit_task_progress
+
+    print(f"任务 {task_id} 已暂停，等待恢复...")
+
+    # 发送暂停状态到WebSocket
+    task = DedupTask.query.get(task_id)
+    if task:
+        progress_percentage = 0.0
+        if task.total_groups > 0:
+            progress_percentage = round(
+                (task.processed_groups / task.total_groups) * 100, 2
+            )
+        emit_task_progress(task_id, {
+            'status': 'paused',
+            'processed_groups': task.processed_groups,
+            'total_groups': task.total_groups,
+            'progress_percentage': progress_percentage,
+            'message': '任务已暂停'
+        })
+
+    # 阻塞等待恢复或取消信号（路由设置信号后立即唤醒），超时后与数据库状态同步一次
+    token = DedupTaskControl.get(task_id)
+    while True:
+        if token is not None:
+            token.wait_while_paused(timeout=STATUS_SYNC_INTERVAL)
+        else:
+            time.sleep(0.5)
+        status = _sync_task_status(task_id, token)
+        if status is None:
+            print(f"任务 {task_id} 不存在，停止执行")
+            return None
+
+        if status == 'paused':
+            continue
+
+        if status == 'running':
+            task = DedupTask.query.get(task_id)
+            print(f"任务 {task_id} 已恢复运行，继续处理...")
+
+            # 发送恢复状态到WebSocket
+            progress_percentage = 0.0
+            if task.total_groups > 0:
+                progress_percentage = round(
+                    (task.processed_groups / task.total_groups) * 100, 2
+                )
+            emit_task_progress(task_id, {
+                'status': 'running',
+                'processed_groups': task.processed_groups,
+                'total_groups': task.total_groups,
+                'progress_percentage': progress_percentage,
+                'message': '任务已恢复运行'
+            })
+            return task
+
+        print(f"任务 {task_id} 状态变为 {status}，停止执行")
+        return None
+
+
+def _emit_group_completed(task_id: int, group: Dict[str, Any]):
+    """
+    分组处理完成后推送任务进度到WebSocket
+
+    Args:
+        task_id: 任务ID
+        group: 已完成的分组信息
+    """
+    from src.routes.websocket import emit_task_progress
+    task = DedupTask.query.get(task_id)
+    if not task:
+        return
+
+    progress_percentage = 0.0
+    if task.total_groups > 0:
+        progress_percentage = round(
+            (task.processed_groups / task.total_groups) * 100, 2
+        )
+
+    emit_task_progress(task_id, {
+        'status': task.status,
+        'processed_groups': task.processed_groups,
+        'total_groups': task.total_groups,
+        'progress_percentage': progress_percentage,
+        'current_group': {
+            'type_name': group['type_name'],
+            'subject_name': group['subject_name'],
+            'channel_code': group['channel_code']
+        },
+        'message': f"已完成分组: {group['type_name']} - {group['subject_name']}"
+    })
+
+
+class _LeaseHeartbeat:
+    """
+    分组租约续租线程：执行线程处理分组期间，每隔租约时长的 1/3 为该执行器租用的分组续租一次
+    （一条 UPDATE 覆盖串行执行的当前分组和进程池中所有进行中的分组）
+    """
+
+    def __init__(self, app, task_id: int, worker_id: str, lease_seconds: float):
+        self.app = app
+        self.task_id = task_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f'dedup-lease-{task_id}', daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.wait(self.lease_seconds / 3):
+            with self.app.app_context():
+                try:
+                    DedupCheckpointStore.renew_leases(self.task_id, self.worker_id, self.lease_seconds)
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"任务 {self.task_id} 分组续租失败: {e}")
+                finally:
+                    db.session.remove()
+
+
+def _run_groups_in_pool(task_id: int,
+                        groups: list,
+                        baseline: Optional[Dict[str, Any]],
+                        max_workers: int,
+                        worker_id: str,
+                        lease_seconds: float):
+    """
+    使用进程池并行处理任务的剩余分组
+
+    工作进程负责读取、清洗、生成指纹和精算；当前线程负责租用分组、保存结果、更新进度和推送。
+    题目数达到 SHARD_MIN_QUESTIONS 的分组在工作进程内部再分片并行，分片进程数来自任务剩余的
+    进程数和调度器空闲名额（每个分片进程占用一个名额），进行中的分组和分片进程合计不超过 max_workers。
+    暂停时不再提交新分组，进行中的分组在下一个检查点退出后归还租约，
+    全部退出后等待恢复；取消时直接丢弃进行中的分组。
+    每个进行中的分组占用一个调度器名额，名额不足时少提交分组，与其他任务轮流使用 CPU。
+    其余分组都由其他执行器租用时等待它们完成，租约到期的分组会被重新租用。
+
+    Args:
+        task_id: 任务ID
+        groups: 任务的分组列表（与检查点中的分组序号一致）
+        baseline: 增量分析基线（为空时全量处理）
+        max_workers: 进程数
+        worker_id: 执行器ID（分组租约的持有者）
+        lease_seconds: 分组租约时长（秒）
+
+    Raises:
+        Exception: 工作进程中处理分组失败时抛出原始异常
+    """
+    from concurrent.futures import wait, FIRST_COMPLETED
+
+    # 题目多的分组先提交，避免超大分组最后才开始、拖慢整个任务
+    def group_order(index):
+        return (-groups[index].get('count', 0), index)
+
+    def lease_candidates():
+        busy = set(in_flight.values())
+        return sorted(
+            (index for index in DedupCheckpointStore.leasable_indexes(task_id, worker_id) if index not in busy),
+            key=group_order
+        )
+
+    print(f"任务 {task_id} 使用 {max_workers} 个进程并行处理 "
+          f"{len(DedupCheckpointStore.pending_indexes(task_id))} 个分组")
+
+    def busy_slots():
+        return len(in_flight) + sum(shard_slots.values())
+
+    token = DedupTaskControl.get(task_id) or DedupTaskControl.register(task_id)
+    pool = create_pool(max_workers, task_id=task_id)
+    in_flight = {}
+    # {future: 分片额外占用的调度器名额}
+    shard_slots = {}
+    last_sync = time.monotonic()
+    try:
+        while True:
+            # 状态以内存控制信号为准，定期与数据库同步一次
+            if time.monotonic() - last_sync >= STATUS_SYNC_INTERVAL:
+                if _sync_task_status(task_id, token) is None:
+                    print(f"任务 {task_id} 不存在，停止执行")
+                    break
+                last_sync = time.monotonic()
+
+            status = token.status
+            if status == 'cancelled':
+                print(f"任务 {task_id} 已停止执行")
+                break
+
+            if status == 'paused' and not in_flight:
+                if not _wait_while_paused(task_id):
+                    break
+                last_sync = time.monotonic()
+                continue
+
+            # 没有可租用的分组（其余分组由其他执行器租用中）
+            starved = False
+            if status == 'running':
+                candidates = None
+                while busy_slots() < max_workers and DedupTaskScheduler.try_acquire(task_id):
+                    if candidates is None:
+                        candidates = lease_candidates()
+                    index = None
+                    while candidates:
+                        candidate = candidates.pop(0)
+                        if DedupCheckpointStore.try_lease(task_id, candidate, worker_id, lease_seconds):
+                            index = candidate
+                            break
+                    if index is None:
+                        DedupTaskScheduler.release(task_id)
+                        starved = True
+                        break
+                    # 超大分组在工作进程内部再分片：按剩余进程数再申请空闲名额，
+                    # 工作进程等待分片结果期间不占 CPU，分片进程数为 1 + 额外名额
+                    extra = 0
+                    if not baseline and groups[index].get('count', 0) >= SHARD_MIN_QUESTIONS:
+                        while busy_slots() + 1 + extra < max_workers and DedupTaskScheduler.try_acquire(task_id):
+                            extra += 1
+                    future = submit_group(pool, index, groups[index], baseline, task_id,
+                                          shard_workers=1 + extra)
+                    in_flight[future] = index
+                    shard_slots[future] = extra
+
+            if not in_flight:
+                if DedupCheckpointStore.next_pending_index(task_id) is None:
+                    break
+                time.sleep(LEASE_WAIT_INTERVAL if starved else 0.1)
+                continue
+
+            done, _ = wait(list(in_flight), timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = in_flight.pop(future)
+                for _ in range(1 + shard_slots.pop(future, 0)):
+                    DedupTaskScheduler.release(task_id)
+                group = groups[index]
+                try:
+                    _, results = future.result()
+                except RuntimeError as e:
+                    error_msg = str(e)
+                    if '已暂停' in error_msg:
+                        # 暂停时中断的分组归还租约，恢复后重新租用
+                        print(f"任务 {task_id} 暂停，分组重新排队: {group['type_name']} - {group['subject_name']}")
+                        DedupCheckpointStore.release_lease(task_id, index, worker_id)
+                        continue
+                    if '状态为' in error_msg:
+                        # 任务状态已被改变，下一轮循环退出
+                        continue
+                    raise
+
+                # 保存结果并标记完成（分组完成顺序与序号无关；租约已被其他执行器接管时丢弃结果）
+                if QuestionDedupService.mark_group_index_completed(index, results, task_id=task_id,
+                                                                   worker_id=worker_id):
+                    _emit_group_completed(task_id, group)
+                    print(f"分组处理完成: {group['type_name']} - {group['subject_name']} ({group['channel_code']})")
+                else:
+                    print(f"分组租约已被其他执行器接管，丢弃结果: {group['type_name']} - {group['subject_name']}")
+    finally:
+        for future in in_flight:
+            for _ in range(1 + shard_slots.get(future, 0)):
+                DedupTaskScheduler.release(task_id)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def execute_dedup_task(task_id: int, worker_id: Optional[str] = None, assist: bool = False):
+    """
+    在执行线程中执行去重任务（执行器认领任务后调用，返回时任务已完成、出错、
+    被暂停后取消，或在暂停等待期间被删除）
+
+    Args:
+        task_id: 任务ID
+        worker_id: 执行器ID（分组租约的持有者），为空时使用 主机名:进程号
+        assist: 是否以协助方式加入其他执行器正在执行的任务（不初始化检查点、不修改任务状态，
+            其余分组都已完成时直接退出，由认领任务的执行器完成收尾）
+    """
+    from src.app import app as flask_app
+    from src.services.question_dedup_service import QuestionDedupService
+
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    heartbeat = None
+    with flask_app.app_context():
+        try:
+            task = DedupTask.query.get(task_id)
+            if not task:
+                print(f"任务 {task_id} 不存在")
+                return
+            if assist and (task.status != 'running' or not DedupCheckpointStore.exists(task_id)):
+                return
+
+            # 获取任务配置
+            config = task.get_config()
+            similarity_threshold = config.get('similarity_threshold', 0.8)
+
+            # 增量分析：以历史已完成任务持久化的特征为基线，只处理新增/变更的题目
+            baseline = None
+            if task.analysis_type == 'incremental':
+                baseline = QuestionDedupService.get_incremental_baseline(task_id)
+                if baseline:
+                    print(f"任务 {task_id} 增量分析，基线任务: {baseline['last_task_id']}，"
+                          f"基线时间: {baseline['since']}")
+                else:
+                    print(f"任务 {task_id} 没有已完成的历史任务，增量分析按全量分析执行")
+
+            # 检查是否已有检查点（支持断点续传）
+            groups = DedupCheckpointStore.load_groups(task_id)
+            
+            if groups:
+                # 恢复执行：使用检查点中的分组列表
+                print(f"恢复执行任务 {task_id}，从第 {(task.processed_groups or 0) + 1} 个分组继续")
+            else:
+                # 首次执行：写入分组检查点
+                print(f"首次执行任务 {task_id}，初始化进度...")
+                groups = QuestionService.get_question_groups()
+                DedupCheckpointStore.create(task_id, groups)
+                
+                # 更新任务状态（仅在首次执行时设置）
+                if not task.started_at:
+                    task.started_at = datetime.now()
+                task.total_groups = len(groups)
+                task.total_questions = sum(group['count'] for group in groups)
+                db.session.commit()
+            
+            # 更新任务状态为运行中（恢复时也需要更新），并注册内存控制信号
+            if not assist:
+                task.status = 'running'
+                db.session.commit()
+            DedupTaskControl.register(task_id)
+            DedupTaskScheduler.register(task_id, resolve_priority(config))
+            
+            # 处理期间为租用的分组定期续租，执行器异常退出后租约到期、分组由其他执行器重新租用
+            lease_seconds = flask_app.config.get('DEDUP_GROUP_LEASE_SECONDS', 120)
+            heartbeat = _LeaseHeartbeat(flask_app, task_id, worker_id, lease_seconds).start()
+            
+            print(f"开始处理任务 {task_id}（执行器 {worker_id}{'，协助执行' if assist else ''}），"
+                  f"共 {len(groups)} 个分组，已处理 {task.processed_groups} 个")
+            
+            # 按任务配置选择执行方式：config.max_workers > 1 时由进程池并行处理分组
+            max_workers = resolve_max_workers(config)
+            if max_workers > 1:
+                _run_groups_in_pool(task_id, groups, baseline, max_workers, worker_id, lease_seconds)
+            else:
+                # 循环处理所有分组
+                token = DedupTaskControl.get(task_id)
+                # 是否占用调度器名额（分组之间保持占用，由 _acquire_slot 决定是否让给其他任务）
+                holding = False
+                while True:
+                    # 每个分组开始前与数据库同步一次状态（分组内部只检查内存控制信号）
+                    status = _sync_task_status(task_id, token)
+                    if status is None:
+                        print(f"任务 {task_id} 不存在，停止执行")
+                        break
+                
+                    # 如果任务被暂停，归还调度器名额并等待恢复
+                    if status == 'paused':
+                        if holding:
+                            DedupTaskScheduler.release(task_id)
+                            holding = False
+                        if not _wait_while_paused(task_id):
+                            break
+                        continue
+                
+                    # 如果任务被取消或完成，退出循环
+                    if status in ['cancelled', 'completed', 'error']:
+                        print(f"任务 {task_id} 状态为 {status}，停止执行")
+                        break
+                
+                    # 确保状态是 running 才继续处理
+                    if status != 'running':
+                        print(f"任务 {task_id} 状态为 {status}，停止执行")
+                        break
+                
+                    # 租用下一个分组（其他执行器可能同时在处理该任务的其他分组）
+                    print(f"任务 {task_id} 准备获取下一个分组...")
+                    group_index = DedupCheckpointStore.lease_next(task_id, worker_id, lease_seconds)
+                    if group_index is None:
+                        if DedupCheckpointStore.next_pending_index(task_id) is None:
+                            print(f"任务 {task_id} 所有分组处理完成")
+                            break
+                        # 其余分组由其他执行器租用中：归还调度器名额，等待它们完成或租约到期
+                        if holding:
+                            DedupTaskScheduler.release(task_id)
+                            holding = False
+                        time.sleep(LEASE_WAIT_INTERVAL)
+                        continue
+                    group = groups[group_index]
+                
+                    print(f"任务 {task_id} 获取到分组: {group.get('type_name', 'N/A')} - {group.get('subject_name', 'N/A')}")
+                
+                    # 其他任务占满调度器名额时在此等待，期间被暂停/取消则归还租约、回到循环开头处理
+                    holding = _acquire_slot(task_id, token, holding)
+                    if not holding:
+                        DedupCheckpointStore.release_lease(task_id, group_index, worker_id)
+                        continue
+                
+                    try:
+                        # 处理该分组（传入 task_id 用于状态检查）
+                        if baseline:
+                            results = QuestionDedupService.process_single_group_incremental(
+                                group, baseline, task_id=task_id
+                            )
+                        else:
+                            results = QuestionDedupService.process_single_group(group, task_id=task_id)
+                    
+                        # 标记完成（会自动保存到数据库；租约已被其他执行器接管时丢弃结果）
+                        if not QuestionDedupService.mark_group_index_completed(
+                                group_index, results, task_id=task_id, worker_id=worker_id):
+                            print(f"分组租约已被其他执行器接管，丢弃结果: {group['type_name']} - {group['subject_name']}")
+                            continue
+                    
+                        # 发送进度更新到WebSocket
+                        _emit_group_completed(task_id, group)
+                    
+                        print(f"分组处理完成: {group['type_name']} - {group['subject_name']} ({group['channel_code']})")
+                    
+                    except RuntimeError as e:
+                        # 处理暂停或取消的情况
+                        error_msg = str(e)
+                        if '已暂停' in error_msg:
+                            print(f"任务 {task_id} 在处理分组时被暂停")
+                            # 不更新任务状态，保持 paused 状态，归还租约
+                            # 任务会在下次循环时进入暂停等待逻辑
+                            DedupCheckpointStore.release_lease(task_id, group_index, worker_id)
+                            continue
+                        elif '状态为' in error_msg:
+                            print(f"任务 {task_id} 在处理分组时状态改变: {error_msg}")
+                            # 任务状态已被改变，退出循环
+                            break
+                        else:
+                            # 其他运行时错误，当作普通异常处理
+                            raise
+                    except Exception as e:
+                        print(f"处理分组失败: {str(e)}")
+                        import traceback
+                        traceback.print_exc()
+                    
+                        # 更新任务状态为错误
+                        task = DedupTask.query.get(task_id)
+                        if task:
+                            task.status = 'error'
+                            task.error_message = str(e)
+                            db.session.commit()
+                        
+                            # 发送错误通知到WebSocket
+                            from src.routes.websocket import emit_task_error
+                            emit_task_error(task_id, str(e))
+                        break
+                
+                if holding:
+                    DedupTaskScheduler.release(task_id)
+            
+            # 检查是否完成（所有分组检查点都已完成），协助执行的执行器不负责收尾
+            if not assist and DedupCheckpointStore.next_pending_index(task_id) is None:
+                task = DedupTask.query.get(task_id)
+                if task and task.status not in ('cancelled', 'error'):
+                    task.status = 'completed'
+                    task.completed_at = datetime.now()
+                    db.session.commit()
+                    
+                    # 发送任务完成通知到WebSocket
+                    from src.routes.websocket import emit_task_completed
+                    task_dict = task.to_dict()
+                    task_dict['progress_percentage'] = 100.0
+                    emit_task_completed(task_id, task_dict)
+                    
+                    print(f"任务 {task_id} 完成")
+                    
+                    # 新特征已持久化，刷新单题查重的内存索引
+                    from src.services.dedup_check_service import DedupCheckService
+                    DedupCheckService.refresh_async(flask_app)
+            
+        except Exception as e:
+            print(f"执行任务 {task_id} 失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            
+            # 更新任务状态为错误
+            try:
+                task = DedupTask.query.get(task_id)
+                if task:
+                    task.status = 'error'
+                    task.error_message = str(e)
+                    db.session.commit()
+                    
+                    # 发送错误通知到WebSocket
+                    from src.routes.websocket import emit_task_error
+                    emit_task_error(task_id, str(e))
+            except:
+                pass
+        finally:
+            if heartbeat is not None:
+                heartbeat.stop()
+                # 归还未完成分组的租约（暂停后取消、出错时），其他执行器不必等租约到期
+                try:
+                    DedupCheckpointStore.release_leases(task_id, worker_id)
+                except Exception:
+                    db.session.rollback()
+            DedupTaskControl.unregister(task_id)
+            DedupTaskScheduler.unregister(task_id)
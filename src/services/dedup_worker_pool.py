@@ -0,0 +1,347 @@
+"""
+去重任务多进程执行
+分组之间相互独立，由进程池中的工作进程并行完成读取、清洗、生成指纹和相似度精算，
+主进程（任务线程）只负责保存结果、更新进度和 WebSocket 推送
+"""
+import os
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, Tuple, List
+import numpy as np
+
+# 分组题目数达到该值时，在分组内部把清洗、N-gram 提取和 MinHash 拆分到多个进程
+SHARD_MIN_QUESTIONS = 20000
+# 每个分片的最少题目数（分片过小时进程间通信开销占比过高）
+SHARD_MIN_SIZE = 2000
+# 等待分片结果时检查暂停/取消信号的间隔（秒）
+SHARD_CHECK_INTERVAL = 0.5
+
+# 工作进程内的最小 Flask 应用（只初始化数据库，不注册路由、不启动 SocketIO）
+_worker_app = None
+
+
+def _init_worker(task_id: Optional[int] = None, control_state=None):
+    """
+    工作进程初始化：创建独立的数据库连接并推入应用上下文
+
+    Args:
+        task_id: 任务ID
+        control_state: 主进程任务控制信号的共享状态值，工作进程据此检查暂停/取消，不查询数据库
+    """
+    global _worker_app
+    from flask import Flask
+    from src.config import Config
+    from src.models import db
+    from src.services.dedup_task_control import DedupTaskControl
+
+    _worker_app = Flask('dedup_worker')
+    _worker_app.config.from_object(Config)
+    db.init_app(_worker_app)
+    _worker_app.app_context().push()
+    if task_id and control_state is not None:
+        DedupTaskControl.attach(task_id, control_state)
+
+
+def _process_group(group_index: int,
+                   group: Dict[str, Any],
+                   baseline: Optional[Dict[str, Any]],
+                   task_id: Optional[int],
+                   shard_workers: int = 1) -> Tuple[int, Dict[str, Any]]:
+    """
+    在工作进程中处理单个分组
+
+    Args:
+        group_index: 分组在任务分组列表中的序号
+        group: 分组信息字典
+        baseline: 增量分析基线（为空时全量处理）
+        task_id: 任务ID，用于在处理步骤之间检查暂停/取消
+        shard_workers: 超大分组在分组内部分片使用的进程数
+
+    Returns:
+        (分组序号, 处理结果字典)
+
+    Raises:
+        RuntimeError: 任务被暂停或取消（与串行执行时相同）
+    """
+    from src.models import db
+    from src.services.question_dedup_service import QuestionDedupService
+
+    try:
+        if baseline:
+            results = QuestionDedupService.process_single_group_incremental(group, baseline, task_id=task_id)
+        else:
+            results = QuestionDedupService.process_single_group(
+                group, task_id=task_id, shard_workers=shard_workers
+            )
+        return group_index, results
+    finally:
+        db.session.remove()
+
+
+def resolve_max_workers(config: Dict[str, Any]) -> int:
+    """
+    从任务配置中读取并行进程数（config.max_workers），限制在 1 ~ CPU 核数之间
+
+    Args:
+        config: 任务配置字典
+
+    Returns:
+        进程数，1 表示在任务线程中串行执行
+    """
+    try:
+        max_workers = int(config.get('max_workers') or 1)
+    except (TypeError, ValueError):
+        max_workers = 1
+    return max(1, min(max_workers, os.cpu_count() or 1))
+
+
+def create_pool(max_workers: int, task_id: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    创建去重工作进程池
+
+    使用 spawn 启动方式：任务线程所在进程中还有 SocketIO 线程和数据库连接池，
+    fork 会把这些状态复制到子进程中
+
+    Args:
+        max_workers: 进程数
+        task_id: 任务ID（可选），任务已注册控制信号时把共享状态传给工作进程
+
+    Returns:
+        进程池
+    """
+    from src.services.dedup_task_control import DedupTaskControl
+
+    token = DedupTaskControl.get(task_id)
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(task_id, token.state if token else None)
+    )
+
+
+def submit_group(pool: ProcessPoolExecutor,
+                 group_index: int,
+                 group: Dict[str, Any],
+                 baseline: Optional[Dict[str, Any]],
+                 task_id: Optional[int],
+                 shard_workers: int = 1):
+    """
+    提交一个分组到进程池
+
+    Returns:
+        Future，结果为 (分组序号, 处理结果字典)
+    """
+    return pool.submit(_process_group, group_index, group, baseline, task_id, shard_workers)
+
+
+class ShardedFingerprints:
+    """
+    超大分组分片计算的结果，保存在临时目录的内存映射文件中，父进程原地读取、不经过序列化传回
+
+    - signatures.npy: 签名矩阵 (题目数, 哈希函数数)，工作进程直接写入自己分片的行
+    - ngram_ends.npy / text_ends.npy: 每道题目的 n-gram 哈希ID、清洗后内容在所在分片文件中的结束位置
+    - ngrams_<起始行>.u32: 分片内题目的 n-gram 哈希ID（与 feature_codec.ngram_ids 一致）依次拼接
+    - texts_<起始行>.bin: 分片内题目清洗后内容的 UTF-8 编码依次拼接
+
+    使用完毕后调用 close() 删除临时文件（对象被回收时也会删除）
+    """
+
+    def __init__(self, num_questions: int, num_hashes: int, shard_size: int):
+        self.num_questions = num_questions
+        self.shard_size = shard_size
+        self._tmpdir = tempfile.TemporaryDirectory(prefix='dedup_shard_')
+        self.directory = self._tmpdir.name
+        self.signatures = self._create('signatures.npy', np.uint32, (num_questions, num_hashes))
+        self._ngram_ends = self._create('ngram_ends.npy', np.int64, (num_questions,))
+        self._text_ends = self._create('text_ends.npy', np.int64, (num_questions,))
+        self._ngram_files: List[np.ndarray] = []
+        self._text_files: List[np.ndarray] = []
+
+    def _create(self, filename: str, dtype, shape: Tuple[int, ...]) -> np.ndarray:
+        return np.lib.format.open_memmap(
+            os.path.join(self.directory, filename), mode='w+', dtype=dtype, shape=shape
+        )
+
+    def shard_starts(self) -> range:
+        """各分片的起始行"""
+        return range(0, self.num_questions, self.shard_size)
+
+    def load_shards(self):
+        """所有分片写入完成后，以只读方式映射各分片的 n-gram 和内容文件"""
+        for start in self.shard_starts():
+            self._ngram_files.append(_open_shard_file(self.directory, f'ngrams_{start}.u32', np.uint32))
+            self._text_files.append(_open_shard_file(self.directory, f'texts_{start}.bin', np.uint8))
+
+    def _span(self, ends: np.ndarray, row: int) -> Tuple[int, int, int]:
+        shard = row // self.shard_size
+        begin = 0 if row == shard * self.shard_size else int(ends[row - 1])
+        return shard, begin, int(ends[row])
+
+    def ngrams(self, row: int) -> np.ndarray:
+        """第 row 道题目的 n-gram 哈希ID（升序去重的 uint32 数组，直接引用映射文件）"""
+        shard, begin, end = self._span(self._ngram_ends, row)
+        return self._ngram_files[shard][begin:end]
+
+    def cleaned_content(self, row: int) -> str:
+        """第 row 道题目清洗后的内容"""
+        shard, begin, end = self._span(self._text_ends, row)
+        return self._text_files[shard][begin:end].tobytes().decode('utf-8')
+
+    def close(self):
+        """释放映射并删除临时文件"""
+        self.signatures = self._ngram_ends = self._text_ends = None
+        self._ngram_files = []
+        self._text_files = []
+        self._tmpdir.cleanup()
+
+
+def _open_shard_file(directory: str, filename: str, dtype) -> np.ndarray:
+    path = os.path.join(directory, filename)
+    if not os.path.getsize(path):
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r')
+
+
+def _init_shard_worker(task_id: Optional[int] = None, control_state=None):
+    """分片工作进程初始化：注册主进程任务控制信号的共享状态（分片工作进程不访问数据库）"""
+    from src.services.dedup_task_control import DedupTaskControl
+
+    if task_id and control_state is not None:
+        DedupTaskControl.attach(task_id, control_state)
+
+
+def _fingerprint_shard(directory: str,
+                       start: int,
+                       contents: List[Optional[str]],
+                       channel_code: Optional[str] = None,
+                       task_id: Optional[int] = None) -> int:
+    """
+    在工作进程中处理一个分片：清洗题干、提取 N-gram、生成 MinHash 签名
+
+    签名写入内存映射矩阵的 [start, start + len(contents)) 行，n-gram 哈希ID 和清洗后的内容
+    写入分片自己的文件，不经过序列化传回
+
+    Args:
+        directory: ShardedFingerprints 的临时目录
+        start: 分片在矩阵中的起始行
+        contents: 分片内题目的原始内容
+        channel_code: 渠道代码，决定使用的题干标准化器
+        task_id: 任务ID（可选），清洗、N-gram 提取时逐批检查控制信号
+
+    Returns:
+        起始行
+
+    Raises:
+        RuntimeError: 任务被暂停或取消
+    """
+    from src.services.question_dedup_service import QuestionDedupService
+    from src.services.text_normalizer import get_normalizer
+    from src.services.dedup_task_control import DedupTaskControl
+    from src.utils.feature_codec import ngram_ids
+
+    end = start + len(contents)
+    cleaned = get_normalizer(channel_code).normalize_many(DedupTaskControl.checked(contents, task_id))
+    signatures = np.load(os.path.join(directory, 'signatures.npy'), mmap_mode='r+')
+    signatures[start:end] = QuestionDedupService._generate_minhash_matrix([
+        QuestionDedupService._extract_ngrams(text, n=3) if text else set()
+        for text in DedupTaskControl.checked(cleaned, task_id)
+    ])
+    signatures.flush()
+    del signatures
+
+    ngram_ends = np.load(os.path.join(directory, 'ngram_ends.npy'), mmap_mode='r+')
+    text_ends = np.load(os.path.join(directory, 'text_ends.npy'), mmap_mode='r+')
+    ngram_total = text_total = 0
+    with open(os.path.join(directory, f'ngrams_{start}.u32'), 'wb') as ngram_file, \
+            open(os.path.join(directory, f'texts_{start}.bin'), 'wb') as text_file:
+        for row, text in enumerate(cleaned, start):
+            ids = ngram_ids(text)
+            ngram_file.write(ids.tobytes())
+            ngram_total += len(ids)
+            ngram_ends[row] = ngram_total
+            encoded = text.encode('utf-8')
+            text_file.write(encoded)
+            text_total += len(encoded)
+            text_ends[row] = text_total
+    ngram_ends.flush()
+    text_ends.flush()
+    return start
+
+
+def fingerprint_group_sharded(contents: List[Optional[str]],
+                              num_hashes: int,
+                              max_workers: int,
+                              channel_code: Optional[str] = None,
+                              task_id: Optional[int] = None) -> ShardedFingerprints:
+    """
+    把一个超大分组的清洗、N-gram 提取和 MinHash 生成拆分到多个进程
+
+    工作进程把签名、n-gram 哈希ID 和清洗后的内容写入临时目录的内存映射文件，
+    父进程按行原地读取，不复制签名矩阵。任务在当前进程中注册了控制信号时，分片工作进程共享该信号，
+    父进程等待期间每隔 SHARD_CHECK_INTERVAL 检查一次，暂停/取消时终止分片工作进程
+
+    Args:
+        contents: 分组内所有题目的原始内容（按题目顺序）
+        num_hashes: 签名长度
+        max_workers: 进程数
+        channel_code: 渠道代码，决定使用的题干标准化器
+        task_id: 任务ID（可选），用于检查暂停/取消
+
+    Returns:
+        分片结果，行与 contents 一一对应；使用完毕后调用 close()
+
+    Raises:
+        RuntimeError: 任务被暂停或取消
+    """
+    from src.services.dedup_task_control import DedupTaskControl
+
+    token = DedupTaskControl.get(task_id)
+    n = len(contents)
+    shard_size = max(SHARD_MIN_SIZE, -(-n // (max_workers * 4)))
+    fingerprints = ShardedFingerprints(n, num_hashes, shard_size)
+    pool = create_shard_pool(max_workers, task_id=task_id)
+    try:
+        results = [
+            pool.apply_async(_fingerprint_shard, (fingerprints.directory, start,
+                                                  contents[start:start + shard_size], channel_code, task_id))
+            for start in fingerprints.shard_starts()
+        ]
+        pool.close()
+        for result in results:
+            while not result.ready():
+                result.wait(SHARD_CHECK_INTERVAL)
+                if token is not None:
+                    token.check()
+            result.get()
+        pool.join()
+        fingerprints.load_shards()
+    except BaseException:
+        # 暂停/取消或分片失败：直接终止分片工作进程（包括仍在启动中的进程），不等待进行中的分片
+        pool.terminate()
+        pool.join()
+        fingerprints.close()
+        raise
+    return fingerprints
+
+
+def create_shard_pool(max_workers: int, task_id: Optional[int] = None):
+    """
+    创建分组内分片计算使用的进程池（工作进程不访问数据库，无需初始化应用）
+
+    使用 multiprocessing.Pool 而不是 ProcessPoolExecutor：任务暂停/取消时需要 terminate() 立即结束分片工作进程，
+    否则外层分组工作进程退出时会一直等待仍在运行的分片
+
+    Args:
+        max_workers: 进程数
+        task_id: 任务ID（可选），任务已注册控制信号时把共享状态传给分片工作进程
+    """
+    from src.services.dedup_task_control import DedupTaskControl
+
+    token = DedupTaskControl.get(task_id)
+    return multiprocessing.get_context('spawn').Pool(
+        processes=max_workers,
+        initializer=_init_shard_worker,
+        initargs=(task_id, token.state if token else None)
+    )
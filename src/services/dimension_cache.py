@@ -0,0 +1,182 @@
+"""
+题目维度缓存
+进程内缓存科目（subject_id → subject_name）和渠道元数据（题目数、题型、科目），
+去重结果和题目相关接口按ID解析名称时直接读缓存，不需要为每行结果查询题目表
+
+缓存用一条 GROUP BY 查询加载；超过 TTL 后下一次读取触发后台刷新，刷新完成前继续返回旧数据
+"""
+import threading
+import time
+from typing import Dict, Any, Optional, List
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import func
+from src.models import db
+from src.models.question import Question
+
+
+class DimensionCache:
+    """题目维度缓存（科目名称、渠道元数据）"""
+
+    # 默认缓存有效期（秒），可通过 DIMENSION_CACHE_TTL 配置
+    DEFAULT_TTL = 300
+    # 读取到缓存中没有的科目时触发刷新的最小间隔（秒），避免不存在的ID反复触发刷新
+    MISS_REFRESH_INTERVAL = 30
+
+    _subjects: Dict[int, str] = {}
+    # {channel_code: {'question_count', 'types', 'subject_ids'}}
+    _channels: Dict[str, Dict[str, Any]] = {}
+    _loaded_at: Optional[float] = None
+    _loaded_at_wall: Optional[datetime] = None
+    _lock = threading.Lock()
+    _refresh_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def load():
+        """
+        从题目表加载维度数据（需要在应用上下文中调用）
+
+        一条 GROUP BY (subject_id, channel_code, type) 查询，新数据整体替换旧数据
+        """
+        rows = db.session.query(
+            Question.subject_id,
+            func.max(Question.subject_name).label('subject_name'),
+            Question.channel_code,
+            Question.type,
+            func.count(Question.question_id).label('count')
+        ).filter(
+            Question.is_del == 0
+        ).group_by(
+            Question.subject_id,
+            Question.channel_code,
+            Question.type
+        ).all()
+
+        subjects: Dict[int, str] = {}
+        channels: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            if row.subject_id is not None and row.subject_name:
+                subjects.setdefault(row.subject_id, row.subject_name)
+            channel = channels.setdefault(row.channel_code or 'default', {
+                'question_count': 0,
+                'types': set(),
+                'subject_ids': set()
+            })
+            channel['question_count'] += row.count
+            # 题型为空的题目只计入题目数（None 与字符串无法一起排序）
+            if row.type is not None:
+                channel['types'].add(row.type)
+            if row.subject_id is not None:
+                channel['subject_ids'].add(row.subject_id)
+
+        with DimensionCache._lock:
+            DimensionCache._subjects = subjects
+            DimensionCache._channels = channels
+            DimensionCache._loaded_at = time.monotonic()
+            DimensionCache._loaded_at_wall = datetime.now()
+
+    @staticmethod
+    def _ttl() -> float:
+        return float(current_app.config.get('DIMENSION_CACHE_TTL', DimensionCache.DEFAULT_TTL))
+
+    @staticmethod
+    def _ensure_loaded(missing: bool = False):
+        """
+        首次读取时同步加载；超过 TTL（或读取到缺失的科目且距上次加载超过 MISS_REFRESH_INTERVAL）时后台刷新
+        """
+        loaded_at = DimensionCache._loaded_at
+        if loaded_at is None:
+            DimensionCache.load()
+            return
+        age = time.monotonic() - loaded_at
+        if age >= DimensionCache._ttl() or (missing and age >= DimensionCache.MISS_REFRESH_INTERVAL):
+            DimensionCache.refresh_async(current_app._get_current_object())
+
+    @staticmethod
+    def refresh_async(app):
+        """
+        在后台线程中刷新缓存（已有刷新线程时忽略）
+
+        Args:
+            app: Flask 应用实例
+        """
+        def run():
+            with app.app_context():
+                try:
+                    DimensionCache.load()
+                except Exception as e:
+                    print(f"题目维度缓存刷新失败: {e}")
+                finally:
+                    db.session.remove()
+                    with DimensionCache._lock:
+                        DimensionCache._refresh_thread = None
+
+        with DimensionCache._lock:
+            if DimensionCache._refresh_thread is not None:
+                return
+            DimensionCache._refresh_thread = threading.Thread(
+                target=run, daemon=True, name='dimension-cache-refresh'
+            )
+            DimensionCache._refresh_thread.start()
+
+    @staticmethod
+    def invalidate():
+        """使缓存失效（下一次读取时同步重新加载）"""
+        with DimensionCache._lock:
+            DimensionCache._loaded_at = None
+
+    @staticmethod
+    def subject_name(subject_id: Optional[int]) -> Optional[str]:
+        """
+        获取科目名称
+
+        Args:
+            subject_id: 科目ID
+
+        Returns:
+            科目名称，科目不存在时返回 None
+        """
+        if subject_id is None:
+            return None
+        DimensionCache._ensure_loaded()
+        name = DimensionCache._subjects.get(subject_id)
+        if name is None:
+            DimensionCache._ensure_loaded(missing=True)
+        return name
+
+    @staticmethod
+    def subject_names() -> Dict[int, str]:
+        """获取所有科目名称（subject_id → subject_name）"""
+        DimensionCache._ensure_loaded()
+        return dict(DimensionCache._subjects)
+
+    @staticmethod
+    def channels() -> List[Dict[str, Any]]:
+        """
+        获取渠道元数据
+
+        Returns:
+            [{'channel_code', 'question_count', 'types', 'subject_ids'}, ...]，按题目数降序
+        """
+        DimensionCache._ensure_loaded()
+        channels = [
+            {
+                'channel_code': channel_code,
+                'question_count': meta['question_count'],
+                'types': sorted(meta['types']),
+                'subject_ids': sorted(meta['subject_ids'])
+            }
+            for channel_code, meta in DimensionCache._channels.items()
+        ]
+        channels.sort(key=lambda item: item['question_count'], reverse=True)
+        return channels
+
+    @staticmethod
+    def get_status() -> Dict[str, Any]:
+        """获取缓存状态"""
+        return {
+            'subjects': len(DimensionCache._subjects),
+            'channels': len(DimensionCache._channels),
+            'loaded_at': DimensionCache._loaded_at_wall.isoformat() if DimensionCache._loaded_at_wall else None,
+            'refreshing': DimensionCache._refresh_thread is not None
+        }
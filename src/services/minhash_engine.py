@@ -0,0 +1,181 @@
+"""
+MinHash 批量计算引擎
+基于 NumPy 对整个分组一次性生成 MinHash 签名矩阵，供去重服务使用
+"""
+import hashlib
+from typing import Set, Iterable, Sequence
+import numpy as np
+
+
+# 默认参数：128 个哈希函数，LSH 分为 16 个 band，每个 band 8 行
+NUM_HASHES = 128
+NUM_BANDS = 16
+ROWS_PER_BAND = 8
+
+# 指纹格式版本：哈希算法、排列参数或签名长度发生变化时必须升级，
+# 版本不一致的已持久化指纹不能与当前指纹比较
+# v2: n-gram 使用 blake2b 64 位哈希，排列参数由 blake2b 派生（与进程、机器无关）
+FINGERPRINT_VERSION = 'v2'
+# band 哈希使用的 FNV-1a 64 位参数
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+
+class MinHashEngine:
+    """
+    MinHash 批量计算引擎
+
+    每个 n-gram 只哈希一次得到 uint64，再用 num_hashes 个
+    multiply-add-shift 通用哈希函数 h(x) = ((a * x + b) mod 2^64) >> 32
+    模拟随机排列，整组题目通过 NumPy 数组运算一次性求最小值。
+
+    n-gram 哈希和排列参数都由 blake2b 确定性派生，不依赖 PYTHONHASHSEED，
+    同一文本在任何进程、任何机器上生成的签名都相同，可以持久化后复用。
+    """
+
+    # 每批参与计算的 n-gram 数量上限：1024 * 128 * 8B = 1MB，中间矩阵可以留在 CPU 缓存中，
+    # 实测比一次性计算大矩阵快数倍
+    CHUNK_SIZE = 1 << 10
+
+    def __init__(self, num_hashes: int = NUM_HASHES, seed: int = 1):
+        """
+        Args:
+            num_hashes: 哈希函数数量（指纹长度），默认为128
+            seed: 派生排列参数的种子
+        """
+        self.num_hashes = num_hashes
+        params = np.array([
+            [int.from_bytes(hashlib.blake2b(f"minhash:{seed}:{i}:{part}".encode('ascii'),
+                                            digest_size=8).digest(), 'little')
+             for part in ('a', 'b')]
+            for i in range(num_hashes)
+        ], dtype=np.uint64).reshape(num_hashes, 2)
+        # a 取奇数，保证乘法在 mod 2^64 下可逆
+        self._a = params[:, 0] | np.uint64(1)
+        self._b = params[:, 1]
+
+    @staticmethod
+    def hash_ngram(ngram: str) -> int:
+        """
+        将单个 n-gram 哈希为 64 位无符号整数（blake2b，结果与进程无关）
+
+        不做缓存：blake2b 单次计算与 LRU 缓存查找的开销相当，n-gram 种类多时小缓存命中率低反而更慢，
+        大缓存则在每个工作进程常驻上百 MB
+
+        Args:
+            ngram: n-gram 字符串
+
+        Returns:
+            0 ~ 2^64-1 之间的整数
+        """
+        return int.from_bytes(hashlib.blake2b(ngram.encode('utf-8'), digest_size=8).digest(), 'little')
+
+    def hash_ngrams(self, ngrams: Iterable[str]) -> np.ndarray:
+        """
+        将 n-gram 集合哈希为 uint64 数组（每个 n-gram 只哈希一次）
+
+        Args:
+            ngrams: n-gram 集合
+
+        Returns:
+            uint64 一维数组
+        """
+        hash_ngram = self.hash_ngram
+        return np.fromiter((hash_ngram(g) for g in ngrams), dtype=np.uint64)
+
+    def signature_matrix(self, ngram_sets: Sequence[Set[str]]) -> np.ndarray:
+        """
+        批量生成 MinHash 签名矩阵
+
+        Args:
+            ngram_sets: 每道题目的 N-gram 集合列表
+
+        Returns:
+            形状为 (题目数, num_hashes) 的 uint32 矩阵，第 i 行对应 ngram_sets[i]；
+            N-gram 为空的题目签名全为 0（与旧实现保持一致）
+        """
+        n = len(ngram_sets)
+        signatures = np.zeros((n, self.num_hashes), dtype=np.uint32)
+        if n == 0:
+            return signatures
+
+        # 扁平化：所有题目的 n-gram 哈希值拼成一个数组，用 offsets 记录每题的起止位置
+        lengths = np.fromiter((len(s) for s in ngram_sets), dtype=np.int64, count=n)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        hash_ngram = self.hash_ngram
+        flat = np.fromiter(
+            (hash_ngram(g) for s in ngram_sets for g in s),
+            dtype=np.uint64,
+            count=int(offsets[-1])
+        )
+
+        # 按题目边界分批，每批的 n-gram 总数不超过 CHUNK_SIZE（单题超限时单独成批）
+        start = 0
+        while start < n:
+            end = int(np.searchsorted(offsets, offsets[start] + self.CHUNK_SIZE, side='right')) - 1
+            end = min(max(end, start + 1), n)
+            lo, hi = int(offsets[start]), int(offsets[end])
+            if hi > lo:
+                block = flat[lo:hi, None] * self._a + self._b
+                block >>= np.uint64(32)
+                nonempty = lengths[start:end] > 0
+                seg_starts = (offsets[start:end] - lo)[nonempty]
+                signatures[start:end][nonempty] = np.minimum.reduceat(block, seg_starts, axis=0)
+            start = end
+
+        return signatures
+
+    def signature(self, ngrams: Set[str]) -> np.ndarray:
+        """
+        生成单个 N-gram 集合的 MinHash 签名
+
+        Args:
+            ngrams: N-gram集合
+
+        Returns:
+            长度为 num_hashes 的 uint32 数组
+        """
+        return self.signature_matrix([ngrams])[0]
+
+    @staticmethod
+    def band_hashes(signatures: np.ndarray,
+                    num_bands: int = NUM_BANDS,
+                    rows_per_band: int = ROWS_PER_BAND) -> np.ndarray:
+        """
+        计算签名矩阵每个 band 的哈希值（FNV-1a，按列向量化）
+
+        Args:
+            signatures: 签名矩阵 (n, num_bands * rows_per_band)
+            num_bands: band数量，默认为16
+            rows_per_band: 每个band的行数，默认为8
+
+        Returns:
+            形状为 (n, num_bands) 的 uint64 矩阵
+        """
+        n = signatures.shape[0]
+        result = np.empty((n, num_bands), dtype=np.uint64)
+        for band_idx in range(num_bands):
+            h = np.full(n, _FNV_OFFSET, dtype=np.uint64)
+            base = band_idx * rows_per_band
+            for row in range(rows_per_band):
+                h ^= signatures[:, base + row].astype(np.uint64)
+                h *= _FNV_PRIME
+            result[:, band_idx] = h
+        return result
+
+    @staticmethod
+    def estimate_jaccard(signature_1: np.ndarray, signature_2: np.ndarray) -> float:
+        """
+        用两个签名中相同位置取值相等的比例估算 Jaccard 相似度
+
+        Args:
+            signature_1: 第一个签名
+            signature_2: 第二个签名
+
+        Returns:
+            估算的相似度（0-1之间的浮点数）
+        """
+        if len(signature_1) == 0:
+            return 0.0
+        return float(np.count_nonzero(signature_1 == signature_2)) / len(signature_1)
@@ -10,17 +10,21 @@ from src.models.question import (
     BlankAnswer, CalcParentAnswer, CalcChildAnswer,
     CalcChildItem, BlankChildAnswer
 )
+from src.services.question_cache import QuestionCache
 
 
 class QuestionAggregationService:
     """题目聚合服务"""
     
+    # 批量聚合支持的题型（其他题型不出现在批量聚合结果中）
+    BATCH_TYPES = ('1', '2', '3', '4', '8')
+    
     @staticmethod
     def aggregate_question(question: Question, channel_code: str, 
                           include_answer: bool = True, 
                           include_analysis: bool = True) -> Dict[str, Any]:
         """
-        聚合单个题目的完整数据
+        聚合单个题目的完整数据（优先读取题目文档缓存）
         
         Args:
             question: 题目对象
@@ -31,6 +35,22 @@ class QuestionAggregationService:
         Returns:
             聚合后的题目数据字典
         """
+        key = QuestionCache.key(question.question_id, channel_code, include_answer, include_analysis)
+        cached = QuestionCache.get_many([key])
+        if key in cached:
+            return cached[key]
+        
+        result = QuestionAggregationService._aggregate_question_uncached(
+            question, channel_code, include_answer, include_analysis
+        )
+        QuestionCache.set_many({key: result})
+        return result
+    
+    @staticmethod
+    def _aggregate_question_uncached(question: Question, channel_code: str,
+                                     include_answer: bool,
+                                     include_analysis: bool) -> Dict[str, Any]:
+        """聚合单个题目（查询数据库）"""
         # 基础题目信息
         result = question.to_dict(include_answer=include_answer, include_analysis=include_analysis)
         
@@ -167,27 +187,57 @@ class QuestionAggregationService:
                                 include_answer: bool, 
                                 include_analysis: bool) -> Dict[str, Any]:
         """聚合计算分析题数据"""
-        result = {}
+        return QuestionAggregationService._batch_aggregate_calc_analysis(
+            [question_id], channel_code, include_answer, include_analysis
+        )[question_id]
+    
+    @staticmethod
+    def _batch_aggregate_calc_analysis(question_ids: List[int], channel_code: str,
+                                       include_answer: bool,
+                                       include_analysis: bool) -> Dict[int, Dict[str, Any]]:
+        """
+        批量聚合计算分析题数据
         
-        # 查询大题答案
-        calc_parent = CalcParentAnswer.query.filter_by(
-            calcparent_id=question_id,
-            channel_code=channel_code
-        ).first()
+        大题答案、子题、填空子题各一条 IN 查询，不定项选择子题（type=3）的选项再一条 IN 查询，
+        查询次数与题目数量无关，子题结构在内存中组装
         
-        # 初始化 answer 对象，无论是否包含答案都要有 answer 结构
-        if calc_parent and include_answer:
-            result['answer'] = calc_parent.to_dict()
-        else:
-            result['answer'] = {}
+        Returns:
+            {question_id: {'answer': {..., 'sub_questions': [...]}}}
+        """
+        # 查询大题答案
+        parents = {}
+        if include_answer:
+            parents = {p.calcparent_id: p for p in
+                       CalcParentAnswer.query.filter(
+                           CalcParentAnswer.calcparent_id.in_(question_ids),
+                           CalcParentAnswer.channel_code == channel_code
+                       ).all()}
         
         # 查询子题（calcchild）
-        sub_questions = []
-        calc_children = CalcChildAnswer.query.filter_by(
-            calcparent_id=question_id,
-            channel_code=channel_code,
-            is_del=0
-        ).order_by(CalcChildAnswer.sort).all()
+        calc_children = CalcChildAnswer.query.filter(
+            CalcChildAnswer.calcparent_id.in_(question_ids),
+            CalcChildAnswer.channel_code == channel_code,
+            CalcChildAnswer.is_del == 0
+        ).order_by(CalcChildAnswer.calcparent_id, CalcChildAnswer.sort, CalcChildAnswer.calcchild_id).all()
+        
+        # 不定项选择子题（type=3）的选项
+        items_dict = {}
+        choice_child_ids = [c.calcchild_id for c in calc_children if c.type == '3']
+        if choice_child_ids:
+            for item in CalcChildItem.query.filter(
+                CalcChildItem.calcchild_id.in_(choice_child_ids),
+                CalcChildItem.channel_code == channel_code
+            ).order_by(CalcChildItem.calcchild_id, CalcChildItem.seq).all():
+                items_dict.setdefault(item.calcchild_id, []).append(item.to_dict())
+        
+        # 查询填空子题（blankchild）
+        blank_children = BlankChildAnswer.query.filter(
+            BlankChildAnswer.calcparent_id.in_(question_ids),
+            BlankChildAnswer.channel_code == channel_code,
+            BlankChildAnswer.is_del == 0
+        ).order_by(BlankChildAnswer.calcparent_id, BlankChildAnswer.sort, BlankChildAnswer.blankchild_id).all()
+        
+        sub_questions_dict = {qid: [] for qid in question_ids}
         
         for calc_child in calc_children:
             sub_question = {
@@ -206,24 +256,8 @@ class QuestionAggregationService:
             if include_analysis and calc_child.analysis:
                 sub_question['analysis'] = calc_child.analysis
             
-            # 如果子题是不定项选择题（type=3），查询选项
-            if calc_child.type == '3':
-                items = CalcChildItem.query.filter_by(
-                    calcchild_id=calc_child.calcchild_id,
-                    channel_code=channel_code
-                ).order_by(CalcChildItem.seq).all()
-                sub_question['options'] = [item.to_dict() for item in items]
-            else:
-                sub_question['options'] = []
-            
-            sub_questions.append(sub_question)
-        
-        # 查询填空子题（blankchild）
-        blank_children = BlankChildAnswer.query.filter_by(
-            calcparent_id=question_id,
-            channel_code=channel_code,
-            is_del=0
-        ).order_by(BlankChildAnswer.sort).all()
+            sub_question['options'] = items_dict.get(calc_child.calcchild_id, []) if calc_child.type == '3' else []
+            sub_questions_dict[calc_child.calcparent_id].append(sub_question)
         
         for blank_child in blank_children:
             sub_question = {
@@ -242,15 +276,23 @@ class QuestionAggregationService:
                 sub_question['analysis'] = blank_child.analysis
             
             sub_question['options'] = []
-            sub_questions.append(sub_question)
-        
-        # 按 sort 排序
-        sub_questions.sort(key=lambda x: x.get('sort', 0))
+            sub_questions_dict[blank_child.calcparent_id].append(sub_question)
         
-        # 子题始终放在 answer.sub_questions 中，符合 API 文档规范
-        result['answer']['sub_questions'] = sub_questions
+        results = {}
+        for qid in question_ids:
+            # 初始化 answer 对象，无论是否包含答案都要有 answer 结构
+            calc_parent = parents.get(qid)
+            answer = calc_parent.to_dict() if calc_parent else {}
+            
+            # 按 sort 排序（子题在前、填空子题在后，sort 相同时保持该顺序）
+            sub_questions = sub_questions_dict[qid]
+            sub_questions.sort(key=lambda x: x.get('sort', 0))
+            
+            # 子题始终放在 answer.sub_questions 中，符合 API 文档规范
+            answer['sub_questions'] = sub_questions
+            results[qid] = {'answer': answer}
         
-        return result
+        return results
     
     @staticmethod
     def batch_aggregate_questions(questions: List[Question], channel_code: str,
@@ -268,6 +310,35 @@ class QuestionAggregationService:
         Returns:
             聚合后的题目数据列表
         """
+        keys = {
+            q.question_id: QuestionCache.key(q.question_id, channel_code, include_answer, include_analysis)
+            for q in questions if q.type in QuestionAggregationService.BATCH_TYPES
+        }
+        cached = QuestionCache.get_many(list(keys.values()))
+        
+        # 只聚合缓存未命中的题目
+        misses = [q for q in questions if keys.get(q.question_id) not in cached]
+        aggregated = QuestionAggregationService._batch_aggregate_uncached(
+            misses, channel_code, include_answer, include_analysis
+        )
+        QuestionCache.set_many({
+            keys[result['question_id']]: result
+            for result in aggregated if result['question_id'] in keys
+        })
+        
+        results = list(cached.values()) + aggregated
+        
+        # 保持原始顺序
+        question_id_map = {q.question_id: i for i, q in enumerate(questions)}
+        results.sort(key=lambda x: question_id_map.get(x['question_id'], 999999))
+        
+        return results
+    
+    @staticmethod
+    def _batch_aggregate_uncached(questions: List[Question], channel_code: str,
+                                  include_answer: bool,
+                                  include_analysis: bool) -> List[Dict[str, Any]]:
+        """批量聚合题目数据（按题型批量查询数据库，结果未排序）"""
         results = []
         
         # 按题型分组，以便批量查询
@@ -371,16 +442,15 @@ class QuestionAggregationService:
                     results.append(result)
             
             elif q_type == '8':
-                # 计算分析题需要单独处理（因为结构复杂）
+                # 批量查询计算分析题的大题答案、子题和选项
+                calc_results = QuestionAggregationService._batch_aggregate_calc_analysis(
+                    question_ids, channel_code, include_answer, include_analysis
+                )
+                
                 for q in q_list:
-                    result = QuestionAggregationService.aggregate_question(
-                        q, channel_code, include_answer, include_analysis
-                    )
+                    result = q.to_dict(include_answer=include_answer, include_analysis=include_analysis)
+                    result.update(calc_results[q.question_id])
                     results.append(result)
         
-        # 保持原始顺序
-        question_id_map = {q.question_id: i for i, q in enumerate(questions)}
-        results.sort(key=lambda x: question_id_map.get(x['question_id'], 999999))
-        
         return results
 
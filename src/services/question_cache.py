@@ -0,0 +1,376 @@
+"""
+聚合题目文档缓存
+题目详情、批量查询、题目列表和去重结果详情都要把题目主表、答案表、选项表（计算分析题还有子题表）
+聚合成同一种 JSON 文档，查重审核页面会反复请求同一批题目。聚合结果按
+(question_id, channel_code, include_answer, include_analysis) 缓存，命中时不再查询答案和选项表
+
+缓存值是序列化后的 JSON 字符串：每次读取都反序列化出新的字典，调用方修改返回结果（如追加 cleaned_content）
+不会影响缓存；字符串长度也用于按内存上限淘汰
+
+后端（QUESTION_CACHE_BACKEND）：
+- memory: 进程内 LRU + TTL，按条数和字节数上限淘汰（默认）
+- database: question_document_cache 表，多个 Web 进程 / 机器共享缓存，失效对所有进程生效
+- 其他后端（如 Redis）实现 QuestionCacheBackend 后通过 QuestionCache.register_backend 注册
+"""
+import json
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from flask import current_app
+from sqlalchemy import and_, delete, func, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from src.models import db
+from src.models.question import QuestionDocumentCache
+
+# 缓存键：(question_id, channel_code, include_answer, include_analysis)
+CacheKey = Tuple[int, str, bool, bool]
+
+
+class QuestionCacheBackend(ABC):
+    """缓存后端接口（值为 JSON 字符串），子类必须实现全部抽象方法"""
+
+    name = 'base'
+
+    @abstractmethod
+    def get_many(self, keys: List[CacheKey]) -> Dict[CacheKey, str]:
+        """读取未过期的缓存值，未命中的键不出现在结果中"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_many(self, items: Dict[CacheKey, str], ttl: float):
+        """写入缓存值"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_questions(self, question_ids: Iterable[int]) -> int:
+        """删除题目的所有缓存值（所有渠道和参数组合），返回删除条数"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> int:
+        """清空缓存，返回删除条数"""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """后端状态（条数、占用等）"""
+        return {}
+
+
+class MemoryCacheBackend(QuestionCacheBackend):
+    """进程内 LRU + TTL 缓存，超过条数或字节数上限时淘汰最久未使用的值"""
+
+    name = 'memory'
+
+    def __init__(self, max_bytes: int, max_entries: int):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        # {key: (value, expires_at, size)}，按最近使用顺序排列
+        self._entries: 'OrderedDict[CacheKey, Tuple[str, float, int]]' = OrderedDict()
+        # {question_id: {key, ...}}，按题目失效时使用
+        self._by_question: Dict[int, Set[CacheKey]] = {}
+        self._bytes = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._lock = threading.Lock()
+
+    def _remove(self, key: CacheKey):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+        keys = self._by_question.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_question[key[0]]
+
+    def get_many(self, keys: List[CacheKey]) -> Dict[CacheKey, str]:
+        now = time.monotonic()
+        result = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry[1] <= now:
+                    self._remove(key)
+                    self._expirations += 1
+                    continue
+                self._entries.move_to_end(key)
+                result[key] = entry[0]
+        return result
+
+    def set_many(self, items: Dict[CacheKey, str], ttl: float):
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            for key, value in items.items():
+                size = sys.getsizeof(value)
+                if key in self._entries:
+                    self._remove(key)
+                if size > self.max_bytes:
+                    continue
+                self._entries[key] = (value, expires_at, size)
+                self._by_question.setdefault(key[0], set()).add(key)
+                self._bytes += size
+            while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def delete_questions(self, question_ids: Iterable[int]) -> int:
+        removed = 0
+        with self._lock:
+            for question_id in question_ids:
+                for key in list(self._by_question.get(question_id, ())):
+                    self._remove(key)
+                    removed += 1
+        return removed
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._by_question.clear()
+            self._bytes = 0
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'evictions': self._evictions,
+                'expirations': self._expirations
+            }
+
+
+class DatabaseCacheBackend(QuestionCacheBackend):
+    """
+    数据库缓存（question_document_cache 表），多个进程共享
+
+    使用独立连接和事务读写，不影响请求会话中未提交的数据；
+    写入时按间隔顺带删除过期记录，表的大小由 TTL 限制
+    """
+
+    name = 'database'
+
+    # 删除过期记录的最小间隔（秒）
+    PURGE_INTERVAL = 60
+
+    def __init__(self):
+        self._table = QuestionDocumentCache.__table__
+        self._last_purge = 0.0
+
+    @staticmethod
+    def _key_condition(table, keys: Iterable[CacheKey]):
+        return or_(*[
+            and_(
+                table.c.question_id == question_id,
+                table.c.channel_code == channel_code,
+                table.c.include_answer == include_answer,
+                table.c.include_analysis == include_analysis
+            )
+            for question_id, channel_code, include_answer, include_analysis in keys
+        ])
+
+    def get_many(self, keys: List[CacheKey]) -> Dict[CacheKey, str]:
+        if not keys:
+            return {}
+        t = self._table
+        wanted = set(keys)
+        with db.engine.connect() as conn:
+            rows = conn.execute(
+                select(t.c.question_id, t.c.channel_code, t.c.include_answer, t.c.include_analysis, t.c.document)
+                .where(t.c.question_id.in_({key[0] for key in keys}), t.c.expires_at > datetime.now())
+            ).all()
+        result = {}
+        for row in rows:
+            key = (row.question_id, row.channel_code, bool(row.include_answer), bool(row.include_analysis))
+            if key in wanted:
+                result[key] = row.document
+        return result
+
+    def set_many(self, items: Dict[CacheKey, str], ttl: float):
+        if not items:
+            return
+        t = self._table
+        now = datetime.now()
+        expires_at = now + timedelta(seconds=ttl)
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(delete(t).where(self._key_condition(t, items.keys())))
+                conn.execute(insert(t), [
+                    {
+                        'question_id': question_id,
+                        'channel_code': channel_code,
+                        'include_answer': include_answer,
+                        'include_analysis': include_analysis,
+                        'document': value,
+                        'expires_at': expires_at,
+                        'created_at': now
+                    }
+                    for (question_id, channel_code, include_answer, include_analysis), value in items.items()
+                ])
+        except IntegrityError:
+            # 其他进程同时写入了相同的键，保留对方写入的值
+            pass
+
+        if time.monotonic() - self._last_purge >= self.PURGE_INTERVAL:
+            self._last_purge = time.monotonic()
+            with db.engine.begin() as conn:
+                conn.execute(delete(t).where(t.c.expires_at <= now))
+
+    def delete_questions(self, question_ids: Iterable[int]) -> int:
+        question_ids = list(question_ids)
+        if not question_ids:
+            return 0
+        with db.engine.begin() as conn:
+            return conn.execute(delete(self._table).where(self._table.c.question_id.in_(question_ids))).rowcount
+
+    def clear(self) -> int:
+        with db.engine.begin() as conn:
+            return conn.execute(delete(self._table)).rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        t = self._table
+        with db.engine.connect() as conn:
+            row = conn.execute(
+                select(func.count(t.c.id), func.coalesce(func.sum(func.length(t.c.document)), 0))
+                .where(t.c.expires_at > datetime.now())
+            ).one()
+        return {'entries': row[0], 'bytes': int(row[1])}
+
+
+class QuestionCache:
+    """聚合题目文档缓存（读穿透：未命中时由调用方聚合后写入）"""
+
+    # 后端工厂：{名称: factory(config) -> QuestionCacheBackend}
+    BACKENDS: Dict[str, Callable[[Any], QuestionCacheBackend]] = {
+        'memory': lambda config: MemoryCacheBackend(
+            max_bytes=int(config.get('QUESTION_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+            max_entries=int(config.get('QUESTION_CACHE_MAX_ENTRIES', 50000))
+        ),
+        'database': lambda config: DatabaseCacheBackend()
+    }
+
+    _backend: Optional[QuestionCacheBackend] = None
+    _lock = threading.Lock()
+    # 本进程的命中统计
+    _hits = 0
+    _misses = 0
+    _writes = 0
+    _invalidations = 0
+    _errors = 0
+
+    @staticmethod
+    def register_backend(name: str, factory: Callable[[Any], QuestionCacheBackend]):
+        """
+        注册缓存后端（在创建第一个后端之前调用）
+
+        Args:
+            name: 后端名称，QUESTION_CACHE_BACKEND 配置为该名称时使用
+            factory: 以应用配置为参数创建后端的函数
+        """
+        QuestionCache.BACKENDS[name] = factory
+
+    @staticmethod
+    def enabled() -> bool:
+        return bool(current_app.config.get('QUESTION_CACHE_ENABLED', True))
+
+    @staticmethod
+    def backend() -> QuestionCacheBackend:
+        """当前后端（首次使用时按配置创建）"""
+        if QuestionCache._backend is None:
+            with QuestionCache._lock:
+                if QuestionCache._backend is None:
+                    name = current_app.config.get('QUESTION_CACHE_BACKEND', 'memory')
+                    factory = QuestionCache.BACKENDS.get(name)
+                    if factory is None:
+                        raise ValueError(f"未知的题目缓存后端: {name}")
+                    QuestionCache._backend = factory(current_app.config)
+        return QuestionCache._backend
+
+    @staticmethod
+    def set_backend(backend: Optional[QuestionCacheBackend]):
+        """替换后端（None 表示下次使用时按配置重新创建）"""
+        with QuestionCache._lock:
+            QuestionCache._backend = backend
+
+    @staticmethod
+    def key(question_id: int, channel_code: str, include_answer: bool, include_analysis: bool) -> CacheKey:
+        return (int(question_id), channel_code or 'default', bool(include_answer), bool(include_analysis))
+
+    @staticmethod
+    def get_many(keys: List[CacheKey]) -> Dict[CacheKey, Dict[str, Any]]:
+        """
+        读取缓存的题目文档
+
+        Returns:
+            {key: 题目文档（新的字典，可以修改）}，未命中的键不出现在结果中；
+            缓存关闭或后端出错时返回空字典
+        """
+        if not keys or not QuestionCache.enabled():
+            return {}
+        try:
+            values = QuestionCache.backend().get_many(keys)
+        except Exception as e:
+            QuestionCache._errors += 1
+            print(f"题目缓存读取失败: {e}")
+            return {}
+        QuestionCache._hits += len(values)
+        QuestionCache._misses += len(keys) - len(values)
+        return {key: json.loads(value) for key, value in values.items()}
+
+    @staticmethod
+    def set_many(documents: Dict[CacheKey, Dict[str, Any]]):
+        """写入题目文档（立即序列化，之后修改文档不影响缓存）"""
+        if not documents or not QuestionCache.enabled():
+            return
+        try:
+            QuestionCache.backend().set_many(
+                {key: json.dumps(document, ensure_ascii=False) for key, document in documents.items()},
+                float(current_app.config.get('QUESTION_CACHE_TTL', 600))
+            )
+            QuestionCache._writes += len(documents)
+        except Exception as e:
+            QuestionCache._errors += 1
+            print(f"题目缓存写入失败: {e}")
+
+    @staticmethod
+    def invalidate(question_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        使题目缓存失效（题目、答案或选项在题库中被修改后调用）
+
+        Args:
+            question_ids: 题目ID列表，None 表示清空全部缓存
+
+        Returns:
+            删除的缓存条数
+        """
+        backend = QuestionCache.backend()
+        removed = backend.clear() if question_ids is None else backend.delete_questions(
+            [int(qid) for qid in question_ids]
+        )
+        QuestionCache._invalidations += 1
+        return removed
+
+    @staticmethod
+    def get_stats() -> Dict[str, Any]:
+        """缓存状态：本进程的命中统计 + 后端状态"""
+        lookups = QuestionCache._hits + QuestionCache._misses
+        backend = QuestionCache.backend()
+        return {
+            'enabled': QuestionCache.enabled(),
+            'backend': backend.name,
+            'ttl': float(current_app.config.get('QUESTION_CACHE_TTL', 600)),
+            'hits': QuestionCache._hits,
+            'misses': QuestionCache._misses,
+            'hit_rate': round(QuestionCache._hits / lookups, 4) if lookups else None,
+            'writes': QuestionCache._writes,
+            'invalidations': QuestionCache._invalidations,
+            'errors': QuestionCache._errors,
+            **backend.stats()
+        }
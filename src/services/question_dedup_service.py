@@ -3,92 +3,103 @@
 实现题目重复性排查功能，支持单分组处理、进度记录和断点续传
 """
 import json
-import os
-import re
 import hashlib
-import threading
-from typing import List, Dict, Any, Optional, Tuple, Set
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple, Set, Iterable, Callable
 from datetime import datetime
+from flask import current_app
+from sqlalchemy import and_, func, or_, select, union_all, literal_column
 from src.models import db
-from src.models.question import Question
 from src.models.question_dedup import (
     DedupTask, QuestionDuplicatePair, QuestionDuplicateGroup,
-    QuestionDuplicateGroupItem, QuestionDedupFeature
+    QuestionDuplicateGroupItem, QuestionDedupFeature, QuestionDedupBandIndex,
+    QuestionDuplicateCluster, QuestionDuplicateClusterMember, QuestionDuplicateSummary,
+    DedupTaskStatistic, DedupTaskCheckpoint, DedupTaskJob
 )
 from src.services.question_service import QuestionService
+from src.services.text_normalizer import get_normalizer
+from src.utils.feature_codec import encode_uint32, decode_uint32, ngram_ids, ngram_jaccard
+from src.services.minhash_engine import (
+    MinHashEngine, NUM_HASHES, NUM_BANDS, ROWS_PER_BAND, FINGERPRINT_VERSION
+)
+from src.services.dedup_worker_pool import SHARD_MIN_QUESTIONS, fingerprint_group_sharded
+from src.services.dedup_task_control import DedupTaskControl, CHECK_INTERVAL
+from src.services.dedup_checkpoint_store import DedupCheckpointStore
+from src.services.dedup_clustering import build_clusters
 
 
 class QuestionDedupService:
     """题目去重服务"""
 
-    # 进度文件路径（放在项目根目录）
-    PROGRESS_FILE = os.path.join(
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')),
-        'question_dedup_progress.json'
-    )
+    # 批量写入结果时每条 INSERT 语句的行数
+    BULK_INSERT_CHUNK_SIZE = 2000
+
+    # MinHash 批量计算引擎（整组生成签名矩阵）
+    _minhash_engine = MinHashEngine(num_hashes=NUM_HASHES)
 
-    # 文件锁，保护进度文件的并发访问
-    _file_lock = threading.Lock()
-    
     @staticmethod
-    def get_progress() -> Dict[str, Any]:
+    def _resolve_task(task_id: Optional[int] = None) -> Optional[DedupTask]:
+        """获取指定任务，未指定时返回最近创建的任务"""
+        if task_id:
+            return DedupTask.query.get(task_id)
+        return DedupTask.query.order_by(DedupTask.id.desc()).first()
+
+    @staticmethod
+    def get_progress(task_id: Optional[int] = None) -> Dict[str, Any]:
         """
-        获取当前处理进度
+        获取当前处理进度（由任务记录和检查点表生成）
+
+        Args:
+            task_id: 任务ID（可选），未指定时返回最近创建的任务的进度
 
         Returns:
             进度信息字典，包含：
-            - current_group_index: 当前处理的分组索引（从0开始）
+            - task_id: 任务ID
+            - current_group_index: 第一个未完成分组的索引（从0开始）
+            - completed_group_indexes: 该索引之后已完成的分组（并行执行时乱序完成）
             - total_groups: 总分组数
             - processed_groups: 已处理的分组数
-            - current_group: 当前分组信息
-            - status: 状态（pending/running/completed/error）
+            - current_group: 当前分组信息（任务运行中时）
+            - status: 状态（pending/running/paused/completed/error/cancelled）
             - last_update: 最后更新时间
         """
-        with QuestionDedupService._file_lock:
-            if os.path.exists(QuestionDedupService.PROGRESS_FILE):
-                try:
-                    with open(QuestionDedupService.PROGRESS_FILE, 'r', encoding='utf-8') as f:
-                        return json.load(f)
-                except Exception as e:
-                    print(f"读取进度文件失败: {e}")
-                    return QuestionDedupService._init_progress()
-            else:
-                return QuestionDedupService._init_progress()
-    
-    @staticmethod
-    def _init_progress() -> Dict[str, Any]:
-        """初始化进度信息"""
+        task = QuestionDedupService._resolve_task(task_id)
+        if not task:
+            return {
+                'task_id': None,
+                'current_group_index': 0,
+                'completed_group_indexes': [],
+                'total_groups': 0,
+                'processed_groups': 0,
+                'current_group': None,
+                'status': 'pending',
+                'last_update': None
+            }
+
+        total_groups = task.total_groups or 0
+        current_index = DedupCheckpointStore.next_pending_index(task.id)
+        if current_index is None:
+            current_index = total_groups
+        current_group = None
+        if task.status == 'running' and current_index < total_groups:
+            current_group = DedupCheckpointStore.get_group(task.id, current_index)
+
         return {
-            'current_group_index': 0,
-            'total_groups': 0,
-            'processed_groups': 0,
-            'current_group': None,
-            'status': 'pending',  # pending/running/completed/error
-            'last_update': None,
-            'groups': []  # 所有分组列表
+            'task_id': task.id,
+            'current_group_index': current_index,
+            'completed_group_indexes': DedupCheckpointStore.completed_indexes_after(task.id, current_index),
+            'total_groups': total_groups,
+            'processed_groups': task.processed_groups or 0,
+            'current_group': current_group,
+            'status': task.status,
+            'last_update': task.updated_at.isoformat() if task.updated_at else None
         }
     
-    @staticmethod
-    def save_progress(progress: Dict[str, Any]):
-        """保存进度信息到文件"""
-        progress['last_update'] = datetime.now().isoformat()
-        with QuestionDedupService._file_lock:
-            try:
-                # 为了防止部分写入，先写入临时文件，然后重命名
-                temp_file = QuestionDedupService.PROGRESS_FILE + '.tmp'
-                with open(temp_file, 'w', encoding='utf-8') as f:
-                    json.dump(progress, f, ensure_ascii=False, indent=2)
-                # 原子性重命名
-                os.replace(temp_file, QuestionDedupService.PROGRESS_FILE)
-            except Exception as e:
-                print(f"保存进度文件失败: {e}")
-                raise
-    
     @staticmethod
     def init_dedup_session(task_name: Optional[str] = None, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         初始化去重会话
-        获取所有分组并初始化进度，同时创建数据库任务记录
+        获取所有分组并写入检查点，同时创建数据库任务记录
         
         Args:
             task_name: 任务名称（可选）
@@ -106,7 +117,7 @@ class QuestionDedupService:
             status='pending',
             total_groups=len(groups),
             processed_groups=0,
-            total_questions=0,
+            total_questions=sum(group['count'] for group in groups),
             exact_duplicate_groups=0,
             exact_duplicate_pairs=0,
             similar_duplicate_pairs=0
@@ -116,21 +127,9 @@ class QuestionDedupService:
         
         db.session.add(task)
         db.session.commit()
-        task_id = task.id
-        
-        progress = {
-            'task_id': task_id,  # 添加task_id到进度
-            'current_group_index': 0,
-            'total_groups': len(groups),
-            'processed_groups': 0,
-            'current_group': None,
-            'status': 'pending',
-            'last_update': datetime.now().isoformat(),
-            'groups': groups
-        }
         
-        QuestionDedupService.save_progress(progress)
-        return progress
+        DedupCheckpointStore.create(task.id, groups)
+        return QuestionDedupService.get_progress(task.id)
     
     @staticmethod
     def get_next_group(task_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
@@ -138,78 +137,54 @@ class QuestionDedupService:
         获取下一个待处理的分组
         
         Args:
-            task_id: 任务ID（可选），如果提供则只处理该任务的分组
+            task_id: 任务ID（可选），未指定时使用最近创建的任务
         
         Returns:
             分组信息字典，如果所有分组都已处理完则返回 None
         """
-        progress = QuestionDedupService.get_progress()
-        
-        # 如果指定了task_id，检查是否匹配
-        if task_id and progress.get('task_id') != task_id:
-            # 如果task_id不匹配，重新初始化进度
+        task = QuestionDedupService._resolve_task(task_id)
+        if not task:
+            task_id = QuestionDedupService.init_dedup_session()['task_id']
+            task = DedupTask.query.get(task_id)
+        elif not DedupCheckpointStore.exists(task.id):
+            # 任务还没有检查点（尚未开始执行），按当前分组初始化
             groups = QuestionService.get_question_groups()
-            progress = {
-                'task_id': task_id,
-                'current_group_index': 0,
-                'total_groups': len(groups),
-                'processed_groups': 0,
-                'current_group': None,
-                'status': 'running',
-                'last_update': datetime.now().isoformat(),
-                'groups': groups
-            }
-            QuestionDedupService.save_progress(progress)
-        
-        # 如果没有初始化，先初始化
-        if progress['total_groups'] == 0 or not progress.get('groups'):
-            if task_id:
-                # 使用指定的task_id初始化
-                groups = QuestionService.get_question_groups()
-                progress = {
-                    'task_id': task_id,
-                    'current_group_index': 0,
-                    'total_groups': len(groups),
-                    'processed_groups': 0,
-                    'current_group': None,
-                    'status': 'running',
-                    'last_update': datetime.now().isoformat(),
-                    'groups': groups
-                }
-                QuestionDedupService.save_progress(progress)
-            else:
-                progress = QuestionDedupService.init_dedup_session()
-        
-        current_index = progress['current_group_index']
-        groups = progress['groups']
-        
-        # 检查是否还有未处理的分组
-        if current_index >= len(groups):
-            progress['status'] = 'completed'
-            QuestionDedupService.save_progress(progress)
+            DedupCheckpointStore.create(task.id, groups)
+            task.total_groups = len(groups)
+            task.total_questions = sum(group['count'] for group in groups)
+            db.session.commit()
+
+        current_index = DedupCheckpointStore.next_pending_index(task.id)
+        if current_index is None:
             return None
+        return DedupCheckpointStore.get_group(task.id, current_index)
+    
+    @staticmethod
+    def _bulk_insert(model, rows: List[Dict[str, Any]]):
+        """
+        分批执行 Core INSERT（executemany），不经过 ORM 工作单元
         
-        # 获取当前分组
-        current_group = groups[current_index]
-        progress['current_group'] = current_group
-        progress['status'] = 'running'
-        QuestionDedupService.save_progress(progress)
-        
-        # 更新数据库任务状态
-        task_id = progress.get('task_id')
-        if task_id:
-            task = DedupTask.query.get(task_id)
-            if task and current_index >= len(groups):
-                task.status = 'completed'
-                task.completed_at = datetime.now()
-                db.session.commit()
+        MySQL 驱动会把 executemany 改写为多行 VALUES，SQLite 使用原生 executemany；
+        与调用方处于同一事务，由调用方提交或回滚
         
-        return current_group
+        Args:
+            model: 目标模型类
+            rows: 列名 → 值的字典列表（所有字典的键必须相同）
+        """
+        if not rows:
+            return
+        statement = model.__table__.insert()
+        chunk_size = QuestionDedupService.BULK_INSERT_CHUNK_SIZE
+        for start in range(0, len(rows), chunk_size):
+            db.session.execute(statement, rows[start:start + chunk_size])
     
     @staticmethod
     def _save_group_results_to_db(task_id: int, results: Dict[str, Any]):
         """
-        保存分组处理结果到数据库
+        保存分组处理结果到数据库（不提交，与分组检查点和任务统计在同一事务中提交）
+        
+        所有记录通过 _bulk_insert 分批写入；完全重复组写入后按内容哈希一次性查回组ID，
+        不需要为每个组单独 flush
         
         Args:
             task_id: 任务ID
@@ -219,222 +194,667 @@ class QuestionDedupService:
         group_type = group.get('type')
         group_subject_id = group.get('subject_id')
         group_channel_code = group.get('channel_code')
+        group_columns = {
+            'group_type': group_type,
+            'group_subject_id': group_subject_id,
+            'group_channel_code': group_channel_code
+        }
         
         try:
             # 保存完全重复组
             exact_duplicates = results.get('exact_duplicates', [])
-            for dup_group in exact_duplicates:
-                # 创建组记录
-                db_group = QuestionDuplicateGroup(
-                    task_id=task_id,
-                    content_hash=dup_group.get('content_hash', ''),
-                    question_count=dup_group.get('count', 0),
-                    group_type=group_type,
-                    group_subject_id=group_subject_id,
-                    group_channel_code=group_channel_code
-                )
-                db.session.add(db_group)
-                db.session.flush()  # 获取group_id
+            if exact_duplicates:
+                detected_at = datetime.now()
+                QuestionDedupService._bulk_insert(QuestionDuplicateGroup, [
+                    dict(group_columns,
+                         task_id=task_id,
+                         content_hash=dup_group.get('content_hash', ''),
+                         question_count=dup_group.get('count', 0),
+                         detected_at=detected_at)
+                    for dup_group in exact_duplicates
+                ])
                 
-                # 创建组明细记录
-                question_ids = dup_group.get('question_ids', [])
-                for qid in question_ids:
-                    item = QuestionDuplicateGroupItem(
-                        group_id=db_group.id,
-                        task_id=task_id,
-                        question_id=qid
+                # 同一任务、同一分组内内容哈希唯一，按哈希查回组ID
+                group_ids = {
+                    row.content_hash: row.id
+                    for row in db.session.query(
+                        QuestionDuplicateGroup.id, QuestionDuplicateGroup.content_hash
+                    ).filter(
+                        QuestionDuplicateGroup.task_id == task_id,
+                        QuestionDuplicateGroup.group_type == group_type,
+                        QuestionDuplicateGroup.group_subject_id == group_subject_id,
+                        QuestionDuplicateGroup.group_channel_code == group_channel_code
                     )
-                    db.session.add(item)
+                }
+                
+                # 创建组明细记录
+                QuestionDedupService._bulk_insert(QuestionDuplicateGroupItem, [
+                    {
+                        'group_id': group_ids[dup_group.get('content_hash', '')],
+                        'task_id': task_id,
+                        'question_id': qid
+                    }
+                    for dup_group in exact_duplicates
+                    for qid in dup_group.get('question_ids', [])
+                ])
             
-            # 保存相似重复对
+            # 保存相似重复对明细（只在开启 DEDUP_STORE_SIMILAR_PAIRS 时保存，默认只保存重复题目簇和按题目汇总）
             similar_duplicates = results.get('similar_duplicates', [])
-            for dup_pair in similar_duplicates:
-                pair = QuestionDuplicatePair(
-                    task_id=task_id,
-                    question_id_1=dup_pair.get('question_id_1'),
-                    question_id_2=dup_pair.get('question_id_2'),
-                    similarity=dup_pair.get('similarity', 0.0),
-                    duplicate_type='similar',
-                    group_type=group_type,
-                    group_subject_id=group_subject_id,
-                    group_channel_code=group_channel_code
-                )
-                db.session.add(pair)
+            detected_at = datetime.now()
+            if current_app.config.get('DEDUP_STORE_SIMILAR_PAIRS', False):
+                QuestionDedupService._bulk_insert(QuestionDuplicatePair, [
+                    dict(group_columns,
+                         task_id=task_id,
+                         question_id_1=dup_pair.get('question_id_1'),
+                         question_id_2=dup_pair.get('question_id_2'),
+                         similarity=dup_pair.get('similarity', 0.0),
+                         duplicate_type='similar',
+                         detected_at=detected_at)
+                    for dup_pair in similar_duplicates
+                ])
+            
+            # 累加任务分维度统计（统计接口直接读取，任务执行期间实时更新）
+            QuestionDedupService._accumulate_task_statistics(task_id, group, results)
+            
+            # 保存按题目汇总的相似重复统计（按题目分组的相似重复列表直接分页查询该表）
+            QuestionDedupService._bulk_insert(
+                QuestionDuplicateSummary,
+                QuestionDedupService._build_duplicate_summary_rows(task_id, group, similar_duplicates)
+            )
+            
+            # 保存重复题目簇（同一任务内每道题目只属于一个簇，按代表题目查回簇ID）
+            clusters = results.get('clusters')
+            if clusters is None:
+                clusters = build_clusters(exact_duplicates, similar_duplicates)
+            if clusters:
+                QuestionDedupService._bulk_insert(QuestionDuplicateCluster, [
+                    dict(group_columns,
+                         task_id=task_id,
+                         representative_question_id=cluster['representative_question_id'],
+                         member_count=cluster['member_count'],
+                         exact_question_count=cluster['exact_question_count'],
+                         similar_edge_count=cluster['similar_edge_count'],
+                         min_similarity=cluster['min_similarity'],
+                         max_similarity=cluster['max_similarity'],
+                         avg_similarity=cluster['avg_similarity'],
+                         detected_at=detected_at)
+                    for cluster in clusters
+                ])
+                cluster_ids = {}
+                representatives = [cluster['representative_question_id'] for cluster in clusters]
+                chunk_size = QuestionDedupService.BULK_INSERT_CHUNK_SIZE
+                for start in range(0, len(representatives), chunk_size):
+                    cluster_ids.update(
+                        db.session.query(
+                            QuestionDuplicateCluster.representative_question_id, QuestionDuplicateCluster.id
+                        ).filter(
+                            QuestionDuplicateCluster.task_id == task_id,
+                            QuestionDuplicateCluster.representative_question_id.in_(
+                                representatives[start:start + chunk_size]
+                            )
+                        ).all()
+                    )
+                QuestionDedupService._bulk_insert(QuestionDuplicateClusterMember, [
+                    {
+                        'cluster_id': cluster_ids[cluster['representative_question_id']],
+                        'task_id': task_id,
+                        'question_id': member['question_id'],
+                        'degree': member['degree'],
+                        'max_similarity': member['max_similarity'],
+                        'is_exact': member['is_exact']
+                    }
+                    for cluster in clusters
+                    for member in cluster['members']
+                ])
             
-            # 保存特征数据
+            # 保存特征数据（二进制格式：MD5 原始摘要、n-gram 哈希ID 和 MinHash 签名的 uint32 数组）
             cleaned_questions = results.get('cleaned_questions', [])
-            for q_data in cleaned_questions:
-                feature = QuestionDedupFeature(
-                    task_id=task_id,
-                    question_id=q_data['question_id'],
-                    cleaned_content=q_data.get('cleaned_content'),
-                    content_hash=q_data.get('content_hash'),
-                    group_type=group_type,
-                    group_subject_id=group_subject_id,
-                    group_channel_code=group_channel_code
-                )
-                # 使用模型的方法设置ngram和minhash（会自动转换为JSON）
-                if q_data.get('ngrams'):
-                    feature.set_ngrams(q_data['ngrams'])
-                if q_data.get('minhash'):
-                    feature.set_minhash(q_data['minhash'])
-                db.session.add(feature)
+            created_at = datetime.now()
+            QuestionDedupService._bulk_insert(QuestionDedupFeature, [
+                dict(group_columns,
+                     task_id=task_id,
+                     question_id=q_data['question_id'],
+                     cleaned_content=q_data.get('cleaned_content'),
+                     content_digest=bytes.fromhex(q_data['content_hash'])
+                     if q_data.get('content_hash') else None,
+                     ngram_blob=encode_uint32(ngram_ids(q_data.get('cleaned_content'))),
+                     minhash_blob=encode_uint32(q_data.get('minhash')),
+                     fingerprint_version=FINGERPRINT_VERSION,
+                     created_at=created_at)
+                for q_data in cleaned_questions
+            ])
             
-            # 更新任务统计
-            task = DedupTask.query.get(task_id)
-            if task:
-                # 完全重复对数 = 每组C(n,2)的和
-                for dup_group in exact_duplicates:
-                    count = dup_group.get('count', 0)
-                    if count > 1:
-                        pairs_count = count * (count - 1) // 2
-                        task.exact_duplicate_pairs += pairs_count
-                        task.exact_duplicate_groups += 1
-                
-                # 相似重复对数
-                task.similar_duplicate_pairs += len(similar_duplicates)
-                
-                # 总题目数
-                task.total_questions += results.get('total_questions', 0)
+            # 保存 LSH band 索引（每题 NUM_BANDS 行，供后续任务按索引查找候选）
+            band_rows = QuestionDedupService._build_band_index_rows(task_id, group, cleaned_questions)
+            QuestionDedupService._bulk_insert(QuestionDedupBandIndex, band_rows)
             
-            db.session.commit()
         except Exception as e:
             db.session.rollback()
             print(f"保存数据到数据库失败: {e}")
             raise
     
     @staticmethod
-    def mark_group_completed(results: Optional[Dict[str, Any]] = None):
+    def load_persisted_signatures(group: Dict[str, Any],
+                                  task_ids: Optional[List[int]] = None,
+                                  with_minhash: bool = True) -> Dict[int, Dict[str, Any]]:
         """
-        标记当前分组处理完成，并更新数据库任务记录
-        
+        读取分组内已持久化、且指纹版本与当前引擎一致的特征
+
+        指纹由确定性哈希生成，跨进程、跨机器都可以直接复用；版本不一致
+        （包括旧版进程相关哈希生成的记录）的特征会被忽略。
+
         Args:
-            results: 该分组的处理结果（可选）
+            group: 分组信息字典，包含 type, subject_id, channel_code
+            task_ids: 限定的任务ID列表（可选），为空时读取所有任务
+            with_minhash: 是否读取并解析 MinHash 签名；只需要内容哈希时传 False，
+                          避免读取和解码 MinHash 签名
+
+        Returns:
+            {question_id: {'feature_id', 'task_id', 'content_hash', 'minhash'}}，
+            同一题目存在多条记录时取任务ID最大（最新）的一条；
+            with_minhash=False 时不包含 minhash
         """
-        progress = QuestionDedupService.get_progress()
-        task_id = progress.get('task_id')
-        
-        # 如果提供了结果，保存结果到JSON（用于断点续传）
-        if results:
-            if 'results' not in progress:
-                progress['results'] = []
-            progress['results'].append({
-                'group_index': progress['current_group_index'],
-                'group': progress['current_group'],
-                'results': results,
-                'processed_at': datetime.now().isoformat()
+        columns = [
+            QuestionDedupFeature.id,
+            QuestionDedupFeature.question_id,
+            QuestionDedupFeature.task_id,
+            QuestionDedupFeature.content_digest,
+            QuestionDedupFeature.content_hash
+        ]
+        if with_minhash:
+            columns += [QuestionDedupFeature.minhash_blob, QuestionDedupFeature.minhash_json]
+        query = db.session.query(*columns).filter(
+            QuestionDedupFeature.group_type == group['type'],
+            QuestionDedupFeature.group_subject_id == group['subject_id'],
+            QuestionDedupFeature.group_channel_code == group['channel_code'],
+            QuestionDedupFeature.fingerprint_version == FINGERPRINT_VERSION
+        )
+        if task_ids is not None:
+            if not task_ids:
+                return {}
+            query = query.filter(QuestionDedupFeature.task_id.in_(task_ids))
+
+        signatures = {}
+        for row in query.order_by(QuestionDedupFeature.task_id).all():
+            content_hash = row.content_digest.hex() if row.content_digest else row.content_hash
+            if not with_minhash:
+                signatures[row.question_id] = {
+                    'feature_id': row.id,
+                    'task_id': row.task_id,
+                    'content_hash': content_hash
+                }
+                continue
+            if row.minhash_blob:
+                minhash = decode_uint32(row.minhash_blob)
+            elif row.minhash_json:
+                minhash = np.asarray(json.loads(row.minhash_json), dtype=np.uint32)
+            else:
+                continue
+            signatures[row.question_id] = {
+                'feature_id': row.id,
+                'task_id': row.task_id,
+                'content_hash': content_hash,
+                'minhash': minhash
+            }
+        return signatures
+
+    @staticmethod
+    def _build_band_index_rows(task_id: int,
+                               group: Dict[str, Any],
+                               cleaned_questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        根据特征数据中的 MinHash 签名生成 band 索引记录
+
+        Args:
+            task_id: 任务ID
+            group: 分组信息字典
+            cleaned_questions: 特征数据列表（包含 question_id 和 minhash）
+
+        Returns:
+            可直接批量插入 question_dedup_band_index 表的字典列表
+        """
+        items = [q for q in cleaned_questions if q.get('minhash') is not None]
+        if not items:
+            return []
+
+        signatures = np.asarray([q['minhash'] for q in items], dtype=np.uint32)
+        # uint64 按位转为 int64，适配数据库的有符号 BIGINT
+        band_hashes = MinHashEngine.band_hashes(signatures, NUM_BANDS, ROWS_PER_BAND).view(np.int64)
+
+        rows = []
+        for row, q_data in enumerate(items):
+            for band_idx in range(NUM_BANDS):
+                rows.append({
+                    'task_id': task_id,
+                    'question_id': q_data['question_id'],
+                    'band_idx': band_idx,
+                    'band_hash': int(band_hashes[row, band_idx]),
+                    'fingerprint_version': FINGERPRINT_VERSION,
+                    'group_type': group.get('type'),
+                    'group_subject_id': group.get('subject_id'),
+                    'group_channel_code': group.get('channel_code')
+                })
+        return rows
+
+    @staticmethod
+    def _dimension_filter(task_id: int, group_type, group_subject_id, group_channel_code):
+        """分维度统计行的查询条件（科目、渠道为空时按 IS NULL 匹配）"""
+        columns = (
+            (DedupTaskStatistic.group_type, group_type),
+            (DedupTaskStatistic.group_subject_id, group_subject_id),
+            (DedupTaskStatistic.group_channel_code, group_channel_code)
+        )
+        return [DedupTaskStatistic.task_id == task_id] + [
+            column.is_(None) if value is None else column == value for column, value in columns
+        ]
+
+    @staticmethod
+    def _accumulate_task_statistics(task_id: int, group: Dict[str, Any], results: Dict[str, Any]):
+        """
+        把分组结果累加到 (任务, 题型, 科目, 渠道) 统计行（不提交）
+
+        先用 SQL 表达式累加已有的统计行，没有时插入；同一维度的分组不会被多个执行器同时保存
+
+        Args:
+            task_id: 任务ID
+            group: 分组信息字典
+            results: 分组处理结果
+        """
+        counters = DedupCheckpointStore.group_counters(results)
+        exact_questions = sum(g.get('count', 0) for g in results.get('exact_duplicates', []))
+        deltas = {
+            'processed_groups': 1,
+            'question_count': counters['question_count'],
+            'exact_duplicate_groups': counters['exact_duplicate_groups'],
+            'exact_duplicate_questions': exact_questions,
+            'exact_duplicate_pairs': counters['exact_duplicate_pairs'],
+            'similar_duplicate_pairs': counters['similar_duplicate_pairs']
+        }
+        group_type = group.get('type')
+        group_subject_id = group.get('subject_id')
+        group_channel_code = group.get('channel_code')
+
+        updated = DedupTaskStatistic.query.filter(*QuestionDedupService._dimension_filter(
+            task_id, group_type, group_subject_id, group_channel_code
+        )).update({
+            getattr(DedupTaskStatistic, column): getattr(DedupTaskStatistic, column) + delta
+            for column, delta in deltas.items()
+        }, synchronize_session=False)
+        if not updated:
+            db.session.execute(DedupTaskStatistic.__table__.insert(), [dict(
+                deltas,
+                task_id=task_id,
+                group_type=group_type,
+                group_subject_id=group_subject_id,
+                group_channel_code=group_channel_code,
+                updated_at=datetime.now()
+            )])
+
+    @staticmethod
+    def rebuild_task_statistics(task_id: int) -> int:
+        """
+        从已保存的结果重新生成任务的分维度统计（用于统计表上线前的任务；调用方负责提交）
+
+        完全重复组、相似重复对和已完成的分组检查点各按维度 GROUP BY 一次后合并
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            生成的统计行数
+        """
+        DedupTaskStatistic.query.filter_by(task_id=task_id).delete(synchronize_session=False)
+
+        stats: Dict[Tuple, Dict[str, int]] = {}
+
+        def row_for(key):
+            return stats.setdefault(key, {
+                'processed_groups': 0,
+                'question_count': 0,
+                'exact_duplicate_groups': 0,
+                'exact_duplicate_questions': 0,
+                'exact_duplicate_pairs': 0,
+                'similar_duplicate_pairs': 0
             })
-            
-            # 保存数据到数据库
-            if task_id:
-                QuestionDedupService._save_group_results_to_db(task_id, results)
-        
-        # 更新进度
-        progress['current_group_index'] += 1
-        progress['processed_groups'] += 1
-        progress['current_group'] = None
-        
-        # 更新数据库任务记录
-        if task_id:
-            task = DedupTask.query.get(task_id)
-            if task:
-                task.processed_groups = progress['processed_groups']
-                # 检查是否全部完成
-                if progress['current_group_index'] >= progress['total_groups']:
-                    task.status = 'completed'
-                    task.completed_at = datetime.now()
-                    progress['status'] = 'completed'
+
+        group = QuestionDuplicateGroup
+        for row in db.session.query(
+            group.group_type, group.group_subject_id, group.group_channel_code,
+            func.count(group.id),
+            func.sum(group.question_count),
+            func.sum(group.question_count * (group.question_count - 1) / 2)
+        ).filter(group.task_id == task_id).group_by(
+            group.group_type, group.group_subject_id, group.group_channel_code
+        ):
+            item = row_for(tuple(row[:3]))
+            item['exact_duplicate_groups'] = row[3] or 0
+            item['exact_duplicate_questions'] = int(row[4] or 0)
+            item['exact_duplicate_pairs'] = int(row[5] or 0)
+
+        pair = QuestionDuplicatePair
+        for row in db.session.query(
+            pair.group_type, pair.group_subject_id, pair.group_channel_code, func.count(pair.id)
+        ).filter(pair.task_id == task_id, pair.duplicate_type == 'similar').group_by(
+            pair.group_type, pair.group_subject_id, pair.group_channel_code
+        ):
+            row_for(tuple(row[:3]))['similar_duplicate_pairs'] = row[3] or 0
+
+        checkpoint = DedupTaskCheckpoint
+        for row in db.session.query(
+            checkpoint.group_type, checkpoint.group_subject_id, checkpoint.group_channel_code,
+            func.count(checkpoint.id), func.sum(checkpoint.question_count)
+        ).filter(checkpoint.task_id == task_id, checkpoint.status == 'completed').group_by(
+            checkpoint.group_type, checkpoint.group_subject_id, checkpoint.group_channel_code
+        ):
+            item = row_for(tuple(row[:3]))
+            item['processed_groups'] = row[3] or 0
+            item['question_count'] = int(row[4] or 0)
+
+        now = datetime.now()
+        QuestionDedupService._bulk_insert(DedupTaskStatistic, [
+            dict(item,
+                 task_id=task_id,
+                 group_type=key[0],
+                 group_subject_id=key[1],
+                 group_channel_code=key[2],
+                 updated_at=now)
+            for key, item in stats.items()
+        ])
+        return len(stats)
+
+    @staticmethod
+    def _build_duplicate_summary_rows(task_id: int,
+                                      group: Dict[str, Any],
+                                      similar_duplicates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        按题目汇总分组内的相似重复对：每道题目的相似重复题目数、最大/最小相似度
+
+        相似重复对只在同一分组内产生，按分组汇总即得到任务内每道题目的完整统计
+
+        Args:
+            task_id: 任务ID
+            group: 分组信息字典
+            similar_duplicates: 相似重复对列表
+
+        Returns:
+            可直接批量插入 question_duplicate_summaries 表的字典列表
+        """
+        stats: Dict[int, List[float]] = {}
+        for pair in similar_duplicates:
+            similarity = float(pair.get('similarity', 0.0))
+            for qid in (pair['question_id_1'], pair['question_id_2']):
+                item = stats.get(qid)
+                if item is None:
+                    stats[qid] = [1, similarity, similarity]
                 else:
-                    task.status = 'running'
-                    progress['status'] = 'running'
-                db.session.commit()
-        else:
-            # 如果没有task_id，只更新JSON
-            if progress['current_group_index'] >= progress['total_groups']:
-                progress['status'] = 'completed'
-            else:
-                progress['status'] = 'pending'
+                    item[0] += 1
+                    item[1] = max(item[1], similarity)
+                    item[2] = min(item[2], similarity)
+        return [
+            {
+                'task_id': task_id,
+                'question_id': qid,
+                'duplicate_count': count,
+                'max_similarity': max_similarity,
+                'min_similarity': min_similarity,
+                'group_type': group.get('type'),
+                'group_subject_id': group.get('subject_id'),
+                'group_channel_code': group.get('channel_code')
+            }
+            for qid, (count, max_similarity, min_similarity) in stats.items()
+        ]
+
+    @staticmethod
+    def rebuild_duplicate_summary(task_id: int) -> int:
+        """
+        从 question_duplicate_pairs 重新生成任务的相似重复汇总（INSERT ... SELECT，在数据库中聚合）
+
+        用于汇总表上线前已完成的任务；调用方负责提交
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            生成的汇总行数
+        """
+        QuestionDuplicateSummary.query.filter_by(task_id=task_id).delete(synchronize_session=False)
+
+        pair = QuestionDuplicatePair
+        group_columns = (pair.group_type, pair.group_subject_id, pair.group_channel_code)
+        sides = union_all(*[
+            select(
+                column.label('question_id'), pair.similarity.label('similarity'), *group_columns
+            ).where(pair.task_id == task_id, pair.duplicate_type == 'similar')
+            for column in (pair.question_id_1, pair.question_id_2)
+        ]).subquery()
+        summary = select(
+            literal_column(str(int(task_id))),
+            sides.c.question_id,
+            func.count(),
+            func.max(sides.c.similarity),
+            func.min(sides.c.similarity),
+            func.max(sides.c.group_type),
+            func.max(sides.c.group_subject_id),
+            func.max(sides.c.group_channel_code)
+        ).group_by(sides.c.question_id)
+        result = db.session.execute(QuestionDuplicateSummary.__table__.insert().from_select([
+            'task_id', 'question_id', 'duplicate_count', 'max_similarity', 'min_similarity',
+            'group_type', 'group_subject_id', 'group_channel_code'
+        ], summary))
+        return result.rowcount
+
+    @staticmethod
+    def delete_task(task: DedupTask):
+        """
+        删除任务及其全部结果和特征数据（不提交）
+
+        关联表按 task_id 批量删除，不把结果逐条加载到会话中；
+        SQLite 默认不开启外键约束，不能只依赖 ON DELETE CASCADE
+
+        Args:
+            task: 任务
+        """
+        # 先删除明细表，再删除它们引用的组/簇表
+        for model in (QuestionDuplicateGroupItem, QuestionDuplicateClusterMember,
+                      QuestionDuplicateGroup, QuestionDuplicateCluster, QuestionDuplicatePair,
+                      QuestionDuplicateSummary, QuestionDedupFeature, QuestionDedupBandIndex,
+                      DedupTaskCheckpoint, DedupTaskStatistic, DedupTaskJob):
+            model.query.filter_by(task_id=task.id).delete(synchronize_session=False)
+        db.session.delete(task)
+
+    @staticmethod
+    def lookup_band_index(band_hashes,
+                          group: Optional[Dict[str, Any]] = None,
+                          task_ids: Optional[List[int]] = None,
+                          batch_size: int = 500) -> Dict[Tuple[int, int], List[Tuple[int, int]]]:
+        """
+        按 (band_idx, band_hash) 查询持久化的 band 索引，找出候选重复题目
+
+        Args:
+            band_hashes: band 哈希矩阵 (n, NUM_BANDS)，由 MinHashEngine.band_hashes 生成
+            group: 限定的分组信息（可选），为空时跨分组查询
+            task_ids: 限定的任务ID列表（可选），为空时查询所有任务
+            batch_size: 每次 IN 查询的哈希值数量
+
+        Returns:
+            {(band_idx, band_hash): [(question_id, task_id), ...]}，band_hash 为有符号 int64
+        """
+        band_hashes = np.asarray(band_hashes, dtype=np.uint64).view(np.int64)
+        wanted = set()
+        for row in band_hashes:
+            for band_idx, band_hash in enumerate(row.tolist()):
+                wanted.add((band_idx, band_hash))
+        if not wanted or task_ids is not None and not task_ids:
+            return {}
+
+        query = db.session.query(
+            QuestionDedupBandIndex.question_id,
+            QuestionDedupBandIndex.task_id,
+            QuestionDedupBandIndex.band_idx,
+            QuestionDedupBandIndex.band_hash
+        ).filter(QuestionDedupBandIndex.fingerprint_version == FINGERPRINT_VERSION)
+        if group:
+            query = query.filter(
+                QuestionDedupBandIndex.group_type == group['type'],
+                QuestionDedupBandIndex.group_subject_id == group['subject_id'],
+                QuestionDedupBandIndex.group_channel_code == group['channel_code']
+            )
+        if task_ids is not None:
+            query = query.filter(QuestionDedupBandIndex.task_id.in_(task_ids))
+
+        result = {}
+        distinct_hashes = sorted({band_hash for _, band_hash in wanted})
+        for start in range(0, len(distinct_hashes), batch_size):
+            batch = distinct_hashes[start:start + batch_size]
+            for row in query.filter(QuestionDedupBandIndex.band_hash.in_(batch)).all():
+                key = (row.band_idx, row.band_hash)
+                # 不同 band 的哈希值可能碰撞，只保留 band 序号也匹配的记录
+                if key in wanted:
+                    result.setdefault(key, []).append((row.question_id, row.task_id))
+        return result
+
+    @staticmethod
+    def get_indexed_task_ids(group: Dict[str, Any], task_ids: List[int]) -> Set[int]:
+        """
+        返回给定任务中，在该分组下写入过 band 索引的任务ID集合
+
+        Args:
+            group: 分组信息字典
+            task_ids: 候选任务ID列表
+
+        Returns:
+            已建立 band 索引的任务ID集合
+        """
+        if not task_ids:
+            return set()
+        rows = db.session.query(QuestionDedupBandIndex.task_id).filter(
+            QuestionDedupBandIndex.task_id.in_(task_ids),
+            QuestionDedupBandIndex.group_type == group['type'],
+            QuestionDedupBandIndex.group_subject_id == group['subject_id'],
+            QuestionDedupBandIndex.group_channel_code == group['channel_code'],
+            QuestionDedupBandIndex.fingerprint_version == FINGERPRINT_VERSION
+        ).distinct().all()
+        return {row.task_id for row in rows}
+
+    @staticmethod
+    def mark_group_completed(results: Optional[Dict[str, Any]] = None, task_id: Optional[int] = None):
+        """
+        标记当前分组（第一个未完成的分组）处理完成，并更新数据库任务记录
         
-        QuestionDedupService.save_progress(progress)
+        Args:
+            results: 该分组的处理结果（可选）
+            task_id: 任务ID（可选），未指定时使用最近创建的任务
+        """
+        task = QuestionDedupService._resolve_task(task_id)
+        if not task:
+            return
+        group_index = DedupCheckpointStore.next_pending_index(task.id)
+        if group_index is None:
+            return
+        QuestionDedupService._complete_group(task, group_index, results)
     
+    @staticmethod
+    def mark_group_index_completed(group_index: int, results: Optional[Dict[str, Any]] = None,
+                                   task_id: Optional[int] = None, worker_id: Optional[str] = None) -> bool:
+        """
+        标记指定序号的分组处理完成（并行执行时分组完成顺序与序号无关）
+
+        Args:
+            group_index: 分组在任务分组列表中的序号
+            results: 该分组的处理结果（可选）
+            task_id: 任务ID（可选），未指定时使用最近创建的任务
+            worker_id: 租用该分组的执行器ID（可选），指定时租约已被其他执行器接管则不保存结果
+
+        Returns:
+            是否保存了该分组的结果
+        """
+        task = QuestionDedupService._resolve_task(task_id)
+        if not task:
+            return False
+        return QuestionDedupService._complete_group(task, group_index, results, worker_id)
+
+    @staticmethod
+    def _complete_group(task: DedupTask, group_index: int, results: Optional[Dict[str, Any]],
+                        worker_id: Optional[str] = None) -> bool:
+        """
+        更新分组检查点、保存分组结果并更新任务进度
+
+        检查点、分组结果和任务统计在同一事务中提交，保存失败时检查点保持未完成，断点续传会重新处理该分组；
+        分组已经完成（或租约已被其他执行器接管）时直接返回，不会重复保存结果。
+        任务统计使用 SQL 表达式累加，多个执行器同时完成分组时不会互相覆盖。
+        total_questions 是创建任务时按分组统计的总题目数，不再逐组累加（已处理题目数见分维度统计）
+        """
+        if not DedupCheckpointStore.mark_completed(task.id, group_index, results, worker_id):
+            db.session.rollback()
+            return False
+
+        try:
+            # 保存数据到数据库（与检查点一起提交）
+            if results:
+                QuestionDedupService._save_group_results_to_db(task.id, results)
+
+            counters = DedupCheckpointStore.group_counters(results)
+            DedupTask.query.filter(DedupTask.id == task.id).update({
+                'processed_groups': func.coalesce(DedupTask.processed_groups, 0) + 1,
+                'exact_duplicate_groups': func.coalesce(DedupTask.exact_duplicate_groups, 0)
+                + counters['exact_duplicate_groups'],
+                'exact_duplicate_pairs': func.coalesce(DedupTask.exact_duplicate_pairs, 0)
+                + counters['exact_duplicate_pairs'],
+                'similar_duplicate_pairs': func.coalesce(DedupTask.similar_duplicate_pairs, 0)
+                + counters['similar_duplicate_pairs']
+            }, synchronize_session=False)
+            if DedupCheckpointStore.next_pending_index(task.id) is None:
+                # 不覆盖处理期间写入的取消/错误状态
+                DedupTask.query.filter(
+                    DedupTask.id == task.id,
+                    DedupTask.status.in_(('pending', 'running', 'paused'))
+                ).update({'status': 'completed', 'completed_at': datetime.now()}, synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        db.session.expire(task)
+        return True
+
     @staticmethod
     def reset_progress():
-        """重置进度（重新开始）"""
-        if os.path.exists(QuestionDedupService.PROGRESS_FILE):
-            os.remove(QuestionDedupService.PROGRESS_FILE)
+        """重置进度（创建新任务重新开始）"""
         return QuestionDedupService.init_dedup_session()
     
     @staticmethod
-    def _clean_question_content(content: str) -> str:
+    def _clean_question_content(content: str, channel_code: Optional[str] = None) -> str:
         """
         清洗题干内容
         
+        去除 HTML 标签 → 全角转半角 → 图片/公式占位符标准化 → 空格标准化 → 去除不可见字符，
+        具体步骤见 text_normalizer.DEFAULT_STEPS
+        
         Args:
             content: 原始题干内容
+            channel_code: 渠道代码（可选），渠道注册了追加步骤时使用该渠道的标准化器
             
         Returns:
             清洗后的题干内容
         """
-        if not content:
-            return ""
-        
-        # 1. 去除 HTML 标签
-        content = re.sub(r'<[^>]+>', '', content)
-        
-        # 2. 全角转半角
-        def full_to_half(text):
-            """全角转半角"""
-            result = ""
-            for char in text:
-                code = ord(char)
-                # 全角空格（12288）转半角空格（32）
-                if code == 12288:
-                    result += chr(32)
-                # 全角字符转半角（65281-65374 对应 33-126）
-                elif 65281 <= code <= 65374:
-                    result += chr(code - 65248)
-                else:
-                    result += char
-            return result
-        
-        content = full_to_half(content)
-        
-        # 3. 图片/公式占位符标准化
-        # [图片1] [图片2] ... → [IMG]
-        content = re.sub(r'\[图片\d+\]', '[IMG]', content)
-        # [公式1] [公式2] ... → [FORMULA]
-        content = re.sub(r'\[公式\d+\]', '[FORMULA]', content)
-        
-        # 4. 空格标准化：多个连续空格合并为一个，去除首尾空白
-        content = re.sub(r'\s+', ' ', content)
-        content = content.strip()
-        
-        # 5. 去除不可见字符（控制字符、零宽字符等）
-        # 保留常见的空格、换行符、制表符，去除其他控制字符
-        content = re.sub(r'[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F-\x9F\u200B-\u200D\uFEFF]', '', content)
-        
-        return content
+        return get_normalizer(channel_code).normalize(content)
     
     @staticmethod
-    def _clean_questions(questions: List[Question]) -> List[Dict[str, Any]]:
+    def _clean_questions(questions: Iterable[Any], channel_code: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         批量清洗题目
         
         Args:
-            questions: 题目列表
+            questions: 题目列表或流式读取的行对象（需包含 question_id 和 content 属性）
+            channel_code: 渠道代码（可选）
             
         Returns:
             清洗后的题目列表，每个元素包含 question_id 和 cleaned_content
         """
-        cleaned = []
-        for q in questions:
-            cleaned_content = QuestionDedupService._clean_question_content(q.content or "")
-            cleaned.append({
-                'question_id': q.question_id,
-                'cleaned_content': cleaned_content,
-                'original_content': q.content
-            })
-        return cleaned
+        normalize = get_normalizer(channel_code).normalize
+        return [
+            {'question_id': q.question_id, 'cleaned_content': normalize(q.content)}
+            for q in questions
+        ]
     
     @staticmethod
     def _find_exact_duplicates(cleaned_questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -516,90 +936,120 @@ class QuestionDedupService:
         return ngrams
     
     @staticmethod
-    def _hash_function(text: str, seed: int) -> int:
+    def _generate_minhash(ngrams: Set[str], num_hashes: int = NUM_HASHES) -> List[int]:
         """
-        哈希函数（使用Python内置hash，通过seed区分不同的哈希函数）
-        
+        生成单个题目的MinHash指纹
+
+        批量场景请使用 _generate_minhash_matrix，一次生成整组签名矩阵
+
         Args:
-            text: 文本内容
-            seed: 种子（用于区分不同的哈希函数）
-            
+            ngrams: N-gram集合
+            num_hashes: 哈希函数数量（指纹长度），默认为128
+
         Returns:
-            哈希值（整数）
+            MinHash指纹列表（128个整数）
         """
-        # 使用字符串拼接种子，然后计算哈希值
-        # 注意：Python的hash函数在不同进程或重启后会不同，但这里只用于相对比较，可以接受
-        return hash(f"{seed}:{text}")
-    
+        engine = QuestionDedupService._minhash_engine
+        if num_hashes != engine.num_hashes:
+            engine = MinHashEngine(num_hashes=num_hashes)
+        return engine.signature(ngrams).tolist()
+
     @staticmethod
-    def _generate_minhash(ngrams: Set[str], num_hashes: int = 128) -> List[int]:
+    def _generate_minhash_matrix(ngram_sets: List[Set[str]]):
         """
-        生成MinHash指纹
-        
+        批量生成MinHash签名矩阵
+
         Args:
-            ngrams: N-gram集合
-            num_hashes: 哈希函数数量（指纹长度），默认为128
-            
+            ngram_sets: N-gram集合列表
+
         Returns:
-            MinHash指纹列表（128个整数）
+            形状为 (len(ngram_sets), 128) 的 NumPy 矩阵，第 i 行为第 i 个集合的指纹
         """
-        if not ngrams:
-            return [0] * num_hashes
-        
-        minhash = []
-        
-        # 对每个哈希函数，计算所有ngram的哈希值，取最小值
-        for seed in range(num_hashes):
-            min_val = None
-            for ngram in ngrams:
-                hash_val = QuestionDedupService._hash_function(ngram, seed)
-                # 将哈希值转换为非负整数（取绝对值）
-                hash_val = abs(hash_val)
-                if min_val is None or hash_val < min_val:
-                    min_val = hash_val
-            minhash.append(min_val if min_val is not None else 0)
-        
-        return minhash
-    
+        return QuestionDedupService._minhash_engine.signature_matrix(ngram_sets)
+
     @staticmethod
-    def _lsh_bucketing(question_fingerprints: List[Dict[str, Any]], 
-                       num_bands: int = 16, 
-                       rows_per_band: int = 8) -> Dict[str, List[int]]:
+    def _lsh_bucketing(question_ids: List[int],
+                       signatures,
+                       num_bands: int = NUM_BANDS,
+                       rows_per_band: int = ROWS_PER_BAND,
+                       rows: Optional[np.ndarray] = None,
+                       task_id: Optional[int] = None) -> Dict[str, List[int]]:
         """
         LSH分桶（Banding技术）
-        
+
         Args:
-            question_fingerprints: 题目指纹列表，每个元素包含question_id和minhash
+            question_ids: 题目ID列表，与签名矩阵的行（或 rows 指定的行）一一对应
+            signatures: MinHash签名矩阵 (题目数, num_bands * rows_per_band)，可以是内存映射数组
             num_bands: band数量，默认为16
             rows_per_band: 每个band的行数，默认为8（128 = 16 * 8）
-            
+            rows: 参与分桶的签名行号（可选），提供时按列原地读取整个签名矩阵，只取这些行的 band 哈希，
+                  不复制签名矩阵
+            task_id: 任务ID（可选），每处理一个 band 检查一次控制信号
+
         Returns:
             桶字典，key为bucket_id，value为该桶内的question_id列表
             格式：{'band0_hash123': [1, 2, 3], 'band1_hash456': [4, 5], ...}
+            只包含题目数>1的桶
         """
         buckets = {}
-        
-        for item in question_fingerprints:
-            question_id = item['question_id']
-            minhash = item['minhash']
-            
-            # 将128位指纹分成16个band，每个band 8位
-            for band_idx in range(num_bands):
-                start_idx = band_idx * rows_per_band
-                end_idx = start_idx + rows_per_band
-                band = minhash[start_idx:end_idx]
-                
-                # 计算band的哈希值作为bucket_id
-                band_str = ','.join(map(str, band))
-                bucket_id = f"band{band_idx}_{hash(band_str)}"
-                
-                if bucket_id not in buckets:
-                    buckets[bucket_id] = []
-                buckets[bucket_id].append(question_id)
-        
-        # 过滤掉只有一个题目的桶（不可能有重复）
+        if len(question_ids) < 2:
+            return buckets
+
+        qids = np.asarray(question_ids)
+        band_hashes = MinHashEngine.band_hashes(signatures, num_bands, rows_per_band)
+        if rows is not None:
+            band_hashes = band_hashes[rows]
+
+        for band_idx in DedupTaskControl.checked(range(num_bands), task_id, interval=1):
+            column = band_hashes[:, band_idx]
+            # 排序后相同哈希值相邻，找出长度>1的连续段即为非空桶
+            order = np.argsort(column, kind='stable')
+            sorted_hashes = column[order]
+            boundaries = np.flatnonzero(sorted_hashes[1:] != sorted_hashes[:-1]) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [len(sorted_hashes)]))
+            for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+                bucket_id = f"band{band_idx}_{int(sorted_hashes[start])}"
+                buckets[bucket_id] = qids[order[start:end]].tolist()
+
+        return buckets
+
+    @staticmethod
+    def _lsh_bucketing_with_index(question_ids: List[int],
+                                  signatures,
+                                  group: Dict[str, Any],
+                                  candidate_tasks: Dict[int, int]) -> Dict[str, List[int]]:
+        """
+        使用持久化的 band 索引分桶：只计算给定题目的 band 哈希，
+        再按 (band_idx, band_hash) 索引查找同桶的历史题目
+
+        Args:
+            question_ids: 需要查找候选的题目ID列表，与签名矩阵的行一一对应
+            signatures: MinHash签名矩阵
+            group: 分组信息字典
+            candidate_tasks: 允许作为候选的历史题目 {question_id: task_id}，
+                             只有索引记录的任务ID与之一致时才采用（过期索引被忽略）
+
+        Returns:
+            桶字典，格式与 _lsh_bucketing 相同，只包含题目数>1的桶
+        """
+        band_hashes = MinHashEngine.band_hashes(signatures, NUM_BANDS, ROWS_PER_BAND)
+        buckets = {}
+        for row, qid in enumerate(question_ids):
+            for band_idx, band_hash in enumerate(band_hashes[row].tolist()):
+                buckets.setdefault(f"band{band_idx}_{band_hash}", []).append(qid)
+
+        task_ids = sorted(set(candidate_tasks.values()))
+        matches = QuestionDedupService.lookup_band_index(band_hashes, group, task_ids)
+        for (band_idx, band_hash), entries in matches.items():
+            # 索引中存储的是有符号 int64，转回 uint64 与分桶键保持一致
+            bucket = buckets[f"band{band_idx}_{band_hash & 0xFFFFFFFFFFFFFFFF}"]
+            for qid, indexed_task_id in entries:
+                if candidate_tasks.get(qid) == indexed_task_id:
+                    bucket.append(qid)
+
         return {bucket_id: qids for bucket_id, qids in buckets.items() if len(qids) > 1}
-    
+
     @staticmethod
     def _jaccard_similarity(ngrams1: Set[str], ngrams2: Set[str]) -> float:
         """
@@ -633,21 +1083,33 @@ class QuestionDedupService:
         cleaned_questions: List[Dict[str, Any]],
         question_ngrams: Dict[int, Set[str]],
         buckets: Dict[str, List[int]],
-        similarity_threshold: float = 0.8
+        similarity_threshold: float = 0.8,
+        required_ids: Optional[Set[int]] = None,
+        similarity_fn: Optional[Callable[[Any, Any], float]] = None,
+        task_id: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         在桶内精确计算相似度，找出相似重复的题目对
         
         Args:
             cleaned_questions: 清洗后的题目列表
-            question_ngrams: 题目ID到N-gram集合的映射
+            question_ngrams: 题目ID到N-gram集合（或 n-gram 哈希ID 数组）的映射
             buckets: LSH分桶结果
             similarity_threshold: 相似度阈值，默认为0.8
+            required_ids: 必须包含的题目ID集合（可选），提供时只比较至少一方在其中的题目对
+                          （增量分析只关心新增/变更题目相关的题目对）
+            similarity_fn: 相似度函数（可选），默认 _jaccard_similarity；
+                           question_ngrams 为 n-gram 哈希ID 数组时使用 ngram_jaccard
+            task_id: 任务ID（可选），每比较 CHECK_INTERVAL 对题目检查一次控制信号
+                     （按比较次数而不是桶数检查，单个超大桶内也能及时响应暂停/取消）
             
         Returns:
             相似重复的题目对列表
             格式：[{'question_id_1': 1, 'question_id_2': 2, 'similarity': 0.95}, ...]
         """
+        similarity_fn = similarity_fn or QuestionDedupService._jaccard_similarity
+        token = DedupTaskControl.get(task_id)
+        compared = 0
         similar_pairs = []
         processed_pairs = set()  # 用于去重，避免同一对题目被重复添加
         
@@ -663,17 +1125,24 @@ class QuestionDedupService:
                     if qid1 > qid2:
                         qid1, qid2 = qid2, qid1
                     
+                    if required_ids is not None and qid1 not in required_ids and qid2 not in required_ids:
+                        continue
+
                     pair_key = (qid1, qid2)
                     if pair_key in processed_pairs:
                         continue
                     processed_pairs.add(pair_key)
+
+                    compared += 1
+                    if token is not None and compared % CHECK_INTERVAL == 0:
+                        token.check()
                     
                     # 获取两个题目的N-gram
                     ngrams1 = question_ngrams.get(qid1, set())
                     ngrams2 = question_ngrams.get(qid2, set())
                     
                     # 计算Jaccard相似度
-                    similarity = QuestionDedupService._jaccard_similarity(ngrams1, ngrams2)
+                    similarity = similarity_fn(ngrams1, ngrams2)
                     
                     # 如果相似度达到阈值，添加到结果中
                     if similarity >= similarity_threshold:
@@ -686,13 +1155,17 @@ class QuestionDedupService:
         return similar_pairs
     
     @staticmethod
-    def process_single_group(group: Dict[str, Any], task_id: Optional[int] = None) -> Dict[str, Any]:
+    def process_single_group(group: Dict[str, Any],
+                             task_id: Optional[int] = None,
+                             shard_workers: int = 1) -> Dict[str, Any]:
         """
         处理单个分组
         
         Args:
             group: 分组信息字典，包含 type, subject_id, channel_code, count 等
             task_id: 任务ID（可选），用于检查任务状态（支持暂停功能）
+            shard_workers: 分组内分片进程数（可选），大于1且题目数达到 SHARD_MIN_QUESTIONS 时，
+                           清洗、N-gram 提取和 MinHash 生成拆分到多个进程并行完成
             
         Returns:
             处理结果字典，包含重复题目对等信息
@@ -700,50 +1173,57 @@ class QuestionDedupService:
         Raises:
             RuntimeError: 如果任务被暂停或取消
         """
-        # 获取该分组的所有题目
-        questions = QuestionService.get_questions_by_group(
+        # 按主键范围流式读取该分组的题目（只读取 question_id 和 content）
+        questions = QuestionService.iter_questions_by_group(
             question_type=group['type'],
             subject_id=group['subject_id'],
             channel_code=group['channel_code']
         )
         
-        # 检查任务状态（如果提供了 task_id）
-        if task_id:
-            task = DedupTask.query.get(task_id)
-            if task and task.status != 'running':
-                if task.status == 'paused':
-                    raise RuntimeError(f"任务 {task_id} 已暂停")
-                elif task.status in ['cancelled', 'completed', 'error']:
-                    raise RuntimeError(f"任务 {task_id} 状态为 {task.status}")
+        # 检查任务状态（如果提供了 task_id），读取和清洗期间每批检查一次
+        QuestionDedupService._check_task_status(task_id)
+        questions = DedupTaskControl.checked(questions, task_id)
         
         print(f"\n处理分组: {group['type_name']} - {group['subject_name']} ({group['channel_code']})")
-        print(f"题目数量: {len(questions)}")
-        
-        # 步骤1 - 清洗题干
-        cleaned_questions = QuestionDedupService._clean_questions(questions)
+        print(f"题目数量: {group.get('count', 0)}")
+        
+        # 步骤1 - 清洗题干（边读取边清洗，不保留原始内容）
+        # 超大分组：清洗、N-gram 提取和 MinHash 一次性分片到多个进程完成，
+        # 签名、n-gram 哈希ID 和清洗后的内容写入内存映射文件，在此原地读取
+        sharded = None
+        sharded_rows = None
+        if shard_workers > 1 and group.get('count', 0) >= SHARD_MIN_QUESTIONS:
+            question_ids = []
+            contents = []
+            for q in questions:
+                question_ids.append(q.question_id)
+                contents.append(q.content)
+            sharded = fingerprint_group_sharded(
+                contents, NUM_HASHES, shard_workers, channel_code=group['channel_code'], task_id=task_id
+            )
+            del contents
+            sharded_rows = {qid: row for row, qid in enumerate(question_ids)}
+            cleaned_questions = [
+                {
+                    'question_id': qid,
+                    'cleaned_content': sharded.cleaned_content(row)
+                }
+                for row, qid in enumerate(question_ids)
+            ]
+            print(f"分片处理完成: {shard_workers} 个进程")
+        else:
+            cleaned_questions = QuestionDedupService._clean_questions(questions, group['channel_code'])
         print(f"清洗完成: {len(cleaned_questions)} 题")
         
         # 检查任务状态（步骤1后）
-        if task_id:
-            task = DedupTask.query.get(task_id)
-            if task and task.status != 'running':
-                if task.status == 'paused':
-                    raise RuntimeError(f"任务 {task_id} 已暂停")
-                elif task.status in ['cancelled', 'completed', 'error']:
-                    raise RuntimeError(f"任务 {task_id} 状态为 {task.status}")
+        QuestionDedupService._check_task_status(task_id)
         
         # 步骤2 - 秒筛完全一样的题
         exact_duplicates = QuestionDedupService._find_exact_duplicates(cleaned_questions)
         print(f"完全重复: {len(exact_duplicates)} 组")
 
         # 检查任务状态（步骤2后）
-        if task_id:
-            task = DedupTask.query.get(task_id)
-            if task and task.status != 'running':
-                if task.status == 'paused':
-                    raise RuntimeError(f"任务 {task_id} 已暂停")
-                elif task.status in ['cancelled', 'completed', 'error']:
-                    raise RuntimeError(f"任务 {task_id} 状态为 {task.status}")
+        QuestionDedupService._check_task_status(task_id)
         
         # 获取完全重复的题目ID集合（这些题目不需要参与相似度计算）
         exact_duplicate_question_ids = set()
@@ -763,137 +1243,79 @@ class QuestionDedupService:
             print(f"参与相似度计算的题目: {len(questions_for_similarity)} 题")
 
             # 检查任务状态（相似度计算开始前）
-            if task_id:
-                task = DedupTask.query.get(task_id)
-                if task and task.status != 'running':
-                    if task.status == 'paused':
-                        raise RuntimeError(f"任务 {task_id} 已暂停")
-                    elif task.status in ['cancelled', 'completed', 'error']:
-                        raise RuntimeError(f"任务 {task_id} 状态为 {task.status}")
+            QuestionDedupService._check_task_status(task_id)
 
             # 步骤3 - 提取特征片段（N-gram）
+            # 分片时使用映射文件中的 n-gram 哈希ID 数组（不复制），精算使用 ngram_jaccard
             question_ngrams = {}
-            for q in questions_for_similarity:
-                # 检查任务状态（在循环中）
-                if task_id:
-                    task = DedupTask.query.get(task_id)
-                    if task and task.status != 'running':
-                        if task.status == 'paused':
-                            raise RuntimeError(f"任务 {task_id} 已暂停")
-                        elif task.status in ['cancelled', 'completed', 'error']:
-                            raise RuntimeError(f"任务 {task_id} 状态为 {task.status}")
-
-                ngrams = QuestionDedupService._extract_ngrams(q['cleaned_content'], n=3)
-                question_ngrams[q['question_id']] = ngrams
+            similarity_fn = None
+            if sharded is not None:
+                for q in questions_for_similarity:
+                    question_ngrams[q['question_id']] = sharded.ngrams(sharded_rows[q['question_id']])
+                similarity_fn = ngram_jaccard
+            else:
+                # 每处理一批题目检查一次任务控制信号
+                for q in DedupTaskControl.checked(questions_for_similarity, task_id):
+                    ngrams = QuestionDedupService._extract_ngrams(q['cleaned_content'], n=3)
+                    question_ngrams[q['question_id']] = ngrams
             print(f"N-gram提取完成")
             
             # 检查任务状态（步骤3后）
-            if task_id:
-                task = DedupTask.query.get(task_id)
-                if task and task.status != 'running':
-                    if task.status == 'paused':
-                        raise RuntimeError(f"任务 {task_id} 已暂停")
-                    elif task.status in ['cancelled', 'completed', 'error']:
-                        raise RuntimeError(f"任务 {task_id} 状态为 {task.status}")
-            
-            # 检查任务状态（MinHash生成前）
-            if task_id:
-                task = DedupTask.query.get(task_id)
-                if task and task.status != 'running':
-                    if task.status == 'paused':
-                        raise RuntimeError(f"任务 {task_id} 已暂停")
-                    elif task.status in ['cancelled', 'completed', 'error']:
-                        raise RuntimeError(f"任务 {task_id} 状态为 {task.status}")
-
-            # 步骤4 - 生成指纹（MinHash）
-            question_fingerprints = []
-            for q in questions_for_similarity:
-                # 检查任务状态（在循环中）
-                if task_id:
-                    task = DedupTask.query.get(task_id)
-                    if task and task.status != 'running':
-                        if task.status == 'paused':
-                            raise RuntimeError(f"任务 {task_id} 已暂停")
-                        elif task.status in ['cancelled', 'completed', 'error']:
-                            raise RuntimeError(f"任务 {task_id} 状态为 {task.status}")
-                
-                ngrams = question_ngrams[q['question_id']]
-                minhash = QuestionDedupService._generate_minhash(ngrams, num_hashes=128)
-                question_fingerprints.append({
-                    'question_id': q['question_id'],
-                    'minhash': minhash
-                })
-            print(f"MinHash生成完成: {len(question_fingerprints)} 个指纹")
+            QuestionDedupService._check_task_status(task_id)
+
+            # 步骤4 - 生成指纹（MinHash），整组一次性生成签名矩阵
+            similarity_question_ids = [q['question_id'] for q in questions_for_similarity]
+            signature_rows = None
+            if sharded is not None:
+                # 原地读取映射文件中的签名矩阵，signature_rows 为参与计算的题目所在的行
+                signature_matrix = sharded.signatures
+                signature_rows = np.fromiter(
+                    (sharded_rows[qid] for qid in similarity_question_ids),
+                    dtype=np.int64, count=len(similarity_question_ids)
+                )
+            else:
+                signature_matrix = QuestionDedupService._generate_minhash_matrix(
+                    [question_ngrams[qid] for qid in similarity_question_ids]
+                )
+            print(f"MinHash生成完成: {len(similarity_question_ids)} 个指纹")
             
             # 检查任务状态（步骤4后）
-            if task_id:
-                task = DedupTask.query.get(task_id)
-                if task and task.status != 'running':
-                    if task.status == 'paused':
-                        raise RuntimeError(f"任务 {task_id} 已暂停")
-                    elif task.status in ['cancelled', 'completed', 'error']:
-                        raise RuntimeError(f"任务 {task_id} 状态为 {task.status}")
-            
-            # 检查任务状态（LSH分桶前）
-            if task_id:
-                task = DedupTask.query.get(task_id)
-                if task and task.status != 'running':
-                    if task.status == 'paused':
-                        raise RuntimeError(f"任务 {task_id} 已暂停")
-                    elif task.status in ['cancelled', 'completed', 'error']:
-                        raise RuntimeError(f"任务 {task_id} 状态为 {task.status}")
+            QuestionDedupService._check_task_status(task_id)
 
             # 步骤5 - LSH 分桶
             buckets = QuestionDedupService._lsh_bucketing(
-                question_fingerprints,
-                num_bands=16,
-                rows_per_band=8
+                similarity_question_ids,
+                signature_matrix,
+                num_bands=NUM_BANDS,
+                rows_per_band=ROWS_PER_BAND,
+                rows=signature_rows,
+                task_id=task_id
             )
             print(f"LSH分桶完成: {len(buckets)} 个非空桶")
             
             # 检查任务状态（步骤5后）
-            if task_id:
-                task = DedupTask.query.get(task_id)
-                if task and task.status != 'running':
-                    if task.status == 'paused':
-                        raise RuntimeError(f"任务 {task_id} 已暂停")
-                    elif task.status in ['cancelled', 'completed', 'error']:
-                        raise RuntimeError(f"任务 {task_id} 状态为 {task.status}")
-            
-            # 检查任务状态（相似度计算前）
-            if task_id:
-                task = DedupTask.query.get(task_id)
-                if task and task.status != 'running':
-                    if task.status == 'paused':
-                        raise RuntimeError(f"任务 {task_id} 已暂停")
-                    elif task.status in ['cancelled', 'completed', 'error']:
-                        raise RuntimeError(f"任务 {task_id} 状态为 {task.status}")
+            QuestionDedupService._check_task_status(task_id)
 
             # 步骤6 - 桶内精算重复程度
             similar_duplicates = QuestionDedupService._calculate_similar_duplicates(
                 questions_for_similarity,
                 question_ngrams,
                 buckets,
-                similarity_threshold=0.8
+                similarity_threshold=0.8,
+                similarity_fn=similarity_fn,
+                task_id=task_id
             )
             print(f"相似重复: {len(similar_duplicates)} 对")
             
             # 准备特征数据（用于保存到数据库）
-            for q in questions_for_similarity:
+            for row, q in enumerate(questions_for_similarity):
                 qid = q['question_id']
-                feature_data = {
+                question_features.append({
                     'question_id': qid,
                     'cleaned_content': q['cleaned_content'],
                     'content_hash': hashlib.md5(q['cleaned_content'].encode('utf-8')).hexdigest(),
-                    'ngrams': list(question_ngrams.get(qid, set())),  # 转为列表便于JSON序列化
-                    'minhash': None
-                }
-                # 找到对应的minhash
-                for fp in question_fingerprints:
-                    if fp['question_id'] == qid:
-                        feature_data['minhash'] = fp['minhash']
-                        break
-                question_features.append(feature_data)
+                    'minhash': signature_matrix[row if signature_rows is None else signature_rows[row]].tolist()
+                })
         else:
             print("参与相似度计算的题目不足2题，跳过相似度计算")
             # 即使不计算相似度，也要保存特征数据（对于非完全重复的题目）
@@ -902,42 +1324,338 @@ class QuestionDedupService:
                     question_features.append({
                         'question_id': q['question_id'],
                         'cleaned_content': q['cleaned_content'],
-                        'content_hash': hashlib.md5(q['cleaned_content'].encode('utf-8')).hexdigest(),
-                        'ngrams': list(QuestionDedupService._extract_ngrams(q['cleaned_content'], n=3)),
-                        'minhash': QuestionDedupService._generate_minhash(
-                            QuestionDedupService._extract_ngrams(q['cleaned_content'], n=3), 
-                            num_hashes=128
-                        )
+                        'content_hash': hashlib.md5(q['cleaned_content'].encode('utf-8')).hexdigest()
                     })
-        
+
         # 也要为完全重复的题目保存特征数据（选择每组中的第一个作为代表）
+        cleaned_by_id = {q['question_id']: q for q in cleaned_questions}
         for dup_group in exact_duplicates:
             question_ids = dup_group['question_ids']
             if question_ids:
                 # 只保存第一个题目的特征（代表整个组）
                 qid = question_ids[0]
-                q = next((q for q in cleaned_questions if q['question_id'] == qid), None)
+                q = cleaned_by_id.get(qid)
                 if q and q['cleaned_content']:
                     question_features.append({
                         'question_id': qid,
                         'cleaned_content': q['cleaned_content'],
-                        'content_hash': dup_group['content_hash'],
-                        'ngrams': list(QuestionDedupService._extract_ngrams(q['cleaned_content'], n=3)),
-                        'minhash': QuestionDedupService._generate_minhash(
-                            QuestionDedupService._extract_ngrams(q['cleaned_content'], n=3), 
-                            num_hashes=128
-                        )
+                        'content_hash': dup_group['content_hash']
                     })
-        
+
+        # 未参与相似度计算的题目，统一批量补齐 MinHash 指纹
+        pending_features = [f for f in question_features if 'minhash' not in f]
+        if pending_features and sharded is not None:
+            for feature_data in pending_features:
+                feature_data['minhash'] = sharded.signatures[sharded_rows[feature_data['question_id']]].tolist()
+        elif pending_features:
+            pending_ngrams = [
+                QuestionDedupService._extract_ngrams(f['cleaned_content'], n=3)
+                for f in pending_features
+            ]
+            pending_matrix = QuestionDedupService._generate_minhash_matrix(pending_ngrams)
+            for row, feature_data in enumerate(pending_features):
+                feature_data['minhash'] = pending_matrix[row].tolist()
+
+        # 分片结果已全部读出，删除临时文件（中途暂停/取消时由对象回收时删除）
+        if sharded is not None:
+            question_ngrams = None
+            sharded.close()
+
+        # 步骤7 - 并查集聚类：完全重复组和相似重复对合并为重复题目簇
+        clusters = build_clusters(exact_duplicates, similar_duplicates)
+        print(f"重复题目簇: {len(clusters)} 个")
+
         return {
             'group': group,
-            'total_questions': len(questions),
+            'total_questions': len(cleaned_questions),
             'exact_duplicates': exact_duplicates,  # 完全重复的题目组
             'similar_duplicates': similar_duplicates,  # 相似重复的题目对
+            'clusters': clusters,  # 重复题目簇（连通分量）
             'cleaned_questions': question_features,  # 特征数据（用于保存到数据库）
             'processed_at': datetime.now().isoformat()
         }
     
+    @staticmethod
+    def _check_task_status(task_id: Optional[int]):
+        """
+        检查任务状态（支持暂停功能）
+
+        任务在当前进程中执行时只读取内存中的控制信号（DedupTaskControl），
+        否则回退为查询数据库中的任务状态
+
+        Raises:
+            RuntimeError: 如果任务被暂停或取消
+        """
+        if not task_id:
+            return
+        token = DedupTaskControl.get(task_id)
+        if token is not None:
+            token.check()
+            return
+        task = DedupTask.query.get(task_id)
+        if task and task.status != 'running':
+            if task.status == 'paused':
+                raise RuntimeError(f"任务 {task_id} 已暂停")
+            elif task.status in ['cancelled', 'completed', 'error']:
+                raise RuntimeError(f"任务 {task_id} 状态为 {task.status}")
+
+    @staticmethod
+    def get_incremental_baseline(task_id: int) -> Optional[Dict[str, Any]]:
+        """
+        获取增量分析的基线：最近一次已完成的全量任务及其后已完成的增量任务持久化的特征
+
+        全量任务为所有题目重新保存特征，更早任务的特征都已被它覆盖；增量任务只保存新增/变更题目的特征，
+        因此基线是最近一次全量任务与其后增量任务特征的并集，同一题目取最新任务的记录。
+        读取量只与题库规模和最近一次全量任务后的变更量有关，不随历史任务数增长。
+        没有已完成的全量任务时（只执行过增量任务，第一个增量任务按全量执行），基线为所有已完成任务。
+
+        Args:
+            task_id: 当前任务ID
+
+        Returns:
+            基线信息字典，没有已完成的历史任务时返回 None
+            {
+                'task_ids': [3, 5],              # 基线任务ID（升序）：最近一次全量任务及其后的增量任务
+                'last_task_id': 5,               # 最近一次已完成任务ID
+                'since': datetime(...)           # 最近一次已完成任务的开始时间
+            }
+        """
+        completed = DedupTask.query.filter(
+            DedupTask.status == 'completed',
+            DedupTask.id != task_id
+        )
+        last_full_task_id = db.session.query(func.max(DedupTask.id)).filter(
+            DedupTask.status == 'completed',
+            DedupTask.id != task_id,
+            or_(DedupTask.analysis_type.is_(None), DedupTask.analysis_type != 'incremental')
+        ).scalar()
+        if last_full_task_id is not None:
+            completed = completed.filter(
+                or_(DedupTask.id == last_full_task_id,
+                    and_(DedupTask.id > last_full_task_id, DedupTask.analysis_type == 'incremental'))
+            )
+        completed_tasks = completed.order_by(DedupTask.id).all()
+
+        if not completed_tasks:
+            return None
+
+        last_task = completed_tasks[-1]
+        return {
+            'task_ids': [t.id for t in completed_tasks],
+            'last_task_id': last_task.id,
+            'since': last_task.started_at or last_task.created_at
+        }
+
+    @staticmethod
+    def process_single_group_incremental(group: Dict[str, Any],
+                                         baseline: Dict[str, Any],
+                                         task_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        增量处理单个分组：只为新增/变更的题目生成指纹，并与基线指纹比较
+
+        判定规则：
+        - 新增：基线中没有该题目的特征，且 create_time 晚于上次已完成任务的开始时间
+        - 变更：清洗后内容哈希与基线特征的 content_hash 不一致
+        - 基线中没有特征的旧题目（上次作为完全重复组的非代表题目），
+          内容哈希仍在基线哈希集合中视为未变化，否则视为变更
+
+        Args:
+            group: 分组信息字典，包含 type, subject_id, channel_code, count 等
+            baseline: get_incremental_baseline 返回的基线信息
+            task_id: 任务ID（可选），用于检查任务状态（支持暂停功能）
+
+        Returns:
+            与 process_single_group 格式相同的处理结果字典，额外包含 incremental 统计信息
+
+        Raises:
+            RuntimeError: 如果任务被暂停或取消
+        """
+        QuestionDedupService._check_task_status(task_id)
+
+        print(f"\n增量处理分组: {group['type_name']} - {group['subject_name']} ({group['channel_code']})")
+        print(f"题目数量: {group.get('count', 0)}")
+
+        # 步骤1 - 流式读取并清洗题干、计算内容哈希（成本远低于生成指纹，全组计算）
+        total_questions = 0
+        cleaned_questions = []
+        create_times = {}
+        normalize = get_normalizer(group['channel_code']).normalize
+        questions = QuestionService.iter_questions_by_group(
+            question_type=group['type'],
+            subject_id=group['subject_id'],
+            channel_code=group['channel_code'],
+            columns=('question_id', 'content', 'create_time')
+        )
+        for q in DedupTaskControl.checked(questions, task_id):
+            total_questions += 1
+            create_times[q.question_id] = q.create_time
+            cleaned_content = normalize(q.content)
+            if cleaned_content:
+                cleaned_questions.append({
+                    'question_id': q.question_id,
+                    'cleaned_content': cleaned_content
+                })
+        content_hashes = {
+            q['question_id']: hashlib.md5(q['cleaned_content'].encode('utf-8')).hexdigest()
+            for q in cleaned_questions
+        }
+
+        # 步骤2 - 对比基线，找出新增/变更的题目
+        persisted = QuestionDedupService.load_persisted_signatures(
+            group, baseline['task_ids'], with_minhash=False
+        )
+        known_hashes = {item['content_hash'] for item in persisted.values()}
+        since = baseline.get('since')
+
+        delta_ids = set()
+        for q in cleaned_questions:
+            qid = q['question_id']
+            content_hash = content_hashes[qid]
+            if qid in persisted:
+                if persisted[qid]['content_hash'] != content_hash:
+                    delta_ids.add(qid)
+            elif since and create_times.get(qid) and create_times[qid] >= since:
+                delta_ids.add(qid)
+            elif content_hash not in known_hashes:
+                delta_ids.add(qid)
+        print(f"新增/变更题目: {len(delta_ids)} 题，基线指纹: {len(persisted)} 个")
+        QuestionDedupService._check_task_status(task_id)
+
+        # 步骤3 - 完全重复：只保留包含新增/变更题目的哈希组
+        hash_to_questions = {}
+        for q in cleaned_questions:
+            hash_to_questions.setdefault(content_hashes[q['question_id']], []).append(q['question_id'])
+        exact_duplicates = []
+        exact_duplicate_question_ids = set()
+        for content_hash, question_ids in hash_to_questions.items():
+            if len(question_ids) > 1:
+                exact_duplicate_question_ids.update(question_ids)
+                if delta_ids.intersection(question_ids):
+                    exact_duplicates.append({
+                        'question_ids': question_ids,
+                        'count': len(question_ids),
+                        'similarity': 1.0,
+                        'content_hash': content_hash
+                    })
+        print(f"完全重复: {len(exact_duplicates)} 组")
+
+        # 步骤4 - 只为新增/变更题目生成指纹
+        cleaned_by_id = {q['question_id']: q for q in cleaned_questions}
+        delta_for_similarity = [
+            qid for qid in sorted(delta_ids) if qid not in exact_duplicate_question_ids
+        ]
+        delta_ngrams = {
+            qid: QuestionDedupService._extract_ngrams(cleaned_by_id[qid]['cleaned_content'], n=3)
+            for qid in delta_for_similarity
+        }
+        delta_matrix = QuestionDedupService._generate_minhash_matrix(
+            [delta_ngrams[qid] for qid in delta_for_similarity]
+        )
+        print(f"MinHash生成完成: {len(delta_for_similarity)} 个指纹")
+        QuestionDedupService._check_task_status(task_id)
+
+        # 步骤5 - 与基线分桶，只保留包含新增/变更题目的桶
+        # 基线任务都写入过 band 索引时按索引查找候选；否则（旧任务）读取基线签名重新分桶
+        similar_duplicates = []
+        baseline_ids = [
+            qid for qid in persisted
+            if qid not in delta_ids and qid in cleaned_by_id and qid not in exact_duplicate_question_ids
+        ]
+        if delta_for_similarity and len(baseline_ids) + len(delta_for_similarity) > 1:
+            delta_set = set(delta_for_similarity)
+            baseline_task_ids = sorted({persisted[qid]['task_id'] for qid in baseline_ids})
+            indexed_task_ids = QuestionDedupService.get_indexed_task_ids(group, baseline_task_ids)
+            if len(indexed_task_ids) == len(baseline_task_ids):
+                buckets = QuestionDedupService._lsh_bucketing_with_index(
+                    delta_for_similarity,
+                    delta_matrix,
+                    group,
+                    {qid: persisted[qid]['task_id'] for qid in baseline_ids}
+                )
+                print(f"LSH索引查找完成: {len(buckets)} 个包含新增/变更题目的桶")
+            else:
+                signatures = QuestionDedupService.load_persisted_signatures(group, baseline_task_ids)
+                baseline_ids = [qid for qid in baseline_ids if qid in signatures]
+                combined_matrix = np.vstack(
+                    [signatures[qid]['minhash'] for qid in baseline_ids] + [delta_matrix]
+                ) if baseline_ids else delta_matrix
+                buckets = QuestionDedupService._lsh_bucketing(
+                    baseline_ids + delta_for_similarity,
+                    combined_matrix,
+                    num_bands=NUM_BANDS,
+                    rows_per_band=ROWS_PER_BAND,
+                    task_id=task_id
+                )
+                buckets = {
+                    bucket_id: qids for bucket_id, qids in buckets.items()
+                    if delta_set.intersection(qids)
+                }
+                print(f"LSH分桶完成: {len(buckets)} 个包含新增/变更题目的桶")
+            QuestionDedupService._check_task_status(task_id)
+
+            # 步骤6 - 桶内精算：基线题目的 N-gram 只在参与比较时才提取
+            question_ngrams = dict(delta_ngrams)
+            for qids in buckets.values():
+                for qid in qids:
+                    if qid not in question_ngrams:
+                        question_ngrams[qid] = QuestionDedupService._extract_ngrams(
+                            cleaned_by_id[qid]['cleaned_content'], n=3
+                        )
+            similar_duplicates = QuestionDedupService._calculate_similar_duplicates(
+                [cleaned_by_id[qid] for qid in question_ngrams],
+                question_ngrams,
+                buckets,
+                similarity_threshold=0.8,
+                required_ids=delta_set,
+                task_id=task_id
+            )
+        print(f"相似重复: {len(similar_duplicates)} 对")
+
+        # 特征数据：新增/变更题目，以及基线中尚无特征的完全重复组代表题目
+        question_features = []
+        for row, qid in enumerate(delta_for_similarity):
+            question_features.append({
+                'question_id': qid,
+                'cleaned_content': cleaned_by_id[qid]['cleaned_content'],
+                'content_hash': content_hashes[qid],
+                'minhash': delta_matrix[row].tolist()
+            })
+        representatives = [
+            dup_group['question_ids'][0] for dup_group in exact_duplicates
+            if dup_group['question_ids'][0] not in persisted
+            or dup_group['question_ids'][0] in delta_ids
+        ]
+        if representatives:
+            rep_ngrams = [
+                QuestionDedupService._extract_ngrams(cleaned_by_id[qid]['cleaned_content'], n=3)
+                for qid in representatives
+            ]
+            rep_matrix = QuestionDedupService._generate_minhash_matrix(rep_ngrams)
+            for row, qid in enumerate(representatives):
+                question_features.append({
+                    'question_id': qid,
+                    'cleaned_content': cleaned_by_id[qid]['cleaned_content'],
+                    'content_hash': content_hashes[qid],
+                    'minhash': rep_matrix[row].tolist()
+                })
+
+        clusters = build_clusters(exact_duplicates, similar_duplicates)
+
+        return {
+            'group': group,
+            'total_questions': total_questions,
+            'exact_duplicates': exact_duplicates,
+            'similar_duplicates': similar_duplicates,
+            'clusters': clusters,
+            'cleaned_questions': question_features,
+            'incremental': {
+                'baseline_task_id': baseline.get('last_task_id'),
+                'delta_questions': len(delta_ids),
+                'baseline_questions': len(persisted)
+            },
+            'processed_at': datetime.now().isoformat()
+        }
+
     @staticmethod
     def process_next_group() -> Optional[Dict[str, Any]]:
         """
@@ -962,11 +1680,12 @@ class QuestionDedupService:
             return results
         except Exception as e:
             # 记录错误
-            progress = QuestionDedupService.get_progress()
-            progress['status'] = 'error'
-            progress['last_error'] = str(e)
-            progress['error_time'] = datetime.now().isoformat()
-            QuestionDedupService.save_progress(progress)
+            db.session.rollback()
+            task = QuestionDedupService._resolve_task()
+            if task:
+                task.status = 'error'
+                task.error_message = str(e)
+                db.session.commit()
             raise
     
     @staticmethod
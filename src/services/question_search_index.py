@@ -0,0 +1,367 @@
+"""
+题目关键字搜索索引
+题目列表的 keyword 筛选原先是 content LIKE '%关键字%'，每次搜索都要扫描题型下的所有题目内容。
+倒排索引按题目内容的 3-gram（与去重特征相同的 feature_codec.ngram_ids 哈希）保存 (n-gram, 题目ID)，
+搜索时在倒排表中求关键字各 n-gram 的题目交集作为候选，再对候选题目执行原来的 LIKE 校验，
+结果与原来的 LIKE 筛选一致
+
+- 题目内容只做逐字符的折叠后提取 n-gram：包含关键字的内容折叠后一定包含折叠后的关键字；去重清洗
+  （去 HTML 标签、替换占位符、合并空白）会改变子串，不适用于搜索
+- 折叠覆盖 utf8mb4_unicode_ci 下 LIKE 逐字符比较的常见等价：全角/半角、大小写、重音和其他附加符号
+  （NFKD 分解后去掉组合字符，'cafe' 与 'café' 相同）、带横线的字母（ł、ø、đ 等）；在这些等价下索引只会多选，
+  不会漏选。排序规则中其他少见的等价（如可忽略的控制字符）不在折叠范围内，包含这类字符的题目可能搜不到
+- 折叠规则改变时必须升级 FOLD_VERSION：内容摘要包含折叠版本，下一次全量摘要比对会按新规则重建所有题目
+- question_search_documents 记录已索引题目的内容摘要，增量同步只重建内容变化的题目；
+  题目ID大于已索引最大ID的新题目不经过索引、直接按 LIKE 校验，并在后台同步到索引
+- 已索引题目的内容被修改后，搜索按旧内容筛选候选；距上次全量摘要比对超过 QUESTION_SEARCH_INDEX_SYNC_INTERVAL 时，
+  下一次搜索在后台触发一次全量摘要比对（与 DimensionCache 的 TTL 刷新相同），因此被修改题目最多在
+  同步间隔加一次同步耗时之后可以按新内容搜到；题库同步修改题目后调用 index_questions 可以立即生效
+- 关键字折叠后不足 3 个字符、含 LIKE 通配符、候选过多或索引未建立时仍使用原来的 LIKE 扫描
+"""
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from flask import current_app
+from sqlalchemy import func, or_
+from src.models import db
+from src.models.question import Question, QuestionSearchNgram, QuestionSearchDocument
+from src.services.text_normalizer import full_to_half
+from src.utils.feature_codec import NGRAM_SIZE, ngram_ids
+
+# 组合字符（重音等附加符号，Unicode 组合类不为 0），NFKD 分解后删除
+_COMBINING_MARK_RE = re.compile('[{}]'.format(''.join(
+    re.escape(chr(code)) for code in range(0x300, 0x10000) if unicodedata.combining(chr(code))
+)))
+# 排序规则中视为基本字母加附加符号、但 NFKD 不分解的带横线字母
+_STROKE_LETTERS = {'ł': 'l', 'ø': 'o', 'đ': 'd', 'ħ': 'h', 'ŧ': 't', 'ƀ': 'b', 'ƶ': 'z', 'ǥ': 'g'}
+_STROKE_LETTER_RE = re.compile('[{}]'.format(''.join(_STROKE_LETTERS)))
+
+
+class QuestionSearchIndex:
+    """题目关键字搜索倒排索引"""
+
+    # 同步时每批读取的题目数
+    SYNC_BATCH_SIZE = 2000
+    # 每次 INSERT 的行数
+    INSERT_CHUNK_SIZE = 5000
+    # 查询时最多使用的关键字 n-gram 数（任意子集的交集都包含所有匹配题目，由 LIKE 校验）
+    MAX_QUERY_NGRAMS = 8
+    # 候选题目数上限，超过时关键字过于常见，直接扫描比按ID读取更快
+    MAX_CANDIDATES = 20000
+    # 发现未索引的新题目时触发后台同步的最小间隔（秒）
+    SYNC_TRIGGER_INTERVAL = 60
+    # 默认全量摘要比对间隔（秒），可通过 QUESTION_SEARCH_INDEX_SYNC_INTERVAL 配置
+    DEFAULT_SYNC_INTERVAL = 300
+
+    # 折叠规则版本（计入内容摘要），fold_text 的规则改变时必须升级
+    # v2: 增加重音、附加符号和带横线字母的折叠
+    FOLD_VERSION = 'v2'
+
+    # LIKE 通配符和转义字符，关键字包含时不能按子串处理
+    LIKE_SPECIAL_CHARS = ('%', '_', '\\')
+
+    _lock = threading.Lock()
+    _sync_thread: Optional[threading.Thread] = None
+    _last_sync_trigger = 0.0
+    # 最近一次触发全量摘要比对的时间（time.monotonic()），进程内尚未触发时为 None
+    _last_full_sync_trigger: Optional[float] = None
+    _last_sync: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def enabled() -> bool:
+        return bool(current_app.config.get('QUESTION_SEARCH_INDEX_ENABLED', True))
+
+    @staticmethod
+    def fold_text(text: Optional[str]) -> str:
+        """
+        搜索折叠：全角转半角、转小写，非 ASCII 内容再做 NFKD 分解、去掉附加符号、带横线字母转为基本字母
+
+        逐字符转换，保持子串关系
+        """
+        if not text:
+            return ""
+        text = full_to_half(text)
+        if text.isascii():
+            return text.lower()
+        text = _COMBINING_MARK_RE.sub('', unicodedata.normalize('NFKD', text.casefold())).casefold()
+        return _STROKE_LETTER_RE.sub(lambda m: _STROKE_LETTERS[m.group()], text)
+
+    @staticmethod
+    def content_ngram_ids(content: Optional[str]) -> np.ndarray:
+        """
+        题目内容的 n-gram 哈希ID
+
+        Returns:
+            升序去重的 int32 数组（uint32 按位转为有符号数，适配数据库的 INT 列）
+        """
+        return ngram_ids(QuestionSearchIndex.fold_text(content)).view(np.int32)
+
+    @staticmethod
+    def content_digest(content: Optional[str]) -> bytes:
+        """题目内容的 MD5 原始摘要（判断内容或折叠规则是否变化）"""
+        return hashlib.md5(f"{QuestionSearchIndex.FOLD_VERSION}:{content or ''}".encode('utf-8')).digest()
+
+    @staticmethod
+    def query_ngram_ids(keyword: str) -> Optional[np.ndarray]:
+        """
+        关键字的 n-gram 哈希ID
+
+        Returns:
+            int32 数组（最多 MAX_QUERY_NGRAMS 个）；关键字不能使用索引时返回 None
+        """
+        if any(char in keyword for char in QuestionSearchIndex.LIKE_SPECIAL_CHARS):
+            return None
+        folded = QuestionSearchIndex.fold_text(keyword)
+        if len(folded) < NGRAM_SIZE:
+            return None
+        ids = ngram_ids(folded).view(np.int32)
+        if len(ids) > QuestionSearchIndex.MAX_QUERY_NGRAMS:
+            # 哈希ID的顺序与在关键字中的位置无关，等间隔取即可
+            ids = ids[np.linspace(0, len(ids) - 1, QuestionSearchIndex.MAX_QUERY_NGRAMS).astype(np.int64)]
+        return ids
+
+    @staticmethod
+    def watermark() -> Optional[int]:
+        """已索引的最大题目ID，索引未建立时返回 None"""
+        return db.session.query(func.max(QuestionSearchDocument.question_id)).scalar()
+
+    @staticmethod
+    def keyword_filter(keyword: str):
+        """
+        关键字搜索的候选题目条件（与 content LIKE 条件一起使用）
+
+        候选为倒排列表交集中的题目，以及题目ID大于已索引最大ID的新题目；
+        已索引题目的修改按 QUESTION_SEARCH_INDEX_SYNC_INTERVAL 在后台同步（见 _ensure_synced）
+
+        Args:
+            keyword: 搜索关键字
+
+        Returns:
+            SQLAlchemy 过滤条件；不能使用索引时返回 None（调用方按原来的 LIKE 扫描）
+        """
+        if not QuestionSearchIndex.enabled():
+            return None
+        ids = QuestionSearchIndex.query_ngram_ids(keyword)
+        if ids is None:
+            return None
+        watermark = QuestionSearchIndex.watermark()
+        if watermark is None:
+            return None
+
+        limit = QuestionSearchIndex.MAX_CANDIDATES
+        candidates = [
+            question_id for (question_id,) in db.session.query(QuestionSearchNgram.question_id).filter(
+                QuestionSearchNgram.ngram_id.in_([int(ngram_id) for ngram_id in ids])
+            ).group_by(
+                QuestionSearchNgram.question_id
+            ).having(
+                func.count(QuestionSearchNgram.ngram_id) == len(ids)
+            ).limit(limit + 1)
+        ]
+        if len(candidates) > limit:
+            return None
+
+        QuestionSearchIndex._ensure_synced(watermark)
+        return or_(Question.question_id.in_(candidates), Question.question_id > watermark)
+
+    @staticmethod
+    def _sync_interval() -> float:
+        return float(current_app.config.get(
+            'QUESTION_SEARCH_INDEX_SYNC_INTERVAL', QuestionSearchIndex.DEFAULT_SYNC_INTERVAL
+        ))
+
+    @staticmethod
+    def _ensure_synced(watermark: int):
+        """
+        进程内首次搜索或距上次全量摘要比对超过同步间隔时，在后台比对全部题目的内容摘要
+        （重建被修改的题目）；否则只同步未索引的新题目
+        """
+        last_trigger = QuestionSearchIndex._last_full_sync_trigger
+        if last_trigger is None or time.monotonic() - last_trigger >= QuestionSearchIndex._sync_interval():
+            if QuestionSearchIndex.sync_async(current_app._get_current_object()):
+                QuestionSearchIndex._last_full_sync_trigger = time.monotonic()
+                return
+        QuestionSearchIndex._sync_new_questions(watermark)
+
+    @staticmethod
+    def _sync_new_questions(watermark: int):
+        """有未索引的新题目时在后台同步（按 SYNC_TRIGGER_INTERVAL 限制触发频率）"""
+        if time.monotonic() - QuestionSearchIndex._last_sync_trigger < QuestionSearchIndex.SYNC_TRIGGER_INTERVAL:
+            return
+        QuestionSearchIndex._last_sync_trigger = time.monotonic()
+        latest = db.session.query(func.max(Question.question_id)).scalar()
+        if latest is not None and latest > watermark:
+            QuestionSearchIndex.sync_async(current_app._get_current_object(), after_question_id=watermark)
+
+    @staticmethod
+    def _insert(model, rows: List[Dict[str, Any]]):
+        statement = model.__table__.insert()
+        chunk_size = QuestionSearchIndex.INSERT_CHUNK_SIZE
+        for start in range(0, len(rows), chunk_size):
+            db.session.execute(statement, rows[start:start + chunk_size])
+
+    @staticmethod
+    def _write(items: List[Tuple[int, Optional[str]]], replace_ids: Iterable[int]) -> int:
+        """
+        写入题目的倒排记录（不提交）
+
+        Args:
+            items: [(题目ID, 题目内容), ...]
+            replace_ids: 需要先删除旧记录的题目ID
+
+        Returns:
+            写入的倒排记录数
+        """
+        replace_ids = list(replace_ids)
+        if replace_ids:
+            db.session.query(QuestionSearchNgram).filter(
+                QuestionSearchNgram.question_id.in_(replace_ids)
+            ).delete(synchronize_session=False)
+            db.session.query(QuestionSearchDocument).filter(
+                QuestionSearchDocument.question_id.in_(replace_ids)
+            ).delete(synchronize_session=False)
+        if not items:
+            return 0
+
+        postings = []
+        documents = []
+        indexed_at = datetime.now()
+        for question_id, content in items:
+            ids = QuestionSearchIndex.content_ngram_ids(content)
+            postings.extend({'ngram_id': int(ngram_id), 'question_id': question_id} for ngram_id in ids)
+            documents.append({
+                'question_id': question_id,
+                'content_digest': QuestionSearchIndex.content_digest(content),
+                'ngram_count': len(ids),
+                'indexed_at': indexed_at
+            })
+        QuestionSearchIndex._insert(QuestionSearchNgram, postings)
+        QuestionSearchIndex._insert(QuestionSearchDocument, documents)
+        return len(postings)
+
+    @staticmethod
+    def index_questions(question_ids: List[int]) -> Dict[str, int]:
+        """
+        重建指定题目的索引（题库同步修改题目内容后调用），已不存在的题目从索引中删除
+
+        Args:
+            question_ids: 题目ID列表
+
+        Returns:
+            {'indexed': 重建的题目数, 'removed': 删除的题目数, 'postings': 写入的倒排记录数}
+        """
+        question_ids = list(dict.fromkeys(int(qid) for qid in question_ids))
+        rows = db.session.query(Question.question_id, Question.content).filter(
+            Question.question_id.in_(question_ids)
+        ).all() if question_ids else []
+        found = {row.question_id for row in rows}
+        postings = QuestionSearchIndex._write([(row.question_id, row.content) for row in rows], question_ids)
+        db.session.commit()
+        return {
+            'indexed': len(rows),
+            'removed': len([qid for qid in question_ids if qid not in found]),
+            'postings': postings
+        }
+
+    @staticmethod
+    def sync(after_question_id: Optional[int] = None, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        增量同步索引：按题目ID分批比较内容摘要，只重建新增和内容变化的题目，删除已不存在的题目
+
+        每批单独提交，同步过程中搜索仍可使用已提交的索引
+
+        Args:
+            after_question_id: 只同步ID大于该值的题目（用于同步新题目），None 表示全部题目
+            batch_size: 每批题目数，默认为 SYNC_BATCH_SIZE
+
+        Returns:
+            {'scanned', 'indexed', 'removed', 'postings'}
+        """
+        batch_size = batch_size or QuestionSearchIndex.SYNC_BATCH_SIZE
+        stats = {'scanned': 0, 'indexed': 0, 'removed': 0, 'postings': 0}
+        last_id = after_question_id if after_question_id is not None else -1
+
+        while True:
+            rows = db.session.query(Question.question_id, Question.content).filter(
+                Question.question_id > last_id
+            ).order_by(Question.question_id).limit(batch_size).all()
+            # 本批覆盖的ID范围；最后一批延伸到索引中的所有剩余题目
+            upper_id = rows[-1].question_id if len(rows) == batch_size else None
+
+            document_query = db.session.query(
+                QuestionSearchDocument.question_id, QuestionSearchDocument.content_digest
+            ).filter(QuestionSearchDocument.question_id > last_id)
+            if upper_id is not None:
+                document_query = document_query.filter(QuestionSearchDocument.question_id <= upper_id)
+            indexed = {question_id: bytes(digest) for question_id, digest in document_query}
+
+            changed = [
+                (row.question_id, row.content) for row in rows
+                if indexed.get(row.question_id) != QuestionSearchIndex.content_digest(row.content)
+            ]
+            found = {row.question_id for row in rows}
+            removed = [question_id for question_id in indexed if question_id not in found]
+
+            stats['postings'] += QuestionSearchIndex._write(
+                changed, [question_id for question_id, _ in changed if question_id in indexed] + removed
+            )
+            db.session.commit()
+
+            stats['scanned'] += len(rows)
+            stats['indexed'] += len(changed)
+            stats['removed'] += len(removed)
+            if upper_id is None:
+                break
+            last_id = upper_id
+
+        QuestionSearchIndex._last_sync = dict(stats, finished_at=datetime.now().isoformat())
+        return stats
+
+    @staticmethod
+    def sync_async(app, after_question_id: Optional[int] = None) -> bool:
+        """
+        在后台线程中同步索引（已有同步线程时忽略）
+
+        Args:
+            app: Flask 应用实例
+            after_question_id: 同 sync
+
+        Returns:
+            是否启动了新的同步线程
+        """
+        def run():
+            with app.app_context():
+                try:
+                    QuestionSearchIndex.sync(after_question_id=after_question_id)
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"题目搜索索引同步失败: {e}")
+                finally:
+                    db.session.remove()
+                    with QuestionSearchIndex._lock:
+                        QuestionSearchIndex._sync_thread = None
+
+        with QuestionSearchIndex._lock:
+            if QuestionSearchIndex._sync_thread is not None:
+                return False
+            QuestionSearchIndex._sync_thread = threading.Thread(
+                target=run, daemon=True, name='question-search-index-sync'
+            )
+            QuestionSearchIndex._sync_thread.start()
+        return True
+
+    @staticmethod
+    def get_status() -> Dict[str, Any]:
+        """获取索引状态"""
+        return {
+            'enabled': QuestionSearchIndex.enabled(),
+            'indexed_questions': db.session.query(func.count(QuestionSearchDocument.question_id)).scalar(),
+            'watermark': QuestionSearchIndex.watermark(),
+            'syncing': QuestionSearchIndex._sync_thread is not None,
+            'last_sync': QuestionSearchIndex._last_sync
+        }
@@ -2,11 +2,13 @@
 题目查询服务
 负责题目列表查询、详情查询、批量查询等业务逻辑
 """
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Sequence
 from sqlalchemy import and_, or_
 from src.models import db
 from src.models.question import Question
 from src.services.question_aggregation_service import QuestionAggregationService
+from src.services.question_search_index import QuestionSearchIndex
+from src.utils.cursor_pagination import paginate
 
 
 class QuestionService:
@@ -24,6 +26,12 @@ class QuestionService:
         '8': '计算分析题'
     }
     
+    # 流式读取分组题目时每批的行数（按主键范围分批）
+    STREAM_BATCH_SIZE = 2000
+    
+    # 题目列表排序键（与索引 idx_type_del_sort 对应）
+    LIST_ORDER = ((Question.sort, False), (Question.question_id, False))
+    
     @staticmethod
     def get_question_list(
         question_type: str,
@@ -36,11 +44,17 @@ class QuestionService:
         page: int = 1,
         page_size: int = 20,
         include_answer: bool = True,
-        include_analysis: bool = True
+        include_analysis: bool = True,
+        cursor: Optional[str] = None,
+        with_total: bool = False
     ) -> Dict[str, Any]:
         """
         获取题目列表（分页）
         
+        传入 cursor 时使用游标分页：按 (sort, question_id) 从上一页最后一道题之后读取，
+        深页和第一页代价相同，只有 with_total=True 时才统计总数；
+        不传 cursor 时使用页码分页（兼容旧接口，每页都统计总数）
+        
         Args:
             question_type: 题型（必填）
             channel_code: 渠道代码
@@ -53,9 +67,14 @@ class QuestionService:
             page_size: 每页数量
             include_answer: 是否包含答案
             include_analysis: 是否包含解析
+            cursor: 游标（上一页返回的 next_cursor，空字符串表示第一页）
+            with_total: 游标分页时是否统计总数
             
         Returns:
             包含题目列表和分页信息的字典
+            
+        Raises:
+            ValueError: 题型参数或游标无效
         """
         # 验证题型
         if question_type not in QuestionService.SUPPORTED_TYPES:
@@ -88,18 +107,19 @@ class QuestionService:
         
         # 关键字搜索（在题目内容中搜索）
         if keyword:
+            # 先按倒排索引筛选候选题目，再用 LIKE 校验；不能使用索引时直接 LIKE 扫描
+            candidate_filter = QuestionSearchIndex.keyword_filter(keyword)
+            if candidate_filter is not None:
+                query = query.filter(candidate_filter)
             query = query.filter(Question.content.like(f'%{keyword}%'))
         
-        # 获取总数
-        total = query.count()
-        
-        # 分页
-        page = max(1, page)
         page_size = min(max(1, page_size), 100)  # 限制最大100条
-        offset = (page - 1) * page_size
         
         # 排序：按 sort 字段和 question_id
-        questions = query.order_by(Question.sort, Question.question_id).offset(offset).limit(page_size).all()
+        questions, pagination = paginate(
+            query, QuestionService.LIST_ORDER, max(1, page), page_size,
+            cursor=cursor, with_total=with_total
+        )
         
         # 聚合数据
         channel_code_for_agg = channel_code or (questions[0].channel_code if questions else 'default')
@@ -107,17 +127,9 @@ class QuestionService:
             questions, channel_code_for_agg, include_answer, include_analysis
         )
         
-        # 计算总页数
-        total_pages = (total + page_size - 1) // page_size
-        
         return {
             'list': aggregated_questions,
-            'pagination': {
-                'page': page,
-                'page_size': page_size,
-                'total': total,
-                'total_pages': total_pages
-            }
+            'pagination': pagination
         }
     
     @staticmethod
@@ -400,4 +412,51 @@ class QuestionService:
         ).all()
         
         return questions
-
+    
+    @staticmethod
+    def iter_questions_by_group(
+        question_type: str,
+        subject_id: int,
+        channel_code: str,
+        columns: Sequence[str] = ('question_id', 'content'),
+        batch_size: Optional[int] = None
+    ) -> Iterator[Any]:
+        """
+        流式读取分组内的题目，只查询指定的列
+        
+        按主键范围分批查询（question_id > 上一批最大ID ORDER BY question_id LIMIT n），
+        返回轻量的行对象而不是 ORM 实体：不会加载 analysis 等大字段，
+        也不会进入会话的 identity map，内存占用与批大小相关而与分组大小无关
+        
+        Args:
+            question_type: 题型
+            subject_id: 科目ID
+            channel_code: 渠道代码
+            columns: 需要读取的 Question 列名（question_id 始终包含）
+            batch_size: 每批行数，默认为 STREAM_BATCH_SIZE
+            
+        Yields:
+            行对象，可按列名访问属性（如 row.question_id, row.content）
+        """
+        batch_size = batch_size or QuestionService.STREAM_BATCH_SIZE
+        names = ['question_id'] + [name for name in columns if name != 'question_id']
+        selected = [getattr(Question, name) for name in names]
+        
+        last_id = None
+        while True:
+            query = db.session.query(*selected).filter(
+                Question.type == question_type,
+                Question.subject_id == subject_id,
+                Question.channel_code == channel_code,
+                Question.is_del == 0
+            )
+            if last_id is not None:
+                query = query.filter(Question.question_id > last_id)
+            rows = query.order_by(Question.question_id).limit(batch_size).all()
+            if not rows:
+                break
+            for row in rows:
+                yield row
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1].question_id
@@ -0,0 +1,149 @@
+"""
+题干文本标准化引擎
+去重清洗阶段对整个分组批量执行：预编译正则、按全角片段 str.translate 转半角、
+占位符单次替换、split/join 合并空白，输出与原逐题清洗逻辑逐字一致
+
+清洗步骤可插拔：渠道可以在默认步骤之后追加自定义步骤，
+追加步骤会改变清洗结果（以及内容哈希），应在模块导入时注册，
+保证多进程工作进程与主进程使用相同的步骤
+"""
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+# 单个清洗步骤：输入文本，返回处理后的文本
+NormalizeStep = Callable[[str], str]
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+# 连续的全角字符（全角空格 U+3000、U+FF01~U+FF5E）
+_FULL_WIDTH_RUN_RE = re.compile(r'[\u3000\uFF01-\uFF5E]+')
+_PLACEHOLDER_RE = re.compile(r'\[(图片|公式)\d+\]')
+_INVISIBLE_RE = re.compile(r'[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F-\x9F\u200B-\u200D\uFEFF]')
+
+# 全角空格（12288）转半角空格（32），全角字符 65281-65374 转半角 33-126
+_FULL_TO_HALF_TABLE = {0x3000: 0x20}
+_FULL_TO_HALF_TABLE.update({code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)})
+
+_PLACEHOLDER_TOKENS = {'图片': '[IMG]', '公式': '[FORMULA]'}
+
+
+def strip_html_tags(text: str) -> str:
+    """去除 HTML 标签"""
+    if '<' not in text:
+        return text
+    return _HTML_TAG_RE.sub('', text)
+
+
+def full_to_half(text: str) -> str:
+    """
+    全角转半角
+
+    只对连续的全角字符片段执行 translate：对整段中文文本执行 translate 需要逐字符查表，
+    而题干中的全角字符通常只占很少一部分
+    """
+    return _FULL_WIDTH_RUN_RE.sub(lambda m: m.group().translate(_FULL_TO_HALF_TABLE), text)
+
+
+def normalize_placeholders(text: str) -> str:
+    """图片/公式占位符标准化：[图片1] → [IMG]，[公式1] → [FORMULA]"""
+    if '[' not in text:
+        return text
+    return _PLACEHOLDER_RE.sub(lambda m: _PLACEHOLDER_TOKENS[m.group(1)], text)
+
+
+def collapse_whitespace(text: str) -> str:
+    """
+    连续空白合并为一个空格并去除首尾空白
+
+    str.split() 与正则 \\s 使用相同的 Unicode 空白定义，结果等价于 re.sub(r'\\s+', ' ', text).strip()
+    """
+    return ' '.join(text.split())
+
+
+def remove_invisible_chars(text: str) -> str:
+    """去除不可见字符（控制字符、零宽字符等）"""
+    return _INVISIBLE_RE.sub('', text)
+
+
+# 默认清洗步骤（顺序影响结果，与原 _clean_question_content 一致）
+DEFAULT_STEPS: Sequence[NormalizeStep] = (
+    strip_html_tags,
+    full_to_half,
+    normalize_placeholders,
+    collapse_whitespace,
+    remove_invisible_chars,
+)
+
+
+class TextNormalizer:
+    """题干文本标准化器（无状态，可在线程/进程间共享）"""
+
+    def __init__(self, steps: Optional[Sequence[NormalizeStep]] = None):
+        """
+        Args:
+            steps: 清洗步骤，默认为 DEFAULT_STEPS
+        """
+        self.steps = tuple(DEFAULT_STEPS if steps is None else steps)
+
+    def with_steps(self, *extra_steps: NormalizeStep) -> 'TextNormalizer':
+        """返回在当前步骤之后追加 extra_steps 的新标准化器"""
+        return TextNormalizer(self.steps + tuple(extra_steps))
+
+    def normalize(self, content: Optional[str]) -> str:
+        """
+        清洗单条题干
+
+        Args:
+            content: 原始题干内容
+
+        Returns:
+            清洗后的题干内容
+        """
+        if not content:
+            return ""
+        for step in self.steps:
+            content = step(content)
+        return content
+
+    def normalize_many(self, contents: Iterable[Optional[str]]) -> List[str]:
+        """
+        批量清洗题干（按步骤逐条执行，避免逐题重复查找步骤和方法）
+
+        Args:
+            contents: 原始题干内容序列
+
+        Returns:
+            清洗后的题干列表，与输入一一对应
+        """
+        steps = self.steps
+        result = []
+        append = result.append
+        for content in contents:
+            if content:
+                for step in steps:
+                    content = step(content)
+                append(content)
+            else:
+                append("")
+        return result
+
+
+_default_normalizer = TextNormalizer()
+# {channel_code: TextNormalizer}
+_channel_normalizers: Dict[str, TextNormalizer] = {}
+
+
+def register_channel_steps(channel_code: str, *steps: NormalizeStep):
+    """
+    为渠道注册追加的清洗步骤（在默认步骤之后执行）
+
+    注册会改变该渠道题目的清洗结果和内容哈希，已持久化的指纹需要重新生成；
+    应在模块导入时调用，保证 spawn 启动的工作进程也能看到
+    """
+    _channel_normalizers[channel_code] = _default_normalizer.with_steps(*steps)
+
+
+def get_normalizer(channel_code: Optional[str] = None) -> TextNormalizer:
+    """获取渠道使用的标准化器，未注册自定义步骤的渠道使用默认标准化器"""
+    if channel_code:
+        return _channel_normalizers.get(channel_code, _default_normalizer)
+    return _default_normalizer
@@ -0,0 +1,205 @@
+"""
+游标（keyset）分页
+按排序键定位下一页：WHERE (排序键) 在上一页最后一行之后 ORDER BY 排序键 LIMIT n，
+配合以排序键结尾的复合索引，第 5000 页和第 1 页的查询代价相同，不需要 OFFSET 扫描和跳过前面的行
+
+游标是上一页最后一行排序键的值，编码为 URL 安全的 base64 JSON，对客户端不透明
+"""
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Float, Numeric, and_, or_, type_coerce
+
+# 排序键：[(列, 是否降序), ...]，最后一列必须唯一（通常是主键），保证顺序确定
+OrderKey = Sequence[Tuple[Any, bool]]
+
+
+def _encode_value(value: Any) -> Any:
+    """排序键的值转换为 JSON 可表示的形式（日期和定点数带类型标记）"""
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'dec': str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'dec' in value:
+            return Decimal(value['dec'])
+        raise ValueError('游标格式无效')
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    编码游标
+
+    Args:
+        values: 最后一行的排序键的值（与排序键顺序一致）
+
+    Returns:
+        URL 安全的游标字符串
+    """
+    payload = json.dumps([_encode_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    解码游标
+
+    Args:
+        cursor: encode_cursor 生成的游标
+        size: 排序键的列数
+
+    Returns:
+        排序键的值列表
+
+    Raises:
+        ValueError: 游标格式无效（客户端传入了被修改或其他接口的游标）
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except (ValueError, UnicodeError):
+        raise ValueError('游标格式无效')
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('游标格式无效')
+    return [_decode_value(v) for v in values]
+
+
+def _nullable(column) -> bool:
+    expression = getattr(column, 'expression', column)
+    return bool(getattr(expression, 'nullable', True))
+
+
+def keyset_condition(order: OrderKey, values: Sequence[Any]):
+    """
+    "排在 values 之后" 的过滤条件
+
+    展开为 (a > x) OR (a = x AND b > y) ...，每列可以有不同的排序方向，
+    MySQL 和 SQLite 都能把它转换为排序键索引上的范围扫描。
+    可为空的列按 MySQL/SQLite 的规则处理 NULL（升序时排在最前，降序时排在最后）
+
+    Args:
+        order: 排序键
+        values: 游标中的排序键的值
+    """
+    clauses = []
+    equal_prefix = []
+    for (column, descending), value in zip(order, values):
+        if value is None:
+            # NULL 之后：升序时是所有非 NULL 值，降序时没有（只能靠后面的列区分）
+            after = column.isnot(None) if not descending else None
+            equal = column.is_(None)
+        else:
+            after = column < value if descending else column > value
+            if descending and _nullable(column):
+                after = or_(after, column.is_(None))
+            equal = column == value
+        if after is not None:
+            clauses.append(and_(*equal_prefix, after))
+        equal_prefix.append(equal)
+    return or_(*clauses)
+
+
+def order_by_clauses(order: OrderKey) -> list:
+    """排序键对应的 ORDER BY 子句"""
+    return [column.desc() if descending else column.asc() for column, descending in order]
+
+
+def _key_column(column):
+    """
+    读取排序键时使用的列表达式
+
+    定点数列按浮点数读取原始值：SQLite 按 REAL 保存相似度，ORM 读出时会按 scale 舍入，
+    用舍入后的值做游标会和数据库中的值对不上
+    """
+    if isinstance(column.type, Numeric) and column.type.asdecimal:
+        return type_coerce(column, Float)
+    return column
+
+
+def _fetch(query, order: OrderKey) -> Tuple[list, list]:
+    """执行查询，同时读取每一行排序键的原始值"""
+    key_size = len(order)
+    rows = query.add_columns(*[_key_column(column) for column, _ in order]).all()
+    return [row[0] for row in rows], [tuple(row[-key_size:]) for row in rows]
+
+
+def keyset_page(query, order: OrderKey, cursor: Optional[str], page_size: int) -> Tuple[list, Optional[str]]:
+    """
+    按游标读取一页
+
+    多读一行判断是否还有下一页，不需要 COUNT
+
+    Args:
+        query: 已加过滤条件、未排序的查询
+        order: 排序键
+        cursor: 上一页返回的 next_cursor，空字符串或 None 表示第一页
+        page_size: 每页数量
+
+    Returns:
+        (当前页的行, 下一页游标)，没有下一页时游标为 None
+
+    Raises:
+        ValueError: 游标格式无效
+    """
+    if cursor:
+        query = query.filter(keyset_condition(order, decode_cursor(cursor, len(order))))
+    rows, keys = _fetch(query.order_by(*order_by_clauses(order)).limit(page_size + 1), order)
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = encode_cursor(keys[page_size - 1]) if has_more and rows else None
+    return rows, next_cursor
+
+
+def paginate(query, order: OrderKey, page: int, page_size: int,
+             cursor: Optional[str] = None, with_total: bool = False) -> Tuple[list, Dict[str, Any]]:
+    """
+    分页读取：传入 cursor 时按游标分页，否则按页码分页（兼容旧接口）
+
+    页码分页每页都统计总数，并返回最后一行的游标，客户端可以从下一页起改用游标分页；
+    游标分页只有 with_total=True 时才统计总数
+
+    Args:
+        query: 已加过滤条件、未排序的查询
+        order: 排序键
+        page: 页码（游标分页时忽略）
+        page_size: 每页数量
+        cursor: 游标，None 表示页码分页，空字符串表示游标分页的第一页
+        with_total: 游标分页时是否统计总数
+
+    Returns:
+        (当前页的行, 分页信息)
+
+    Raises:
+        ValueError: 游标格式无效
+    """
+    if cursor is not None:
+        rows, next_cursor = keyset_page(query, order, cursor, page_size)
+        pagination = {
+            'page_size': page_size,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
+        }
+        if with_total:
+            pagination['total'] = query.order_by(None).count()
+        return rows, pagination
+
+    total = query.order_by(None).count()
+    rows, keys = _fetch(query.order_by(*order_by_clauses(order)).offset((page - 1) * page_size).limit(page_size), order)
+    total_pages = (total + page_size - 1) // page_size
+    return rows, {
+        'page': page,
+        'page_size': page_size,
+        'total': total,
+        'total_pages': total_pages,
+        'next_cursor': encode_cursor(keys[-1]) if rows and page < total_pages else None
+    }
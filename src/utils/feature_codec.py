@@ -0,0 +1,117 @@
+"""
+去重特征二进制编码
+question_dedup_features 表的紧凑存储格式：
+
+- minhash_blob: MinHash 签名，小端 uint32 数组（128 个哈希 = 512 字节）
+- ngram_blob: 3-gram 哈希ID，升序去重的小端 uint32 数组
+- content_digest: 清洗后内容的 MD5 原始摘要（16 字节）
+
+解码使用 np.frombuffer，直接引用数据库返回的 bytes，不复制数据（返回只读数组）
+"""
+import hashlib
+from typing import Iterable, Optional
+import numpy as np
+
+NGRAM_SIZE = 3
+
+_UINT32_LE = np.dtype('<u4')
+# 每个字符的码位占 21 位，3 个字符拼成 63 位的唯一键
+_CODE_BITS = 21
+# 64 位混合函数常量（MurmurHash3 fmix64）
+_FMIX_C1 = np.uint64(0xFF51AFD7ED558CCD)
+_FMIX_C2 = np.uint64(0xC4CEB9FE1A85EC53)
+_SHIFT_33 = np.uint64(33)
+_SHIFT_32 = np.uint64(32)
+
+
+def _mix_keys(keys: np.ndarray) -> np.ndarray:
+    """把 63 位 n-gram 键混合后取高 32 位，得到升序去重的 uint32 ID 数组"""
+    keys ^= keys >> _SHIFT_33
+    keys *= _FMIX_C1
+    keys ^= keys >> _SHIFT_33
+    keys *= _FMIX_C2
+    keys ^= keys >> _SHIFT_33
+    return np.unique((keys >> _SHIFT_32).astype(np.uint32))
+
+
+def ngram_ids(text: Optional[str]) -> np.ndarray:
+    """
+    计算文本 3-gram 的哈希ID（向量化，与 QuestionDedupService._extract_ngrams 的 n-gram 集合一一对应）
+
+    文本短于 3 个字符时整段文本作为一个 n-gram（不足的位置补 0，清洗后的文本不含 NUL 字符）
+
+    Args:
+        text: 清洗后的题干内容
+
+    Returns:
+        升序去重的 uint32 数组
+    """
+    if not text:
+        return np.empty(0, dtype=np.uint32)
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=_UINT32_LE).astype(np.uint64)
+    if len(codes) < NGRAM_SIZE:
+        codes = np.concatenate([codes, np.zeros(NGRAM_SIZE - len(codes), dtype=np.uint64)])
+    count = len(codes) - NGRAM_SIZE + 1
+    keys = codes[:count].copy()
+    for offset in range(1, NGRAM_SIZE):
+        keys |= codes[offset:offset + count] << np.uint64(_CODE_BITS * offset)
+    return _mix_keys(keys)
+
+
+def ngram_ids_from_ngrams(ngrams: Iterable[str]) -> np.ndarray:
+    """
+    由 n-gram 字符串集合计算哈希ID（用于迁移旧的 ngram_json，结果与 ngram_ids 一致）
+
+    Args:
+        ngrams: n-gram 字符串集合
+
+    Returns:
+        升序去重的 uint32 数组
+    """
+    keys = []
+    for ngram in ngrams:
+        key = 0
+        for offset, char in enumerate(ngram[:NGRAM_SIZE]):
+            key |= ord(char) << (_CODE_BITS * offset)
+        keys.append(key)
+    if not keys:
+        return np.empty(0, dtype=np.uint32)
+    return _mix_keys(np.asarray(keys, dtype=np.uint64))
+
+
+def encode_uint32(values) -> Optional[bytes]:
+    """把 uint32 数组（或整数列表）编码为小端字节串，空数组返回 None"""
+    if values is None or len(values) == 0:
+        return None
+    return np.asarray(values, dtype=_UINT32_LE).tobytes()
+
+
+def decode_uint32(blob: Optional[bytes]) -> np.ndarray:
+    """把小端字节串解码为 uint32 数组（不复制，返回只读数组）"""
+    if not blob:
+        return np.empty(0, dtype=np.uint32)
+    return np.frombuffer(blob, dtype=_UINT32_LE)
+
+
+def content_digest(cleaned_content: str) -> bytes:
+    """清洗后内容的 MD5 原始摘要（与 content_hash 的十六进制字符串一一对应）"""
+    return hashlib.md5(cleaned_content.encode('utf-8')).digest()
+
+
+def ngram_jaccard(ids_1: np.ndarray, ids_2: np.ndarray) -> float:
+    """
+    基于 n-gram 哈希ID计算 Jaccard 相似度
+
+    Args:
+        ids_1: 第一个文本的升序去重 ID 数组
+        ids_2: 第二个文本的升序去重 ID 数组
+
+    Returns:
+        相似度（0-1之间的浮点数）
+    """
+    if len(ids_1) == 0 and len(ids_2) == 0:
+        return 1.0
+    if len(ids_1) == 0 or len(ids_2) == 0:
+        return 0.0
+    intersection = len(np.intersect1d(ids_1, ids_2, assume_unique=True))
+    return intersection / (len(ids_1) + len(ids_2) - intersection)
@@ -0,0 +1,69 @@
+"""游标分页测试"""
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import Column, Float, Integer, MetaData, Table, create_engine, select
+from sqlalchemy.orm import Session
+
+from src.utils.cursor_pagination import decode_cursor, encode_cursor, keyset_condition, order_by_clauses
+
+
+class TestCursorCodec:
+    """游标编解码"""
+
+    def test_round_trip(self):
+        values = [datetime(2024, 1, 1, 12, 30, 5, 123), Decimal('0.9123'), 0.8139534883720931, None, 42]
+        assert decode_cursor(encode_cursor(values), len(values)) == values
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            decode_cursor('not a cursor!', 2)
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor([1, 2]), 3)
+
+
+class TestKeysetCondition:
+    """游标翻页与 OFFSET 翻页结果一致"""
+
+    @pytest.fixture
+    def table(self):
+        engine = create_engine('sqlite://')
+        metadata = MetaData()
+        table = Table(
+            't', metadata,
+            Column('id', Integer, primary_key=True),
+            Column('score', Float, nullable=True),
+            Column('sort', Integer, nullable=True),
+        )
+        metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(table.insert(), [
+                {'id': i, 'score': (i * 7 % 5) / 4, 'sort': None if i % 6 == 0 else i % 3}
+                for i in range(1, 41)
+            ])
+        return engine, table
+
+    @pytest.mark.parametrize('order_spec', [
+        [('score', True), ('id', True)],
+        [('score', True), ('id', False)],
+        [('sort', False), ('id', False)],
+        [('sort', True), ('id', True)],
+    ])
+    def test_walk_matches_offset(self, table, order_spec):
+        engine, t = table
+        order = [(t.c[name], descending) for name, descending in order_spec]
+        base = select(t.c.id, t.c.score, t.c.sort).order_by(*order_by_clauses(order))
+        with Session(engine) as session:
+            expected = [row.id for row in session.execute(base)]
+            walked, last = [], None
+            while True:
+                stmt = base
+                if last is not None:
+                    stmt = stmt.where(keyset_condition(order, decode_cursor(last, len(order))))
+                rows = session.execute(stmt.limit(7)).all()
+                if not rows:
+                    break
+                walked.extend(row.id for row in rows)
+                last = encode_cursor([getattr(rows[-1], column.name) for column, _ in order])
+        assert walked == expected
@@ -0,0 +1,47 @@
+"""单题查重内存索引测试"""
+import numpy as np
+from src.services.minhash_engine import MinHashEngine
+from src.services.dedup_check_service import _GroupBandIndex
+
+
+def _ngrams(text, n=3):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class TestGroupBandIndex:
+    """测试分组内存 LSH 索引"""
+
+    def test_candidates_found_by_band_lookup(self):
+        """相同和高度相似的题目能被查到，无关题目查不到"""
+        engine = MinHashEngine()
+        texts = [
+            '某公司2023年销售收入为500万元，销售成本为300万元，求该公司的毛利率',
+            '下列关于长期股权投资的说法中，正确的是哪一项',
+            '资产负债表日后调整事项与非调整事项的区别是什么',
+        ]
+        signatures = engine.signature_matrix([_ngrams(t) for t in texts])
+        index = _GroupBandIndex(
+            np.array([101, 102, 103]), np.array([1, 2, 3]), MinHashEngine.band_hashes(signatures)
+        )
+
+        query = engine.signature(_ngrams(texts[1]))
+        rows, counts = index.candidates(MinHashEngine.band_hashes(query[None, :])[0])
+        assert index.question_ids[rows].tolist() == [102]
+        assert counts.tolist() == [16]
+
+        query = engine.signature(_ngrams('完全无关的一段文字内容，用于测试查不到候选'))
+        rows, _ = index.candidates(MinHashEngine.band_hashes(query[None, :])[0])
+        assert len(rows) == 0
+
+    def test_duplicate_band_hashes_return_all_rows(self):
+        """多道题目签名相同时全部返回"""
+        engine = MinHashEngine()
+        signature = engine.signature(_ngrams('固定资产折旧方法的选择'))
+        signatures = np.vstack([signature, signature, signature])
+        index = _GroupBandIndex(
+            np.array([1, 2, 3]), np.array([10, 20, 30]), MinHashEngine.band_hashes(signatures)
+        )
+
+        rows, counts = index.candidates(MinHashEngine.band_hashes(signature[None, :])[0])
+        assert sorted(index.feature_ids[rows].tolist()) == [10, 20, 30]
+        assert counts.tolist() == [16, 16, 16]
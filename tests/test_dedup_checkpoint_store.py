@@ -0,0 +1,160 @@
+"""去重任务分组租约测试（内存 SQLite，不依赖 MySQL test 数据库）"""
+import hashlib
+
+import pytest
+from flask import Flask
+from sqlalchemy.schema import CreateTable
+
+from src.config import Config
+from src.models import db
+from src.models.question_dedup import DedupTask, DedupTaskCheckpoint
+from src.services.dedup_checkpoint_store import DedupCheckpointStore
+from src.services.question_dedup_service import QuestionDedupService
+
+LEASE_SECONDS = 60
+
+GROUPS = [
+    {'type': '1', 'type_name': '单选题', 'subject_id': 10, 'subject_name': '科目10',
+     'channel_code': 'default', 'count': 4},
+    {'type': '2', 'type_name': '多选题', 'subject_id': 10, 'subject_name': '科目10',
+     'channel_code': 'default', 'count': 4},
+]
+
+
+@pytest.fixture
+def task_id():
+    """内存 SQLite 应用，创建一个带两个分组检查点的任务"""
+    app = Flask('dedup_checkpoint_test')
+    app.config.from_object(Config)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        # SQLite 的索引名在整个库中唯一，模型中有同名索引（idx_group 等），测试只建表不建索引
+        with db.engine.begin() as connection:
+            for table in db.metadata.sorted_tables:
+                connection.execute(CreateTable(table))
+        task = DedupTask(task_name='租约测试', status='running', total_groups=len(GROUPS),
+                         processed_groups=0, exact_duplicate_groups=0, exact_duplicate_pairs=0,
+                         similar_duplicate_pairs=0)
+        db.session.add(task)
+        db.session.commit()
+        DedupCheckpointStore.create(task.id, GROUPS)
+        yield task.id
+        db.session.remove()
+
+
+def _results(group_index):
+    """一个完全重复组（2 题）和一个相似重复对的分组结果，各分组的题目ID互不相同"""
+    group = GROUPS[group_index]
+    base = group_index * 10
+    return {
+        'group': group,
+        'total_questions': 4,
+        'exact_duplicates': [{
+            'question_ids': [base + 1, base + 2], 'count': 2, 'similarity': 1.0,
+            'content_hash': hashlib.md5(f'题干{group_index}'.encode('utf-8')).hexdigest()
+        }],
+        'similar_duplicates': [{'question_id_1': base + 3, 'question_id_2': base + 4, 'similarity': 0.9}],
+        'cleaned_questions': []
+    }
+
+
+def _checkpoint(task_id, group_index):
+    db.session.expire_all()
+    return DedupTaskCheckpoint.query.filter_by(task_id=task_id, group_index=group_index).one()
+
+
+class TestGroupLease:
+    """分组租约"""
+
+    def test_try_lease_only_one_worker_wins(self, task_id):
+        # 两个执行器都看到分组 0 可以租用，带条件的 UPDATE 只让先执行的一方成功
+        assert 0 in DedupCheckpointStore.leasable_indexes(task_id, 'worker-a')
+        assert 0 in DedupCheckpointStore.leasable_indexes(task_id, 'worker-b')
+        assert DedupCheckpointStore.try_lease(task_id, 0, 'worker-a', LEASE_SECONDS)
+        assert not DedupCheckpointStore.try_lease(task_id, 0, 'worker-b', LEASE_SECONDS)
+        assert _checkpoint(task_id, 0).worker_id == 'worker-a'
+
+    def test_lease_next_skips_group_taken_concurrently(self, task_id, monkeypatch):
+        # worker-b 查到分组 0 后、UPDATE 之前被 worker-a 抢先租用，worker-b 改为租用分组 1
+        original = DedupCheckpointStore.try_lease
+        raced = []
+
+        def racing_try_lease(t_id, group_index, worker_id, lease_seconds):
+            if worker_id == 'worker-b' and not raced:
+                raced.append(group_index)
+                assert original(t_id, group_index, 'worker-a', lease_seconds)
+            return original(t_id, group_index, worker_id, lease_seconds)
+
+        monkeypatch.setattr(DedupCheckpointStore, 'try_lease', staticmethod(racing_try_lease))
+        assert DedupCheckpointStore.lease_next(task_id, 'worker-b', LEASE_SECONDS) == 1
+        assert raced == [0]
+        assert _checkpoint(task_id, 0).worker_id == 'worker-a'
+        assert _checkpoint(task_id, 1).worker_id == 'worker-b'
+        assert DedupCheckpointStore.lease_next(task_id, 'worker-c', LEASE_SECONDS) is None
+
+    def test_expired_lease_can_be_leased_again(self, task_id):
+        # 租约时长为负数，租用后立即到期（模拟执行器退出后不再续租）
+        assert DedupCheckpointStore.try_lease(task_id, 0, 'worker-a', -1)
+        assert DedupCheckpointStore.try_lease(task_id, 0, 'worker-b', LEASE_SECONDS)
+        checkpoint = _checkpoint(task_id, 0)
+        assert checkpoint.worker_id == 'worker-b'
+        assert checkpoint.attempts == 2
+        # 有效租约不会被抢走
+        assert not DedupCheckpointStore.try_lease(task_id, 0, 'worker-a', LEASE_SECONDS)
+
+    def test_mark_completed_rejects_stale_owner(self, task_id):
+        assert DedupCheckpointStore.try_lease(task_id, 0, 'worker-a', -1)
+        assert DedupCheckpointStore.try_lease(task_id, 0, 'worker-b', LEASE_SECONDS)
+        assert not DedupCheckpointStore.mark_completed(task_id, 0, _results(0), worker_id='worker-a')
+        assert DedupCheckpointStore.mark_completed(task_id, 0, _results(0), worker_id='worker-b')
+        db.session.commit()
+        assert _checkpoint(task_id, 0).status == 'completed'
+
+
+class TestCompleteGroup:
+    """分组完成时任务进度只累加一次"""
+
+    def _task(self, task_id):
+        db.session.expire_all()
+        return db.session.get(DedupTask, task_id)
+
+    def test_group_counted_once(self, task_id):
+        assert DedupCheckpointStore.try_lease(task_id, 0, 'worker-a', LEASE_SECONDS)
+        assert QuestionDedupService.mark_group_index_completed(
+            0, _results(0), task_id=task_id, worker_id='worker-a'
+        )
+        # 同一分组再次完成（重复提交或其他执行器的迟到结果）不再累加
+        assert not QuestionDedupService.mark_group_index_completed(
+            0, _results(0), task_id=task_id, worker_id='worker-a'
+        )
+        assert not QuestionDedupService.mark_group_index_completed(
+            0, _results(0), task_id=task_id, worker_id='worker-b'
+        )
+
+        task = self._task(task_id)
+        assert task.processed_groups == 1
+        assert task.exact_duplicate_groups == 1
+        assert task.exact_duplicate_pairs == 1
+        assert task.similar_duplicate_pairs == 1
+        assert task.status == 'running'
+
+    def test_stale_owner_result_discarded(self, task_id):
+        assert DedupCheckpointStore.try_lease(task_id, 0, 'worker-a', -1)
+        assert DedupCheckpointStore.try_lease(task_id, 0, 'worker-b', LEASE_SECONDS)
+        assert not QuestionDedupService.mark_group_index_completed(
+            0, _results(0), task_id=task_id, worker_id='worker-a'
+        )
+        assert self._task(task_id).processed_groups == 0
+
+        assert QuestionDedupService.mark_group_index_completed(
+            0, _results(0), task_id=task_id, worker_id='worker-b'
+        )
+        assert DedupCheckpointStore.try_lease(task_id, 1, 'worker-a', LEASE_SECONDS)
+        assert QuestionDedupService.mark_group_index_completed(
+            1, _results(1), task_id=task_id, worker_id='worker-a'
+        )
+        task = self._task(task_id)
+        assert task.processed_groups == 2
+        assert task.similar_duplicate_pairs == 2
+        assert task.status == 'completed'
@@ -0,0 +1,62 @@
+"""重复题目聚类测试"""
+from src.services.dedup_clustering import UnionFind, build_clusters
+
+
+def _pair(qid1, qid2, similarity):
+    return {'question_id_1': qid1, 'question_id_2': qid2, 'similarity': similarity}
+
+
+class TestUnionFind:
+    """并查集"""
+
+    def test_union_and_components(self):
+        uf = UnionFind()
+        uf.union(1, 2)
+        uf.union(3, 4)
+        uf.union(2, 4)
+        uf.add(5)
+        components = sorted(sorted(members) for members in uf.components().values())
+        assert components == [[1, 2, 3, 4], [5]]
+        assert uf.find(1) == uf.find(3)
+
+
+class TestBuildClusters:
+    """完全重复组和相似重复对聚类"""
+
+    def test_chain_of_pairs_forms_one_cluster(self):
+        pairs = [_pair(1, 2, 0.9), _pair(2, 3, 0.8), _pair(5, 6, 0.95)]
+        clusters = build_clusters([], pairs)
+        assert [c['member_count'] for c in clusters] == [3, 2]
+        chain = clusters[0]
+        # 题目2与另外两题相似，作为代表题目
+        assert chain['representative_question_id'] == 2
+        assert chain['similar_edge_count'] == 2
+        assert chain['min_similarity'] == 0.8
+        assert chain['max_similarity'] == 0.9
+        assert [m['question_id'] for m in chain['members']] == [1, 2, 3]
+
+    def test_exact_group_merges_with_similar_pairs(self):
+        exact = [{'question_ids': [10, 11, 12], 'count': 3}]
+        clusters = build_clusters(exact, [_pair(12, 20, 0.85)])
+        assert len(clusters) == 1
+        cluster = clusters[0]
+        assert cluster['member_count'] == 4
+        assert cluster['exact_question_count'] == 3
+        assert cluster['similar_edge_count'] == 1
+        members = {m['question_id']: m for m in cluster['members']}
+        assert members[11]['is_exact'] and members[11]['max_similarity'] == 1.0
+        assert members[20]['max_similarity'] == 0.85
+
+    def test_exact_only_cluster(self):
+        clusters = build_clusters([{'question_ids': [7, 3], 'count': 2}], [])
+        assert clusters[0]['representative_question_id'] == 3
+        assert clusters[0]['similar_edge_count'] == 0
+        assert clusters[0]['avg_similarity'] == 1.0
+
+    def test_dense_cluster_members_are_linear(self):
+        qids = list(range(1, 51))
+        pairs = [_pair(a, b, 0.9) for i, a in enumerate(qids) for b in qids[i + 1:]]
+        clusters = build_clusters([], pairs)
+        assert len(clusters) == 1
+        assert clusters[0]['similar_edge_count'] == len(pairs)
+        assert len(clusters[0]['members']) == len(qids)
@@ -0,0 +1,100 @@
+"""去重任务调度器测试"""
+import time
+import threading
+import pytest
+from src.services.dedup_scheduler import DedupTaskScheduler, resolve_priority
+
+
+@pytest.fixture
+def scheduler():
+    """全局并发上限设为 1，测试结束后注销测试任务"""
+    DedupTaskScheduler.configure(1)
+    yield DedupTaskScheduler
+    for task_id in (1, 2, 3):
+        DedupTaskScheduler.unregister(task_id)
+    DedupTaskScheduler.configure(0)
+
+
+def _wait_until_waiting(*task_ids):
+    """等待指定任务都进入阻塞等待"""
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline:
+        waiting = {t['task_id'] for t in DedupTaskScheduler.get_status()['tasks'] if t['waiting']}
+        if set(task_ids) <= waiting:
+            return
+        time.sleep(0.01)
+    raise AssertionError(f'任务 {task_ids} 没有进入等待')
+
+
+def _acquire_in_thread(task_id, order):
+    """在线程中获取名额，记录获得顺序后归还"""
+    def run():
+        if DedupTaskScheduler.acquire(task_id, timeout=2):
+            order.append(task_id)
+            DedupTaskScheduler.release(task_id)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+class TestDedupTaskScheduler:
+    """测试全局并发上限、优先级和分组之间的轮转"""
+
+    def test_concurrency_limit(self, scheduler):
+        """名额用完后其他任务获取失败，归还后可以获取"""
+        scheduler.register(1)
+        scheduler.register(2)
+
+        assert scheduler.try_acquire(1)
+        assert not scheduler.try_acquire(2)
+        assert scheduler.get_status()['in_use'] == 1
+
+        scheduler.release(1)
+        assert scheduler.try_acquire(2)
+
+    def test_higher_priority_first(self, scheduler):
+        """同时等待时优先级高的任务先获得名额"""
+        scheduler.register(1)
+        scheduler.register(2, priority=5)
+        scheduler.register(3)
+        assert scheduler.acquire(1)
+
+        order = []
+        threads = [_acquire_in_thread(3, order)]
+        _wait_until_waiting(3)
+        threads.append(_acquire_in_thread(2, order))
+        _wait_until_waiting(2, 3)
+
+        scheduler.release(1)
+        for thread in threads:
+            thread.join()
+        assert order == [2, 3]
+
+    def test_yield_hands_over_to_waiting_task(self, scheduler):
+        """同优先级时，占用名额的任务在分组之间把名额让给等待中的任务"""
+        scheduler.register(1)
+        scheduler.register(2)
+        assert scheduler.acquire(1)
+
+        order = []
+        thread = _acquire_in_thread(2, order)
+        _wait_until_waiting(2)
+
+        assert scheduler.yield_slot(1, timeout=2)
+        order.append(1)
+        thread.join()
+        assert order == [2, 1]
+
+    def test_yield_keeps_slot_without_waiters(self, scheduler):
+        """没有等待任务时让出后立即重新获得名额"""
+        scheduler.register(1)
+        assert scheduler.acquire(1)
+
+        assert scheduler.yield_slot(1, timeout=0)
+        assert scheduler.get_status()['in_use'] == 1
+
+    def test_resolve_priority(self):
+        """从任务配置读取优先级，无效值按 0 处理"""
+        assert resolve_priority({'priority': '3'}) == 3
+        assert resolve_priority({'priority': 'high'}) == 0
+        assert resolve_priority({}) == 0
@@ -0,0 +1,42 @@
+"""去重特征二进制编码测试"""
+import numpy as np
+from src.services.question_dedup_service import QuestionDedupService
+from src.utils.feature_codec import (
+    ngram_ids, ngram_ids_from_ngrams, encode_uint32, decode_uint32, ngram_jaccard
+)
+
+
+class TestFeatureCodec:
+    """测试 n-gram 哈希ID与 uint32 数组编解码"""
+
+    def test_ngram_ids_match_extracted_ngrams(self):
+        """由文本计算的ID与由 n-gram 字符串计算的ID一致（含短文本和非 BMP 字符）"""
+        for text in ['a', 'ab', '资产负债表日后事项', '😀甲😀乙丙']:
+            ngrams = QuestionDedupService._extract_ngrams(text, n=3)
+            ids = ngram_ids(text)
+
+            assert np.array_equal(ids, ngram_ids_from_ngrams(ngrams))
+            assert len(ids) == len(ngrams)
+            assert np.all(ids[:-1] < ids[1:])
+
+    def test_jaccard_matches_string_ngrams(self):
+        """基于ID的 Jaccard 相似度与基于 n-gram 字符串的结果一致"""
+        a = '某公司2023年销售收入为500万元，销售成本为300万元，求毛利率'
+        b = '某公司2023年销售收入为600万元，销售成本为300万元，求毛利率'
+        expected = QuestionDedupService._jaccard_similarity(
+            QuestionDedupService._extract_ngrams(a), QuestionDedupService._extract_ngrams(b)
+        )
+
+        assert ngram_jaccard(ngram_ids(a), ngram_ids(b)) == expected
+
+    def test_uint32_round_trip(self):
+        """编码后解码得到相同的值，解码结果直接引用字节数据"""
+        signature = np.arange(128, dtype=np.uint32) * 33554467
+        blob = encode_uint32(signature)
+        decoded = decode_uint32(blob)
+
+        assert len(blob) == 512
+        assert np.array_equal(decoded, signature)
+        assert not decoded.flags.writeable
+        assert encode_uint32([]) is None
+        assert len(decode_uint32(None)) == 0
@@ -0,0 +1,71 @@
+"""MinHash 批量计算引擎测试"""
+import os
+import subprocess
+import sys
+import numpy as np
+from src.services.minhash_engine import MinHashEngine, NUM_HASHES
+
+
+def _ngrams(text, n=3):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class TestMinHashEngine:
+    """测试签名矩阵生成"""
+
+    def test_signature_matrix_matches_single(self):
+        """批量签名矩阵与逐题生成的签名一致"""
+        engine = MinHashEngine()
+        sets = [_ngrams('甲乙丙丁戊己庚辛壬癸' * 3), set(), _ngrams('子丑寅卯辰巳午未申酉戌亥')]
+        matrix = engine.signature_matrix(sets)
+
+        assert matrix.shape == (3, NUM_HASHES)
+        assert np.array_equal(matrix[0], engine.signature(sets[0]))
+        assert np.array_equal(matrix[2], engine.signature(sets[2]))
+        # 空集合签名全为 0
+        assert not matrix[1].any()
+
+    def test_signature_matrix_across_chunks(self):
+        """跨批次计算结果与单题计算一致"""
+        engine = MinHashEngine()
+        engine.CHUNK_SIZE = 16
+        sets = [_ngrams(f'第{i}题：计算下列各式的值并说明理由') for i in range(20)]
+        matrix = engine.signature_matrix(sets)
+
+        for i, s in enumerate(sets):
+            assert np.array_equal(matrix[i], engine.signature(s))
+
+    def test_estimate_jaccard(self):
+        """相同集合估算相似度为 1，相似集合估算值接近真实值"""
+        engine = MinHashEngine()
+        a = _ngrams('某公司2023年销售收入为500万元，销售成本为300万元，求毛利率')
+        b = _ngrams('某公司2023年销售收入为600万元，销售成本为300万元，求毛利率')
+        sig_a, sig_b = engine.signature(a), engine.signature(b)
+
+        assert MinHashEngine.estimate_jaccard(sig_a, sig_a) == 1.0
+        exact = len(a & b) / len(a | b)
+        assert abs(MinHashEngine.estimate_jaccard(sig_a, sig_b) - exact) < 0.2
+
+    def test_band_hashes_equal_for_equal_signatures(self):
+        """相同签名的 band 哈希完全相同"""
+        engine = MinHashEngine()
+        sig = engine.signature_matrix([_ngrams('资产负债表日后事项'), _ngrams('资产负债表日后事项')])
+        bands = MinHashEngine.band_hashes(sig)
+
+        assert bands.shape == (2, 16)
+        assert np.array_equal(bands[0], bands[1])
+
+    def test_signature_is_process_independent(self):
+        """不同 PYTHONHASHSEED 的进程生成的签名完全相同"""
+        code = (
+            "from src.services.minhash_engine import MinHashEngine;"
+            "s = 'ABCDEFGHIJKLMNOP';"
+            "print(MinHashEngine().signature({s[i:i + 3] for i in range(len(s) - 2)}).tolist())"
+        )
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        outputs = []
+        for seed in ('1', '2'):
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            outputs.append(subprocess.check_output([sys.executable, '-c', code], cwd=root, env=env))
+
+        assert outputs[0] == outputs[1]
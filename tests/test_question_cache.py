@@ -0,0 +1,73 @@
+"""题目文档缓存测试"""
+import time
+
+import pytest
+
+from src.services.question_cache import MemoryCacheBackend, QuestionCacheBackend
+
+
+def key(question_id, channel_code='default', include_answer=True, include_analysis=True):
+    return (question_id, channel_code, include_answer, include_analysis)
+
+
+class TestMemoryCacheBackend:
+    """进程内 LRU + TTL 缓存"""
+
+    def test_get_and_miss(self):
+        backend = MemoryCacheBackend(max_bytes=1024 * 1024, max_entries=100)
+        backend.set_many({key(1): '{"a": 1}', key(2): '{"b": 2}'}, ttl=60)
+        assert backend.get_many([key(1), key(2), key(3)]) == {key(1): '{"a": 1}', key(2): '{"b": 2}'}
+        assert backend.get_many([key(1, include_answer=False)]) == {}
+
+    def test_evict_least_recently_used(self):
+        backend = MemoryCacheBackend(max_bytes=1024 * 1024, max_entries=2)
+        backend.set_many({key(1): '1', key(2): '2'}, ttl=60)
+        backend.get_many([key(1)])
+        backend.set_many({key(3): '3'}, ttl=60)
+        assert set(backend.get_many([key(1), key(2), key(3)])) == {key(1), key(3)}
+        assert backend.stats()['evictions'] == 1
+
+    def test_byte_limit(self):
+        value = 'x' * 1000
+        backend = MemoryCacheBackend(max_bytes=3500, max_entries=100)
+        backend.set_many({key(i): value for i in range(10)}, ttl=60)
+        stats = backend.stats()
+        assert stats['bytes'] <= 3500
+        assert stats['entries'] == 3
+        assert set(backend.get_many([key(i) for i in range(10)])) == {key(7), key(8), key(9)}
+
+    def test_expiration(self):
+        backend = MemoryCacheBackend(max_bytes=1024 * 1024, max_entries=100)
+        backend.set_many({key(1): '1'}, ttl=0.01)
+        time.sleep(0.02)
+        assert backend.get_many([key(1)]) == {}
+        assert backend.stats()['entries'] == 0
+        assert backend.stats()['expirations'] == 1
+
+    def test_delete_questions(self):
+        backend = MemoryCacheBackend(max_bytes=1024 * 1024, max_entries=100)
+        backend.set_many({
+            key(1): '1', key(1, 'other'): '1', key(1, include_answer=False): '1', key(2): '2'
+        }, ttl=60)
+        assert backend.delete_questions([1]) == 3
+        assert set(backend.get_many([key(1), key(1, 'other'), key(2)])) == {key(2)}
+        assert backend.clear() == 1
+        assert backend.stats()['bytes'] == 0
+
+
+class TestQuestionCacheBackend:
+    """缓存后端接口"""
+
+    def test_incomplete_backend_rejected(self):
+        # 未实现 delete_questions / clear 的后端在创建时就报错，而不是在失效缓存时才抛出 NotImplementedError
+        class PartialBackend(QuestionCacheBackend):
+            def get_many(self, keys):
+                return {}
+
+            def set_many(self, items, ttl):
+                pass
+
+        with pytest.raises(TypeError):
+            PartialBackend()
+        with pytest.raises(TypeError):
+            QuestionCacheBackend()
@@ -0,0 +1,45 @@
+"""题目关键字搜索索引测试"""
+import random
+
+import numpy as np
+
+from src.services.question_search_index import QuestionSearchIndex
+
+
+class TestSearchNgrams:
+    """关键字 n-gram 与题目内容 n-gram"""
+
+    def test_fold_text(self):
+        assert QuestionSearchIndex.fold_text('ＡＢＣ（1）Hello') == 'abc(1)hello'
+        assert QuestionSearchIndex.fold_text(None) == ''
+        # utf8mb4_unicode_ci 的 LIKE 不区分重音：'cafe' 与 'café' 相同
+        assert QuestionSearchIndex.fold_text('Café Łódź Ørsted') == 'cafe lodz orsted'
+
+    def test_keyword_ngrams_contained_in_content(self):
+        rng = random.Random(1)
+        chars = [chr(c) for c in range(0x4E00, 0x4E00 + 300)] + list('abcABCＡＢＣ（） <>éÉüçłØ') + ['e\u0301']
+        for _ in range(200):
+            content = ''.join(rng.choice(chars) for _ in range(rng.randint(5, 80)))
+            length = rng.randint(3, min(12, len(content)))
+            start = rng.randint(0, len(content) - length)
+            keyword = content[start:start + length]
+            if rng.random() < 0.3:
+                keyword = keyword.upper()
+            ids = QuestionSearchIndex.query_ngram_ids(keyword)
+            assert ids is not None
+            assert np.isin(ids, QuestionSearchIndex.content_ngram_ids(content)).all()
+
+    def test_accent_insensitive_keyword(self):
+        content = QuestionSearchIndex.content_ngram_ids('法语单词 café 的含义')
+        for keyword in ('cafe', 'CAFÉ', 'cafe\u0301'):
+            assert np.isin(QuestionSearchIndex.query_ngram_ids(keyword), content).all()
+
+    def test_keyword_without_index(self):
+        assert QuestionSearchIndex.query_ngram_ids('会计') is None
+        assert QuestionSearchIndex.query_ngram_ids('a_c') is None
+        assert QuestionSearchIndex.query_ngram_ids('100%') is None
+
+    def test_query_ngram_limit(self):
+        ids = QuestionSearchIndex.query_ngram_ids('下列关于长期股权投资后续计量的表述中正确的是')
+        assert len(ids) == QuestionSearchIndex.MAX_QUERY_NGRAMS
+        assert ids.dtype == np.int32
@@ -0,0 +1,39 @@
+"""题干文本标准化引擎测试"""
+from src.services.text_normalizer import TextNormalizer, get_normalizer, register_channel_steps, _channel_normalizers
+
+
+class TestTextNormalizer:
+    """测试默认清洗步骤与可插拔步骤"""
+
+    def test_default_steps(self):
+        """默认步骤与原逐题清洗逻辑的结果一致"""
+        normalizer = TextNormalizer()
+        cases = [
+            ("  ABC  ", "ABC"),
+            ("A  B \n\t C", "A B C"),
+            ("[图片1]内容[公式23]", "[IMG]内容[FORMULA]"),
+            ("<p>HTML标签</p>", "HTML标签"),
+            ("全角ＡＢＣ　（１）", "全角ABC (1)"),
+            # 全角尖括号在去除标签之后才转半角，不会被当作标签删除
+            ("ａ＜ｂ＞ｃ", "a<b>c"),
+            # 不可见字符在合并空白之后去除，两侧空格保留
+            ("A \x00 B\u200b", "A  B"),
+            ("", ""),
+            (None, ""),
+        ]
+        for original, expected in cases:
+            assert normalizer.normalize(original) == expected
+
+        assert normalizer.normalize_many([c[0] for c in cases]) == [c[1] for c in cases]
+
+    def test_channel_steps(self):
+        """渠道追加的步骤在默认步骤之后执行，其他渠道不受影响"""
+        register_channel_steps('test_channel', str.lower)
+        try:
+            assert get_normalizer('test_channel').normalize('<b>ＡＢＣ</b>') == 'abc'
+            assert get_normalizer('other_channel').normalize('<b>ＡＢＣ</b>') == 'ABC'
+            assert get_normalizer().normalize('<b>ＡＢＣ</b>') == 'ABC'
+        finally:
+            # 注册表是模块级全局状态，测试结束后移除，避免影响后续测试
+            _channel_normalizers.pop('test_channel', None)
+        assert get_normalizer('test_channel').normalize('<b>ＡＢＣ</b>') == 'ABC'